@@ -4,7 +4,7 @@ Jarvis module
 # Libraries
 import re
 import os
-import requests
+import concurrent.futures
 from IPython.display import display, HTML, Markdown
 
 # Modules
@@ -14,10 +14,11 @@ from jarvis.orchestrator import orchestrator_functional, orchestrator_shared, or
     orchestrator_viewpoint_attribute, orchestrator_viewpoint_requirement, orchestrator_object, \
     orchestrator_object_allocation, orchestrator_viewpoint_type, orchestrator_dictionary , \
     orchestrator_viewpoint_goal
-from jarvis.diagram import diagram_generator
+from jarvis.diagram import diagram_generator, diagram_exporter, diagram_pager, DiagramCache
 from jarvis.simulation import simulation_generator
 from jarvis.handler import handler_question, handler_list
 from jarvis import util
+from xml_adapter import XML_DICT_KEY_13_VIEW_LIST
 from tools import get_hyperlink
 from tools import Config
 from tools import Logger
@@ -25,54 +26,73 @@ from tools import Logger
 
 class CmdParser:
     def __init__(self, generator, simulator):
+        # Each command is defined by its regex, a keyword that any match of the regex contains (lower case) and its
+        # handler. Commands are handled in this order.
         self.command_list = [
-            (r"^under ([^.|\n]*)", self.matched_under),
-            (r"([^. |\n][^.|\n]*) extends ([^.|\n]*)", orchestrator_viewpoint_type.check_add_type_extension),
-            (r"([^. |\n][^.|\n]*) is a ((?!attribute)[^.|\n]*)", orchestrator_object.check_add_specific_obj_by_type),
-            (r"([^. |\n][^.|\n]*) is an ((?!attribute)[^.|\n]*)", orchestrator_object.check_add_specific_obj_by_type),
-            (r"([^. |\n][^.|\n]*) is an attribute", orchestrator_viewpoint_attribute.add_attribute),
-            (r"([^. |\n][^.|\n]*) inherits from ([^.|\n]*)", orchestrator_shared.check_add_inheritance),
-            (r"The alias of (.*?) is ([^.|\n]*)", orchestrator_shared.check_set_object_alias),
-            (r"^consider ([^.|\n]*)", orchestrator_viewpoint.check_get_consider),
-            (r"([^. |\n][^.|\n]*) is composed of ([^.|\n]*)", orchestrator_shared.check_add_child),
-            (r"([^. |\n][^.|\n]*) composes ([^.|\n]*)", orchestrator_shared.check_add_child),
-            (r"([^. |\n][^.|\n]*) compose ([^.|\n]*)", orchestrator_shared.check_add_child),
-            (r"([^. |\n][^.|\n]*) consumes ([^.|\n]*)", orchestrator_functional.check_add_consumer_elem),
-            (r"([^. |\n][^.|\n]*) is an input of ([^.|\n]*)", orchestrator_functional.check_add_consumer_elem),
-            (r"([^. |\n][^.|\n]*) produces ([^.|\n]*)", orchestrator_functional.check_add_producer_elem),
-            (r"([^. |\n][^.|\n]*) is an output of ([^.|\n]*)", orchestrator_functional.check_add_producer_elem),
-            (r"([^. |\n][^.|\n]*) exposes ([^.|\n]*)", orchestrator_functional.check_add_exposes),
-            (r"([^. |\n][^.|\n]*) expose ([^.|\n]*)", orchestrator_functional.check_add_exposes),
-            (r"([^. |\n][^.|\n]*) is allocated to ([^.|\n]*)", orchestrator_object_allocation.check_add_allocation),
-            (r"([^. |\n][^.|\n]*) are allocated to ([^.|\n]*)", orchestrator_object_allocation.check_add_allocation),
-            (r"([^. |\n][^.|\n]*) allocates ([^.|\n]*)", orchestrator_object_allocation.check_add_allocation),
-            (r"^delete ([^.|\n]*)", orchestrator_shared.check_and_delete_object),
-            (r"The type of (.*?) is ([^.|\n]*)", orchestrator_shared.check_set_object_type),
-            (r"([^. |\n][^.|\n]*) implies ([^.|\n]*)", orchestrator_functional.check_add_predecessor),
-            (r"([^. |\n][^.|\n]*) imply ([^.|\n]*)", orchestrator_functional.check_add_predecessor),
-            (r'Condition for (.*?) is: "((.|\n)*?)"', orchestrator_functional.check_add_transition_condition),
-            (r"Condition for (.*?) is: ([^.|\n]*)", orchestrator_functional.check_add_transition_condition),
-            (r"The (source|destination) of (.*?) is ([^.|\n]*)", orchestrator_functional.check_add_src_dest),
+            (r"^under ([^.|\n]*)", "under ", self.matched_under),
+            (r"([^. |\n][^.|\n]*) extends ([^.|\n]*)", " extends ",
+             orchestrator_viewpoint_type.check_add_type_extension),
+            (r"([^. |\n][^.|\n]*) is a ((?!attribute)[^.|\n]*)", " is a ",
+             orchestrator_object.check_add_specific_obj_by_type),
+            (r"([^. |\n][^.|\n]*) is an ((?!attribute)[^.|\n]*)", " is an ",
+             orchestrator_object.check_add_specific_obj_by_type),
+            (r"([^. |\n][^.|\n]*) is an attribute", " is an attribute", orchestrator_viewpoint_attribute.add_attribute),
+            (r"([^. |\n][^.|\n]*) inherits from ([^.|\n]*)", " inherits from ", orchestrator_shared.check_add_inheritance),
+            (r"The alias of (.*?) is ([^.|\n]*)", "the alias of ", orchestrator_shared.check_set_object_alias),
+            (r"^consider ([^.|\n]*)", "consider ", orchestrator_viewpoint.check_get_consider),
+            (r"([^. |\n][^.|\n]*) is composed of ([^.|\n]*)", " is composed of ", orchestrator_shared.check_add_child),
+            (r"([^. |\n][^.|\n]*) composes ([^.|\n]*)", " composes ", orchestrator_shared.check_add_child),
+            (r"([^. |\n][^.|\n]*) compose ([^.|\n]*)", " compose ", orchestrator_shared.check_add_child),
+            (r"([^. |\n][^.|\n]*) consumes ([^.|\n]*)", " consumes ", orchestrator_functional.check_add_consumer_elem),
+            (r"([^. |\n][^.|\n]*) is an input of ([^.|\n]*)", " is an input of ",
+             orchestrator_functional.check_add_consumer_elem),
+            (r"([^. |\n][^.|\n]*) produces ([^.|\n]*)", " produces ", orchestrator_functional.check_add_producer_elem),
+            (r"([^. |\n][^.|\n]*) is an output of ([^.|\n]*)", " is an output of ",
+             orchestrator_functional.check_add_producer_elem),
+            (r"([^. |\n][^.|\n]*) exposes ([^.|\n]*)", " exposes ", orchestrator_functional.check_add_exposes),
+            (r"([^. |\n][^.|\n]*) expose ([^.|\n]*)", " expose ", orchestrator_functional.check_add_exposes),
+            (r"([^. |\n][^.|\n]*) is allocated to ([^.|\n]*)", " is allocated to ",
+             orchestrator_object_allocation.check_add_allocation),
+            (r"([^. |\n][^.|\n]*) are allocated to ([^.|\n]*)", " are allocated to ",
+             orchestrator_object_allocation.check_add_allocation),
+            (r"([^. |\n][^.|\n]*) allocates ([^.|\n]*)", " allocates ",
+             orchestrator_object_allocation.check_add_allocation),
+            (r"^delete ([^.|\n]*)", "delete ", orchestrator_shared.check_and_delete_object),
+            (r"The type of (.*?) is ([^.|\n]*)", "the type of ", orchestrator_shared.check_set_object_type),
+            (r"([^. |\n][^.|\n]*) implies ([^.|\n]*)", " implies ", orchestrator_functional.check_add_predecessor),
+            (r"([^. |\n][^.|\n]*) imply ([^.|\n]*)", " imply ", orchestrator_functional.check_add_predecessor),
+            (r'Condition for (.*?) is: "((.|\n)*?)"', "condition for ",
+             orchestrator_functional.check_add_transition_condition),
+            (r"Condition for (.*?) is: ([^.|\n]*)", "condition for ", orchestrator_functional.check_add_transition_condition),
+            (r"The (source|destination) of (.*?) is ([^.|\n]*)", " of ", orchestrator_functional.check_add_src_dest),
             (r"The " + datamodel.ObjectTextPropertyLabel + " of (.*?) is ([^.|\n]*)",
+             "the " + datamodel.ObjectTextPropertyLabel + " of ",
              orchestrator_viewpoint_requirement.check_add_text),
-            (datamodel.REQUIREMENT_PATTERN, orchestrator_viewpoint_requirement.check_add_requirement),
-            (r"([^. |\n][^.|\n]*) is satisfied by ([^.|\n]*)", orchestrator_object_allocation.check_add_allocation),
-            (r"([^. |\n][^.|\n]*) are satisfied by ([^.|\n]*)",
+            (datamodel.REQUIREMENT_PATTERN, " shall ", orchestrator_viewpoint_requirement.check_add_requirement),
+            (r"([^. |\n][^.|\n]*) is satisfied by ([^.|\n]*)", " is satisfied by ",
              orchestrator_object_allocation.check_add_allocation),
-            (r"([^. |\n][^.|\n]*) satisfies ([^.|\n]*)", orchestrator_object_allocation.check_add_allocation),
-            (datamodel.GOAL_PATTERN, orchestrator_viewpoint_goal.check_add_goal),
-            (r"([^. |\n][^.|\n]*) derives from ([^.|\n]*)", orchestrator_viewpoint_requirement.check_add_derived),
-            (r"([^. |\n][^.|\n]*) derive from ([^.|\n]*)", orchestrator_viewpoint_requirement.check_add_derived),
-            (r"([^. |\n][^.|\n]*) is derived into ([^.|\n]*)", orchestrator_viewpoint_requirement.check_add_derived),
-            (r"^show ([^.|\n]*)", self.matched_show),
-            (r"^(.*?)\?", self.matched_question_mark),
-            (r"^list (.*?) ([^.|\n]*)", CmdParser.matched_list),
-            (r"^import requirement from ([^.|\n]*) in column ([^.|\n]*)", CmdParser.matched_import),
-            (r"^import ((?!requirement from)[^.|\n]*)", CmdParser.matched_import),
-            (r"^export ([^.|\n]*)", CmdParser.matched_export),
-            (r"^analyze ([^.|\n]*)", CmdParser.matched_analyze),
-            (r"^simulate ([^.|\n]*) between ([^.|\n]*) and ([^.|\n]*)", self.matched_simulate),
-            (r"^plot ([^.|\n]*)", self.matched_plot)
+            (r"([^. |\n][^.|\n]*) are satisfied by ([^.|\n]*)", " are satisfied by ",
+             orchestrator_object_allocation.check_add_allocation),
+            (r"([^. |\n][^.|\n]*) satisfies ([^.|\n]*)", " satisfies ", orchestrator_object_allocation.check_add_allocation),
+            (datamodel.GOAL_PATTERN, " i want ", orchestrator_viewpoint_goal.check_add_goal),
+            (r"([^. |\n][^.|\n]*) derives from ([^.|\n]*)", " derives from ",
+             orchestrator_viewpoint_requirement.check_add_derived),
+            (r"([^. |\n][^.|\n]*) derive from ([^.|\n]*)", " derive from ",
+             orchestrator_viewpoint_requirement.check_add_derived),
+            (r"([^. |\n][^.|\n]*) is derived into ([^.|\n]*)", " is derived into ",
+             orchestrator_viewpoint_requirement.check_add_derived),
+            (r"^show ([^.|\n]*)", "show ", self.matched_show),
+            (r"^(.*?)\?", "?", self.matched_question_mark),
+            (r"^list (.*?) ([^.|\n]*)", "list ", CmdParser.matched_list),
+            (r"^import requirement from ([^.|\n]*) in column ([^.|\n]*)", "import requirement from ",
+             CmdParser.matched_import),
+            (r"^import ((?!requirement from)[^.|\n]*)", "import ", CmdParser.matched_import),
+            (r"^include ([^.|\n]*)", "include ", CmdParser.matched_include),
+            (r"^export diagrams(?: to ([^.|\n]*))?", "export diagrams", self.matched_export_diagrams),
+            (r"^export ((?!diagrams\b)[^.|\n]*)", "export ", CmdParser.matched_export),
+            (r"^analyze ([^.|\n]*)", "analyze ", CmdParser.matched_analyze),
+            (r"^simulate ([^.|\n]*) between ([^.|\n]*) and ([^.|\n]*)", "simulate ", self.matched_simulate),
+            (r"^plot ([^.|\n]*)", "plot ", self.matched_plot)
         ]
 
         self.attribute_command_list = [
@@ -111,56 +131,105 @@ class CmdParser:
 
         self.simulator = simulator
 
+        self.diagram_cache = DiagramCache()
+
+        # Diagram files are rendered in background so that the notebook is not blocked by the PlantUml server,
+        # diagrams being rendered are kept by file path so that a diagram is rendered once even if shown again
+        self.render_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="jarvis_diagram")
+        self.pending_diagram_dict = {}
+
+        # Regexes are compiled once for all inputs
+        self.compiled_command_list = [(re.compile(regex, flags=re.MULTILINE | re.IGNORECASE),
+                                       keyword,
+                                       CmdParser.is_multiline_regex(regex),
+                                       regex in self.reverse_command_list,
+                                       method) for regex, keyword, method in self.command_list]
+
+        self.compiled_attribute_command_list = [(re.compile(regex, flags=re.MULTILINE | re.IGNORECASE), method)
+                                                for regex, method in self.attribute_command_list]
+
     def lookup_table(self, string, **kwargs):
-        """Lookup table with conditions depending on the match"""
+        """Lookup table with conditions depending on the match
+
+        XML file modifications are buffered in memory and written at once when all commands have been handled
+        @param[in] string : input string
+        @param[in] kwargs : xml lists + xml's file object
+        @return update list
+        """
+        output_xml = kwargs.get('output_xml')
+        if output_xml is not None:
+            output_xml.start_buffer()
+        # Else do nothing
+
+        try:
+            update_list = self.lookup_command_list(string, **kwargs)
+        finally:
+            if output_xml is not None:
+                output_xml.flush()
+            # Else do nothing
+
+        return update_list
+
+    def lookup_command_list(self, string, **kwargs):
+        """Match and handle each command of the input string
+        @param[in] string : input string
+        @param[in] kwargs : xml lists + xml's file object
+        @return update list
+        """
         update_list = []
         update = None
 
+        # The input string is split in lines once. A command regex is only applied if the input string contains its
+        # keyword, and only on the lines containing its keyword when its matches cannot span several lines.
+        lower_string = string.lower()
+        line_list = string.split('\n')
+        lower_line_list = lower_string.split('\n')
+        keyword_line_dict = {}
+
         # Case of non-attribute command
-        for regex, method in self.command_list:
+        for regex, keyword, is_multiline, is_reversed, method in self.compiled_command_list:
             result_command = None
-            result_command_chain = None
-
-            if regex == r"under ([^.|\n]*)":
-                result_command_chain = re.split(regex, string)
-                del result_command_chain[0]
-            # Only one diagram per cell can be output
-            elif regex == r"show ([^.|\n]*)":
-                result_command = re.search(regex, string, flags=re.MULTILINE | re.IGNORECASE)
-            else:
-                # Transform to avoid duplicated function's declaration within cells input
-                result_command = []
-                [result_command.append(x) for x in re.findall(regex, string, flags=re.MULTILINE | re.IGNORECASE)
-                 if x not in result_command]
-
-            if result_command and not result_command_chain:
-                # self.reverse
-                if regex in self.reverse_command_list:
+
+            if keyword in lower_string:
+                if is_multiline:
+                    match_list = regex.findall(string)
+                else:
+                    if keyword not in keyword_line_dict:
+                        keyword_line_dict[keyword] = [line for line, lower_line in zip(line_list, lower_line_list)
+                                                      if keyword in lower_line]
+                    # Else do nothing
+
+                    match_list = [match for line in keyword_line_dict[keyword] for match in regex.findall(line)]
+
+                # Transform to avoid duplicated function's declaration within cells input, keeping the order of
+                # first declaration
+                result_command = list(dict.fromkeys(match_list))
+            # Else do nothing
+
+            if result_command:
+                if is_reversed:
                     result_command = util.reverse_tuple_list(result_command)
+                # Else do nothing
+
                 update = method(result_command, **kwargs)
-            elif result_command_chain:
-                string = ''
-                update = self.matched_under(result_command_chain, **kwargs)
+            # Else do nothing
 
             if update is not None:
                 if isinstance(update, int):
                     update_list.append(update)
 
-        # Case of attribute command
-        result_attr_command = re.findall(self.attribute_command_list[0][0], string, flags=re.MULTILINE | re.IGNORECASE)
-        if result_attr_command:
-            update = self.attribute_command_list[0][1](result_attr_command, **kwargs)
-            if update is not None:
-                if isinstance(update, int):
-                    update_list.append(update)
-        else:
-            result_attr_command = re.findall(self.attribute_command_list[1][0], string, flags=re.MULTILINE | re.IGNORECASE)
-            if result_attr_command:
-                update = self.attribute_command_list[1][1](result_attr_command, **kwargs)
-                if update is not None:
-                    if isinstance(update, int):
-                        update_list.append(update)
-            # Else do nothing
+        # Case of attribute command: only the first matching attribute regex is handled
+        if 'the ' in lower_string:
+            for regex, method in self.compiled_attribute_command_list:
+                result_attr_command = regex.findall(string)
+                if result_attr_command:
+                    update = method(result_attr_command, **kwargs)
+                    if update is not None:
+                        if isinstance(update, int):
+                            update_list.append(update)
+                    break
+                # Else do nothing
+        # Else do nothing
 
         if update is None:
             Logger.set_error(__name__, f"Unable to understand this request")
@@ -168,6 +237,15 @@ class CmdParser:
 
         return update_list
 
+    @staticmethod
+    def is_multiline_regex(p_regex):
+        """Check if the matches of a command regex can span several lines, i.e. if the regex explicitly accepts a
+        new line character within an alternative, e.g. (.|\\n)
+        @param[in] p_regex : command regex
+        @return True if the matches can span several lines, False otherwise
+        """
+        return '|\\n)' in p_regex
+
     @staticmethod
     def matched_under(p_str_list, **kwargs):
         """Get "under" declaration"""
@@ -179,36 +257,130 @@ class CmdParser:
         update = 0
 
         """Get "show" declaration"""
-        out = diagram_generator.filter_show_command(diagram_name_str, **kwargs)
+        # Diagram is generated again only if the model or the active view has changed since it was displayed
+        output_xml = kwargs.get('output_xml')
+        diagram_key = self.diagram_cache.get_key(diagram_name_str[0], getattr(output_xml, 'revision', None),
+                                                 kwargs.get(XML_DICT_KEY_13_VIEW_LIST, ()))
+        diagram = self.diagram_cache.get(diagram_key)
+        if diagram:
+            page_list, url_list = diagram
+        else:
+            # Oversized diagram is split into pages, each page being rendered on its own
+            out = diagram_generator.filter_show_command(diagram_name_str, **kwargs)
+            page_list = diagram_pager.get_page_list(diagram_name_str[0], out, **kwargs)
+            url_list = None
 
-        if out:
+        if page_list:
             if Config.is_diagram_file:
-                url = self.generator.get_diagram_url(out)
-                # Generate and set unique identifier of length 10 integers
-                identi = util.get_unique_id()
-
-                if not os.path.isdir("diagrams"):
-                    os.makedirs("diagrams")
-
-                current_file_path = str('./diagrams/Diagram' + identi + '.svg')
-                try:
-                    response = requests.get(url)
-                    with open(current_file_path, "wb") as file_writer:
-                        file_writer.write(response.content)
-                    url = current_file_path
-                except EnvironmentError as ex:
-                    Logger.set_error(__name__,
-                                     f"Unable to write the diagram {current_file_path}: {str(ex)}")
-            else:
-                url = self.generator.get_diagram_url(out)
+                # Diagram file is named after its PlantUml text: the diagram is rendered only once
+                url_list = [DiagramCache.get_svg_file_path(page_text) for _, page_text in page_list]
+                self.diagram_cache.set(diagram_key, page_list, url_list)
+            elif url_list is None:
+                url_list = [self.generator.get_diagram_url(page_text) for _, page_text in page_list]
+                if all(url_list):
+                    self.diagram_cache.set(diagram_key, page_list, url_list)
+                # Else do nothing
+            # Else do nothing
+
+            for index, ((page_str, page_text), url) in enumerate(zip(page_list, url_list), 1):
+                if len(page_list) > 1:
+                    # Single display (not related to logging)
+                    print(f"Page {index}/{len(page_list)}: {page_str}")
+                # Else do nothing
 
-            hyper = get_hyperlink(url)
-            display(HTML(hyper))
+                if Config.is_diagram_file and not os.path.isfile(url):
+                    self.show_diagram_file(page_text, url)
+                else:
+                    self.display_diagram(url)
+        # Else do nothing
+
+        return update
+
+    @staticmethod
+    def display_diagram(p_url, p_link_handle=None, p_image_handle=None):
+        """Display a diagram link and image, or update their placeholders
+        @param[in] p_url : diagram url or file path
+        @param[in] p_link_handle : display handle of the link placeholder, None to display a new link
+        @param[in] p_image_handle : display handle of the image placeholder, None to display a new image
+        @return None
+        """
+        hyper = HTML(get_hyperlink(p_url))
+        image = Markdown(f'![figure]({p_url})')
+        if p_link_handle is None:
+            display(hyper)
             # Single display (not related to logging)
             print("Overview :")
-            display(Markdown(f'![figure]({url})'))
+            display(image)
+        else:
+            p_link_handle.update(hyper)
+            p_image_handle.update(image)
+
+    def show_diagram_file(self, p_plantuml_text, p_file_path):
+        """Display placeholders filled in when the diagram file is rendered in background
+        @param[in] p_plantuml_text : PlantUml text of the diagram
+        @param[in] p_file_path : diagram .svg file path
+        @return None
+        """
+        link_handle = display(HTML("<i>Rendering diagram...</i>"), display_id=True)
+        # Single display (not related to logging)
+        print("Overview :")
+        image_handle = display(Markdown(""), display_id=True)
+
+        render_future = self.pending_diagram_dict.get(p_file_path)
+        if render_future is None:
+            render_future = self.render_pool.submit(self.render_diagram_file, p_plantuml_text, p_file_path)
+            self.pending_diagram_dict[p_file_path] = render_future
+            render_future.add_done_callback(lambda _: self.pending_diagram_dict.pop(p_file_path, None))
+        # Else diagram is already being rendered
+
+        render_future.add_done_callback(lambda f: self.update_diagram(f, link_handle, image_handle))
+
+    def render_diagram_file(self, p_plantuml_text, p_file_path):
+        """Render a diagram as .svg file, called in background
+        @param[in] p_plantuml_text : PlantUml text of the diagram
+        @param[in] p_file_path : diagram .svg file path
+        @return diagram file path, diagram url if the file cannot be written, None if the diagram cannot be rendered
+        """
+        url = None
+        svg = self.generator.get_diagram_svg(p_plantuml_text)
+        if svg:
+            try:
+                DiagramCache.write_svg_file(p_file_path, svg)
+                url = p_file_path
+            except EnvironmentError as ex:
+                Logger.set_error(__name__, f"Unable to write the diagram {p_file_path}: {str(ex)}")
+        # Else do nothing
 
-        return update
+        if url is None:
+            url = self.generator.get_diagram_url(p_plantuml_text)
+        # Else do nothing
+
+        return url
+
+    def update_diagram(self, p_render_future, p_link_handle, p_image_handle):
+        """Fill in the placeholders of a diagram once rendered
+        @param[in] p_render_future : rendering future
+        @param[in] p_link_handle : display handle of the link placeholder
+        @param[in] p_image_handle : display handle of the image placeholder
+        @return None
+        """
+        try:
+            url = p_render_future.result()
+        except Exception as ex:
+            Logger.set_error(__name__, f"Unable to render the diagram: {str(ex)}")
+            url = None
+
+        if url:
+            self.display_diagram(url, p_link_handle, p_image_handle)
+        else:
+            p_link_handle.update(HTML("<i>Diagram not rendered</i>"))
+
+    def wait_diagrams(self, p_timeout=None):
+        """Wait for the diagrams being rendered in background
+        @param[in] p_timeout : maximum duration in seconds, None for no limit
+        @return None
+        """
+        concurrent.futures.wait(list(self.pending_diagram_dict.values()), timeout=p_timeout)
 
     def matched_simulate(self, simulation_str_list, **kwargs):
         update = 0
@@ -352,6 +524,44 @@ class CmdParser:
 
         return update
 
+    @staticmethod
+    def matched_include(p_str_list, **kwargs):
+        """@ingroup jarvis
+        @anchor matched_include
+        Get "include" declaration for declaring sub-models of the model, loaded only when one of their objects is
+        named (see @ref XmlManifest3SE)
+
+        @param[in] p_str_list : list of input strings
+        @param[in] kwargs : jarvis data structure
+        @return xml updated (1) or not (0)
+        """
+        update = 0
+
+        output_xml = kwargs['output_xml']
+        folder = os.path.dirname(output_xml.file)
+        sub_model_file_list = []
+        for sub_model_str in p_str_list:
+            sub_model_name = sub_model_str.replace('"', "").strip()
+            sub_model_file = f"{sub_model_name}.xml"
+            sub_model_path = os.path.normpath(os.path.join(folder, sub_model_file))
+            if sub_model_path == os.path.normpath(output_xml.file):
+                Logger.set_error(__name__,
+                                 f"Model {sub_model_file} cannot be a sub-model of itself")
+            elif os.path.isfile(sub_model_path):
+                sub_model_file_list.append(sub_model_file)
+                Logger.set_info(__name__,
+                                f"{sub_model_file} is a sub-model of {output_xml.file}")
+            else:
+                Logger.set_error(__name__,
+                                 f"File {sub_model_path} does not exist")
+
+        if sub_model_file_list:
+            output_xml.write_sub_model_list(sub_model_file_list)
+            update = 1
+        # Else do nothing
+
+        return update
+
     @staticmethod
     def matched_export(p_str_list, **kwargs):
         """@ingroup jarvis
@@ -370,6 +580,29 @@ class CmdParser:
 
         return update
 
+    def matched_export_diagrams(self, p_str_list, **kwargs):
+        """@ingroup jarvis
+        @anchor matched_export_diagrams
+        Get "export diagrams" declaration for exporting all the diagrams of the model as PlantUml text and .svg files
+
+        @param[in] p_str_list : list of input strings
+        @param[in] kwargs : jarvis data structure
+        @return None (no xml update, no info displayed)
+        """
+        update = 0
+
+        output_xml = kwargs.get('output_xml')
+        if output_xml is None:
+            Logger.set_error(__name__, "Diagrams cannot be exported without model file")
+        else:
+            # Diagrams are generated by other processes from the model file: buffered modifications are written first
+            output_xml.write_buffer()
+            output_folder = p_str_list[0].replace('"', "").strip() or diagram_exporter.EXPORT_FOLDER
+            diagram_exporter.export_diagrams(output_xml.file, self.generator, output_folder,
+                                             p_sub_model_file_list=output_xml.sub_model_file_list)
+
+        return update
+
     @staticmethod
     def matched_analyze(p_str_list, **kwargs):
         """@ingroup jarvis
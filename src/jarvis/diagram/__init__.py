@@ -5,3 +5,6 @@ Handles the user commands coming from @ref Jarvis module related to object diagr
 coming from @ref query module before calling @ref plantuml_adapter module
 """
 from . import diagram_generator
+from .diagram_cache import DiagramCache
+from .diagram_exporter import export_diagrams, get_export_target_list
+from .diagram_pager import get_page_list
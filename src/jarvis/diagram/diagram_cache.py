@@ -0,0 +1,125 @@
+"""@defgroup diagram
+Jarvis diagram module
+"""
+# Libraries
+import os
+import hashlib
+from collections import OrderedDict
+
+# Modules
+from tools import Logger
+
+# Constants
+DIAGRAM_FOLDER = "diagrams"
+
+
+class DiagramCache:
+    """@ingroup diagram
+    @anchor DiagramCache
+    Cache of the diagrams displayed by the "show" command
+
+    Diagrams are identified by the diagram type, the target object, the model revision and the active view, that
+    is not written within the model: a diagram is generated again only if the model or the active view has changed
+    since it was displayed. The pages of the diagram and their rendered diagram
+    (url or .svg file) are kept for the most recently displayed diagrams.
+
+    Diagram .svg files are named after the hash of their PlantUml text, so that a diagram already rendered in a
+    previous session is reused without calling the PlantUml server.
+    """
+
+    def __init__(self, p_max_size=128):
+        """@var diagram_dict
+        Dictionary of (page list, rendered diagram list) by diagram key, from the least to the most recently used
+
+        @var max_size
+        Maximum number of diagrams kept in cache
+        """
+        self.diagram_dict = OrderedDict()
+        self.max_size = p_max_size
+
+    @staticmethod
+    def get_key(p_diagram_str, p_revision, p_view_list=()):
+        """Get the key of a diagram
+        @param[in] p_diagram_str : diagram type and target object, as written after "show"
+        @param[in] p_revision : model revision, None if unknown
+        @param[in] p_view_list : views of the model, the diagram only showing the items of the activated one
+        @return diagram key, None if the diagram cannot be cached
+        """
+        if p_revision is None:
+            key = None
+        else:
+            view_id = next((view.id for view in p_view_list if view.activated), None)
+            key = (' '.join(p_diagram_str.split()), p_revision, view_id)
+
+        return key
+
+    def get(self, p_key):
+        """Get a diagram from the cache
+        @param[in] p_key : diagram key
+        @return (page list, rendered diagram list) tuple, None if not in cache
+        """
+        diagram = self.diagram_dict.get(p_key)
+        if diagram is not None:
+            self.diagram_dict.move_to_end(p_key)
+            Logger.set_debug(__name__, f"Diagram {p_key[0]} reused from cache")
+        # Else do nothing
+
+        return diagram
+
+    def set(self, p_key, p_page_list, p_diagram_list):
+        """Add a diagram to the cache, the least recently used diagram is removed if the cache is full
+        @param[in] p_key : diagram key
+        @param[in] p_page_list : list of (diagram, PlantUml text) pages, see @ref get_page_list
+        @param[in] p_diagram_list : list of rendered diagrams (url or .svg file path), per page
+        @return None
+        """
+        if p_key is not None:
+            self.diagram_dict[p_key] = (p_page_list, p_diagram_list)
+            self.diagram_dict.move_to_end(p_key)
+            while len(self.diagram_dict) > self.max_size:
+                self.diagram_dict.popitem(last=False)
+        # Else do nothing
+
+    def clear(self):
+        """Remove all diagrams from the cache
+        @return None
+        """
+        self.diagram_dict.clear()
+
+    @staticmethod
+    def get_svg_file_path(p_plantuml_text):
+        """Get the .svg file path of a diagram, named after the hash of its PlantUml text
+        @param[in] p_plantuml_text : PlantUml text of the diagram
+        @return .svg file path
+        """
+        plantuml_text_hash = hashlib.sha1(p_plantuml_text.encode('utf-8')).hexdigest()
+
+        return f"./{DIAGRAM_FOLDER}/{plantuml_text_hash}.svg"
+
+    @staticmethod
+    def is_svg_file_name(p_file_name):
+        """Check if a file name is the name of a diagram .svg file, as given by @ref get_svg_file_path
+        @param[in] p_file_name : file name
+        @return True if the file is a diagram .svg file, else False
+        """
+        name, extension = os.path.splitext(p_file_name)
+
+        return extension == '.svg' and len(name) == 40 and all(c in '0123456789abcdef' for c in name)
+
+    @staticmethod
+    def write_svg_file(p_file_path, p_svg):
+        """Write a diagram .svg file at once, so that a file named after its PlantUml text is never partially
+        written
+        @param[in] p_file_path : .svg file path
+        @param[in] p_svg : .svg content
+        @return None
+        """
+        folder = os.path.dirname(p_file_path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        # Else do nothing
+
+        tmp_file_path = f"{p_file_path}.tmp"
+        with open(tmp_file_path, "wb") as file_writer:
+            file_writer.write(p_svg)
+        os.replace(tmp_file_path, p_file_path)
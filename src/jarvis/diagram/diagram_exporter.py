@@ -0,0 +1,203 @@
+"""@defgroup diagram
+Jarvis diagram module
+"""
+# Libraries
+import io
+import os
+import re
+import contextlib
+import concurrent.futures
+
+# Modules
+from xml_adapter import XmlParser3SE
+from xml_adapter import XML_DICT_KEY_1_FUNCTION_LIST, XML_DICT_KEY_2_FUN_ELEM_LIST
+from . import diagram_generator
+from . import diagram_pager
+from tools import Logger
+
+# Constants
+EXPORT_FOLDER = "export"
+EXPORT_RENDER_COUNT = 4
+
+# Model of the diagram generation process, see @ref init_export_process
+export_xml_dict = None
+
+
+def get_export_target_list(**kwargs):
+    """@ingroup diagram
+    @anchor get_export_target_list
+    Get the diagrams to be exported: context of every function, decomposition of every functional element having
+    children and state machine of every functional element having allocated states
+
+    @param[in] kwargs : jarvis data structure
+    @return list of diagrams, as written after "show", ordered by diagram type then object name
+    """
+    target_list = [f"context {function.name}"
+                   for function in sorted(kwargs[XML_DICT_KEY_1_FUNCTION_LIST], key=lambda x: x.name)]
+    fun_elem_list = sorted(kwargs[XML_DICT_KEY_2_FUN_ELEM_LIST], key=lambda x: x.name)
+    target_list.extend(f"decomposition {fun_elem.name}" for fun_elem in fun_elem_list if fun_elem.child_list)
+    target_list.extend(f"state {fun_elem.name}" for fun_elem in fun_elem_list if fun_elem.allocated_state_list)
+
+    return target_list
+
+
+def init_export_process(p_xml_file, p_sub_model_file_list=()):
+    """@ingroup diagram
+    @anchor init_export_process
+    Parse the model once for all the diagrams generated by a process of the pool
+
+    @param[in] p_xml_file : XML file of the model
+    @param[in] p_sub_model_file_list : list of the sub-model XML files merged within the model
+    @return None
+    """
+    global export_xml_dict
+    with contextlib.redirect_stdout(io.StringIO()):
+        export_xml_dict = XmlParser3SE().parse_xml(p_xml_file, p_sub_model_file_list=p_sub_model_file_list)
+
+
+def generate_diagram_text(p_target):
+    """@ingroup diagram
+    @anchor generate_diagram_text
+    Generate the PlantUml text of a diagram with the model of the process, split into pages if oversized, messages
+    are not displayed
+
+    @param[in] p_target : diagram, as written after "show"
+    @return diagram, list of (diagram, PlantUml text) pages (empty if not generated)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        plantuml_text = diagram_generator.filter_show_command([p_target], **export_xml_dict)
+        page_list = diagram_pager.get_page_list(p_target, plantuml_text, **export_xml_dict)
+
+    return p_target, page_list
+
+
+def get_export_file_path(p_output_folder, p_target):
+    """@ingroup diagram
+    @anchor get_export_file_path
+    Get the file path of an exported diagram, without extension
+
+    @param[in] p_output_folder : export folder
+    @param[in] p_target : diagram, as written after "show"
+    @return file path without extension
+    """
+    return os.path.join(p_output_folder, re.sub(r'[^\w.-]+', '_', p_target.strip()))
+
+
+def export_diagrams(p_xml_file, p_generator, p_output_folder=EXPORT_FOLDER, p_target_list=None,
+                    p_process_count=None, p_render_count=EXPORT_RENDER_COUNT, p_sub_model_file_list=()):
+    """@ingroup diagram
+    @anchor export_diagrams
+    Export diagrams of a model as PlantUml text (.puml) and .svg files
+
+    PlantUml texts are generated by a pool of processes, each of them parsing the model once. Each text is rendered
+    as soon as generated, by at most p_render_count concurrent renderings. Progress is reported for each diagram.
+
+    @param[in] p_xml_file : XML file of the model
+    @param[in] p_generator : PlantUml connector rendering the diagrams
+    @param[in] p_output_folder : export folder
+    @param[in] p_target_list : list of diagrams, as written after "show", all diagrams given by
+    @ref get_export_target_list if None
+    @param[in] p_process_count : number of diagram generation processes, number of CPU if None. Diagrams are
+    generated within the current process if 1
+    @param[in] p_render_count : maximum number of concurrent renderings
+    @param[in] p_sub_model_file_list : list of the sub-model XML files merged within the model, see
+    @ref XmlManifest3SE
+    @return list of exported .svg file paths
+    """
+    global export_xml_dict
+    is_parsed = False
+    if p_target_list is None:
+        init_export_process(p_xml_file, p_sub_model_file_list)
+        is_parsed = True
+        p_target_list = get_export_target_list(**export_xml_dict)
+    # Else do nothing
+
+    svg_file_list = []
+    if not p_target_list:
+        Logger.set_info(__name__, "Not any diagram to export")
+        return svg_file_list
+    # Else do nothing
+
+    process_count = min(p_process_count or os.cpu_count() or 1, len(p_target_list))
+
+    os.makedirs(p_output_folder, exist_ok=True)
+    Logger.set_info(__name__, f"Exporting {len(p_target_list)} diagrams to {p_output_folder}")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(p_render_count, 1)) as render_pool:
+        render_future_dict = {}
+        if process_count > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=process_count,
+                                                        initializer=init_export_process,
+                                                        initargs=(p_xml_file, p_sub_model_file_list)) as process_pool:
+                text_future_list = [process_pool.submit(generate_diagram_text, target) for target in p_target_list]
+                for text_future in concurrent.futures.as_completed(text_future_list):
+                    target, page_list = text_future.result()
+                    submit_diagram(render_pool, render_future_dict, p_generator, p_output_folder, target, page_list)
+        else:
+            if not is_parsed:
+                init_export_process(p_xml_file, p_sub_model_file_list)
+            # Else do nothing
+            for target in p_target_list:
+                target, page_list = generate_diagram_text(target)
+                submit_diagram(render_pool, render_future_dict, p_generator, p_output_folder, target, page_list)
+
+        for index, render_future in enumerate(concurrent.futures.as_completed(render_future_dict), 1):
+            target = render_future_dict[render_future]
+            svg_file = render_future.result()
+            if svg_file:
+                svg_file_list.append(svg_file)
+                Logger.set_info(__name__, f"[{index}/{len(render_future_dict)}] Diagram {target} exported")
+            else:
+                Logger.set_error(__name__, f"[{index}/{len(render_future_dict)}] Diagram {target} not rendered")
+
+    # Model is only kept during the export
+    export_xml_dict = None
+    Logger.set_info(__name__, f"{len(svg_file_list)}/{len(render_future_dict)} diagrams exported to {p_output_folder}")
+
+    return sorted(svg_file_list)
+
+
+def submit_diagram(p_render_pool, p_render_future_dict, p_generator, p_output_folder, p_target, p_page_list):
+    """@ingroup diagram
+    @anchor submit_diagram
+    Write the PlantUml text of each page of a diagram and submit its rendering
+
+    @param[in] p_render_pool : rendering pool
+    @param[in,out] p_render_future_dict : dictionary of pages by rendering future
+    @param[in] p_generator : PlantUml connector rendering the diagrams
+    @param[in] p_output_folder : export folder
+    @param[in] p_target : diagram, as written after "show"
+    @param[in] p_page_list : list of (diagram, PlantUml text) pages of the diagram, empty if not generated
+    @return None
+    """
+    if p_page_list:
+        for page_str, plantuml_text in p_page_list:
+            file_path = get_export_file_path(p_output_folder, page_str)
+            with open(f"{file_path}.puml", "w", encoding="utf-8") as file_writer:
+                file_writer.write(p_generator.get_full_string(plantuml_text))
+
+            render_future = p_render_pool.submit(render_diagram, p_generator, plantuml_text, file_path)
+            p_render_future_dict[render_future] = page_str
+    else:
+        Logger.set_warning(__name__, f"Diagram {p_target} not generated")
+
+
+def render_diagram(p_generator, p_plantuml_text, p_file_path):
+    """@ingroup diagram
+    @anchor render_diagram
+    Render a diagram as .svg file
+
+    @param[in] p_generator : PlantUml connector rendering the diagrams
+    @param[in] p_plantuml_text : PlantUml text of the diagram
+    @param[in] p_file_path : file path of the diagram, without extension
+    @return .svg file path, None if not rendered
+    """
+    svg = p_generator.get_diagram_svg(p_plantuml_text)
+    if svg:
+        svg_file = f"{p_file_path}.svg"
+        with open(svg_file, "wb") as file_writer:
+            file_writer.write(svg)
+    else:
+        svg_file = None
+
+    return svg_file
@@ -7,6 +7,7 @@ import re
 # Modules
 import plantuml_adapter
 from datamodel import FunctionalElement
+from xml_adapter import IndexedFlowList, StateMachineIndex, XmlProjection3SE
 from xml_adapter import XML_DICT_KEY_0_DATA_LIST, XML_DICT_KEY_1_FUNCTION_LIST, XML_DICT_KEY_2_FUN_ELEM_LIST, \
     XML_DICT_KEY_3_FUN_INTF_LIST, XML_DICT_KEY_4_PHY_ELEM_LIST, XML_DICT_KEY_5_PHY_INTF_LIST, \
     XML_DICT_KEY_6_STATE_LIST, XML_DICT_KEY_7_TRANSITION_LIST, XML_DICT_KEY_8_REQUIREMENT_LIST, \
@@ -26,6 +27,9 @@ from tools import Logger
 def filter_show_command(diagram_name_str, **kwargs):
     """Entry point for all diagrams (i.e. 'show' command) from command_parser.py"""
     plantuml_string = None
+    # Diagrams are generated on a projection of the model, so that the model itself is never altered. Only the
+    # sections read by the diagram are projected.
+    kwargs = XmlProjection3SE(kwargs, p_is_lazy=True).xml_dict
     wanted_diagram_str = diagram_name_str[0].strip()
     regex = r"(decomposition|context|chain|sequence|state|function|state sequence)\s(.*)"
     specific_diagram_str = re.search(regex, wanted_diagram_str, re.MULTILINE)
@@ -87,6 +91,19 @@ def case_context_diagram(**kwargs):
     plantuml_string = None
     object_str = kwargs['diagram_object_str'].replace("\"", "")
 
+    # Context of a functional element can be limited to one of its functional interfaces, or to the flows allocated
+    # to none of them
+    without_interface = False
+    if ' for interface ' in object_str:
+        object_str, fun_inter_str = re.split(" for interface ", object_str, maxsplit=1)
+        fun_inter_str = fun_inter_str.strip()
+    else:
+        fun_inter_str = None
+        if object_str.rstrip().endswith(' without interface'):
+            object_str = object_str.rstrip()[:-len(' without interface')]
+            without_interface = True
+        # Else do nothing
+
     if object_str in query_object.query_object_name_in_list(kwargs[XML_DICT_KEY_1_FUNCTION_LIST]):
         consumed_flow_inheritance = query_inheritance.query_inheritance_add_inherited_object(
             kwargs[XML_DICT_KEY_1_FUNCTION_LIST],
@@ -167,7 +184,9 @@ def case_context_diagram(**kwargs):
                                                                         kwargs[XML_DICT_KEY_16_FUN_PROD_LIST],
                                                                         kwargs[XML_DICT_KEY_12_ATTRIBUTE_LIST],
                                                                         kwargs[XML_DICT_KEY_3_FUN_INTF_LIST],
-                                                                        kwargs[XML_DICT_KEY_0_DATA_LIST])
+                                                                        kwargs[XML_DICT_KEY_0_DATA_LIST],
+                                                                        fun_inter_str,
+                                                                        without_interface)
 
         query_inheritance.query_inheritance_remove_inherited_object_children(
             kwargs[XML_DICT_KEY_1_FUNCTION_LIST],
@@ -202,6 +221,22 @@ def case_decomposition_diagram(**kwargs):
     plantuml_string = None
     object_str = kwargs['diagram_object_str'].replace("\"", "")
 
+    # Level of detail: functional elements beyond the node budget are collapsed into a summary
+    if ' with budget ' in object_str:
+        object_str, budget_str = re.split(" with budget ", object_str, maxsplit=1)
+        try:
+            diagram_budget = int(budget_str)
+        except ValueError:
+            diagram_budget = 0
+
+        if diagram_budget < 1:
+            Logger.set_error(__name__,
+                             "Invalid budget, please choose a valid number of nodes >= 1")
+            return plantuml_string
+        # Else do nothing
+    else:
+        diagram_budget = None
+
     if ' at level ' in object_str:
         splitted_str = re.split(" at level ", object_str)
         diagram_object_str = splitted_str[0]
@@ -315,7 +350,8 @@ def case_decomposition_diagram(**kwargs):
                                                                                   kwargs[XML_DICT_KEY_12_ATTRIBUTE_LIST],
                                                                                   kwargs[XML_DICT_KEY_0_DATA_LIST],
                                                                                   kwargs[XML_DICT_KEY_3_FUN_INTF_LIST],
-                                                                                  diagram_level)
+                                                                                  diagram_level,
+                                                                                  diagram_budget)
 
             query_inheritance.query_inheritance_remove_inherited_object_children(
                 function_list,
@@ -597,15 +633,17 @@ def case_sequence_diagram(**kwargs):
 
             xml_information_list, _ = util.filter_allocated_item_from_view(kwargs[XML_DICT_KEY_11_INFORMATION_LIST],
                                                                            kwargs[XML_DICT_KEY_13_VIEW_LIST])
+            xml_data_set = set(xml_data_list)
+            xml_information_set = set(xml_information_list)
 
             if all(i in query_object.query_object_name_in_list(kwargs[XML_DICT_KEY_10_ACTIVITY_LIST])
                      for i in object_list_str):
                 if len(xml_information_list) > 0:
                     if len(xml_information_list) != len(kwargs[XML_DICT_KEY_11_INFORMATION_LIST]):
-                        xml_cons = [i for i in kwargs[XML_DICT_KEY_17_ACT_CONS_LIST]
-                                    if any(a == i[0] for a in [d for d in xml_information_list])]
-                        xml_prod = [i for i in kwargs[XML_DICT_KEY_18_ACT_PROD_LIST]
-                                    if any(a == i[0] for a in [d for d in xml_information_list])]
+                        xml_cons = IndexedFlowList(i for i in kwargs[XML_DICT_KEY_17_ACT_CONS_LIST]
+                                                   if i[0] in xml_information_set)
+                        xml_prod = IndexedFlowList(i for i in kwargs[XML_DICT_KEY_18_ACT_PROD_LIST]
+                                                   if i[0] in xml_information_set)
                     else:
                         xml_cons = kwargs[XML_DICT_KEY_17_ACT_CONS_LIST]
                         xml_prod = kwargs[XML_DICT_KEY_18_ACT_PROD_LIST]
@@ -633,10 +671,10 @@ def case_sequence_diagram(**kwargs):
                     )
 
                     if len(xml_data_list) != len(kwargs[XML_DICT_KEY_0_DATA_LIST]):
-                        xml_cons = [i for i in kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]
-                                    if any(a == i[0] for a in [d for d in xml_data_list])]
-                        xml_prod = [i for i in kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]
-                                    if any(a == i[0] for a in [d for d in xml_data_list])]
+                        xml_cons = IndexedFlowList(i for i in kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]
+                                                   if i[0] in xml_data_set)
+                        xml_prod = IndexedFlowList(i for i in kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]
+                                                   if i[0] in xml_data_set)
                     else:
                         xml_cons = kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]
                         xml_prod = kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]
@@ -665,11 +703,11 @@ def case_sequence_diagram(**kwargs):
                 if len(xml_data_list) > 0:
                     if len(xml_data_list) != len(kwargs[XML_DICT_KEY_0_DATA_LIST]):
                         kwargs[XML_DICT_KEY_15_FUN_CONS_LIST] = \
-                            [i for i in kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]
-                             if any(a == i[0] for a in [d for d in xml_data_list])]
+                            IndexedFlowList(i for i in kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]
+                                            if i[0] in xml_data_set)
                         kwargs[XML_DICT_KEY_16_FUN_PROD_LIST] = \
-                            [i for i in kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]
-                             if any(a == i[0] for a in [d for d in xml_data_list])]
+                            IndexedFlowList(i for i in kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]
+                                            if i[0] in xml_data_set)
                     kwargs[XML_DICT_KEY_0_DATA_LIST] = xml_data_list
                     plantuml_string = get_fun_elem_sequence_diagram(object_list_str, **kwargs)
                 else:
@@ -680,11 +718,11 @@ def case_sequence_diagram(**kwargs):
                 if len(xml_information_list) > 0:
                     if len(xml_information_list) != len(kwargs[XML_DICT_KEY_11_INFORMATION_LIST]):
                         kwargs[XML_DICT_KEY_17_ACT_CONS_LIST] = \
-                            [i for i in kwargs[XML_DICT_KEY_17_ACT_CONS_LIST]
-                             if any(a == i[0] for a in [d for d in xml_information_list])]
+                            IndexedFlowList(i for i in kwargs[XML_DICT_KEY_17_ACT_CONS_LIST]
+                                            if i[0] in xml_information_set)
                         kwargs[XML_DICT_KEY_18_ACT_PROD_LIST] = \
-                            [i for i in kwargs[XML_DICT_KEY_18_ACT_PROD_LIST]
-                             if any(a == i[0] for a in [d for d in xml_information_list])]
+                            IndexedFlowList(i for i in kwargs[XML_DICT_KEY_18_ACT_PROD_LIST]
+                                            if i[0] in xml_information_set)
                     # Else do nothing
 
                     kwargs[XML_DICT_KEY_11_INFORMATION_LIST] = xml_information_list
@@ -714,7 +752,8 @@ def case_state_diagram(**kwargs):
         plantuml_string = show_fun_elem_state_machine(object_str,
                                                       kwargs[XML_DICT_KEY_6_STATE_LIST],
                                                       kwargs[XML_DICT_KEY_7_TRANSITION_LIST],
-                                                      kwargs[XML_DICT_KEY_2_FUN_ELEM_LIST])
+                                                      kwargs[XML_DICT_KEY_2_FUN_ELEM_LIST],
+                                                      StateMachineIndex.get(**kwargs))
     else:
         Logger.set_error(__name__,
                          f"Jarvis does not know the functional Element {object_str}")
@@ -782,7 +821,7 @@ def show_state_allocated_function(state_str, state_list, function_list, xml_cons
 
 
 def show_fun_elem_state_machine(fun_elem_str, xml_state_list, xml_transition_list,
-                                xml_fun_elem_list):
+                                xml_fun_elem_list, state_machine_index=None):
     """Creates lists with desired objects for <functional_element> state, send them to
     plantuml_adapter.py then returns plantuml_text"""
     new_fun_elem_list = set()
@@ -795,7 +834,7 @@ def show_fun_elem_state_machine(fun_elem_str, xml_state_list, xml_transition_lis
 
             new_state_list = {s for s in xml_state_list if s.id in main_fun_elem.allocated_state_list}
 
-            new_transition_list = util.get_transition_list(new_state_list, xml_transition_list)
+            new_transition_list = util.get_transition_list(new_state_list, xml_transition_list, state_machine_index)
 
             plantuml_text = plantuml_adapter.get_state_machine_diagram(new_state_list,
                                                                        new_transition_list,
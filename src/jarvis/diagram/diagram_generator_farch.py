@@ -82,7 +82,8 @@ def show_fun_elem_function(fun_elem_str, xml_fun_elem_list, xml_function_list,
 
 def show_fun_elem_context(fun_elem_str, xml_fun_elem_list, xml_function_list,
                           xml_consumer_function_list, xml_producer_function_list,
-                          xml_attribute_list, xml_fun_inter_list, xml_data_list):
+                          xml_attribute_list, xml_fun_inter_list, xml_data_list, fun_inter_str=None,
+                          without_interface=False):
     """@ingroup diagram
     @anchor show_fun_elem_context
     Creates lists with desired objects for functional element context, send them to plantuml_adapter.py
@@ -95,7 +96,10 @@ def show_fun_elem_context(fun_elem_str, xml_fun_elem_list, xml_function_list,
     @param[in] xml_attribute_list: list of all attributes
     @param[in] xml_fun_inter_list: list of all functional interfaces
     @param[in] xml_data_list: list of all data
-    @return plantuml text
+    @param[in] fun_inter_str: name of the functional interface the context is limited to, None for the whole context
+    @param[in] without_interface: indicates if the context is limited to the flows of the data allocated to none of
+    the functional interfaces of the functional element (True) or not (False)
+    @return plantuml text, None if the context is limited to the flows without interface and there is none
     """
     plantuml_text = None
 
@@ -128,6 +132,30 @@ def show_fun_elem_context(fun_elem_str, xml_fun_elem_list, xml_function_list,
     fun_elem_list, interface_list, fun_elem_inter_list = util.get_fun_inter_for_fun_elem_context(
         main_fun_elem, xml_fun_inter_list, xml_fun_elem_list)
 
+    if fun_inter_str is not None:
+        interface_list, fun_elem_list, new_function_list, new_consumer_list, new_producer_list = \
+            util.filter_fun_elem_context_with_interface(fun_inter_str,
+                                                        main_fun_elem,
+                                                        allocated_function_list,
+                                                        interface_list,
+                                                        fun_elem_list,
+                                                        new_function_list,
+                                                        new_consumer_list,
+                                                        new_producer_list)
+    elif without_interface:
+        interface_list, fun_elem_list, new_function_list, new_consumer_list, new_producer_list = \
+            util.filter_fun_elem_context_without_interface(main_fun_elem,
+                                                           allocated_function_list,
+                                                           interface_list,
+                                                           new_function_list,
+                                                           new_consumer_list,
+                                                           new_producer_list)
+        if not new_consumer_list and not new_producer_list:
+            Logger.set_info(__name__, f"No flow of {fun_elem_str} without functional interface")
+            return plantuml_text
+        # Else do nothing
+    # Else do nothing
+
     Logger.set_debug(__name__, f'list of functional element: {fun_elem_list}')
     Logger.set_debug(__name__, f'list of functional interfaces: {interface_list}')
 
@@ -165,7 +193,7 @@ def show_fun_elem_context(fun_elem_str, xml_fun_elem_list, xml_function_list,
 
 def show_fun_elem_decomposition(fun_elem_str, xml_function_list, xml_consumer_function_list,
                                 xml_producer_function_list, xml_fun_elem_list, xml_attribute_list,
-                                xml_data_list, xml_fun_inter_list, diagram_level=None):
+                                xml_data_list, xml_fun_inter_list, diagram_level=None, diagram_budget=None):
     """@ingroup diagram
     @anchor show_fun_elem_decomposition
     Creates lists with desired objects for functional element decomposition, send them to plantuml_adapter.py
@@ -178,6 +206,9 @@ def show_fun_elem_decomposition(fun_elem_str, xml_function_list, xml_consumer_fu
     @param[in] xml_attribute_list: list of all attributes
     @param[in] xml_fun_inter_list: list of all functional interfaces
     @param[in] xml_data_list: list of all data
+    @param[in] diagram_level: deepest level of the decomposition, None for all levels
+    @param[in] diagram_budget: maximum number of displayed nodes, functional elements beyond being collapsed into
+    a summary, None for no limit
     @return plantuml text
     """
     plantuml_text = None
@@ -198,12 +229,23 @@ def show_fun_elem_decomposition(fun_elem_str, xml_function_list, xml_consumer_fu
     if main_fun_elem.child_list != set():
         util.get_level_0_function(main_fun_elem, xml_function_list, allocated_function_list)
 
+    # Functional elements beyond the budget are selected first, so that the flows internal to them are not built
+    if diagram_budget:
+        collapsed_fun_elem_dict = util.get_collapsed_fun_elem_dict(main_fun_elem,
+                                                                   allocated_function_list,
+                                                                   xml_consumer_function_list,
+                                                                   xml_producer_function_list,
+                                                                   diagram_budget)
+    else:
+        collapsed_fun_elem_dict = None
+
     if allocated_function_list != set():
         external_function_list, new_consumer_list, new_producer_list = \
             util.get_cons_prod_from_allocated_elements(
                 allocated_function_list,
                 xml_producer_function_list,
-                xml_consumer_function_list)
+                xml_consumer_function_list,
+                collapsed_elem_dict=collapsed_fun_elem_dict)
 
         if external_function_list:
             for fun in external_function_list:
@@ -232,7 +274,8 @@ def show_fun_elem_decomposition(fun_elem_str, xml_function_list, xml_consumer_fu
                                                                 external_function_list,
                                                                 xml_attribute_list,
                                                                 xml_data_list,
-                                                                xml_fun_inter_list)
+                                                                xml_fun_inter_list,
+                                                                collapsed_fun_elem_dict)
     Logger.set_info(__name__,
                     f"Decomposition Diagram for {fun_elem_str} generated")
 
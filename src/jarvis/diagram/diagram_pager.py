@@ -0,0 +1,145 @@
+"""@defgroup diagram
+Jarvis diagram module
+"""
+# Libraries
+import re
+
+# Modules
+from xml_adapter import XML_DICT_KEY_1_FUNCTION_LIST, XML_DICT_KEY_2_FUN_ELEM_LIST, XML_DICT_KEY_3_FUN_INTF_LIST
+from . import diagram_generator
+from tools import Logger
+
+# Constants
+# Maximum size of a diagram page, as estimated by @ref estimate_diagram_size. It matches the largest diagram
+# accepted by the online PlantUml server
+DIAGRAM_PAGE_SIZE = 15000
+
+
+def estimate_diagram_size(p_plantuml_text):
+    """@ingroup diagram
+    @anchor estimate_diagram_size
+    Estimate the size of a diagram before rendering, as the length of its PlantUml text: the url of the online
+    PlantUml server and the layout duration grow with it
+
+    @param[in] p_plantuml_text : PlantUml text of the diagram
+    @return estimated diagram size
+    """
+    return len(p_plantuml_text)
+
+
+def get_page_list(p_diagram_str, p_plantuml_text, p_page_size=None, **kwargs):
+    """@ingroup diagram
+    @anchor get_page_list
+    Split an oversized diagram into pages: per subtree for decompositions of functions and functional elements, per
+    functional interface for contexts of functional elements, the flows without functional interface being displayed
+    on a last page. Each page is itself a diagram, as written after "show",
+    titled with its position among the pages.
+
+    @param[in] p_diagram_str : diagram, as written after "show"
+    @param[in] p_plantuml_text : PlantUml text of the diagram, None if not generated
+    @param[in] p_page_size : maximum size of a page, @ref DIAGRAM_PAGE_SIZE if None
+    @param[in] kwargs : jarvis data structure
+    @return list of (diagram, PlantUml text) pages, single page if the diagram is not oversized or cannot be split,
+    empty list if the diagram is not generated
+    """
+    if p_page_size is None:
+        p_page_size = DIAGRAM_PAGE_SIZE
+    # Else do nothing
+
+    if not p_plantuml_text:
+        return []
+    elif estimate_diagram_size(p_plantuml_text) <= p_page_size:
+        return [(p_diagram_str, p_plantuml_text)]
+    # Else diagram is oversized
+
+    page_list = None
+    diagram_str = ' '.join(p_diagram_str.replace('"', '').split())
+    specific_diagram_str = re.fullmatch(r"(decomposition|context) (.*)", diagram_str)
+    if specific_diagram_str and ' at level ' not in diagram_str and ' for interface ' not in diagram_str \
+            and not diagram_str.endswith(' without interface'):
+        diagram_type_str, object_str = specific_diagram_str.groups()
+        if diagram_type_str == 'decomposition':
+            obj = kwargs[XML_DICT_KEY_2_FUN_ELEM_LIST].get_by_name(object_str) or \
+                kwargs[XML_DICT_KEY_1_FUNCTION_LIST].get_by_name(object_str)
+            if obj is not None:
+                page_list = get_decomposition_page_list(obj, p_plantuml_text, p_page_size, **kwargs)
+            # Else do nothing
+        else:
+            fun_elem = kwargs[XML_DICT_KEY_2_FUN_ELEM_LIST].get_by_name(object_str)
+            if fun_elem is not None:
+                page_list = get_context_page_list(fun_elem, **kwargs)
+            # Else do nothing
+    # Else do nothing
+
+    if not page_list:
+        Logger.set_warning(__name__, f"Diagram {p_diagram_str} is too large to be split into pages")
+        return [(p_diagram_str, p_plantuml_text)]
+    # Else do nothing
+
+    Logger.set_info(__name__, f"Diagram {p_diagram_str} split into {len(page_list)} pages")
+
+    return [(page_str, f"title {page_str} ({index}/{len(page_list)})\n{page_text}")
+            for index, (page_str, page_text) in enumerate(page_list, 1)]
+
+
+def get_decomposition_page_list(p_object, p_plantuml_text, p_page_size, **kwargs):
+    """@ingroup diagram
+    @anchor get_decomposition_page_list
+    Split the decomposition of a function or functional element per subtree: the first level of the decomposition,
+    then the decomposition of each child having children, split again if oversized
+
+    @param[in] p_object : decomposed function or functional element
+    @param[in] p_plantuml_text : PlantUml text of the whole decomposition
+    @param[in] p_page_size : maximum size of a page
+    @param[in] kwargs : jarvis data structure
+    @return list of (diagram, PlantUml text) pages
+    """
+    if estimate_diagram_size(p_plantuml_text) <= p_page_size or not p_object.child_list:
+        return [(f"decomposition {p_object.name}", p_plantuml_text)]
+    # Else do nothing
+
+    page_str = f"decomposition {p_object.name} at level 1"
+    page_list = [(page_str, diagram_generator.filter_show_command([page_str], **kwargs))]
+    for child in sorted(p_object.child_list, key=lambda x: x.name):
+        if child.child_list:
+            child_plantuml_text = diagram_generator.filter_show_command([f"decomposition {child.name}"], **kwargs)
+            if child_plantuml_text:
+                page_list.extend(get_decomposition_page_list(child, child_plantuml_text, p_page_size, **kwargs))
+            # Else do nothing
+        # Else child is already displayed by the first level
+
+    return [page for page in page_list if page[1]]
+
+
+def get_context_page_list(p_fun_elem, **kwargs):
+    """@ingroup diagram
+    @anchor get_context_page_list
+    Split the context of a functional element per functional interface it exposes. Flows whose data is not
+    allocated to any of these functional interfaces are displayed on a last page, if any.
+
+    @param[in] p_fun_elem : functional element
+    @param[in] kwargs : jarvis data structure
+    @return list of (diagram, PlantUml text) pages, empty list if the functional element does not expose any
+    functional interface with allocated data
+    """
+    page_list = []
+    for fun_inter_id in p_fun_elem.exposed_interface_list:
+        fun_inter = kwargs[XML_DICT_KEY_3_FUN_INTF_LIST].get_by_id(fun_inter_id)
+        if fun_inter is not None and fun_inter.allocated_data_list:
+            page_str = f"context {p_fun_elem.name} for interface {fun_inter.name}"
+            page_text = diagram_generator.filter_show_command([page_str], **kwargs)
+            if page_text:
+                page_list.append((page_str, page_text))
+            # Else do nothing
+        # Else do nothing
+
+    if page_list:
+        page_list.sort()
+        page_str = f"context {p_fun_elem.name} without interface"
+        page_text = diagram_generator.filter_show_command([page_str], **kwargs)
+        if page_text:
+            page_list.append((page_str, page_text))
+        # Else do nothing
+    # Else do nothing
+
+    return page_list
@@ -1,7 +1,11 @@
 """@defgroup diagram
 Jarvis diagram module
 """
+# Libraries
+from collections import deque
+
 # Modules
+from xml_adapter import IndexedObjectSet, IndexedFlowList, StateMachineIndex
 from jarvis.query import question_answer, query_object
 from tools import Logger
 
@@ -27,8 +31,19 @@ def get_cons_or_prod_paired(function_list, xml_flow_list, xml_opposite_flow_list
 def get_cons_prod_from_allocated_elements(allocated_elem_list,
                                           xml_producer_elem_list,
                                           xml_consumer_elem_list,
-                                          with_external_elements=True):
-    """Get consumers/producers from function's allocated to main_fun_elem (and its descendant)"""
+                                          with_external_elements=True,
+                                          collapsed_elem_dict=None):
+    """Get consumers/producers from function's allocated to main_fun_elem (and its descendant)
+
+    Relationships are got through the indexes of @ref IndexedFlowList, by allocated element. Flows only exchanged
+    between functions hidden within the same collapsed functional element (see @ref get_collapsed_fun_elem_dict) are
+    not displayed: they are skipped without building their relationships."""
+    indexed_producer_list = get_indexed_flow_list(xml_producer_elem_list)
+    indexed_consumer_list = get_indexed_flow_list(xml_consumer_elem_list)
+    hidden_elem_dict = {}
+    for collapsed_elem, (hidden_elem_list, _, _) in (collapsed_elem_dict or {}).items():
+        hidden_elem_dict.update((hidden_elem, collapsed_elem) for hidden_elem in hidden_elem_list)
+
     new_producer_list = []
     new_consumer_list = []
     for allocated_elem in allocated_elem_list:
@@ -38,15 +53,15 @@ def get_cons_prod_from_allocated_elements(allocated_elem_list,
 
         allocated_elem.parent = None
 
-        for xml_producer_elem in xml_producer_elem_list:
-            if allocated_elem in xml_producer_elem:
-                new_producer_list.append(xml_producer_elem)
-            # Else do nothing
-
-        for xml_consumer_elem in xml_consumer_elem_list:
-            if allocated_elem in xml_consumer_elem:
-                new_consumer_list.append(xml_consumer_elem)
-            # Else do nothing
+        collapsed_elem = hidden_elem_dict.get(allocated_elem)
+        for indexed_flow_list, new_flow_list in ((indexed_producer_list, new_producer_list),
+                                                 (indexed_consumer_list, new_consumer_list)):
+            for flow in get_indexed_flow_pair_list(indexed_flow_list, allocated_elem, False):
+                if collapsed_elem is None or \
+                        not is_flow_internal_to_collapsed_elem(flow, collapsed_elem, hidden_elem_dict,
+                                                               indexed_producer_list, indexed_consumer_list):
+                    new_flow_list.append([flow, allocated_elem])
+                # Else flow is internal to a collapsed functional element
 
     if with_external_elements:
         external_elem_list, new_consumer_list, new_producer_list = get_ext_cons_prod(
@@ -60,6 +75,14 @@ def get_cons_prod_from_allocated_elements(allocated_elem_list,
     return external_elem_list, new_consumer_list, new_producer_list
 
 
+def is_flow_internal_to_collapsed_elem(flow, collapsed_elem, hidden_elem_dict, indexed_producer_list,
+                                       indexed_consumer_list):
+    """Returns True if a flow is only exchanged between functions hidden within a collapsed functional element"""
+    return all(hidden_elem_dict.get(elem) is collapsed_elem
+               for indexed_flow_list in (indexed_producer_list, indexed_consumer_list)
+               for elem in indexed_flow_list.get_element_list(flow))
+
+
 def get_ext_cons_prod(producer_list, consumer_list, xml_producer_elem_list,
                       xml_consumer_elem_list):
     """Get external cons/prod associated to considered element"""
@@ -115,106 +138,78 @@ def get_allocated_function_context_lists(allocated_function_list,
 
 def get_function_context_lists(diagram_function_str, xml_function_list, xml_consumer_function_list,
                                xml_producer_function_list):
-    """Create necessary lists then returns plantuml text for context of function"""
+    """Create necessary lists then returns plantuml text for context of function
+
+    Flows of the main function are joined with their opposite functions through the indexes of
+    @ref IndexedFlowList: only the flows of the main function are visited, whatever the size of the model. The
+    descendants and the ancestors of the main function are computed once.
+    """
     new_function_list = set()
     new_producer_list = []
     new_consumer_list = []
-    main_function = None
 
-    for xml_function in xml_function_list:
-        if diagram_function_str in (xml_function.name, xml_function.alias):
-            main_function = xml_function
-            new_function_list.add(xml_function)
-            break
-        # Else do nothing
+    if isinstance(xml_function_list, IndexedObjectSet):
+        main_function = xml_function_list.get_by_name(diagram_function_str)
+    else:
+        main_function = None
+        for xml_function in xml_function_list:
+            if diagram_function_str in (xml_function.name, xml_function.alias):
+                main_function = xml_function
+                break
+            # Else do nothing
 
     if main_function is not None:
-        for xml_producer_flow, xml_producer_function in xml_producer_function_list:
-            if xml_producer_function == main_function:
+        new_function_list.add(main_function)
+        consumer_flow_list = get_indexed_flow_list(xml_consumer_function_list)
+        producer_flow_list = get_indexed_flow_list(xml_producer_function_list)
+        descendant_set, _ = query_object.query_object_children_recursively(main_function)
+        ancestor_set = set()
+        parent = main_function.parent
+        while parent:
+            ancestor_set.add(parent)
+            parent = parent.parent
+
+        new_producer_set = set()
+        new_consumer_set = set()
+        for flow_list, opposite_flow_list, new_flow_list, new_flow_set, new_opposite_flow_list, \
+                new_opposite_flow_set in ((producer_flow_list, consumer_flow_list, new_producer_list, new_producer_set,
+                                           new_consumer_list, new_consumer_set),
+                                          (consumer_flow_list, producer_flow_list, new_consumer_list, new_consumer_set,
+                                           new_producer_list, new_producer_set)):
+            for flow in get_indexed_flow_pair_list(flow_list, main_function, p_is_by_flow=False):
                 check = False
-                for xml_consumer_flow, xml_consumer_function in xml_consumer_function_list:
-                    if xml_producer_flow == xml_consumer_flow:
-                        if hasattr(xml_consumer_function, "parent"):
-                            if xml_consumer_function.parent is None:
-                                xml_function_children_list, _ = \
-                                    query_object.query_object_children_recursively(main_function)
-                                parent_check = \
-                                    query_object.query_object_is_parent_recursively(xml_consumer_function,
-                                                                                    main_function)
-                                if xml_consumer_function not in xml_function_children_list and parent_check is False:
-                                    new_consumer_list.append([xml_producer_flow, xml_consumer_function])
-                                    new_function_list.add(xml_consumer_function)
-                                    check = True
-                                # ELse do nothing
-                            elif main_function.parent == xml_consumer_function.parent and \
-                                    xml_consumer_function != main_function:
-                                new_consumer_list.append([xml_consumer_flow, xml_consumer_function])
-                                new_function_list.add(xml_consumer_function)
-                                check = True
-                            elif xml_consumer_function != main_function:
-                                if len(xml_consumer_function.child_list) == 0:
-                                    new_consumer_list.append([xml_consumer_flow, xml_consumer_function])
-                                    new_function_list.add(xml_consumer_function)
-                                # Else do nothing
+                for opposite_function in get_indexed_flow_pair_list(opposite_flow_list, flow):
+                    is_added = False
+                    if hasattr(opposite_function, "parent"):
+                        if opposite_function.parent is None:
+                            if opposite_function not in descendant_set and opposite_function not in ancestor_set:
+                                is_added = True
                                 check = True
                             # Else do nothing
-                        elif xml_consumer_function != main_function:
-                            new_consumer_list.append([xml_consumer_flow, xml_consumer_function])
-                            new_function_list.add(xml_consumer_function)
+                        elif main_function.parent == opposite_function.parent and \
+                                opposite_function != main_function:
+                            is_added = True
                             check = True
-                        # Else do nothing
-                    # Else do nothing
-
-                if check:
-                    if [xml_producer_flow, xml_producer_function] not in new_producer_list:
-                        new_producer_list.append([xml_producer_flow, xml_producer_function])
-
-                if not any(xml_producer_flow in s for s in xml_consumer_function_list):
-                    if [xml_producer_flow, xml_producer_function] not in new_producer_list:
-                        new_producer_list.append([xml_producer_flow, xml_producer_function])
-
-        for xml_consumer_flow, xml_consumer_function in xml_consumer_function_list:
-            if xml_consumer_function == main_function:
-                check = False
-                for xml_producer_flow, xml_producer_function in xml_producer_function_list:
-                    if xml_producer_flow == xml_consumer_flow:
-                        if hasattr(xml_producer_function, "parent"):
-                            if xml_producer_function.parent is None:
-                                xml_function_children_list, _ = \
-                                    query_object.query_object_children_recursively(main_function)
-                                parent_check = \
-                                    query_object.query_object_is_parent_recursively(xml_producer_function,
-                                                                                    main_function)
-                                if xml_producer_function not in xml_function_children_list and parent_check is False:
-                                    new_producer_list.append([xml_producer_flow, xml_producer_function])
-                                    new_function_list.add(xml_producer_function)
-                                    check = True
-                                # ELse do nothing
-                            elif main_function.parent == xml_producer_function.parent and\
-                                    xml_producer_function != main_function:
-                                new_producer_list.append([xml_producer_flow, xml_producer_function])
-                                new_function_list.add(xml_producer_function)
-                                check = True
-                            elif xml_producer_function != main_function:
-                                if len(xml_producer_function.child_list) == 0:
-                                    new_producer_list.append([xml_producer_flow, xml_producer_function])
-                                    new_function_list.add(xml_producer_function)
-                                # Else do nothing
-                                check = True
-                            # Else do nothing
-                        elif xml_producer_function != main_function:
-                            new_producer_list.append([xml_producer_flow, xml_producer_function])
-                            new_function_list.add(xml_producer_function)
+                        elif opposite_function != main_function:
+                            is_added = len(opposite_function.child_list) == 0
                             check = True
                         # Else do nothing
+                    elif opposite_function != main_function:
+                        is_added = True
+                        check = True
+                    # Else do nothing
 
-                if check:
-                    if [xml_consumer_flow, xml_consumer_function] not in new_consumer_list:
-                        new_consumer_list.append([xml_consumer_flow, xml_consumer_function])
+                    if is_added:
+                        new_opposite_flow_list.append([flow, opposite_function])
+                        new_opposite_flow_set.add((flow, opposite_function))
+                        new_function_list.add(opposite_function)
+                    # Else do nothing
 
-                if not any(xml_consumer_flow in s for s in xml_producer_function_list):
-                    if [xml_consumer_flow, xml_consumer_function] not in new_consumer_list:
-                        new_consumer_list.append([xml_consumer_flow, xml_consumer_function])
+                if (check or not opposite_flow_list.has_flow(flow)) and \
+                        (flow, main_function) not in new_flow_set:
+                    new_flow_list.append([flow, main_function])
+                    new_flow_set.add((flow, main_function))
+                # Else do nothing
 
         for f in new_function_list:
             f.child_list.clear()
@@ -223,6 +218,37 @@ def get_function_context_lists(diagram_function_str, xml_function_list, xml_cons
     return new_function_list, new_consumer_list, new_producer_list
 
 
+def get_indexed_flow_list(p_flow_list):
+    """Get a list of [flow, function] relationships indexed by flow and by function
+    @param[in] p_flow_list : list of [flow, function] relationships
+    @return the list itself if already indexed, else an indexed copy of the list
+    """
+    if isinstance(p_flow_list, IndexedFlowList):
+        indexed_flow_list = p_flow_list
+    else:
+        indexed_flow_list = IndexedFlowList(p_flow_list)
+
+    return indexed_flow_list
+
+
+def get_indexed_flow_pair_list(p_indexed_flow_list, p_key, p_is_by_flow=True):
+    """Get the functions related to a flow, or the flows related to a function, once per relationship
+    @param[in] p_indexed_flow_list : list of [flow, function] relationships, see @ref get_indexed_flow_list
+    @param[in] p_key : flow if p_is_by_flow is True, else function
+    @param[in] p_is_by_flow : indicates if p_key is a flow (True) or a function (False)
+    @return list of functions (resp. flows), repeated as many times as the relationship is
+    """
+    pair_list = []
+    if p_is_by_flow:
+        for function in p_indexed_flow_list.get_element_list(p_key):
+            pair_list.extend([function] * p_indexed_flow_list.pair_dict[(p_key, function)])
+    else:
+        for flow in p_indexed_flow_list.get_flow_list(p_key):
+            pair_list.extend([flow] * p_indexed_flow_list.pair_dict[(flow, p_key)])
+
+    return pair_list
+
+
 def get_fun_inter_for_fun_elem_context(main_fun_elem, xml_fun_inter_list, xml_fun_elem_list):
     """Get functional interfaces and associated functional elements"""
     fun_elem_list = set()
@@ -251,6 +277,124 @@ def get_fun_inter_for_fun_elem_context(main_fun_elem, xml_fun_inter_list, xml_fu
     return fun_elem_list, interface_list, fun_elem_inter_list
 
 
+def filter_fun_elem_context_with_interface(fun_inter_str, main_fun_elem, allocated_function_list, interface_list,
+                                           fun_elem_list, function_list, consumer_list, producer_list):
+    """Limit the context of a functional element to one of its functional interfaces: flows of the data allocated to
+    the interface, functions exchanging them and functional elements exposing the interface"""
+    interface_list = {i for i in interface_list if fun_inter_str in (i.name, i.alias)}
+    data_id_set = set()
+    for interface in interface_list:
+        data_id_set.update(interface.allocated_data_list)
+
+    consumer_list = [flow for flow in consumer_list if flow[0].id in data_id_set]
+    producer_list = [flow for flow in producer_list if flow[0].id in data_id_set]
+    flow_function_set = {flow[1] for flow in consumer_list + producer_list}
+    function_list = {fun for fun in function_list if fun in allocated_function_list or fun in flow_function_set}
+
+    interface_id_set = {interface.id for interface in interface_list}
+    fun_elem_list = {fun_elem for fun_elem in fun_elem_list
+                     if fun_elem == main_fun_elem or interface_id_set.intersection(fun_elem.exposed_interface_list)}
+
+    return interface_list, fun_elem_list, function_list, consumer_list, producer_list
+
+
+def filter_fun_elem_context_without_interface(main_fun_elem, allocated_function_list, interface_list, function_list,
+                                              consumer_list, producer_list):
+    """Limit the context of a functional element to the flows of the data allocated to none of its functional
+    interfaces, and to the functions exchanging them"""
+    data_id_set = set()
+    for interface in interface_list:
+        data_id_set.update(interface.allocated_data_list)
+
+    consumer_list = [flow for flow in consumer_list if flow[0].id not in data_id_set]
+    producer_list = [flow for flow in producer_list if flow[0].id not in data_id_set]
+    flow_function_set = {flow[1] for flow in consumer_list + producer_list}
+    function_list = {fun for fun in function_list if fun in allocated_function_list or fun in flow_function_set}
+
+    return set(), {main_fun_elem}, function_list, consumer_list, producer_list
+
+
+def get_descendant_count_dict(main_fun_elem, function_list):
+    """Get the functions displayed within each functional element of a decomposition, i.e. allocated to it and not to
+    any of its children, and the number of nodes (functional elements and functions) below each functional element,
+    computed once from the leaves up"""
+    function_id_set = {fun.id for fun in function_list}
+    own_function_id_dict = {}
+    descendant_count_dict = {}
+
+    # Post order traversal without recursion: a functional element is counted once all its children are
+    fun_elem_stack = [(main_fun_elem, False)]
+    while fun_elem_stack:
+        fun_elem, is_visited = fun_elem_stack.pop()
+        if is_visited:
+            child_function_id_set = set()
+            for child in fun_elem.child_list:
+                child_function_id_set.update(child.allocated_function_list)
+            own_function_id_dict[fun_elem] = function_id_set.intersection(fun_elem.allocated_function_list) \
+                - child_function_id_set
+            descendant_count_dict[fun_elem] = len(own_function_id_dict[fun_elem]) + \
+                sum(1 + descendant_count_dict[child] for child in fun_elem.child_list)
+        elif fun_elem not in descendant_count_dict:
+            fun_elem_stack.append((fun_elem, True))
+            fun_elem_stack.extend((child, False) for child in fun_elem.child_list)
+        # Else functional element already counted
+
+    return own_function_id_dict, descendant_count_dict
+
+
+def get_collapsed_fun_elem_dict(main_fun_elem, function_list, consumer_list, producer_list, diagram_budget):
+    """Select the functional elements to be collapsed so that a decomposition displays at most diagram_budget nodes.
+    Functional elements are expanded level by level: a functional element is fully expanded if all its nodes fit
+    within the budget, expanded by one level if its functions and children fit, collapsed otherwise. Flows are
+    counted through the indexes of the consumer and producer lists, only for the hidden functions, so that the
+    selection is done before the flow lists of the diagram are built. Returns a dictionary of [hidden functions,
+    flow count, interface count] by collapsed functional element"""
+    consumer_list = get_indexed_flow_list(consumer_list)
+    producer_list = get_indexed_flow_list(producer_list)
+    own_function_id_dict, descendant_count_dict = get_descendant_count_dict(main_fun_elem, function_list)
+
+    collapsed_fun_elem_list = []
+    visible_count = 1 + len(own_function_id_dict[main_fun_elem]) + len(main_fun_elem.child_list)
+    fun_elem_queue = deque(sorted(main_fun_elem.child_list, key=lambda x: x.name))
+    while fun_elem_queue:
+        fun_elem = fun_elem_queue.popleft()
+        descendant_count = descendant_count_dict[fun_elem]
+        level_count = len(own_function_id_dict[fun_elem]) + len(fun_elem.child_list)
+        if visible_count + descendant_count <= diagram_budget:
+            visible_count += descendant_count
+        elif visible_count + level_count <= diagram_budget:
+            visible_count += level_count
+            fun_elem_queue.extend(sorted(fun_elem.child_list, key=lambda x: x.name))
+        else:
+            collapsed_fun_elem_list.append(fun_elem)
+
+    function_dict = {fun.id: fun for fun in function_list}
+    collapsed_fun_elem_dict = {}
+    for collapsed_fun_elem in collapsed_fun_elem_list:
+        hidden_function_id_set = set()
+        interface_id_set = set()
+        fun_elem_list = [collapsed_fun_elem]
+        while fun_elem_list:
+            fun_elem = fun_elem_list.pop()
+            hidden_function_id_set.update(own_function_id_dict[fun_elem])
+            if fun_elem != collapsed_fun_elem:
+                interface_id_set.update(fun_elem.exposed_interface_list)
+            # Else interfaces of the collapsed functional element remain displayed
+            fun_elem_list.extend(fun_elem.child_list)
+
+        hidden_function_list = [function_dict[fun_id] for fun_id in sorted(hidden_function_id_set)]
+        produced_data_id_set = {flow.id for fun in hidden_function_list for flow in producer_list.get_flow_list(fun)}
+        consumed_data_id_set = {flow.id for fun in hidden_function_list for flow in consumer_list.get_flow_list(fun)}
+        collapsed_fun_elem_dict[collapsed_fun_elem] = [hidden_function_list,
+                                                       len(produced_data_id_set & consumed_data_id_set),
+                                                       len(interface_id_set)]
+
+    Logger.set_debug(__name__, f'{visible_count} nodes displayed, '
+                               f'{len(collapsed_fun_elem_dict)} functional elements collapsed')
+
+    return collapsed_fun_elem_dict
+
+
 def check_is_highest_fun_elem_exposing_fun_inter(fun_inter, fun_elem):
     """Returns True if it's highest fun_elem exposing fun_inter"""
     check = False
@@ -564,14 +708,23 @@ def get_fun_elem_function_list(function, function_list, fun_elem):
         function_list.add(function)
 
 
-def get_transition_list(p_state_list, p_transition_list):
+def get_transition_list(p_state_list, p_transition_list, p_state_machine_index=None):
     """Get transitions if state(s) from state_list are source/destination"""
+    if p_state_machine_index is None:
+        p_state_machine_index = StateMachineIndex((), p_transition_list)
+    # Else do nothing
+
+    if not isinstance(p_transition_list, IndexedObjectSet):
+        p_transition_list = IndexedObjectSet(p_transition_list)
+    # Else do nothing
+
     transition_list = set()
     for state in p_state_list:
-        for transition in p_transition_list:
-            if state.id == transition.source:
-                transition_list.add(transition)
-            if state.id == transition.destination:
+        for transition_id in p_state_machine_index.get_source_transition_id_list(state.id) + \
+                p_state_machine_index.get_destination_transition_id_list(state.id):
+            transition = p_transition_list.get_by_id(transition_id)
+            if transition is not None:
                 transition_list.add(transition)
+            # Else do nothing
 
     return transition_list
@@ -11,7 +11,8 @@ from io import StringIO
 from IPython.core.magic import (Magics, magics_class, cell_magic)
 
 # Modules
-from xml_adapter import XmlWriter3SE, XmlParser3SE
+from xml_adapter import XmlSession3SE
+from jarvis.diagram import DiagramCache
 from tools import Logger
 
 
@@ -23,13 +24,12 @@ class MagicJarvis(Magics):
         # You must call the parent constructor
         super().__init__(shell)
         self.parser = parser
+        # Model session kept alive between cells
+        self.session = XmlSession3SE()
 
     @cell_magic
     def jarvis(self, _, cell):
         """Entry point for jarvi4se"""
-        # Initialize xml_parser i.e. empty obj_dict that will contain objet's lists
-        xml_parser = XmlParser3SE()
-        obj_dict = xml_parser.xml_dict
         # We create a string buffer containing the
         # contents of the cell.
         sio = StringIO(cell)
@@ -43,28 +43,18 @@ class MagicJarvis(Magics):
         xml_name_str = re.match(r"^with (.*)(?=.|\n)", input_str, re.MULTILINE)
         if xml_name_str:
             xml_name = xml_name_str.group(1)
-            # If the model(i.e. file) already exists, parse it to extract lists
-            if os.path.isfile(f"{xml_name}.xml"):
-                obj_dict = xml_parser.parse_xml(f"{xml_name}.xml")
-                Logger.set_info(__name__,
-                                f"{xml_name}.xml parsed")
-                output_xml = XmlWriter3SE(f"{xml_name}.xml")
-            # Else create an empty xml_lists
-            # or will be named by default "Output"
-            else:
-                if len(xml_name) > 1:
-                    Logger.set_info(__name__,
-                                    f"Creating {xml_name}.xml !")
-
-                    output_xml = XmlWriter3SE(f"{xml_name}.xml")
-                else:
-                    Logger.set_info(__name__,
-                                    "Xml's file does not exist, creating it ('output.xml' by default) !")
-                    output_xml = XmlWriter3SE("")
-                output_xml.write()
+            # Get the model from the session: the XML file is parsed only if it has changed since last cell,
+            # or created if it does not exist. Sub-models are loaded if the cell names any of their objects
+            obj_dict = self.session.open(xml_name, input_str)
+            output_xml = obj_dict['output_xml']
 
-            obj_dict['output_xml'] = output_xml
-            update = self.parser.lookup_table(input_str, **obj_dict)
+            try:
+                update = self.parser.lookup_table(input_str, **obj_dict)
+            except Exception:
+                # Objects may have been changed without being written: the model is parsed again at next cell
+                self.session.invalidate()
+                raise
+            self.session.synchronize()
 
             if not update:
                 return
@@ -102,7 +92,8 @@ def greet_user():
 
 
 def clean_folders():
-    """ Clean Jarvis folder
+    """ Clean Jarvis folder, except diagram files named after their PlantUml text that are reused from one session
+    to another
     @return None
     """
     for folder in ["./diagrams", "./log"]:
@@ -110,7 +101,9 @@ def clean_folders():
             for filename in os.listdir(folder):
                 file_path = os.path.join(folder, filename)
                 try:
-                    if os.path.isfile(file_path) or os.path.islink(file_path):
+                    if DiagramCache.is_svg_file_name(filename) and os.path.isfile(file_path):
+                        pass
+                    elif os.path.isfile(file_path) or os.path.islink(file_path):
                         os.remove(file_path)
                     elif os.path.isdir(file_path):
                         shutil.rmtree(file_path)
@@ -6,7 +6,8 @@ import re
 
 # Modules
 import datamodel
-from xml_adapter import XmlDictKeyListForObjects, XmlDictKeyListForTypeIndex
+from xml_adapter import XmlDictKeyListForObjects, XmlDictKeyListForTypeIndex, IndexedObjectSet, IndexedFlowList, \
+    LazyIndexedObjectSet
 from xml_adapter import XML_DICT_KEY_0_DATA_LIST, XML_DICT_KEY_1_FUNCTION_LIST, XML_DICT_KEY_2_FUN_ELEM_LIST, \
     XML_DICT_KEY_3_FUN_INTF_LIST, XML_DICT_KEY_4_PHY_ELEM_LIST, XML_DICT_KEY_5_PHY_INTF_LIST, \
     XML_DICT_KEY_6_STATE_LIST, XML_DICT_KEY_7_TRANSITION_LIST, XML_DICT_KEY_8_REQUIREMENT_LIST, \
@@ -302,45 +303,26 @@ def retrieve_object_parents_recursively(p_object, p_object_list=None):
 
 
 def retrieve_object_by_id(p_obj_id, **kwargs):
-    whole_objects_id_list = check_object_id_in_dict(**kwargs)
-
-    result = [False] * len(XmlDictKeyListForObjects)
+    wanted_object = None
     for i in range(len(XmlDictKeyListForObjects)):
-        result[i] = any(a == p_obj_id for a in whole_objects_id_list[i])
-
-    wanted_object = match_object_by_id(p_obj_id, result, p_xml_str_lists=XmlDictKeyListForObjects, **kwargs)
-
-    return wanted_object
-
-
-def match_object_by_id(p_obj_id, p_obj_list_filter, p_obj_list=None, **kwargs):
-    """Returns wanted_object from object_str and result matched from name lists"""
-    if not p_obj_list:
-        p_obj_list = XmlDictKeyListForObjects
-    # Else do nothing
-
-    for i in range(len(p_obj_list)):
-        if p_obj_list_filter[i]:
-            for obj in kwargs[p_obj_list[i]]:
-                if p_obj_id == obj.id:
-                    return obj
-        # Else do nothing
-    return None
-
+        object_list = kwargs.get(XmlDictKeyListForObjects[i], False)
+        if isinstance(object_list, LazyIndexedObjectSet) and not object_list.may_hold_id(p_obj_id):
+            # Object list not loaded yet, that does not hold the object
+            continue
+        elif object_list:
+            if not isinstance(object_list, IndexedObjectSet):
+                # Object list not coming from the XML dictionary
+                object_list = IndexedObjectSet(object_list)
+            # Else do nothing
 
-def check_object_id_in_dict(**kwargs):
-    """Returns lists of objects with their names depending on kwargs"""
-    whole_objects_id_list = [[] for _ in range(len(XmlDictKeyListForObjects))]
-    for i in range(len(XmlDictKeyListForObjects)):
-        if kwargs.get(XmlDictKeyListForObjects[i], False):
-            object_id_list = []
-            for obj in kwargs[XmlDictKeyListForObjects[i]]:
-                object_id_list.append(obj.id)
+            wanted_object = object_list.get_by_id(p_obj_id)
 
-            whole_objects_id_list[i] = object_id_list
+            if wanted_object is not None:
+                break
+            # Else do nothing
         # Else do nothing
 
-    return whole_objects_id_list
+    return wanted_object
 
 
 def retrieve_object_by_name(p_obj_name_str, **kwargs):
@@ -353,50 +335,40 @@ def retrieve_object_by_name(p_obj_name_str, **kwargs):
     Returns:
         wanted_object : Function/State/Data/Fun_Elem/Transition/Fun_Inter
     """
-    whole_objects_name_list = check_object_name_in_dict(**kwargs)
-
-    result = [False] * len(XmlDictKeyListForObjects)
+    wanted_object = None
     for i in range(len(XmlDictKeyListForObjects)):
-        if i == XmlDictKeyListForTypeIndex:
-            result[i] = any(a.lower() == p_obj_name_str.lower() for a in whole_objects_name_list[i])
-        else:
-            result[i] = any(a == p_obj_name_str for a in whole_objects_name_list[i])
+        object_list = kwargs.get(XmlDictKeyListForObjects[i], False)
+        if isinstance(object_list, LazyIndexedObjectSet) and not object_list.may_hold_name(p_obj_name_str):
+            # Object list not loaded yet, that does not hold the object
+            continue
+        elif object_list:
+            if not isinstance(object_list, IndexedObjectSet):
+                # Object list not coming from the XML dictionary
+                object_list = IndexedObjectSet(object_list)
+            # Else do nothing
 
-    wanted_object = match_object_by_name(p_obj_name_str, result, p_obj_list=XmlDictKeyListForObjects, **kwargs)
+            # Type names are not case-sensitive
+            wanted_object = object_list.get_by_name(p_obj_name_str, i != XmlDictKeyListForTypeIndex)
 
-    return wanted_object
+            if wanted_object is not None:
+                break
+            # Else do nothing
+        # Else do nothing
 
+    return wanted_object
 
-def match_object_by_name(p_obj_str, p_obj_list_filter, p_obj_list=None, **kwargs):
-    """Returns wanted_object from object_str and result matched from name lists"""
-    if not p_obj_list:
-        p_obj_list = XmlDictKeyListForObjects
-    # Else do nothing
 
-    for i in range(len(p_obj_list)):
-        if p_obj_list_filter[i]:
-            if i == XmlDictKeyListForTypeIndex:
-                for obj in kwargs[p_obj_list[i]]:
-                    if p_obj_str.lower() == obj.name.lower():
-                        return obj
-
-                    if hasattr(obj, "alias"):
-                        if p_obj_str.lower() == obj.alias.lower():
-                            return obj
-                        # ELse do nothing
-                    # Else do nothing
-            else:
-                for obj in kwargs[p_obj_list[i]]:
-                    if p_obj_str == obj.name:
-                        return obj
-
-                    if hasattr(obj, "alias"):
-                        if p_obj_str == obj.alias:
-                            return obj
-                        # ELse do nothing
-                    # Else do nothing
+def refresh_object_index(p_object, **kwargs):
+    """Update the indexes of the XML dictionary after a change of object identifier, name or alias
+    @param[in] p_object : object
+    @param[in] kwargs : xml lists
+    @return None
+    """
+    for xml_dict_key in XmlDictKeyListForObjects:
+        object_list = kwargs.get(xml_dict_key)
+        if isinstance(object_list, IndexedObjectSet):
+            object_list.refresh(p_object)
         # Else do nothing
-    return None
 
 
 def retrieve_allocated_object_list(wanted_object, object_list, **kwargs):
@@ -447,17 +419,6 @@ def retrieve_allocated_object_list(wanted_object, object_list, **kwargs):
     return allocation_set
 
 
-def check_object_name_in_dict(**kwargs):
-    """Returns lists of objects with their names depending on kwargs"""
-    whole_objects_name_list = [[] for _ in range(len(XmlDictKeyListForObjects))]
-    for i in range(len(XmlDictKeyListForObjects)):
-        if kwargs.get(XmlDictKeyListForObjects[i], False):
-            whole_objects_name_list[i] = check_object_name_in_list(kwargs[XmlDictKeyListForObjects[i]])
-        # Else do nothing
-
-    return whole_objects_name_list
-
-
 def check_object_name_in_list(p_object_list):
     """
     Method that returns a list with all object aliases/names from object's list
@@ -500,22 +461,16 @@ def check_object_relationship(p_object_src, p_object_dest, p_context, **kwargs):
                         xml_consumer_function_list = kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]
                         xml_producer_function_list = kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]
 
-                        for xml_consumer_function in xml_consumer_function_list:
-                            if xml_consumer_function[0] == p_object_dest and xml_consumer_function[1] == p_object_src:
-                                Logger.set_info(__name__,
-                                                f"{object_src_type} {p_object_src.name} consumes "
-                                                f"{object_dest_type} {p_object_dest.name}")
-                                is_relationship = True
-                                break
-
-                        if not is_relationship:
-                            for xml_producer_function in xml_producer_function_list:
-                                if xml_producer_function[0] == p_object_dest and xml_producer_function[1] == p_object_src:
-                                    Logger.set_info(__name__,
-                                                    f"{object_src_type} {p_object_src.name} produces "
-                                                    f"{object_dest_type} {p_object_dest.name}")
-                                    is_relationship = True
-                                    break
+                        if [p_object_dest, p_object_src] in xml_consumer_function_list:
+                            Logger.set_info(__name__,
+                                            f"{object_src_type} {p_object_src.name} consumes "
+                                            f"{object_dest_type} {p_object_dest.name}")
+                            is_relationship = True
+                        elif [p_object_dest, p_object_src] in xml_producer_function_list:
+                            Logger.set_info(__name__,
+                                            f"{object_src_type} {p_object_src.name} produces "
+                                            f"{object_dest_type} {p_object_dest.name}")
+                            is_relationship = True
                         # Else do nothing
 
                         if not is_relationship:
@@ -954,6 +909,40 @@ def retrieve_object_type_requirement_list(p_object, **kwargs):
     return requirement_list
 
 
+def retrieve_flow_name_list(p_object, p_relationship_list, p_opposite_relationship_list):
+    """@ingroup orchestrator
+    @anchor retrieve_flow_name_list
+    Retrieve the flows exchanged by an object, with the objects at the other end of each flow
+    @param[in] p_object : object consuming (resp. producing) the flows
+    @param[in] p_relationship_list : list of [flow, object] consumer (resp. producer) relationships
+    @param[in] p_opposite_relationship_list : list of [flow, object] producer (resp. consumer) relationships
+    @return list of [flow name, opposite object name or None]
+    """
+    if not isinstance(p_relationship_list, IndexedFlowList):
+        # Relationship list not coming from the XML dictionary
+        p_relationship_list = IndexedFlowList(p_relationship_list)
+    # Else do nothing
+
+    if not isinstance(p_opposite_relationship_list, IndexedFlowList):
+        # Relationship list not coming from the XML dictionary
+        p_opposite_relationship_list = IndexedFlowList(p_opposite_relationship_list)
+    # Else do nothing
+
+    flow_name_list = []
+    for flow in p_relationship_list.get_flow_list(p_object):
+        opposite_object_list = p_opposite_relationship_list.get_element_list(flow)
+        if not opposite_object_list:
+            flow_name_list.append([flow.name, None])
+        else:
+            for opposite_object in opposite_object_list:
+                # Only keep the lowest level objects exchanging the flow
+                if not any([flow, child] in p_opposite_relationship_list for child in opposite_object.child_list):
+                    flow_name_list.append([flow.name, opposite_object.name])
+                # Else do nothing
+
+    return flow_name_list
+
+
 def retrieve_object_input_name_list(p_object, p_is_sorted=True, **kwargs):
     input_list = []
     if hasattr(p_object, 'type'):
@@ -962,49 +951,14 @@ def retrieve_object_input_name_list(p_object, p_is_sorted=True, **kwargs):
         else:
             _, object_type = retrieve_type(p_object.type.name, True, **kwargs)
 
-        flow_list = set()
         if object_type == datamodel.BaseType.ACTIVITY:
-            for elem in kwargs[XML_DICT_KEY_17_ACT_CONS_LIST]:
-                if elem[1].id == p_object.id:
-                    flow_list.add(elem[0])
-
-            for flow in flow_list:
-                if not any(flow in s for s in kwargs[XML_DICT_KEY_18_ACT_PROD_LIST]):
-                    input_list.append([flow.name, None])
-                else:
-                    for elem in kwargs[XML_DICT_KEY_18_ACT_PROD_LIST]:
-                        check = True
-                        if elem[0] == flow:
-                            for child in elem[1].child_list:
-                                if [elem[0], child] in kwargs[XML_DICT_KEY_18_ACT_PROD_LIST]:
-                                    check = False
-                                # Else do nothing
-
-                            if check:
-                                input_list.append([elem[0].name, elem[1].name])
-                            # Else do nothing
-                        # Else do nothing
+            input_list.extend(retrieve_flow_name_list(p_object,
+                                                      kwargs[XML_DICT_KEY_17_ACT_CONS_LIST],
+                                                      kwargs[XML_DICT_KEY_18_ACT_PROD_LIST]))
         elif object_type == datamodel.BaseType.FUNCTION:
-            for elem in kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]:
-                if elem[1].id == p_object.id:
-                    flow_list.add(elem[0])
-
-            for flow in flow_list:
-                if not any(flow in s for s in kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]):
-                    input_list.append([flow.name, None])
-                else:
-                    for elem in kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]:
-                        check = True
-                        if elem[0] == flow:
-                            for child in elem[1].child_list:
-                                if [elem[0], child] in kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]:
-                                    check = False
-                                # Else do nothing
-
-                            if check:
-                                input_list.append([elem[0].name, elem[1].name])
-                            # Else do nothing
-                        # Else do nothing
+            input_list.extend(retrieve_flow_name_list(p_object,
+                                                      kwargs[XML_DICT_KEY_15_FUN_CONS_LIST],
+                                                      kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]))
         elif object_type == datamodel.BaseType.FUNCTIONAL_ELEMENT:
             allocated_function_list = retrieve_allocated_object_list(p_object, XML_DICT_KEY_1_FUNCTION_LIST, **kwargs)
 
@@ -1052,49 +1006,14 @@ def retrieve_object_output_name_list(p_object, p_is_sorted=True, **kwargs):
         else:
             _, object_type = retrieve_type(p_object.type.name, True, **kwargs)
 
-        flow_list = set()
         if object_type == datamodel.BaseType.ACTIVITY:
-            for elem in kwargs[XML_DICT_KEY_18_ACT_PROD_LIST]:
-                if elem[1].id == p_object.id:
-                    flow_list.add(elem[0])
-
-            for flow in flow_list:
-                if not any(flow in s for s in kwargs[XML_DICT_KEY_17_ACT_CONS_LIST]):
-                    input_list.append([flow.name, None])
-                else:
-                    for elem in kwargs[XML_DICT_KEY_17_ACT_CONS_LIST]:
-                        check = True
-                        if elem[0] == flow:
-                            for child in elem[1].child_list:
-                                if [elem[0], child] in kwargs[XML_DICT_KEY_17_ACT_CONS_LIST]:
-                                    check = False
-                                # Else do nothing
-
-                            if check:
-                                input_list.append([elem[0].name, elem[1].name])
-                            # Else do nothing
-                        # Else do nothing
+            input_list.extend(retrieve_flow_name_list(p_object,
+                                                      kwargs[XML_DICT_KEY_18_ACT_PROD_LIST],
+                                                      kwargs[XML_DICT_KEY_17_ACT_CONS_LIST]))
         elif object_type == datamodel.BaseType.FUNCTION:
-            for elem in kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]:
-                if elem[1].id == p_object.id:
-                    flow_list.add(elem[0])
-
-            for flow in flow_list:
-                if not any(flow in s for s in kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]):
-                    input_list.append([flow.name, None])
-                else:
-                    for elem in kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]:
-                        check = True
-                        if elem[0] == flow:
-                            for child in elem[1].child_list:
-                                if [elem[0], child] in kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]:
-                                    check = False
-                                # Else do nothing
-
-                            if check:
-                                input_list.append([elem[0].name, elem[1].name])
-                            # Else do nothing
-                        # Else do nothing
+            input_list.extend(retrieve_flow_name_list(p_object,
+                                                      kwargs[XML_DICT_KEY_16_FUN_PROD_LIST],
+                                                      kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]))
         elif object_type == datamodel.BaseType.FUNCTIONAL_ELEMENT:
             allocated_function_list = retrieve_allocated_object_list(p_object, XML_DICT_KEY_1_FUNCTION_LIST, **kwargs)
 
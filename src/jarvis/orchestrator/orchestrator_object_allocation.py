@@ -436,7 +436,7 @@ def check_allocation_to_phy_elem(alloc_obj, obj_to_alloc, **kwargs):
     elif  isinstance(obj_to_alloc, datamodel.FunctionalElement):
         if not any(allocated_fun_elem_id == obj_to_alloc.id
                    for allocated_fun_elem_id in alloc_obj.allocated_fun_elem_list):
-            alloc_obj.add_allocated_activity(obj_to_alloc.id)
+            alloc_obj.add_allocated_fun_elem(obj_to_alloc.id)
             pair = [alloc_obj, obj_to_alloc]
         # Else do nothing
     # Else do nothing
@@ -11,6 +11,7 @@ from xml_adapter import XML_DICT_KEY_0_DATA_LIST, XML_DICT_KEY_1_FUNCTION_LIST,
     XML_DICT_KEY_9_GOAL_LIST, XML_DICT_KEY_10_ACTIVITY_LIST, XML_DICT_KEY_11_INFORMATION_LIST, XML_DICT_KEY_12_ATTRIBUTE_LIST, \
     XML_DICT_KEY_13_VIEW_LIST, XML_DICT_KEY_14_TYPE_LIST, XML_DICT_KEY_15_FUN_CONS_LIST, \
     XML_DICT_KEY_16_FUN_PROD_LIST, XML_DICT_KEY_17_ACT_CONS_LIST, XML_DICT_KEY_18_ACT_PROD_LIST
+from xml_adapter import ReferenceIndex
 from . import orchestrator_object
 from . import orchestrator_object_allocation
 from jarvis import util
@@ -105,8 +106,8 @@ def add_child(parent_child_lists, **kwargs):
                             xml_consumer_function_list = kwargs[XML_DICT_KEY_15_FUN_CONS_LIST]
                             xml_producer_function_list = kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]
 
-                            for (flow, function) in xml_consumer_function_list:
-                                if obj[1].id == function.id and [flow, obj[0]] not in xml_consumer_function_list:
+                            for flow in xml_consumer_function_list.get_flow_list(obj[1]):
+                                if [flow, obj[0]] not in xml_consumer_function_list:
                                     if [flow, obj[0]] not in xml_producer_function_list:
                                         output_xml.write_data_consumer([[flow, obj[0]]])
                                         xml_consumer_function_list.append([flow, obj[0]])
@@ -119,8 +120,8 @@ def add_child(parent_child_lists, **kwargs):
 
                                         Logger.set_info(__name__, f"{obj[0].name} does not produce {flow.name} anymore")
 
-                            for (flow, function) in xml_producer_function_list:
-                                if obj[1].id == function.id and [flow, obj[0]] not in xml_producer_function_list:
+                            for flow in xml_producer_function_list.get_flow_list(obj[1]):
+                                if [flow, obj[0]] not in xml_producer_function_list:
                                     if [flow, obj[0]] not in xml_consumer_function_list:
                                         output_xml.write_data_producer([[flow, obj[0]]])
                                         xml_producer_function_list.append([flow, obj[0]])
@@ -142,6 +143,9 @@ def check_and_delete_object(delete_str_list, **kwargs):
     objects list for objects to delete.
     Send lists to delete_objects() to delete them within xml and then returns update from it.
 
+    Relationships of the objects are checked through the reference index of the model, built once for all the
+    objects to delete.
+
         Parameters:
             delete_str_list ([str]) : List of string from jarvis cell
             kwargs (dict) : whole xml lists + xml's file object
@@ -150,6 +154,7 @@ def check_and_delete_object(delete_str_list, **kwargs):
             update ([0/1]) : 1 if update, else 0
     """
     to_be_deleted_obj_lists = [[] for _ in range(10)]
+    reference_index = ReferenceIndex.get(**kwargs)
     # Check if the wanted to delete object exists and can be deleted
     for elem in delete_str_list:
         object_name = elem.replace('"', "")
@@ -160,7 +165,7 @@ def check_and_delete_object(delete_str_list, **kwargs):
                              f"{object_name} does not exist")
             continue
 
-        check, list_idx = check_relationship_before_delete(object_to_del, **kwargs)
+        check, list_idx = check_relationship_before_delete(object_to_del, reference_index, **kwargs)
         if check:
             to_be_deleted_obj_lists[list_idx].append(object_to_del)
         else:
@@ -172,30 +177,36 @@ def check_and_delete_object(delete_str_list, **kwargs):
     return update
 
 
-def check_relationship_before_delete(object_to_del, **kwargs):
+def check_relationship_before_delete(object_to_del, reference_index, **kwargs):
     """Switch to trigger differents methods depend object's type"""
-    _, idx = get_basetype_and_idx(object_to_del)
-    switch_check = {
-        0: check_data,
-        1: check_function,
-        2: check_fun_elem,
-        3: check_fun_inter,
-        4: check_phy_elem,
-        5: check_phy_inter,
-        6: check_state,
-        7: check_transition,
-        8: check_attribute,
-        9: check_chain,
-    }
-    check_obj = switch_check.get(idx, "Object can not be deleted")
-    check = check_obj(object_to_del, **kwargs)
+    # Tuple order is same as object_lists of delete_objects()
+    switch_check = ((datamodel.Data, check_data),
+                    (datamodel.Function, check_function),
+                    (datamodel.FunctionalElement, check_fun_elem),
+                    (datamodel.FunctionalInterface, check_fun_inter),
+                    (datamodel.PhysicalElement, check_phy_elem),
+                    (datamodel.PhysicalInterface, check_phy_inter),
+                    (datamodel.State, check_state),
+                    (datamodel.Transition, check_transition),
+                    (datamodel.Attribute, check_attribute),
+                    (datamodel.View, check_chain))
+    check = False
+    idx = None
+    for switch_idx, (class_obj, check_obj) in enumerate(switch_check):
+        if isinstance(object_to_del, class_obj):
+            idx = switch_idx
+            check = check_obj(object_to_del, reference_index, **kwargs)
+            break
+        # Else do nothing
+
     return check, idx
 
 
 def check_object_not_in_prod_cons(object_to_check, consumer_list, producer_list):
-    """Check if object/data_name not in producer or consumer lists"""
+    """Check if object (function or data) not in producer or consumer lists"""
     check = False
-    if not any(object_to_check in o for o in consumer_list + producer_list):
+    if not any(flow_list.has_flow(object_to_check) or flow_list.has_element(object_to_check)
+               for flow_list in (consumer_list, producer_list)):
         check = True
     return check
 
@@ -209,97 +220,44 @@ def check_object_no_parent_and_child(object_to_check):
     return check
 
 
-def check_object_not_allocated(object_to_check, allocated_to_object_list):
-    """Check if object in allocated_list of allocated objects"""
-    check = False
-    if not allocated_to_object_list:
-        check = True
-        return check
-
-    converted_list = list(allocated_to_object_list)
-    if isinstance(object_to_check, datamodel.Function):
-        if isinstance(converted_list[0], (datamodel.State, datamodel.FunctionalElement)):
-            if not any(object_to_check.id in obj.allocated_function_list for obj
-                       in converted_list):
-                check = True
-        if isinstance(converted_list[0], datamodel.View):
-            if not any(object_to_check.id in obj.allocated_item_list for obj
-                       in converted_list):
-                check = True
-    if isinstance(object_to_check, datamodel.Data):
-        if isinstance(converted_list[0], datamodel.View):
-            if not any(object_to_check.id in obj.allocated_item_list for obj
-                       in converted_list):
-                check = True
-        if isinstance(converted_list[0], datamodel.FunctionalInterface):
-            if not any(object_to_check.id in obj.allocated_data_list for obj
-                       in converted_list):
-                check = True
-    if isinstance(object_to_check, datamodel.State):
-        if isinstance(converted_list[0], datamodel.FunctionalElement):
-            if not any(object_to_check.id in obj.allocated_state_list for obj
-                       in converted_list):
-                check = True
-    if isinstance(object_to_check, datamodel.FunctionalElement):
-        if isinstance(converted_list[0], datamodel.PhysicalElement):
-            if not any(object_to_check.id in obj.allocated_fun_elem_list for obj
-                       in converted_list):
-                check = True
-    if isinstance(object_to_check, datamodel.FunctionalInterface):
-        if isinstance(converted_list[0], datamodel.FunctionalElement):
-            if not any(object_to_check.id in obj.exposed_interface_list for obj
-                       in converted_list):
-                check = True
-        if isinstance(converted_list[0], datamodel.PhysicalInterface):
-            if not any(object_to_check.id in obj.allocated_fun_inter_list for obj
-                       in converted_list):
-                check = True
-    if isinstance(object_to_check, datamodel.PhysicalInterface):
-        if isinstance(converted_list[0], datamodel.PhysicalElement):
-            if not any(object_to_check.id in obj.exposed_interface_list for obj
-                       in converted_list):
-                check = True
-    return check
-
-
-def check_object_no_attribute(object_to_check, attribute_list):
-    """Check that object has not attribute set"""
+def check_object_not_referred(object_to_check, reference_index, *attribute_list):
+    """Check if object is not referred by the given attributes of other objects (allocations, exposed interfaces,
+    transitions, attributes)"""
     check = False
-    described_item_list = [obj.described_item_list for obj in attribute_list]
-    if not any(object_to_check.id in obj for obj in described_item_list):
+    if not reference_index.has_referrer(object_to_check.id, *attribute_list):
         check = True
     return check
 
 
-def check_function(object_to_del, **kwargs):
+def check_function(object_to_del, reference_index, **kwargs):
     """Checks for Function's object"""
     check = False
-    check_list = [False] * 6
+    check_list = [False] * 5
     check_list[0] = check_object_no_parent_and_child(object_to_del)
     if not check_list[0]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has composition relationship(s)")
 
-    check_list[1] = check_object_not_allocated(object_to_del, kwargs[XML_DICT_KEY_6_STATE_LIST])
-    check_list[2] = check_object_not_allocated(object_to_del, kwargs[XML_DICT_KEY_2_FUN_ELEM_LIST])
-    if not check_list[1] or not check_list[2]:
+    # Allocation to states and functional elements
+    check_list[1] = check_object_not_referred(object_to_del, reference_index, 'allocated_function_list')
+    if not check_list[1]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has allocation relationship(s)")
 
-    check_list[3] = check_object_not_in_prod_cons(object_to_del,
+    check_list[2] = check_object_not_in_prod_cons(object_to_del,
                                                   kwargs[XML_DICT_KEY_15_FUN_CONS_LIST],
                                                   kwargs[XML_DICT_KEY_16_FUN_PROD_LIST])
-    if not check_list[3]:
+    if not check_list[2]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has production/consumption relationship(s)")
 
-    check_list[4] = check_object_no_attribute(object_to_del, kwargs[XML_DICT_KEY_12_ATTRIBUTE_LIST])
-    if not check_list[4]:
+    check_list[3] = check_object_not_referred(object_to_del, reference_index, 'described_item_list')
+    if not check_list[3]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has attribute(s) set")
 
-    check_list[5] = check_object_not_allocated(object_to_del, kwargs[XML_DICT_KEY_13_VIEW_LIST])
-    if not check_list[5]:
+    check_list[4] = check_object_not_referred(object_to_del, reference_index, 'allocated_item_list')
+    if not check_list[4]:
         Logger.set_info(__name__, f"{object_to_del.name} has chain relationship(s)")
 
     if all(check_list):
@@ -308,23 +266,24 @@ def check_function(object_to_del, **kwargs):
     return check
 
 
-def check_data(object_to_del, **kwargs):
+def check_data(object_to_del, reference_index, **kwargs):
     """Checks for Data's object"""
     check = False
     check_list = [False] * 3
-    check_list[0] = check_object_not_in_prod_cons(object_to_del.name,
+    check_list[0] = check_object_not_in_prod_cons(object_to_del,
                                                   kwargs[XML_DICT_KEY_15_FUN_CONS_LIST],
                                                   kwargs[XML_DICT_KEY_16_FUN_PROD_LIST])
     if not check_list[0]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has production/consumption relationship(s)")
 
-    check_list[1] = check_object_not_allocated(object_to_del, kwargs[XML_DICT_KEY_13_VIEW_LIST])
+    check_list[1] = check_object_not_referred(object_to_del, reference_index, 'allocated_item_list')
     if not check_list[1]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has chain relationship(s)")
 
-    check_list[2] = check_object_not_allocated(object_to_del, kwargs[XML_DICT_KEY_3_FUN_INTF_LIST])
+    # Allocation to functional interfaces
+    check_list[2] = check_object_not_referred(object_to_del, reference_index, 'allocated_data_list')
     if not check_list[2]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has allocation relationship(s)")
@@ -335,7 +294,7 @@ def check_data(object_to_del, **kwargs):
     return check
 
 
-def check_state(object_to_del, **kwargs):
+def check_state(object_to_del, reference_index, **kwargs):
     """Checks for State's object"""
     check = False
     check_list = [False] * 4
@@ -345,14 +304,14 @@ def check_state(object_to_del, **kwargs):
         Logger.set_info(__name__,
                         f"{object_to_del.name} has composition relationship(s)")
 
+    # Allocation to functional elements
     check_list[1] = not object_to_del.allocated_function_list
-    check_list[2] = check_object_not_allocated(object_to_del, kwargs[XML_DICT_KEY_2_FUN_ELEM_LIST])
+    check_list[2] = check_object_not_referred(object_to_del, reference_index, 'allocated_state_list')
     if not check_list[1] or not check_list[2]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has allocation relationship(s)")
 
-    check_list[3] = not any(object_to_del.id in (trans.source, trans.destination)
-                            for trans in kwargs[XML_DICT_KEY_7_TRANSITION_LIST])
+    check_list[3] = check_object_not_referred(object_to_del, reference_index, 'source', 'destination')
     if not check_list[3]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has transition relationship(s)")
@@ -362,7 +321,7 @@ def check_state(object_to_del, **kwargs):
     return check
 
 
-def check_transition(object_to_del, **kwargs):
+def check_transition(object_to_del, _reference_index, **kwargs):
     """Checks for State's object"""
     check = False
     check_list = [False] * 1
@@ -378,7 +337,7 @@ def check_transition(object_to_del, **kwargs):
     return check
 
 
-def check_fun_elem(object_to_del, **kwargs):
+def check_fun_elem(object_to_del, reference_index, **kwargs):
     """Checks for Functional Element's object"""
     check = False
     check_list = [False] * 4
@@ -388,9 +347,10 @@ def check_fun_elem(object_to_del, **kwargs):
         Logger.set_info(__name__,
                         f"{object_to_del.name} has composition relationship(s)")
 
+    # Allocation to physical elements
     check_list[1] = (not object_to_del.allocated_function_list and
                      not object_to_del.allocated_state_list)
-    check_list[2] = check_object_not_allocated(object_to_del, kwargs[XML_DICT_KEY_4_PHY_ELEM_LIST])
+    check_list[2] = check_object_not_referred(object_to_del, reference_index, 'allocated_fun_elem_list')
     if not check_list[1] or not check_list[2]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has allocation relationship(s)")
@@ -407,7 +367,7 @@ def check_fun_elem(object_to_del, **kwargs):
     return check
 
 
-def check_chain(object_to_del, **kwargs):
+def check_chain(object_to_del, _reference_index, **kwargs):
     """Checks for View's object"""
     check = False
     check_list = [False] * 1
@@ -424,7 +384,7 @@ def check_chain(object_to_del, **kwargs):
     return check
 
 
-def check_attribute(object_to_del, **kwargs):
+def check_attribute(object_to_del, _reference_index, **kwargs):
     """Checks for Attribute's object"""
     check = False
     check_list = [False] * 1
@@ -441,15 +401,16 @@ def check_attribute(object_to_del, **kwargs):
     return check
 
 
-def check_fun_inter(object_to_del, **kwargs):
+def check_fun_inter(object_to_del, reference_index, **kwargs):
     """Checks for Functional Interface's object"""
     check = False
-    check_list = [False] * 3
+    check_list = [False] * 2
 
+    # Exposition by functional elements and allocation to physical interfaces
     check_list[0] = not object_to_del.allocated_data_list
-    check_list[1] = check_object_not_allocated(object_to_del, kwargs[XML_DICT_KEY_2_FUN_ELEM_LIST])
-    check_list[2] = check_object_not_allocated(object_to_del, kwargs[XML_DICT_KEY_5_PHY_INTF_LIST])
-    if not check_list[0] or not check_list[1] or not check_list[2]:
+    check_list[1] = check_object_not_referred(object_to_del, reference_index, 'exposed_interface_list',
+                                              'allocated_fun_inter_list')
+    if not check_list[0] or not check_list[1]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has allocation relationship(s)")
 
@@ -460,7 +421,7 @@ def check_fun_inter(object_to_del, **kwargs):
     return check
 
 
-def check_phy_elem(object_to_del, **kwargs):
+def check_phy_elem(object_to_del, _reference_index, **kwargs):
     """Checks for Physical Element's object"""
     check = False
     check_list = [False] * 3
@@ -487,7 +448,7 @@ def check_phy_elem(object_to_del, **kwargs):
     return check
 
 
-def check_phy_inter(object_to_del, **kwargs):
+def check_phy_inter(object_to_del, reference_index, **kwargs):
     """Checks for Physical Interface's object"""
     check = False
     check_list = [False] * 2
@@ -497,7 +458,8 @@ def check_phy_inter(object_to_del, **kwargs):
         Logger.set_info(__name__,
                         f"{object_to_del.name} has allocation relationship(s)")
 
-    check_list[1] = check_object_not_allocated(object_to_del, kwargs[XML_DICT_KEY_4_PHY_ELEM_LIST])
+    # Exposition by physical elements
+    check_list[1] = check_object_not_referred(object_to_del, reference_index, 'exposed_interface_list')
     if not check_list[1]:
         Logger.set_info(__name__,
                         f"{object_to_del.name} has interface relationship(s)")
@@ -511,23 +473,22 @@ def check_phy_inter(object_to_del, **kwargs):
 
 def delete_objects(object_lists, output_xml):
     """
-    Check if input lists are not empty, write in xml for each list and return update list if some
+    Check if input lists are not empty, delete all the objects within xml at once and return update list if some
     updates has been made
 
         Parameters:
-            object_lists : see order in get_basetype_and_idx()
+            object_lists : see order in check_relationship_before_delete()
             output_xml (XmlWriter3SE object) : XML's file object
 
         Returns:
             1 if update, else 0
     """
-    if any(object_lists):
-        for i in range(10):
-            if object_lists[i]:
-                output_xml.delete_object(object_lists[i])
-                for object_type in object_lists[i]:
-                    Logger.set_info(__name__,
-                                    f"{object_type.name} deleted")
+    deleted_object_list = [obj for object_list in object_lists for obj in object_list]
+    if deleted_object_list:
+        output_xml.delete_object(deleted_object_list)
+        for deleted_object in deleted_object_list:
+            Logger.set_info(__name__,
+                            f"{deleted_object.name} deleted")
         return 1
     return 0
 
@@ -682,6 +643,7 @@ def check_set_object_alias(alias_str_list, **kwargs):
 
         idx = check_new_alias(object_to_set, alias_str)
         if isinstance(idx, int):
+            orchestrator_object.refresh_object_index(object_to_set, **kwargs)
             object_lists[idx].append(object_to_set)
 
     update = set_object_alias(object_lists, kwargs['output_xml'])
@@ -144,7 +144,8 @@ def add_object_attribute(new_obj_attribute_list, **kwargs):
         output_xml.write_attribute_described_item(new_obj_attribute_list)
         # Warn the user once added within xml
         for described_attribute in new_obj_attribute_list:
-            described_attribute[0].add_described_item(described_attribute[1])
+            # Described item is stored by identifier, as when parsed from XML
+            described_attribute[0].add_described_item((described_attribute[1][0].id, described_attribute[1][1]))
             Logger.set_info(__name__,
                             f"Attribute {described_attribute[0].name} for {described_attribute[1][0].name} "
                             f"with value {described_attribute[1][1]}")
@@ -3,12 +3,9 @@ Jarvis orchestrator module
 """
 # Libraries
 import re
-import nltk
-nltk.download('punkt')
-nltk.download('punkt_tab')
-nltk.download('averaged_perceptron_tagger')
-nltk.download('averaged_perceptron_tagger_eng')
 import difflib
+import functools
+import weakref
 
 # Modules
 import datamodel
@@ -20,6 +17,7 @@ from xml_adapter import XML_DICT_KEY_0_DATA_LIST, XML_DICT_KEY_1_FUNCTION_LIST,
     XML_DICT_KEY_16_FUN_PROD_LIST, XML_DICT_KEY_17_ACT_CONS_LIST, XML_DICT_KEY_18_ACT_PROD_LIST
 from . import orchestrator_object, orchestrator_viewpoint_goal
 from tools import Logger
+from tools import Config
 from jarvis.handler import handler_question
 from jarvis import util
 
@@ -37,6 +35,17 @@ VERB_TAG = "VB"
 VERB_PAST_TAG = "VBN"
 TO_TAG = "TO"
 SEMICOLON_TAG = ":"
+# Natural language toolkit resources used to tag requirement texts
+NLTK_RESOURCE_DICT = {'punkt_tab': 'tokenizers/punkt_tab',
+                      'averaged_perceptron_tagger_eng': 'taggers/averaged_perceptron_tagger_eng'}
+
+# Length of the character n-grams used to block requirement texts before exact similarity evaluation
+REQUIREMENT_NGRAM_LENGTH = 3
+
+# Natural language toolkit module, imported at first requirement text tagging
+nltk_module = None
+# Similarity indexes by identity of the requirement list they are built on
+requirement_similarity_index_dict = {}
 
 
 def check_add_requirement(p_str_list, **kwargs):
@@ -231,44 +240,286 @@ def evaluate_text_similarities(p_req_subject, p_req_object, p_req_conditional, p
     @param[in] kwargs : Jarvis dictionaries
     @return list of similarities ratio per requirements
     """
-    xml_requirement_list = kwargs[XML_DICT_KEY_8_REQUIREMENT_LIST]
-    sequence_ratio_list = {}
+    similarity_index = get_requirement_similarity_index(kwargs[XML_DICT_KEY_8_REQUIREMENT_LIST])
+    sequence_ratio_list = similarity_index.evaluate_text_similarities(p_req_subject,
+                                                                      p_req_object,
+                                                                      p_req_conditional,
+                                                                      p_req_temporal)
 
-    for xml_requirement in xml_requirement_list:
-        if xml_requirement.text:
-            xml_requirement_subject, xml_requirement_object, xml_requirement_conditional, \
-                xml_requirement_temporal = detect_req_pattern(xml_requirement.text)
-
-            sequence_subject = difflib.SequenceMatcher(None,
-                                                       xml_requirement_subject,
-                                                       p_req_subject)
-            sequence_object = difflib.SequenceMatcher(None,
-                                                      xml_requirement_object,
-                                                      p_req_object)
-            sequence_conditional = difflib.SequenceMatcher(None,
-                                                           xml_requirement_conditional,
-                                                           p_req_conditional)
-            sequence_temporal = difflib.SequenceMatcher(None,
-                                                        xml_requirement_temporal,
-                                                        p_req_temporal)
-
-            if sequence_subject.ratio() == 1 \
-                    and sequence_object.ratio() > REQUIREMENT_CONFIDENCE_RATIO \
-                    and sequence_conditional.ratio() > REQUIREMENT_CONFIDENCE_RATIO \
-                    and sequence_temporal.ratio() > REQUIREMENT_CONFIDENCE_RATIO:
-                sequence_ratio_list[xml_requirement.name] = max(sequence_object.ratio(),
-                                                                sequence_conditional.ratio(),
-                                                                sequence_temporal.ratio())
+    return sequence_ratio_list
+
+
+def get_requirement_similarity_index(p_requirement_list):
+    """@ingroup orchestrator
+    @anchor get_requirement_similarity_index
+    Get the similarity index of a requirement list, create it at first call
+
+    @param[in] p_requirement_list : requirement list
+    @return similarity index of the requirement list
+    """
+    similarity_index = find_requirement_similarity_index(p_requirement_list)
+    if similarity_index is None:
+        try:
+            similarity_index = RequirementSimilarityIndex(p_requirement_list)
+        except TypeError:
+            # Requirement list cannot be weakly referenced: the index is not kept
+            similarity_index = RequirementSimilarityIndex()
+        else:
+            requirement_similarity_index_dict[id(p_requirement_list)] = similarity_index
+
+        similarity_index.synchronize(p_requirement_list)
+    # Else do nothing
+
+    return similarity_index
+
+
+def find_requirement_similarity_index(p_requirement_list):
+    """@ingroup orchestrator
+    @anchor find_requirement_similarity_index
+    Find the similarity index of a requirement list, if already created
+
+    @param[in] p_requirement_list : requirement list
+    @return similarity index of the requirement list, None if not created yet
+    """
+    similarity_index = requirement_similarity_index_dict.get(id(p_requirement_list))
+    if similarity_index is not None and similarity_index.requirement_list_ref() is not p_requirement_list:
+        similarity_index = None
+    # Else do nothing
+
+    return similarity_index
+
+
+def update_requirement_similarity_index(p_requirement_list, p_requirement):
+    """@ingroup orchestrator
+    @anchor update_requirement_similarity_index
+    Update the similarity index of a requirement list, if already created, with a requirement added to the list,
+    removed from it or whose text has changed
+
+    @param[in] p_requirement_list : requirement list
+    @param[in] p_requirement : requirement
+    @return None
+    """
+    similarity_index = find_requirement_similarity_index(p_requirement_list)
+    if similarity_index is not None:
+        similarity_index.update(p_requirement, p_requirement in p_requirement_list)
+    # Else do nothing
+
+
+class RequirementSimilarityIndex:
+    """@ingroup orchestrator
+    @anchor RequirementSimilarityIndex
+    Index of requirement texts used to find requirements similar to a requirement declaration
+
+    Requirement texts are decomposed once into subject, object, conditional and temporal parts. Requirements are
+    grouped by subject, as similar requirements have the same subject, and the n-grams of their object are indexed in
+    each group. Only the requirements that can reach @ref REQUIREMENT_CONFIDENCE_RATIO, according to the length of
+    their parts and to the number of n-grams shared with the requirement declaration, are compared with difflib.
+    """
+
+    def __init__(self, p_requirement_list=None):
+        """@var requirement_list_ref
+        Weak reference to the indexed requirement list
+
+        @var entry_dict
+        Dictionary of (text, subject, object, conditional, temporal, object n-gram dictionary) by requirement
+
+        @var subject_dict
+        Dictionary of requirement sets by subject
+
+        @var ngram_dict
+        Dictionary of {requirement: count} dictionaries by (subject, object n-gram)
+        """
+        if p_requirement_list is None:
+            self.requirement_list_ref = lambda: None
+        else:
+            self.requirement_list_ref = weakref.ref(p_requirement_list,
+                                                    functools.partial(remove_requirement_similarity_index,
+                                                                      id(p_requirement_list), self))
+        self.entry_dict = {}
+        self.subject_dict = {}
+        self.ngram_dict = {}
+
+    def synchronize(self, p_requirement_list):
+        """Update the index with all the requirements of the requirement list, the index being then updated
+        requirement by requirement, see @ref update
+        @param[in] p_requirement_list : requirement list
+        @return None
+        """
+        requirement_set = set()
+        for requirement in p_requirement_list:
+            if requirement.text:
+                requirement_set.add(requirement)
+                self.update(requirement, True)
             # Else do nothing
+
+        if len(requirement_set) != len(self.entry_dict):
+            for requirement in [r for r in self.entry_dict if r not in requirement_set]:
+                self.remove(requirement)
         # Else do nothing
 
-    return sequence_ratio_list
+    def update(self, p_requirement, p_is_listed):
+        """Update the index with a requirement added to the requirement list, removed from it or whose text has
+        changed
+        @param[in] p_requirement : requirement
+        @param[in] p_is_listed : indicates if the requirement is within the requirement list (True) or not (False)
+        @return None
+        """
+        entry = self.entry_dict.get(p_requirement)
+        if not p_is_listed or not p_requirement.text:
+            self.remove(p_requirement)
+        elif entry is None or entry[0] != p_requirement.text:
+            self.remove(p_requirement)
+            self.add(p_requirement)
+        # Else do nothing
+
+    def add(self, p_requirement):
+        """Add a requirement to the index
+        @param[in] p_requirement : requirement
+        @return None
+        """
+        req_subject, req_object, req_conditional, req_temporal = detect_req_pattern(p_requirement.text)
+        ngram_count_dict = get_ngram_count_dict(req_object)
+
+        self.entry_dict[p_requirement] = (p_requirement.text, req_subject, req_object, req_conditional, req_temporal,
+                                          ngram_count_dict)
+        self.subject_dict.setdefault(req_subject, set()).add(p_requirement)
+        for ngram, count in ngram_count_dict.items():
+            self.ngram_dict.setdefault((req_subject, ngram), {})[p_requirement] = count
+
+    def remove(self, p_requirement):
+        """Remove a requirement from the index if present
+        @param[in] p_requirement : requirement
+        @return None
+        """
+        entry = self.entry_dict.pop(p_requirement, None)
+        if entry is not None:
+            req_subject = entry[1]
+            self.subject_dict[req_subject].discard(p_requirement)
+            if not self.subject_dict[req_subject]:
+                del self.subject_dict[req_subject]
+            # Else do nothing
+
+            for ngram in entry[5]:
+                requirement_count_dict = self.ngram_dict[(req_subject, ngram)]
+                del requirement_count_dict[p_requirement]
+                if not requirement_count_dict:
+                    del self.ngram_dict[(req_subject, ngram)]
+                # Else do nothing
+        # Else do nothing
+
+    def evaluate_text_similarities(self, p_req_subject, p_req_object, p_req_conditional, p_req_temporal):
+        """Evaluate similarities between a requirement declaration and the indexed requirements
+        @param[in] p_req_subject : subject part of requirement declaration
+        @param[in] p_req_object : object part of requirement declaration
+        @param[in] p_req_conditional : conditional part of requirement declaration
+        @param[in] p_req_temporal : temporal part of requirement declaration
+        @return list of similarities ratio per requirements
+        """
+        sequence_ratio_list = {}
+
+        # Subject ratio shall be 1, i.e. subjects shall be equal
+        requirement_set = self.subject_dict.get(p_req_subject)
+        if requirement_set:
+            # Count the object n-grams shared with each requirement of the subject group
+            ngram_count_dict = get_ngram_count_dict(p_req_object)
+            shared_count_dict = {}
+            for ngram, count in ngram_count_dict.items():
+                for requirement, requirement_count in self.ngram_dict.get((p_req_subject, ngram), {}).items():
+                    shared_count_dict[requirement] = shared_count_dict.get(requirement, 0) + \
+                                                     min(count, requirement_count)
+
+            for requirement in requirement_set:
+                _, _, req_object, req_conditional, req_temporal, _ = self.entry_dict[requirement]
+                if is_similarity_possible(req_object, p_req_object, shared_count_dict.get(requirement, 0)) \
+                        and is_similarity_possible(req_conditional, p_req_conditional) \
+                        and is_similarity_possible(req_temporal, p_req_temporal):
+                    sequence_object = difflib.SequenceMatcher(None, req_object, p_req_object)
+                    sequence_conditional = difflib.SequenceMatcher(None, req_conditional, p_req_conditional)
+                    sequence_temporal = difflib.SequenceMatcher(None, req_temporal, p_req_temporal)
+
+                    if sequence_object.ratio() > REQUIREMENT_CONFIDENCE_RATIO \
+                            and sequence_conditional.ratio() > REQUIREMENT_CONFIDENCE_RATIO \
+                            and sequence_temporal.ratio() > REQUIREMENT_CONFIDENCE_RATIO:
+                        sequence_ratio_list[requirement.name] = max(sequence_object.ratio(),
+                                                                    sequence_conditional.ratio(),
+                                                                    sequence_temporal.ratio())
+                    # Else do nothing
+                # Else do nothing
+        # Else do nothing
+
+        return sequence_ratio_list
+
+
+def remove_requirement_similarity_index(p_requirement_list_id, p_similarity_index, _p_requirement_list_ref):
+    """@ingroup orchestrator
+    @anchor remove_requirement_similarity_index
+    Forget the similarity index of a requirement list that no longer exists
+
+    @param[in] p_requirement_list_id : identity of the requirement list
+    @param[in] p_similarity_index : similarity index of the requirement list
+    @param[in] _p_requirement_list_ref : weak reference to the requirement list
+    @return None
+    """
+    # Module globals may already be cleared at interpreter shutdown
+    if requirement_similarity_index_dict is not None \
+            and requirement_similarity_index_dict.get(p_requirement_list_id) is p_similarity_index:
+        del requirement_similarity_index_dict[p_requirement_list_id]
+    # Else do nothing
+
+
+def get_ngram_count_dict(p_str):
+    """@ingroup orchestrator
+    @anchor get_ngram_count_dict
+    Count the character n-grams of a string
+
+    @param[in] p_str : string
+    @return dictionary of counts by n-gram
+    """
+    ngram_count_dict = {}
+    for i in range(len(p_str) - REQUIREMENT_NGRAM_LENGTH + 1):
+        ngram = p_str[i:i + REQUIREMENT_NGRAM_LENGTH]
+        ngram_count_dict[ngram] = ngram_count_dict.get(ngram, 0) + 1
+
+    return ngram_count_dict
+
+
+def is_similarity_possible(p_str, p_other_str, p_shared_ngram_count=None):
+    """@ingroup orchestrator
+    @anchor is_similarity_possible
+    Check if the difflib ratio of two strings can be greater than @ref REQUIREMENT_CONFIDENCE_RATIO
+
+    The ratio is 2*M/T, where M is the number of matching characters and T the total number of characters. M cannot
+    be greater than the length of the shortest string. Besides, reaching the ratio allows less than
+    D = (1 - ratio)*T characters to be inserted or deleted, and each of them removes at most n of the n-grams shared
+    by the strings: at least max(length) - n + 1 - n*D n-grams are shared.
+
+    @param[in] p_str : string
+    @param[in] p_other_str : other string
+    @param[in] p_shared_ngram_count : number of n-grams shared by the strings, None if not evaluated
+    @return True if the ratio can be reached, else False
+    """
+    total_length = len(p_str) + len(p_other_str)
+    if total_length == 0:
+        # Empty strings are equal
+        is_possible = True
+    elif 2.0 * min(len(p_str), len(p_other_str)) / total_length <= REQUIREMENT_CONFIDENCE_RATIO:
+        is_possible = False
+    elif p_shared_ngram_count is not None:
+        # One n-gram of margin for float rounding
+        min_shared_ngram_count = max(len(p_str), len(p_other_str)) - REQUIREMENT_NGRAM_LENGTH + 1 - \
+            REQUIREMENT_NGRAM_LENGTH * (1 - REQUIREMENT_CONFIDENCE_RATIO) * total_length - 1
+        is_possible = p_shared_ngram_count >= min_shared_ngram_count
+    else:
+        is_possible = True
 
+    return is_possible
 
+
+@functools.lru_cache(maxsize=4096)
 def detect_req_pattern(p_str_before_modal, p_str_after_modal=None):
     """@ingroup orchestrator
     @anchor detect_req_pattern
-    Detect requirement pattern in requirement declaration
+    Detect requirement pattern in requirement declaration, results are cached by requirement declaration
 
     @param[in] p_str_before_modal : full requirement declaration (p_str_after_modal=None) or requirement declaration
     before the modal "shall" (p_str_after_modal!=None)
@@ -446,6 +697,7 @@ def add_requirement(p_requirement_list, **kwargs):
 
         for requirement in new_requirement_list:
             xml_requirement_list.add(requirement)
+            update_requirement_similarity_index(xml_requirement_list, requirement)
             Logger.set_info(__name__,
                             requirement.name + " is a requirement")
 
@@ -491,6 +743,8 @@ def add_requirement_text(p_text_list, **kwargs):
         # Else do nothing
 
         output_xml.write_requirement_text([[text_item[0], text_item[1]]])
+        text_item[0].set_text(text_item[1])
+        update_requirement_similarity_index(kwargs[XML_DICT_KEY_8_REQUIREMENT_LIST], text_item[0])
         Logger.set_info(__name__,
                         f"{text_item[0].name} text is {text_item[1]}")
 
@@ -559,6 +813,64 @@ def update_requirement_link(p_allocated_parent, p_requirement, **kwargs):
                                   f"{similar_requirement_name}")
 
 
+def get_nltk():
+    """@ingroup orchestrator
+    @anchor get_nltk
+    Get the natural language toolkit module, importing it at first call
+
+    The toolkit resources are only searched in local directories (the one set in the configuration file if any, then
+    the NLTK default ones): they are never downloaded.
+
+    @return nltk module
+    """
+    global nltk_module
+
+    if nltk_module is None:
+        import nltk
+        nltk_module = nltk
+
+        if Config.nltk_data_path and Config.nltk_data_path not in nltk_module.data.path:
+            nltk_module.data.path.insert(0, Config.nltk_data_path)
+        # Else do nothing
+
+        missing_resource_list = []
+        for resource_name, resource_path in NLTK_RESOURCE_DICT.items():
+            try:
+                nltk_module.data.find(resource_path)
+            except LookupError:
+                missing_resource_list.append(resource_name)
+
+        if missing_resource_list:
+            Logger.set_error(__name__,
+                             f"NLTK resources {', '.join(missing_resource_list)} not found in "
+                             f"{', '.join(nltk_module.data.path)}. Install them with: python -m nltk.downloader "
+                             f"-d <nltk data directory> {' '.join(missing_resource_list)}")
+        # Else do nothing
+    # Else do nothing
+
+    return nltk_module
+
+
+def retrieve_text_tag_list(p_text_str):
+    """@ingroup orchestrator
+    @anchor retrieve_text_tag_list
+    Retrieve the part-of-speech tags of a text
+
+    @param[in] p_text_str : text
+    @return list of (word, tag), empty if the NLTK resources are not found
+    """
+    nltk = get_nltk()
+    try:
+        token_list = nltk.word_tokenize(p_text_str)
+        tag_list = nltk.pos_tag(token_list)
+    except LookupError:
+        # Missing resources are already detailed when NLTK is loaded
+        Logger.set_error(__name__, f"Unable to analyze text \"{p_text_str}\": NLTK resources not found")
+        tag_list = []
+
+    return tag_list
+
+
 def retrieve_requirement_object(p_requirement_object_str):
     """@ingroup orchestrator
     @anchor retrieve_requirement_object
@@ -568,8 +880,7 @@ def retrieve_requirement_object(p_requirement_object_str):
     @return requirement object
     """
     req_object = ''
-    token_list = nltk.word_tokenize(p_requirement_object_str)
-    tag_list = nltk.pos_tag(token_list)
+    tag_list = retrieve_text_tag_list(p_requirement_object_str)
 
     for word, tag in tag_list[1:]:
         if tag == NOUN_SINGULAR_TAG or tag == NOUN_PLURAL_TAG:
@@ -683,8 +994,7 @@ def retrieve_req_proper_noun_list(p_req_str, p_is_noun_split=True):
     is_previous_function_name = False
     is_function_name = False
     function_name_str = ''
-    token_list = nltk.word_tokenize(p_req_str)
-    tag_list = nltk.pos_tag(token_list)
+    tag_list = retrieve_text_tag_list(p_req_str)
     index = 0
     for tag in tag_list:
         previous_tag_list = []
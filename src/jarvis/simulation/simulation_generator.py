@@ -6,6 +6,7 @@ import re
 
 # Modules
 import open_modelica_adapter
+from xml_adapter import StateMachineIndex
 from xml_adapter import XML_DICT_KEY_0_DATA_LIST, XML_DICT_KEY_1_FUNCTION_LIST, XML_DICT_KEY_2_FUN_ELEM_LIST, \
     XML_DICT_KEY_3_FUN_INTF_LIST, XML_DICT_KEY_4_PHY_ELEM_LIST, XML_DICT_KEY_5_PHY_INTF_LIST, \
     XML_DICT_KEY_6_STATE_LIST, XML_DICT_KEY_7_TRANSITION_LIST, XML_DICT_KEY_8_REQUIREMENT_LIST, \
@@ -70,7 +71,8 @@ def simulate_fun_elem_state_machine(fun_elem_str, **kwargs):
 
             new_state_list = {s for s in xml_state_list if s.id in main_fun_elem.allocated_state_list}
 
-            new_transition_list = diagram_util.get_transition_list(new_state_list, xml_transition_list)
+            new_transition_list = diagram_util.get_transition_list(new_state_list, xml_transition_list,
+                                                                   StateMachineIndex.get(**kwargs))
 
             open_modelica_text = open_modelica_adapter.get_state_machine_model(fun_elem_str,
                                                                                new_state_list,
@@ -5,21 +5,23 @@ Open modelica adapter module
 
 # Modules
 import datamodel
+from xml_adapter import StateMachineIndex
 from .util import StateModel
 
 
 def get_state_machine_model(p_fun_elem_name, p_state_list, p_transition_list, **kwargs):
     string_obj = StateModel(p_fun_elem_name)
+    state_machine_index = StateMachineIndex.get(**kwargs)
+    state_id_set = {state.id for state in p_state_list}
+    transition_dict = {transition.id: transition for transition in p_transition_list}
     for state_dest in p_state_list:
+        # A state is initial if it is the destination of a transition from an entry state
         is_initial = False
-        for transition in p_transition_list:
-            if transition.destination == state_dest.id:
-                for state_src in p_state_list:
-                    if transition.source == state_src.id:
-                        if not isinstance(state_src.type, datamodel.BaseType):
-                            is_initial = datamodel.EntryStateLabel in state_src.type.name.lower()
-                        # Else do nothing
-                    # Else do nothing
+        for transition_id in state_machine_index.get_destination_transition_id_list(state_dest.id):
+            transition = transition_dict.get(transition_id)
+            if transition is not None and transition.source in state_id_set and \
+                    state_machine_index.is_entry_state(transition.source):
+                is_initial = True
             # Else do nothing
 
         if datamodel.EntryStateLabel not in state_dest.name.lower():
@@ -12,7 +12,7 @@ from xml_adapter import XML_DICT_KEY_0_DATA_LIST, XML_DICT_KEY_1_FUNCTION_LIST,
     XML_DICT_KEY_13_VIEW_LIST, XML_DICT_KEY_14_TYPE_LIST, XML_DICT_KEY_15_FUN_CONS_LIST, \
     XML_DICT_KEY_16_FUN_PROD_LIST, XML_DICT_KEY_17_ACT_CONS_LIST, XML_DICT_KEY_18_ACT_PROD_LIST
 from jarvis.query import query_object, question_answer
-from tools import Logger
+from tools import Logger, get_topological_order, get_cycle
 
 
 class StateModel:
@@ -135,27 +135,24 @@ class StateModel:
         self.string_algorithm = self.string_algorithm + f'end if;\n'
 
     def create_transition(self, p_transition, **kwargs):
-        xml_state_list = kwargs[XML_DICT_KEY_6_STATE_LIST]
-        for xml_state in xml_state_list:
-            if xml_state.id == p_transition.destination:
-                data_attribute = query_object.query_object_by_name(datamodel.DesignAttributeLabel,
-                                                                   **{XML_DICT_KEY_12_ATTRIBUTE_LIST: kwargs[
-                                                                       XML_DICT_KEY_12_ATTRIBUTE_LIST]})
-                if data_attribute:
-                    for described_item in data_attribute.described_item_list:
-                        if described_item[0] == p_transition.id:
-                            self.string_algorithm = self.string_algorithm + 'if ' + described_item[1] + ' then\n' \
+        xml_state = kwargs[XML_DICT_KEY_6_STATE_LIST].get_by_id(p_transition.destination)
+        if xml_state is not None:
+            data_attribute = query_object.query_object_by_name(datamodel.DesignAttributeLabel,
+                                                               **{XML_DICT_KEY_12_ATTRIBUTE_LIST: kwargs[
+                                                                   XML_DICT_KEY_12_ATTRIBUTE_LIST]})
+            if data_attribute:
+                for described_item in data_attribute.described_item_list:
+                    if described_item[0] == p_transition.id:
+                        self.string_algorithm = self.string_algorithm + 'if ' + described_item[1] + ' then\n' \
+                                    + f'state := state.{xml_state.name};\n' \
+                                    + 'end if;\n'
+                        break
+                    # Else do nothing
+            else:
+                self.string_algorithm = self.string_algorithm + 'if then\n' \
                                         + f'state := state.{xml_state.name};\n' \
                                         + 'end if;\n'
-                            break
-                        # Else do nothing
-                else:
-                    self.string_algorithm = self.string_algorithm + 'if then\n' \
-                                            + f'state := state.{xml_state.name};\n' \
-                                            + 'end if;\n'
-
-                break
-            # Else do nothing
+        # Else do nothing
 
     def get_model(self):
         return self.string_begin \
@@ -168,60 +165,49 @@ class StateModel:
 
 
 def sort_state_function_list(p_function_id_list, **kwargs):
+    """@ingroup open_modelica_adapter
+    @anchor sort_state_function_list
+    Order the functions allocated to a state so that each function comes after the functions producing the
+    predecessors of its produced data. Independent functions are ordered by name. Functions that cannot be ordered
+    because of a cycle between data predecessors are reported and put at the end
+
+    @param[in] p_function_id_list : list of function identifiers
+    @param[in] kwargs : jarvis data structure
+    @return ordered function list
+    """
     xml_function_list = kwargs[XML_DICT_KEY_1_FUNCTION_LIST]
     xml_producer_function_list = kwargs[XML_DICT_KEY_16_FUN_PROD_LIST]
-    state_function_list = []
-
-    for function_id in p_function_id_list:
-        for xml_function in xml_function_list:
-            if xml_function.id == function_id:
-                state_function_list.append(xml_function)
-            # Else do nothing
+    state_function_list = [xml_function_list.get_by_id(function_id) for function_id in p_function_id_list]
+    state_function_list = [state_function for state_function in state_function_list if state_function is not None]
 
     if len(state_function_list) > 1:
-        state_producer_function_list = []
+        function_index_dict = {state_function: index for index, state_function in enumerate(state_function_list)}
+        data_function_index_list_dict = {}
         for state_function in state_function_list:
-            for xml_producer_function in xml_producer_function_list:
-                if xml_producer_function[1].id == state_function.id:
-                    state_producer_function_list.append([xml_producer_function[0], xml_producer_function[1]])
-                # Else do nothing
-
-        sorted_state_producer_function_dict = dict()
-        last_index = 0
-        for state_producer_function in state_producer_function_list:
-            if state_producer_function not in sorted_state_producer_function_dict.values():
-                last_index = last_index + 1
-                current_index = last_index
-                sorted_state_producer_function_dict[current_index] = state_producer_function
-            else:
-                current_index = list(sorted_state_producer_function_dict.keys())[
-                    list(sorted_state_producer_function_dict.values()).index(state_producer_function)]
-
-            for predecessor in state_producer_function[0].predecessor_list:
-                for predecessor_producer_function in state_producer_function_list:
-                    if predecessor_producer_function[0] == predecessor:
-                        if [predecessor_producer_function[0], predecessor_producer_function[1]] not in \
-                                sorted_state_producer_function_dict.values():
-                            current_index = current_index + 1
-                            if last_index > current_index:
-                                for i in range(0, last_index - current_index):
-                                    sorted_state_producer_function_dict[last_index - i + 1] = \
-                                        sorted_state_producer_function_dict[last_index - i]
-                                last_index = last_index + 1
-                            else:
-                                last_index = current_index
-                            sorted_state_producer_function_dict[current_index] = [state_producer_function[0],
-                                                                                  state_producer_function[1]]
-                            sorted_state_producer_function_dict[current_index - 1] = [predecessor_producer_function[0],
-                                                                                      predecessor_producer_function[1]]
-                        # Else do nothing
-                    # Else do nothing
+            for data in xml_producer_function_list.get_flow_list(state_function):
+                data_function_index_list_dict.setdefault(data, []).append(function_index_dict[state_function])
+
+        predecessor_index_list_list = []
+        for index, state_function in enumerate(state_function_list):
+            predecessor_index_list = []
+            for data in xml_producer_function_list.get_flow_list(state_function):
+                for predecessor in data.predecessor_list:
+                    # A function producing both a data and its predecessor does not depend on itself
+                    predecessor_index_list.extend(i for i in data_function_index_list_dict.get(predecessor, ())
+                                                  if i != index)
+            predecessor_index_list_list.append(predecessor_index_list)
+
+        ordered_index_list, cycle_index_list = get_topological_order(
+            predecessor_index_list_list, [state_function.name for state_function in state_function_list])
+
+        if cycle_index_list:
+            cycle_function_name_list = [state_function_list[index].name
+                                        for index in get_cycle(predecessor_index_list_list, cycle_index_list)]
+            Logger.set_warning(__name__, f"Functions cannot be ordered because of the data predecessor cycle: "
+                                         f"{' -> '.join(cycle_function_name_list + cycle_function_name_list[:1])}")
+        # Else do nothing
 
-        # Reconstruct ordered state function list
-        sorted_state_producer_function_dict = sorted(sorted_state_producer_function_dict.items())
-        state_function_list = []
-        for key, value in sorted_state_producer_function_dict:
-            state_function_list.append(value[1])
+        state_function_list = [state_function_list[index] for index in ordered_index_list + cycle_index_list]
     # Else do nothing
 
     return state_function_list
@@ -13,6 +13,7 @@ Defines the different functions and classes used by Jarvis to call Plantuml as a
 @ref get_fun_elem_context_diagram
 - class to handle local PlantUml PicoWeb Server: @ref PlantUmlPicoServer
 - class to encode PlantUml text and get server url as .svg : @ref PlantUmlConnector
+- class to render PlantUml text as .svg with a PlantUml process in pipe mode : @ref PlantUmlPipeRenderer
 - class to encode PlantUml text for state diagram : @ref StateDiagram
 - class to encode PlantUml text for sequence diagram : @ref SequenceDiagram
 - class to encode PlantUml text for object diagram : @ref ObjDiagram
@@ -27,3 +28,4 @@ from .plantuml_adapter import get_phy_elem_decomposition
 from .plantuml_adapter import get_fun_elem_context_diagram
 from .plantuml_connector import PlantUmlPicoServer
 from .plantuml_connector import PlantUmlConnector
+from .plantuml_renderer import PlantUmlPipeRenderer
@@ -5,7 +5,7 @@ Plantuml adapter module
 # Modules
 import datamodel
 from .util import ObjDiagram, StateDiagram, SequenceDiagram
-from tools import Logger
+from tools import Logger, get_topological_order, get_cycle
 
 
 def write_function_child(string_obj, function, input_flow_list, output_flow_list,
@@ -748,7 +748,7 @@ def check_child_allocation(string_obj, main_elem, elem_list, xml_attribute_list)
 
 
 def recursive_decomposition(string_obj, main_elem, elem_list, xml_attribute_list,
-                            first_iter=False):
+                            first_iter=False, collapsed_elem_dict=None):
     """@ingroup plantuml_adapter
     Create PlantUml text for functional elements recursively
     @param[in,out] string_obj current PlantUml text
@@ -756,6 +756,8 @@ def recursive_decomposition(string_obj, main_elem, elem_list, xml_attribute_list
     @param[in] elem_list list of functions/activities
     @param[in] xml_attribute_list xml list of attributes
     @param[in] first_iter
+    @param[in] collapsed_elem_dict dictionary of [hidden functions, flow count, interface count] by collapsed
+    functional element, whose children and functions are summarized (optional)
     @return None
     """
 
@@ -763,20 +765,74 @@ def recursive_decomposition(string_obj, main_elem, elem_list, xml_attribute_list
         string_obj.create_component(main_elem)
         check_child_allocation(string_obj, main_elem, elem_list, xml_attribute_list)
         if main_elem.child_list:
-            recursive_decomposition(string_obj, main_elem, elem_list, xml_attribute_list)
+            recursive_decomposition(string_obj, main_elem, elem_list, xml_attribute_list,
+                                    collapsed_elem_dict=collapsed_elem_dict)
     else:
         for c in main_elem.child_list:
             string_obj.create_component(c)
-            check_child_allocation(string_obj, c, elem_list, xml_attribute_list)
-            if c.child_list:
-                recursive_decomposition(string_obj, c, elem_list, xml_attribute_list)
+            if collapsed_elem_dict and c in collapsed_elem_dict:
+                hidden_function_list, flow_count, interface_count = collapsed_elem_dict[c]
+                string_obj.create_component_summary(c, len(hidden_function_list), flow_count, interface_count)
+            else:
+                check_child_allocation(string_obj, c, elem_list, xml_attribute_list)
+                if c.child_list:
+                    recursive_decomposition(string_obj, c, elem_list, xml_attribute_list,
+                                            collapsed_elem_dict=collapsed_elem_dict)
             string_obj.append_string('}\n')
             string_obj.create_component_attribute(c, xml_attribute_list)
 
 
+def collapse_flows(data_flow_list, interface_list, collapsed_elem_dict):
+    """@ingroup plantuml_adapter
+    Redirect the flows and interfaces of the functions and functional elements hidden within collapsed functional
+    elements to these collapsed functional elements. Flows and interfaces internal to a collapsed functional element
+    are removed.
+    @param[in] data_flow_list concatenated data flows list
+    @param[in] interface_list interfaces list [[functional element, functional element, interface]...], None if not
+    any
+    @param[in] collapsed_elem_dict dictionary of [hidden functions, flow count, interface count] by collapsed
+    functional element
+    @return data flows list, interfaces list
+    """
+    function_name_dict = {}
+    elem_dict = {}
+    for collapsed_elem, (hidden_function_list, _, _) in collapsed_elem_dict.items():
+        for function in hidden_function_list:
+            function_name_dict[function.name.lower()] = collapsed_elem.name.lower()
+
+        elem_list = [collapsed_elem]
+        while elem_list:
+            elem = elem_list.pop()
+            elem_dict[elem] = collapsed_elem
+            elem_list.extend(elem.child_list)
+
+    # Redirected flows and interfaces are kept in order, without duplicates
+    flow_dict = {}
+    for (producer_name, consumer_name), flow_name_list in data_flow_list:
+        producer_name = function_name_dict.get(producer_name, producer_name)
+        consumer_name = function_name_dict.get(consumer_name, consumer_name)
+        if producer_name != consumer_name:
+            for flow_name in flow_name_list:
+                flow_dict.setdefault((producer_name, consumer_name, flow_name), None)
+        # Else flow is internal to a collapsed functional element
+
+    if interface_list:
+        collapsed_interface_dict = {}
+        for first_elem, second_elem, interface in interface_list:
+            first_elem = elem_dict.get(first_elem, first_elem)
+            second_elem = elem_dict.get(second_elem, second_elem)
+            if first_elem != second_elem:
+                collapsed_interface_dict.setdefault((first_elem, second_elem, interface), None)
+            # Else interface is internal to a collapsed functional element
+        interface_list = [list(key) for key in collapsed_interface_dict]
+    # Else do nothing
+
+    return concatenate_flows([list(key) for key in flow_dict]), interface_list
+
+
 def get_fun_elem_decomposition(main_fun_elem, fun_elem_list, allocated_function_list, consumer_list,
                                producer_list, external_function_list, xml_attribute_list,
-                               data_list, fun_inter_list):
+                               data_list, fun_inter_list, collapsed_elem_dict=None):
     """@ingroup plantuml_adapter
     @anchor get_fun_elem_decomposition
     Construct the PlantUml text for the functional element decomposition diagram
@@ -789,6 +845,8 @@ def get_fun_elem_decomposition(main_fun_elem, fun_elem_list, allocated_function_
     @param[in] xml_attribute_list xml list of attributes
     @param[in] data_list data list
     @param[in] fun_inter_list functional interface list
+    @param[in] collapsed_elem_dict dictionary of [hidden functions, flow count, interface count] by collapsed
+    functional element (optional)
     @return PlantUml text of the diagram
     """
 
@@ -824,9 +882,13 @@ def get_fun_elem_decomposition(main_fun_elem, fun_elem_list, allocated_function_
     for function in external_function_not_allocated_list:
         string_obj.create_object(function, xml_attribute_list)
 
+    if collapsed_elem_dict:
+        data_flow_list, interface_list = collapse_flows(data_flow_list, interface_list, collapsed_elem_dict)
+    # Else do nothing
+
     # Write functional element decompo recursively and add allocated functions
     recursive_decomposition(string_obj, main_fun_elem, allocated_function_list, xml_attribute_list,
-                            first_iter=True)
+                            first_iter=True, collapsed_elem_dict=collapsed_elem_dict)
     string_obj.append_string('}\n')
     string_obj.create_component_attribute(main_fun_elem, xml_attribute_list)
 
@@ -940,159 +1002,43 @@ def get_sequence_diagram(function_list, consumer_function_list, producer_functio
     return seq_obj_string.string
 
 
-def get_predecessor_list(data):
-    """@ingroup plantuml_adapter
-    Get the predecessor's list for a Data object
-    @param[in] data data object
-    @return predecessor list
-    """
-
-    predecessor_list = set()
-    if data.predecessor_list:
-        for predecessor in data.predecessor_list:
-            predecessor_list.add(predecessor)
-
-    return predecessor_list
-
-
-def check_sequence(predecessor_list, sequence):
-    """@ingroup plantuml_adapter
-    Check if predecessors of a data are in a sequence
-    @param[in] predecessor_list predecessor list
-    @param[in] sequence sequence
-    @return TRUE (predecessors are in the sequence) or FALSE
-    """
-
-    check = False
-    if predecessor_list == set():
-        check = None
-        return check
-
-    pred_set = set()
-    seq_set = set()
-    for pred in predecessor_list:
-        pred_set.add(pred.name)
-    for elem in sequence:
-        seq_set.add(elem[2].name)
-
-    if pred_set.issubset(seq_set):
-        check = True
-        return check
-
-    return check
-
-
-def clean_predecessor_list(message_object_list):
-    """@ingroup plantuml_adapter
-    Delete predecessor if not in the message's list
-    @param[in] message_object_list TBD
-    @return updated message list
-    """
-
-    for message in message_object_list:
-        pred_list = get_predecessor_list(message[2])
-        for pred in pred_list:
-            if not any(pred in s for s in message_object_list):
-                message[2].predecessor_list.remove(pred)
-
-    return message_object_list
-
-
-def get_sequence(message, message_object_list, sequence_list, sequence=None, index=None):
-    """@ingroup plantuml_adapter
-    Return a sequence for a given message
-    @param[in] message TBD
-    @param[in] message_object_list TBD
-    @param[in] sequence_list TBD
-    @param[in] sequence TBD
-    @param[in] index TBD
-    @return sequence
-    """
-    if not sequence:
-        sequence = []
-        index = 0
-    if message not in sequence and not any(message in s for s in sequence_list) is True:
-        message[3] = True
-        sequence.insert(index, message)
-        index += 1
-        for mess in message_object_list:
-            if message[2] in mess[2].predecessor_list:
-                get_sequence(mess, message_object_list, sequence_list, sequence, index)
-
-    return sequence
-
-
-def get_sequences(message_object_list):
+def get_sequence_list(message_object_list):
     """@ingroup plantuml_adapter
-    Group all sequences into a sequence list
-    @param[in] message_object_list
+    Order messages so that each message comes after the messages of its data predecessors. Predecessors that are not
+    exchanged within the messages are ignored. Messages that cannot be ordered because of a cycle between data
+    predecessors are reported and put at the end
+    @param[in] message_object_list list of messages [producer name, consumer name, data, is ordered]
     @return sequence list
     """
+    message_index_list_dict = {}
+    for index, message in enumerate(message_object_list):
+        message_index_list_dict.setdefault(message[2], []).append(index)
 
-    sequence_list = []
+    predecessor_index_list_list = []
     for message in message_object_list:
-        if not message[2].predecessor_list:
-            sequence = get_sequence(message, message_object_list, sequence_list)
-            sequence_list.append(sequence)
-
-    return sequence_list
+        predecessor_index_list = []
+        for predecessor in message[2].predecessor_list:
+            predecessor_index_list.extend(message_index_list_dict.get(predecessor, ()))
+        predecessor_index_list_list.append(predecessor_index_list)
 
+    # Messages come from sets: independent messages are ordered by data, producer and consumer names
+    ordered_index_list, cycle_index_list = get_topological_order(predecessor_index_list_list,
+                                                                 [(message[2].name, message[0], message[1])
+                                                                  for message in message_object_list])
 
-def post_check_sequence(sequence_list):
-    """@ingroup plantuml_adapter
-    Check if message isn't missing in sequence, insert it at the good place and loop if not
-    well ordered (predecessor after each one)
-    @param[in] sequence_list TBD
-    @return sequence list ordered
-    """
-
-    for (idx, i) in enumerate(sequence_list):
-        pred = i[2].predecessor_list
-        if check_sequence(pred, sequence_list[:idx]) is True:
-            pass
-        elif check_sequence(pred, sequence_list[:idx]) is False:
-            for (index, elem) in enumerate(sequence_list.copy()):
-                curr_pred = elem[2].predecessor_list
-                if check_sequence(curr_pred, sequence_list[:index]) is True:
-                    sequence_list.remove(i)
-                    sequence_list.insert(index + 1, i)
-                    index += 1
-                else:
-                    continue
-        elif check_sequence(pred, sequence_list[:idx]) is None:
-            pass
-        idx += 1
-
-    for (new_idx, message) in enumerate(sequence_list):
-        new_pred = message[2].predecessor_list
-        if check_sequence(new_pred, sequence_list[:new_idx]) is False:
-            post_check_sequence(sequence_list)
-
-    return sequence_list
-
-
-def get_sequence_list(message_object_list):
-    """@ingroup plantuml_adapter
-    Call for sequences then clean_up and post_check
-    @param[in] message_object_list TBD
-    @return sequence list
-    """
-    sequence_list = get_sequences(message_object_list)
-
-    sequence_list = sorted(sequence_list, key=lambda x: len(x), reverse=True)
-    # Could be possible to implement this part within post_check_sequence()
-    for (index, i) in enumerate(sequence_list):
-        main_list = sequence_list[0]
-        if index > 0:
-            start = 0
-            for j in i.copy():
-                if not j[2].predecessor_list:
-                    i.remove(j)
-                    main_list.insert(start, j)
-                    start += 1
-
-    sequence_list = [item for sub in sequence_list for item in sub]
-    sequence_list = post_check_sequence(sequence_list)
+    sequence_list = []
+    for index in ordered_index_list:
+        message_object_list[index][3] = True
+        sequence_list.append(message_object_list[index])
+
+    if cycle_index_list:
+        cycle_data_name_list = [message_object_list[index][2].name
+                                for index in get_cycle(predecessor_index_list_list, cycle_index_list)]
+        Logger.set_warning(__name__, f"Messages cannot be ordered because of the data predecessor cycle: "
+                                     f"{' -> '.join(cycle_data_name_list + cycle_data_name_list[:1])}")
+        for index in cycle_index_list:
+            sequence_list.append(message_object_list[index])
+    # Else do nothing
 
     return sequence_list
 
@@ -1114,7 +1060,6 @@ def order_list(message_list, data_list):
             if i[2] == data.name:
                 message_object_list.append([i[0], i[1], data, False])
 
-    message_object_list = clean_predecessor_list(message_object_list)
     ordered_message_object_list = get_sequence_list(message_object_list)
 
     # Add index for each item within the list
@@ -1274,17 +1219,27 @@ def get_state_machine_diagram(xml_state_list, xml_transition_list, fun_elem_list
     """
 
     state_obj_string = StateDiagram()
-    objects_conditions_list = get_objects_conditions_list(xml_state_list, xml_transition_list)
+    objects_conditions_dict = {}
+    for object_conditions in get_objects_conditions_list(xml_state_list, xml_transition_list):
+        objects_conditions_dict.setdefault(object_conditions[0].id, []).append(object_conditions)
+
+    # Functional elements without parent by allocated state
+    fun_elem_dict = {}
+    if fun_elem_list:
+        for fun_elem in fun_elem_list:
+            if fun_elem.parent is None:
+                for state_id in dict.fromkeys(fun_elem.allocated_state_list):
+                    fun_elem_dict.setdefault(state_id, []).append(fun_elem)
+            # Else do nothing
+    # Else do nothing
+
     already_added_state_id_list = []
     for state in xml_state_list:
         if not state.parent and state.child_list:
             check = False
-            if fun_elem_list:
-                for fun_elem in fun_elem_list:
-                    if state.id in fun_elem.allocated_state_list:
-                        if fun_elem.parent is None:
-                            check = True
-                            state_obj_string.create_state(fun_elem, True)
+            for fun_elem in fun_elem_dict.get(state.id, []):
+                check = True
+                state_obj_string.create_state(fun_elem, True)
 
             write_composed_state(state_obj_string, state, already_added_state_id_list)
             if check:
@@ -1293,18 +1248,15 @@ def get_state_machine_diagram(xml_state_list, xml_transition_list, fun_elem_list
     for state in xml_state_list:
         if state.id not in already_added_state_id_list:
             check = False
-            if fun_elem_list:
-                for fun_elem in fun_elem_list:
-                    if state.id in fun_elem.allocated_state_list:
-                        if fun_elem.parent is None:
-                            check = True
-                            state_obj_string.create_state(fun_elem, True)
+            for fun_elem in fun_elem_dict.get(state.id, []):
+                check = True
+                state_obj_string.create_state(fun_elem, True)
             write_state(state_obj_string, state, already_added_state_id_list)
             if check:
                 state_obj_string.append_string('}\n')
 
     for state in xml_state_list:
-        write_transition(state_obj_string, state, objects_conditions_list)
+        write_transition(state_obj_string, state, objects_conditions_dict)
 
     return state_obj_string.string
 
@@ -1318,33 +1270,21 @@ def get_objects_conditions_list(xml_state_list, xml_transition_list):
     """
 
     objects_conditions_list = []
-    formatted_transition_list = []
-    # Create transition's list [name, src_id, dest_id, [conditions]]
-    for transition in xml_transition_list:
-        formatted_transition_list.append([transition.name, transition.source, transition.destination,
-                                          transition.condition_list])
+    state_dict = {state.id: state for state in xml_state_list}
 
     # Create transition's list [src_state_obj, dest_state_obj, [conditions]]
-    for formatted_transition in formatted_transition_list:
-        src_state_obj = None
-        dest_state_obj = None
-        for state in xml_state_list:
-            if formatted_transition[1] == state.id:
-                src_state_obj = state
-            # Else do nothing
-
-            if formatted_transition[2] == state.id:
-                dest_state_obj = state
-            # Else do nothing
+    for transition in xml_transition_list:
+        src_state_obj = state_dict.get(transition.source)
+        dest_state_obj = state_dict.get(transition.destination)
 
         if src_state_obj is not None and dest_state_obj is not None:
-            objects_conditions_list.append([src_state_obj, dest_state_obj, formatted_transition[3]])
+            objects_conditions_list.append([src_state_obj, dest_state_obj, transition.condition_list])
         elif src_state_obj is None:
             Logger.set_warning(__name__,
-                               f'{formatted_transition[0]} is not displayed because it has an unknown source state')
+                               f'{transition.name} is not displayed because it has an unknown source state')
         else:
             Logger.set_warning(__name__,
-                               f'{formatted_transition[0]} is not displayed because it has unknown destination state')
+                               f'{transition.name} is not displayed because it has unknown destination state')
 
     return objects_conditions_list
 
@@ -1385,16 +1325,14 @@ def write_composed_state(state_obj_string, state, new, count=0):
     state_obj_string.append_string("}\n" * count)
 
 
-def write_transition(state_obj_string, state, objects_conditions_list):
+def write_transition(state_obj_string, state, objects_conditions_dict):
     """@ingroup plantuml_adapter
     Returns simple transition string for PlantUml text
     @param[in, out] state_obj_string TBD
     @param[in] state TBD
-    @param[in] new TBD
-    @param[in, out] objects_conditions_list TBD
+    @param[in, out] objects_conditions_dict conditions list by source state identifier, see
+    @ref get_objects_conditions_list
     @return None
     """
-    for object_conditions in objects_conditions_list.copy():
-        if object_conditions[0].id == state.id:
-            state_obj_string.create_transition([object_conditions])
-            objects_conditions_list.remove(object_conditions)
+    for object_conditions in objects_conditions_dict.pop(state.id, []):
+        state_obj_string.create_transition([object_conditions])
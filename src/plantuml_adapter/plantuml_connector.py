@@ -4,14 +4,23 @@ Plantuml adapter module
 # Libraries
 import os
 import re
+import json
+import time
+import hashlib
 import pathlib
+import datetime
+import threading
 import subprocess
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.request import urlopen
 from urllib.error import URLError, HTTPError
 from plantuml import PlantUML
 
 # Modules
 from tools import Logger
+from .plantuml_renderer import PlantUmlPipeRenderer
 
 
 class PlantUmlPicoServer:
@@ -22,7 +31,19 @@ class PlantUmlPicoServer:
 
     If . jar, get it, check if PicoWeb is running, if not start new process else default url
     to online PlantUml server
+
+    The .jar is looked for at creation but the server is only resolved at first diagram, see @ref resolve. The .jar
+    version check is kept on disk per .jar hash, so that java is not called again for the same .jar.
     """
+    # File where .jar version checks are kept, per .jar hash
+    version_cache_file = os.path.join(os.path.expanduser('~'), '.jarvis4se', 'plantuml_version.json')
+    # Maximum duration in seconds of a probe of the local PlantUml PicoWeb Server or of the latest release
+    probe_timeout = 1
+    # Maximum duration in seconds to wait for the local PlantUml PicoWeb Server to be ready once started
+    ready_timeout = 10
+    # Maximum duration in seconds to get the .jar version
+    version_timeout = 30
+
     def __init__(self):
         """
         @var plantuml_jar_path
@@ -33,15 +54,48 @@ class PlantUmlPicoServer:
 
         @var version_cmd
         JAVA command to retrieve the PlantUml jar file version
+
+        @var process
+        Local PlantUml PicoWeb Server process, None if not started by this instance
+
+        @var is_resolved
+        Indicates if the server has been resolved (True) or not (False)
+
+        @var resolve_lock
+        Lock ensuring that the server is resolved only once
         """
 
         self.plantuml_jar_path = None
+        self.url = None
+        self.version_cmd = None
+        self.process = None
+        self.is_resolved = False
+        self.resolve_lock = threading.Lock()
 
+        # Looking for the .jar is immediate, java and network are only called at first diagram
         jar_file = self.get_jar()
-        if not jar_file:
+        if jar_file:
+            self.plantuml_jar_path = str(pathlib.Path(f'./{jar_file}'))
+        # Else do nothing
+
+    def resolve(self):
+        """ Resolve the server at first call: if .jar, check its version, then start the local PlantUml PicoWeb
+        Server unless already running, otherwise use the online PlantUml server
+        @return None
+        """
+        with self.resolve_lock:
+            if not self.is_resolved:
+                self.resolve_server()
+                self.is_resolved = True
+            # Else do nothing
+
+    def resolve_server(self):
+        """ Resolve the server, see @ref resolve
+        @return None
+        """
+        if self.plantuml_jar_path is None:
             self.url = 'http://www.plantuml.com/plantuml/svg/'
         else:
-            self.plantuml_jar_path = str(pathlib.Path(f'./{jar_file}'))
             self.version_cmd = ['java', '-jar', self.plantuml_jar_path, '-version']
             pico_cmd = ['java', '-DPLANTUML_LIMIT_SIZE=20000', '-jar', self.plantuml_jar_path,
                         '-picoweb']
@@ -50,19 +104,45 @@ class PlantUmlPicoServer:
             # Default localhost pico server
             self.url = "http://127.0.0.1:8080/plantuml/svg/"
             # Check if pico is running
-            check_pico = False
-            try:
-                with urlopen(f"{self.url}"):
-                    pass
-            except HTTPError:
-                pass
-            except URLError:
+            if not self.is_ready():
+                try:
+                    self.process = subprocess.Popen(pico_cmd)
+                except OSError as ex:
+                    Logger.set_warning(__name__, f"Unable to start PlantUml PicoWeb Server: {str(ex)}")
+                else:
+                    self.wait_ready()
+
+    def is_ready(self):
+        """ Probe the local PlantUml PicoWeb Server, bounded by @ref probe_timeout
+        @return True if the server answers, else False
+        """
+        check_pico = False
+        try:
+            with urlopen(f"{self.url}", timeout=self.probe_timeout):
                 pass
-            else:
-                check_pico = True
+        except HTTPError:
+            # Server answers, even if with an error for an empty diagram
+            check_pico = True
+        except (URLError, OSError):
+            pass
+        else:
+            check_pico = True
 
-            if not check_pico:
-                self.process = subprocess.Popen(pico_cmd)
+        return check_pico
+
+    def wait_ready(self):
+        """ Wait for the local PlantUml PicoWeb Server to be ready, bounded by @ref ready_timeout
+        @return None
+        """
+        ready_time = time.monotonic() + self.ready_timeout
+        is_ready = self.is_ready()
+        while not is_ready and time.monotonic() < ready_time and self.process.poll() is None:
+            time.sleep(0.2)
+            is_ready = self.is_ready()
+
+        if not is_ready:
+            Logger.set_warning(__name__, f"PlantUml PicoWeb Server not ready after {self.ready_timeout}s")
+        # Else do nothing
 
     @classmethod
     def get_jar(cls):
@@ -91,19 +171,42 @@ class PlantUmlPicoServer:
         return jar_list.pop(0)
 
     def check_version(self):
-        """ Get .jar version and check with latest release
+        """ Get .jar version and check with latest release. The .jar version is only retrieved once per .jar and the
+        latest release once a day
 
         @return None
         """
+        version_cache_dict = self.read_version_cache()
+        jar_hash = self.get_jar_hash(self.plantuml_jar_path)
+        jar_version_dict = version_cache_dict.setdefault(jar_hash, {})
+        today = datetime.date.today().isoformat()
+        is_modified = False
 
-        jar_version = subprocess.run(
-            self.version_cmd, capture_output=True, encoding="utf-8").stdout[17:26].strip()
-        github_url = "https://github.com/plantuml/plantuml/releases/latest"
+        jar_version = jar_version_dict.get('version')
+        if jar_version is None:
+            try:
+                jar_version = subprocess.run(self.version_cmd, capture_output=True, encoding="utf-8",
+                                             timeout=self.version_timeout).stdout[17:26].strip()
+            except (OSError, subprocess.SubprocessError) as ex:
+                Logger.set_info(__name__, f"Not able to get plantuml.jar version: {str(ex)}")
+            else:
+                jar_version_dict['version'] = jar_version
+                is_modified = True
+        # Else do nothing
 
-        try:
-            with urlopen(f"{github_url}") as rep:
-                release_ver = str(rep.geturl())[51:]
+        if jar_version_dict.get('check_date') != today:
+            jar_version_dict['release'] = self.get_latest_release()
+            jar_version_dict['check_date'] = today
+            is_modified = True
+        # Else do nothing
+
+        if is_modified:
+            self.write_version_cache(version_cache_dict)
+        # Else do nothing
 
+        release_ver = jar_version_dict['release']
+        github_url = "https://github.com/plantuml/plantuml/releases/latest"
+        try:
             if int(release_ver[0]) > int(jar_version[0]) or \
                     int(release_ver[2:6]) > int(jar_version[2:6]) or \
                     int(release_ver[7:len(release_ver)]) > int(jar_version[7:len(jar_version)]):
@@ -113,32 +216,133 @@ class PlantUmlPicoServer:
             Logger.set_info(__name__,
                            "Not able to check plantuml.jar version.")
 
+    def get_latest_release(self):
+        """ Get the latest PlantUml release, bounded by @ref probe_timeout
+
+        @return latest release version, None if not available
+        """
+        github_url = "https://github.com/plantuml/plantuml/releases/latest"
+        try:
+            with urlopen(f"{github_url}", timeout=self.probe_timeout) as rep:
+                release_ver = str(rep.geturl())[51:]
+        except (URLError, OSError):
+            release_ver = None
+
+        return release_ver
+
+    @staticmethod
+    def get_jar_hash(p_jar_path):
+        """ Get the content hash of a .jar
+        @param[in] p_jar_path : .jar filepath
+        @return hexadecimal hash
+        """
+        jar_hash = hashlib.sha1()
+        with open(p_jar_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                jar_hash.update(chunk)
+
+        return jar_hash.hexdigest()
+
+    @classmethod
+    def read_version_cache(cls):
+        """ Read the .jar version checks kept on disk
+        @return dictionary of version checks by .jar hash
+        """
+        try:
+            with open(cls.version_cache_file, 'r', encoding='utf-8') as file:
+                version_cache_dict = json.load(file)
+        except (OSError, ValueError):
+            version_cache_dict = {}
+
+        return version_cache_dict
+
+    @classmethod
+    def write_version_cache(cls, p_version_cache_dict):
+        """ Write the .jar version checks on disk
+        @param[in] p_version_cache_dict : dictionary of version checks by .jar hash
+        @return None
+        """
+        try:
+            os.makedirs(os.path.dirname(cls.version_cache_file), exist_ok=True)
+            with open(cls.version_cache_file, 'w', encoding='utf-8') as file:
+                json.dump(p_version_cache_dict, file)
+        except OSError as ex:
+            Logger.set_debug(__name__, f"Unable to write {cls.version_cache_file}: {str(ex)}")
+
 
 class PlantUmlConnector(PlantUmlPicoServer):
     """@ingroup plantuml_adapter
     @anchor PlantUmlConnector
     Class to encode PlantUml text and get server url as .svg
+
+    Diagrams are downloaded from the PlantUml server through a single HTTP session, so that connections are kept
+    alive and shared between concurrent renderings. Requests are bounded by @ref request_timeout and retried on
+    connection errors and server errors.
     """
+    # Maximum durations in seconds to connect to the PlantUml server and to receive the diagram
+    request_timeout = (5, 60)
+    # Maximum number of retries of a diagram request
+    request_retry_count = 3
+    # Maximum number of connections kept alive per PlantUml server
+    request_pool_size = 8
+
     def __init__(self):
         """
         @var server
         PlantUml server
+
+        @var renderer
+        PlantUml process rendering diagrams in pipe mode, None if not any .jar found
+
+        @var session
+        HTTP session downloading the diagrams from the PlantUml server
         """
 
-        # Init PicoWeb server from PlantUMLPicoServer
-        # If .jar found or default online PlantUml, send it to PlantUml for encoding and HTTP handling
+        # PicoWeb server from PlantUMLPicoServer is only resolved at first diagram
         super().__init__()
+        self.server = None
+        self.renderer = None
+        self.session = self.get_session()
+
+    @classmethod
+    def get_session(cls):
+        """ Get an HTTP session with a pool of connections and retries with exponential backoff
+        @return HTTP session
+        """
+        retry = Retry(total=cls.request_retry_count,
+                      backoff_factor=0.5,
+                      status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=frozenset(['GET']))
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=cls.request_pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        return session
+
+    def resolve_server(self):
+        """ Resolve the server, see @ref PlantUmlPicoServer.resolve, then prepare PlantUml encoding and rendering
+        @return None
+        """
+        super().resolve_server()
+        # If .jar found or default online PlantUml, send it to PlantUml for encoding and HTTP handling
         # PlantUml has encoding and handling errors
         self.server = PlantUML(url=self.url,
                                basic_auth={},
                                form_auth={}, http_opts={}, request_opts={})
 
-    def get_diagram_url(self, string, from_diagram_cell=False):
-        """ Generate .svg from PlantUml text using PlantUml default server or PlantUml .jar PicoWeb
+        # PlantUml process is only started at first rendering
+        if self.plantuml_jar_path is not None:
+            self.renderer = PlantUmlPipeRenderer(self.plantuml_jar_path)
+        # Else do nothing
+
+    @staticmethod
+    def get_full_string(string, from_diagram_cell=False):
+        """ Get the full PlantUml text of a diagram
         @param[in] string PlantUml text
         @param[in] from_diagram_cell indicates if PlantUml text is coming from a notebook diagram cell
         (TRUE) or not (FALSE)
-        @return diagram url
+        @return PlantUml text, from @startuml to @enduml
         """
         if not from_diagram_cell:
             full_string = "@startuml\nskin rose\nskinparam NoteBackgroundColor PapayaWhip\n" \
@@ -146,6 +350,18 @@ class PlantUmlConnector(PlantUmlPicoServer):
         else:
             full_string = string
 
+        return full_string
+
+    def get_diagram_url(self, string, from_diagram_cell=False):
+        """ Generate .svg from PlantUml text using PlantUml default server or PlantUml .jar PicoWeb
+        @param[in] string PlantUml text
+        @param[in] from_diagram_cell indicates if PlantUml text is coming from a notebook diagram cell
+        (TRUE) or not (FALSE)
+        @return diagram url
+        """
+        self.resolve()
+        full_string = self.get_full_string(string, from_diagram_cell)
+
         if len(string) > 15000 and self.plantuml_jar_path is None:
             Logger.set_warning(__name__,
                               f"Diagram is too large to be display with PlantUml Online Server, "
@@ -153,3 +369,31 @@ class PlantUmlConnector(PlantUmlPicoServer):
             return None
 
         return self.server.get_url(full_string)
+
+    def get_diagram_svg(self, string, from_diagram_cell=False):
+        """ Render PlantUml text as .svg, with the PlantUml .jar in pipe mode if found, otherwise with the PlantUml
+        default server
+        @param[in] string PlantUml text
+        @param[in] from_diagram_cell indicates if PlantUml text is coming from a notebook diagram cell
+        (TRUE) or not (FALSE)
+        @return .svg content, None if the diagram cannot be rendered
+        """
+        self.resolve()
+        svg = None
+        if self.renderer is not None:
+            svg = self.renderer.render(self.get_full_string(string, from_diagram_cell))
+        # Else do nothing
+
+        if svg is None:
+            url = self.get_diagram_url(string, from_diagram_cell)
+            if url:
+                try:
+                    response = self.session.get(url, timeout=self.request_timeout)
+                    response.raise_for_status()
+                    svg = response.content
+                except requests.RequestException as ex:
+                    Logger.set_error(__name__, f"Unable to get the diagram from {url}: {str(ex)}")
+            # Else do nothing
+        # Else do nothing
+
+        return svg
@@ -0,0 +1,163 @@
+"""@defgroup plantuml_adapter
+Plantuml adapter module
+"""
+# Libraries
+import queue
+import atexit
+import threading
+import subprocess
+
+# Modules
+from tools import Logger
+
+# Constants
+PIPE_DELIMITER = "__JARVIS_PLANTUML_END__"
+
+
+class PlantUmlPipeRenderer:
+    """@ingroup plantuml_adapter
+    @anchor PlantUmlPipeRenderer
+    Class that renders PlantUml texts as .svg with a single PlantUml process running in pipe mode
+    (https://plantuml.com/en/command-line)
+
+    The PlantUml process is started at first rendering and kept alive: diagrams are streamed through its standard
+    input and output without any HTTP encoding, server round trip or size limit of the url. The process is started
+    again if it stops or does not answer within the timeout.
+    """
+
+    def __init__(self, p_jar_path, p_timeout=60, p_cmd=None):
+        """
+        @var cmd
+        Command starting the PlantUml process in pipe mode
+
+        @var timeout
+        Maximum duration in seconds to render a diagram
+
+        @var process
+        PlantUml process, None if not started
+
+        @var output_queue
+        Queue of the lines written by the PlantUml process on its standard output
+
+        @var lock
+        Lock ensuring that a single diagram is streamed at a time
+
+        @var is_available
+        Indicates if the PlantUml process can be started (True) or not (False)
+        """
+        if p_cmd is None:
+            self.cmd = ['java', '-DPLANTUML_LIMIT_SIZE=20000', '-Djava.awt.headless=true', '-jar', p_jar_path,
+                        '-pipe', '-tsvg', '-charset', 'UTF-8', '-pipedelimitor', PIPE_DELIMITER]
+        else:
+            self.cmd = p_cmd
+        self.timeout = p_timeout
+        self.process = None
+        self.output_queue = None
+        self.lock = threading.Lock()
+        self.is_available = True
+
+        atexit.register(self.close)
+
+    def start(self):
+        """Start the PlantUml process unless already running
+        @return None
+        """
+        if self.process is None or self.process.poll() is not None:
+            Logger.set_debug(__name__, f"Starting PlantUml process: {' '.join(self.cmd)}")
+            self.process = subprocess.Popen(self.cmd,
+                                            stdin=subprocess.PIPE,
+                                            stdout=subprocess.PIPE,
+                                            stderr=subprocess.DEVNULL)
+            # Standard output is read by a thread so that the rendering can be bounded by the timeout
+            self.output_queue = queue.Queue()
+            threading.Thread(target=self.read_output,
+                             args=(self.process.stdout, self.output_queue),
+                             daemon=True).start()
+        # Else do nothing
+
+    @staticmethod
+    def read_output(p_stdout, p_output_queue):
+        """Forward the lines of the PlantUml process standard output to a queue until the process stops
+        @param[in] p_stdout : standard output of the PlantUml process
+        @param[in] p_output_queue : queue of the output lines, None is queued when the process stops
+        @return None
+        """
+        for line in iter(p_stdout.readline, b''):
+            p_output_queue.put(line)
+        p_stdout.close()
+        p_output_queue.put(None)
+
+    def render(self, p_plantuml_text):
+        """Render a PlantUml text as .svg
+        @param[in] p_plantuml_text : full PlantUml text, from @startuml to @enduml
+        @return .svg content, None if the diagram cannot be rendered
+        """
+        with self.lock:
+            if self.is_available:
+                try:
+                    self.start()
+                except OSError as ex:
+                    Logger.set_error(__name__, f"Unable to start PlantUml process: {str(ex)}")
+                    self.is_available = False
+            # Else do nothing
+
+            if not self.is_available:
+                return None
+            # Else do nothing
+
+            try:
+                self.process.stdin.write(p_plantuml_text.encode('utf-8') + b'\n')
+                self.process.stdin.flush()
+
+                # PlantUml writes the delimiter right after the .svg, that does not end with a new line: the
+                # delimiter ends the last .svg line
+                delimiter = PIPE_DELIMITER.encode('utf-8')
+                svg_line_list = []
+                line = self.output_queue.get(timeout=self.timeout)
+                while line is not None and not line.rstrip().endswith(delimiter):
+                    svg_line_list.append(line)
+                    line = self.output_queue.get(timeout=self.timeout)
+
+                if line is not None:
+                    svg_line_list.append(line.rstrip()[:-len(delimiter)])
+                # Else do nothing
+
+                if line is None:
+                    Logger.set_error(__name__, "PlantUml process stopped while rendering the diagram")
+                    svg = None
+                else:
+                    svg = b''.join(svg_line_list).strip()
+            except queue.Empty:
+                Logger.set_error(__name__, f"PlantUml process did not render the diagram within {self.timeout}s")
+                self.stop()
+                svg = None
+            except OSError as ex:
+                Logger.set_error(__name__, f"Unable to render the diagram with PlantUml process: {str(ex)}")
+                self.stop()
+                svg = None
+
+        return svg
+
+    def stop(self):
+        """Stop the PlantUml process if running
+        @return None
+        """
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.kill()
+                self.process.wait()
+            # Else do nothing
+            # Standard output is closed by the reading thread at end of stream
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process = None
+        # Else do nothing
+
+    def close(self):
+        """Stop the PlantUml process, called at exit
+        @return None
+        """
+        with self.lock:
+            self.stop()
@@ -267,6 +267,18 @@ class ObjDiagram:
         self.append_string("'id: ", component.id, '\ncomponent "', component.name, '" ', 'as ',
                            component_ref, ' <<', component_type_str, '>>{\n')
 
+    def create_component_summary(self, component, function_count, flow_count, interface_count):
+        """Update the PlantUml text for the summary of a collapsed component
+        @param[in] component component
+        @param[in] function_count number of functions within the component
+        @param[in] flow_count number of flows within the component
+        @param[in] interface_count number of interfaces within the component
+        @return None
+        """
+        component_ref = normalize_element_reference(component.name)
+        self.append_string('object "functions: ', str(function_count), ', flows: ', str(flow_count),
+                           ', interfaces: ', str(interface_count), '" as ', component_ref, '_summary <<Collapsed>>\n')
+
     def create_output_flow(self, output_flow_list):
         """Update the PlantUml text for output flows list
         @param[in] output_flow_list output flows list
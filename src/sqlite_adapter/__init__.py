@@ -0,0 +1,4 @@
+""" @defgroup sqlite_adapter
+Module for 3SE sqlite storage
+"""
+from .sqlite_storage import SqliteStorage3SE
@@ -0,0 +1,11 @@
+from setuptools import setup
+
+setup(name='sqlite_adapter',
+      version='0.1',
+      description='3SE sqlite adapter',
+      url='',
+      author='',
+      author_email='',
+      license='MIT',
+      packages=['sqlite_adapter'],
+      zip_safe=False)
@@ -0,0 +1,398 @@
+"""@defgroup sqlite_adapter
+Module for 3SE sqlite storage
+"""
+# Libraries
+import os
+import sqlite3
+from lxml import etree
+
+# Modules
+from tools import Logger
+
+# Constants
+# XML tags of the objects, one table per tag, in the order of the XML file
+OBJECT_TAG_LIST = ['activity', 'information', 'function', 'data', 'state', 'transition', 'functionalElement',
+                   'functionalInterface', 'physicalElement', 'physicalInterface', 'view', 'attribute',
+                   'requirement', 'goal', 'type']
+# XML tags of the flow relationships
+FLOW_TAG_LIST = ['consumer', 'producer', 'predecessor']
+
+
+class SqliteStorage3SE:
+    """@ingroup sqlite_adapter
+    @anchor SqliteStorage3SE
+    3SE sqlite storage
+
+    Stores a 3SE model within a SQLite file, with:
+    - one table per object tag, holding the XML element of each object together with its id, name, alias and type
+    - relationship tables derived from the XML elements: child (parent/child), flow (consumers, producers and
+    predecessors), allocation (allocated and exposed objects), described_item (attributes) and view_item (views)
+    - the XML document without its objects, so that the XML file is rebuilt as imported, with the content hash of
+    the XML file the stored model matches (see @ref get_model_hash)
+
+    Objects are written and deleted incrementally, each call being a single transaction. Relationships are queried
+    through indexes, without loading the model.
+    """
+
+    def __init__(self, p_db_file):
+        """@var file
+        SQLite file name
+
+        @var connection
+        SQLite connection
+        """
+        self.file = p_db_file
+        self.connection = sqlite3.connect(p_db_file)
+        self.create_schema()
+
+    def close(self):
+        """Close the SQLite connection
+        @return None
+        """
+        self.connection.close()
+
+    def create_schema(self):
+        """Create the tables and indexes unless already created
+        @return None
+        """
+        with self.connection:
+            for tag in OBJECT_TAG_LIST:
+                self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{tag}" '
+                                        f'(id TEXT PRIMARY KEY, name TEXT, alias TEXT, type TEXT, '
+                                        f'position INTEGER, parent TEXT, xml TEXT)')
+                self.connection.execute(f'CREATE INDEX IF NOT EXISTS "{tag}_name" ON "{tag}" (name)')
+                self.connection.execute(f'CREATE INDEX IF NOT EXISTS "{tag}_alias" ON "{tag}" (alias)')
+
+            self.connection.executescript('''
+                CREATE TABLE IF NOT EXISTS document (xml TEXT, hash TEXT);
+                CREATE TABLE IF NOT EXISTS child (parent_id TEXT, child_id TEXT);
+                CREATE INDEX IF NOT EXISTS child_parent ON child (parent_id);
+                CREATE INDEX IF NOT EXISTS child_child ON child (child_id);
+                CREATE TABLE IF NOT EXISTS flow (flow_id TEXT, element_id TEXT, relationship TEXT);
+                CREATE INDEX IF NOT EXISTS flow_flow ON flow (flow_id);
+                CREATE INDEX IF NOT EXISTS flow_element ON flow (element_id);
+                CREATE TABLE IF NOT EXISTS allocation (object_id TEXT, allocated_id TEXT, tag TEXT);
+                CREATE INDEX IF NOT EXISTS allocation_object ON allocation (object_id);
+                CREATE INDEX IF NOT EXISTS allocation_allocated ON allocation (allocated_id);
+                CREATE TABLE IF NOT EXISTS described_item (attribute_id TEXT, item_id TEXT, value TEXT);
+                CREATE INDEX IF NOT EXISTS described_item_attribute ON described_item (attribute_id);
+                CREATE INDEX IF NOT EXISTS described_item_item ON described_item (item_id);
+                CREATE TABLE IF NOT EXISTS view_item (view_id TEXT, item_id TEXT);
+                CREATE INDEX IF NOT EXISTS view_item_view ON view_item (view_id);
+                CREATE INDEX IF NOT EXISTS view_item_item ON view_item (item_id);
+            ''')
+
+            # SQLite files created before the content hash was stored
+            column_list = [row[1] for row in self.connection.execute('PRAGMA table_info(document)')]
+            if 'hash' not in column_list:
+                self.connection.execute('ALTER TABLE document ADD COLUMN hash TEXT')
+            # Else do nothing
+
+    def import_root(self, p_root, p_model_hash=None):
+        """Replace the stored model by an XML elements tree
+        @param[in] p_root : XML root object
+        @param[in] p_model_hash : content hash of the XML file the XML elements tree is parsed from, None if unknown
+        @return None
+        """
+        document = etree.Element(p_root.tag, p_root.attrib)
+        object_row_dict = {tag: [] for tag in OBJECT_TAG_LIST}
+        elem_list = []
+        for arch in p_root:
+            arch_copy = etree.SubElement(document, arch.tag, arch.attrib)
+            for list_elem in arch:
+                list_copy = etree.SubElement(arch_copy, list_elem.tag, list_elem.attrib)
+                for elem in list_elem:
+                    if elem.tag in object_row_dict and elem.get('id'):
+                        object_row_dict[elem.tag].append(
+                            self.get_object_row(elem, len(object_row_dict[elem.tag]), f"{arch.tag}/{list_elem.tag}"))
+                        elem_list.append(elem)
+                    else:
+                        # Not an object: kept within the document
+                        list_copy.append(etree.fromstring(etree.tostring(elem, with_tail=False)))
+
+        with self.connection:
+            self.clear()
+            self.connection.execute('INSERT INTO document VALUES (?, ?)',
+                                    (etree.tostring(document, encoding='unicode'), p_model_hash))
+            for tag, row_list in object_row_dict.items():
+                self.connection.executemany(f'INSERT INTO "{tag}" VALUES (?, ?, ?, ?, ?, ?, ?)', row_list)
+            for elem in elem_list:
+                self.insert_relationship(elem)
+
+        Logger.set_debug(__name__, f"{len(elem_list)} objects imported in {self.file}")
+
+    def get_model_hash(self):
+        """Get the content hash of the XML file the stored model matches
+        @return hexadecimal hash, None if unknown or if no model is stored
+        """
+        row = self.connection.execute('SELECT hash FROM document').fetchone()
+
+        return row[0] if row is not None else None
+
+    def set_model_hash(self, p_model_hash):
+        """Set the content hash of the XML file the stored model matches, once the XML file is written
+        @param[in] p_model_hash : hexadecimal hash
+        @return None
+        """
+        with self.connection:
+            self.connection.execute('UPDATE document SET hash = ?', (p_model_hash,))
+
+    def import_xml(self, p_xml_file):
+        """Replace the stored model by an XML file
+        @param[in] p_xml_file : XML file name
+        @return None
+        """
+        parser = etree.XMLParser(remove_blank_text=True)
+        self.import_root(etree.parse(p_xml_file, parser).getroot())
+
+    def export_root(self):
+        """Rebuild the XML elements tree of the stored model
+        @return XML root object, None if no model is stored
+        """
+        row = self.connection.execute('SELECT xml FROM document').fetchone()
+        if row is None:
+            return None
+        # Else do nothing
+
+        root = etree.fromstring(row[0])
+        for tag in OBJECT_TAG_LIST:
+            for parent, xml in self.connection.execute(f'SELECT parent, xml FROM "{tag}" ORDER BY position'):
+                self.get_list_element(root, parent).append(etree.fromstring(xml))
+
+        return root
+
+    def export_xml(self, p_xml_file):
+        """Write the stored model within an XML file. The file is replaced at once so that it is never left
+        partially written.
+        @param[in] p_xml_file : XML file name
+        @return None
+        """
+        root = self.export_root()
+        if root is not None:
+            tmp_file = f"{p_xml_file}.tmp"
+            etree.ElementTree(root).write(tmp_file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+            os.replace(tmp_file, p_xml_file)
+        else:
+            Logger.set_error(__name__, f"No model stored in {self.file}")
+
+    def apply_record_list(self, p_record_list):
+        """Write and delete objects as recorded by @ref XmlJournal3SE, within a single transaction. The stored model
+        no longer matches any XML file until @ref set_model_hash is called.
+        @param[in] p_record_list : list of records
+        @return None
+        """
+        with self.connection:
+            self.connection.execute('UPDATE document SET hash = NULL')
+            for record in p_record_list:
+                if record['op'] == 'set':
+                    self.set_object(etree.fromstring(record['xml']), record['parent'])
+                else:
+                    self.delete_object(record['tag'], record['id'])
+
+    def set_object(self, p_elem, p_parent):
+        """Write an object, replacing its previous version if any, without committing
+        @param[in] p_elem : object XML element
+        @param[in] p_parent : path of the XML list element of the object, from the XML root element
+        @return None
+        """
+        if p_elem.tag not in OBJECT_TAG_LIST:
+            Logger.set_error(__name__, f"Unsupported object tag {p_elem.tag}")
+            return
+        # Else do nothing
+
+        position = self.connection.execute(f'SELECT position FROM "{p_elem.tag}" WHERE id = ?',
+                                           (p_elem.get('id'),)).fetchone()
+        if position is None:
+            position = self.connection.execute(f'SELECT COALESCE(MAX(position) + 1, 0) FROM "{p_elem.tag}"').fetchone()
+        # Else do nothing
+
+        self.delete_object(p_elem.tag, p_elem.get('id'))
+        self.connection.execute(f'INSERT INTO "{p_elem.tag}" VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                self.get_object_row(p_elem, position[0], p_parent))
+        self.insert_relationship(p_elem)
+
+    def delete_object(self, p_tag, p_id):
+        """Delete an object with the relationships it holds, without committing
+        @param[in] p_tag : object XML tag
+        @param[in] p_id : object id
+        @return None
+        """
+        if p_tag in OBJECT_TAG_LIST:
+            self.connection.execute(f'DELETE FROM "{p_tag}" WHERE id = ?', (p_id,))
+        # Else do nothing
+        self.connection.execute('DELETE FROM child WHERE parent_id = ?', (p_id,))
+        self.connection.execute('DELETE FROM flow WHERE flow_id = ?', (p_id,))
+        self.connection.execute('DELETE FROM allocation WHERE object_id = ?', (p_id,))
+        self.connection.execute('DELETE FROM described_item WHERE attribute_id = ?', (p_id,))
+        self.connection.execute('DELETE FROM view_item WHERE view_id = ?', (p_id,))
+
+    def clear(self):
+        """Delete the stored model, without committing
+        @return None
+        """
+        for table in OBJECT_TAG_LIST + ['document', 'child', 'flow', 'allocation', 'described_item', 'view_item']:
+            self.connection.execute(f'DELETE FROM "{table}"')
+
+    @staticmethod
+    def get_object_row(p_elem, p_position, p_parent):
+        """Get the table row of an object
+        @param[in] p_elem : object XML element
+        @param[in] p_position : position of the object within its XML list element
+        @param[in] p_parent : path of the XML list element of the object, from the XML root element
+        @return table row
+        """
+        return (p_elem.get('id'), p_elem.get('name'), p_elem.get('alias'), p_elem.get('type'), p_position, p_parent,
+                etree.tostring(p_elem, encoding='unicode', with_tail=False))
+
+    @staticmethod
+    def get_list_element(p_root, p_parent):
+        """Get the XML list element of an object, created if missing
+        @param[in] p_root : XML root object
+        @param[in] p_parent : path of the XML list element of the object, from the XML root element
+        @return XML list element
+        """
+        elem = p_root
+        for tag in p_parent.split('/'):
+            child = elem.find(tag)
+            if child is None:
+                child = etree.SubElement(elem, tag)
+            # Else do nothing
+            elem = child
+
+        return elem
+
+    def insert_relationship(self, p_elem):
+        """Insert the relationships held by an object, without committing
+        @param[in] p_elem : object XML element
+        @return None
+        """
+        object_id = p_elem.get('id')
+        for list_elem in p_elem:
+            for item in list_elem:
+                item_id = item.get('id')
+                if item_id is None:
+                    # Not a relationship, e.g. transition condition
+                    continue
+                elif item.tag == f"{p_elem.tag}Part":
+                    self.connection.execute('INSERT INTO child VALUES (?, ?)', (object_id, item_id))
+                elif item.tag in FLOW_TAG_LIST:
+                    self.connection.execute('INSERT INTO flow VALUES (?, ?, ?)', (object_id, item_id, item.tag))
+                elif item.tag == 'describedItem':
+                    self.connection.execute('INSERT INTO described_item VALUES (?, ?, ?)',
+                                            (object_id, item_id, item.get('value')))
+                elif p_elem.tag == 'view':
+                    self.connection.execute('INSERT INTO view_item VALUES (?, ?)', (object_id, item_id))
+                elif item.tag.startswith('allocated') or item.tag == 'exposedInterface':
+                    self.connection.execute('INSERT INTO allocation VALUES (?, ?, ?)', (object_id, item_id, item.tag))
+                # Else do nothing
+
+    def get_object(self, p_tag, p_id):
+        """Get an object by id
+        @param[in] p_tag : object XML tag
+        @param[in] p_id : object id
+        @return object XML element, None if not stored
+        """
+        row = self.connection.execute(f'SELECT xml FROM "{p_tag}" WHERE id = ?', (p_id,)).fetchone()
+
+        return None if row is None else etree.fromstring(row[0])
+
+    def get_object_by_name(self, p_tag, p_name):
+        """Get an object by name, then by alias
+        @param[in] p_tag : object XML tag
+        @param[in] p_name : object name or alias
+        @return object XML element, None if not stored
+        """
+        row = self.connection.execute(f'SELECT xml FROM "{p_tag}" WHERE name = ?', (p_name,)).fetchone() or \
+            self.connection.execute(f'SELECT xml FROM "{p_tag}" WHERE alias = ?', (p_name,)).fetchone()
+
+        return None if row is None else etree.fromstring(row[0])
+
+    def get_name_list(self, p_tag, p_id_list):
+        """Get the names of objects
+        @param[in] p_tag : object XML tag
+        @param[in] p_id_list : list of object ids
+        @return list of object names, ordered as the objects within the XML file
+        """
+        id_list = list(p_id_list)
+        query = f'SELECT name FROM "{p_tag}" WHERE id IN ({", ".join("?" * len(id_list))}) ORDER BY position'
+
+        return [row[0] for row in self.connection.execute(query, id_list)]
+
+    def get_child_id_list(self, p_id):
+        """Get the children of an object
+        @param[in] p_id : parent id
+        @return list of child ids
+        """
+        return [row[0] for row in self.connection.execute('SELECT child_id FROM child WHERE parent_id = ?', (p_id,))]
+
+    def get_parent_id_list(self, p_id):
+        """Get the parents of an object
+        @param[in] p_id : child id
+        @return list of parent ids
+        """
+        return [row[0] for row in self.connection.execute('SELECT parent_id FROM child WHERE child_id = ?', (p_id,))]
+
+    def get_flow_element_id_list(self, p_flow_id, p_relationship):
+        """Get the elements related to a flow
+        @param[in] p_flow_id : flow (data or information) id
+        @param[in] p_relationship : "consumer", "producer" or "predecessor"
+        @return list of element ids
+        """
+        return [row[0] for row in self.connection.execute(
+            'SELECT element_id FROM flow WHERE flow_id = ? AND relationship = ?', (p_flow_id, p_relationship))]
+
+    def get_element_flow_id_list(self, p_element_id, p_relationship):
+        """Get the flows related to an element
+        @param[in] p_element_id : element (function or activity) id
+        @param[in] p_relationship : "consumer", "producer" or "predecessor"
+        @return list of flow ids
+        """
+        return [row[0] for row in self.connection.execute(
+            'SELECT flow_id FROM flow WHERE element_id = ? AND relationship = ?', (p_element_id, p_relationship))]
+
+    def get_allocated_id_list(self, p_id):
+        """Get the objects allocated to (or exposed by) an object
+        @param[in] p_id : object id
+        @return list of allocated object ids
+        """
+        return [row[0] for row in self.connection.execute(
+            'SELECT allocated_id FROM allocation WHERE object_id = ?', (p_id,))]
+
+    def get_allocating_id_list(self, p_id, p_tag=None):
+        """Get the objects allocating (or exposing) an object
+        @param[in] p_id : allocated object id
+        @param[in] p_tag : XML tag of the allocating objects, all objects if None
+        @return list of allocating object ids
+        """
+        if p_tag is None:
+            cursor = self.connection.execute('SELECT object_id FROM allocation WHERE allocated_id = ?', (p_id,))
+        else:
+            cursor = self.connection.execute(f'SELECT allocation.object_id FROM allocation '
+                                             f'JOIN "{p_tag}" ON "{p_tag}".id = allocation.object_id '
+                                             f'WHERE allocation.allocated_id = ?', (p_id,))
+
+        return [row[0] for row in cursor]
+
+    def get_described_item_list(self, p_attribute_id):
+        """Get the objects described by an attribute
+        @param[in] p_attribute_id : attribute id
+        @return list of (object id, value)
+        """
+        return self.connection.execute('SELECT item_id, value FROM described_item WHERE attribute_id = ?',
+                                       (p_attribute_id,)).fetchall()
+
+    def get_attribute_value_list(self, p_item_id):
+        """Get the attributes describing an object
+        @param[in] p_item_id : object id
+        @return list of (attribute id, value)
+        """
+        return self.connection.execute('SELECT attribute_id, value FROM described_item WHERE item_id = ?',
+                                       (p_item_id,)).fetchall()
+
+    def get_view_item_id_list(self, p_view_id):
+        """Get the objects of a view
+        @param[in] p_view_id : view id
+        @return list of object ids
+        """
+        return [row[0] for row in self.connection.execute('SELECT item_id FROM view_item WHERE view_id = ?',
+                                                          (p_view_id,))]
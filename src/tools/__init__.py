@@ -8,11 +8,14 @@ Defines the following classes that provides tooling features used by Jarvis:
 
 Provides the following utilities:
 - @ref get_hyperlink to covert file path into HTML link
+- @ref get_topological_order to order nodes after their predecessors, and @ref get_cycle to report a cycle
 
 Provides the Jarvis console : @ref main
 """
 
 from .util import get_hyperlink
+from .util import get_topological_order
+from .util import get_cycle
 from .magic_tools import MagicTools
 from .config import Config
 from .logger import Logger
@@ -18,7 +18,11 @@ class Config:
     is_log_file = False
     is_diagram_file = False
     is_open_modelica = False
+    is_journal = False
+    is_sqlite = False
+    is_lazy = False
     verbose_level = 1
+    nltk_data_path = None
 
     @classmethod
     def read(cls):
@@ -49,6 +53,28 @@ class Config:
                                     cls.is_open_modelica = True
                                     # Logger depends from Config. Thus simple print
                                     print("Open Modelica simulation activated")
+                            elif lines[0].strip() == 'journal':
+                                if 'True' == lines[1].strip() or '1' == lines[1].strip():
+                                    cls.is_journal = True
+                                    # Logger depends from Config. Thus simple print
+                                    print("Model journal activated")
+                            elif lines[0].strip() == 'sqlite':
+                                if 'True' == lines[1].strip() or '1' == lines[1].strip():
+                                    cls.is_sqlite = True
+                                    # Logger depends from Config. Thus simple print
+                                    print("SQLite storage activated")
+                            elif lines[0].strip() == 'lazy':
+                                if 'True' == lines[1].strip() or '1' == lines[1].strip():
+                                    cls.is_lazy = True
+                                    # Logger depends from Config. Thus simple print
+                                    print("Model lazy loading activated")
+                            elif lines[0].strip() == 'nltk_data':
+                                if os.path.isdir(lines[1].strip()):
+                                    cls.nltk_data_path = os.path.abspath(lines[1].strip())
+                                    # Logger depends from Config. Thus simple print
+                                    print(f"NLTK data directory set to {cls.nltk_data_path}")
+                                else:
+                                    error = True
                             elif lines[0].strip() == 'verbose':
                                 if lines[1].strip().isnumeric():
                                     cls.verbose_level = int(lines[1].strip())
@@ -4,13 +4,12 @@ Tooling module
 
 # Libraries
 import re
-import os
 
 # Modules
 from jarvis.command_parser import CmdParser
 from plantuml_adapter import PlantUmlConnector
 from open_modelica_adapter import OpenModelicaConnector
-from xml_adapter import XmlWriter3SE, XmlParser3SE
+from xml_adapter import XmlSession3SE
 from tools import Config
 
 
@@ -31,9 +30,9 @@ def main():
         simulator = None
     parser = CmdParser(generator, simulator)
 
-    # Initialize xml_parser i.e. empty obj_dict that will contain objet's lists
-    xml_parser = XmlParser3SE()
-    obj_dict = xml_parser.xml_dict
+    # Initialize model session i.e. model kept alive between inputs
+    session = XmlSession3SE()
+    obj_dict = None
 
     # Initialize model name
     xml_name = ""
@@ -53,25 +52,22 @@ def main():
             xml_name_str = re.match(r"^with (.*)(?=.|\n)", input_str, re.MULTILINE)
             if xml_name_str:
                 xml_name = xml_name_str.group(1)
-                # If the model(i.e. file) already exists, parse it to extract lists
-                if os.path.isfile(f"{xml_name}.xml"):
-                    obj_dict = xml_parser.parse_xml(f"{xml_name}.xml")
-                    print(f"{xml_name}.xml parsed")
-                    output_xml = XmlWriter3SE(f"{xml_name}.xml")
-                # Else create an empty xml_lists
-                # or will be named by default "Output"
-                else:
-                    if len(xml_name) > 1:
-                        print(f"Creating {xml_name}.xml !")
-                        output_xml = XmlWriter3SE(f"{xml_name}.xml")
-                    else:
-                        print("Xml's file does not exist, creating it ('output.xml' by default) !")
-                        output_xml = XmlWriter3SE("")
-                    output_xml.write()
-
-                obj_dict['output_xml'] = output_xml
+                # Get the model from the session: the XML file is parsed only if it has changed since last
+                # declaration, or created if it does not exist
+                obj_dict = session.open(xml_name, input_str)
+                output_xml = obj_dict['output_xml']
             elif len(xml_name) > 0:
-                update = parser.lookup_table(input_str, **obj_dict)
+                # Sub-models are loaded if the input names any of their objects. Views activated since the model
+                # declaration are kept
+                obj_dict = session.open(xml_name, input_str, p_is_view_reset=False)
+                output_xml = obj_dict['output_xml']
+                try:
+                    update = parser.lookup_table(input_str, **obj_dict)
+                except Exception:
+                    # Objects may have been changed without being written: the model is parsed again at next input
+                    session.invalidate()
+                    raise
+                session.synchronize()
 
                 if update:
                     if 1 in update:
@@ -3,6 +3,7 @@ Tooling module
 """
 
 # Libraries
+import heapq
 
 # Modules
 
@@ -17,3 +18,74 @@ def get_hyperlink(path):
     text = "Click to open in new tab"
     # convert the url into link
     return f'<a href="{path}" target="_blank">{text}</a>'
+
+
+def get_topological_order(p_predecessor_index_list_list, p_key_list=None):
+    """@ingroup tools
+    @anchor get_topological_order
+    Order nodes so that each node comes after its predecessors (Kahn algorithm)
+
+    Nodes are identified by their index. Among the nodes whose predecessors are already ordered, the node with the
+    lowest key comes first, then the node with the lowest index, so that the order is deterministic.
+    @param[in] p_predecessor_index_list_list : list of predecessor index lists, per node index
+    @param[in] p_key_list : list of keys per node index, used to order independent nodes (optional)
+    @return list of ordered node indexes, list of node indexes not ordered because of a cycle (in key then index
+    order)
+    """
+    node_count = len(p_predecessor_index_list_list)
+    if p_key_list is None:
+        p_key_list = [0] * node_count
+    # Else do nothing
+
+    successor_index_list_list = [[] for _ in range(node_count)]
+    predecessor_count_list = [0] * node_count
+    for index, predecessor_index_list in enumerate(p_predecessor_index_list_list):
+        for predecessor_index in set(predecessor_index_list):
+            successor_index_list_list[predecessor_index].append(index)
+            predecessor_count_list[index] += 1
+
+    ready_node_heap = [(p_key_list[index], index) for index in range(node_count) if predecessor_count_list[index] == 0]
+    heapq.heapify(ready_node_heap)
+    ordered_index_list = []
+    while ready_node_heap:
+        _, index = heapq.heappop(ready_node_heap)
+        ordered_index_list.append(index)
+        for successor_index in successor_index_list_list[index]:
+            predecessor_count_list[successor_index] -= 1
+            if predecessor_count_list[successor_index] == 0:
+                heapq.heappush(ready_node_heap, (p_key_list[successor_index], successor_index))
+            # Else do nothing
+
+    cycle_index_list = sorted((index for index in range(node_count) if predecessor_count_list[index] > 0),
+                              key=lambda i: (p_key_list[i], i))
+
+    return ordered_index_list, cycle_index_list
+
+
+def get_cycle(p_predecessor_index_list_list, p_index_list):
+    """@ingroup tools
+    @anchor get_cycle
+    Get a cycle among nodes that cannot be ordered, as returned by @ref get_topological_order
+    @param[in] p_predecessor_index_list_list : list of predecessor index lists, per node index
+    @param[in] p_index_list : list of node indexes not ordered because of a cycle, the cycle is searched from the
+    first one
+    @return list of node indexes of the cycle, from predecessor to successor, empty list if no cycle
+    """
+    position_dict = {index: position for position, index in enumerate(p_index_list)}
+    visited_position_dict = {}
+    path_index_list = []
+    index = p_index_list[0] if p_index_list else None
+    # Each remaining node has a remaining predecessor: walking up predecessors ends in a cycle
+    while index is not None and index not in visited_position_dict:
+        visited_position_dict[index] = len(path_index_list)
+        path_index_list.append(index)
+        index = min((i for i in p_predecessor_index_list_list[index] if i in position_dict),
+                    key=position_dict.get, default=None)
+
+    if index is None:
+        cycle_index_list = []
+    else:
+        cycle_index_list = path_index_list[visited_position_dict[index]:]
+        cycle_index_list.reverse()
+
+    return cycle_index_list
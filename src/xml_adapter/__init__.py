@@ -2,10 +2,24 @@
 Module for 3SE xml parsing and writing
 """
 from .xml_writer import XmlWriter3SE
+from .xml_journal import XmlJournal3SE
+from .xml_snapshot import XmlSnapshot3SE
+from .xml_manifest import XmlManifest3SE
 from .xml_parser import XmlParser3SE
+from .xml_session import XmlSession3SE
+from .xml_projection import XmlProjection3SE
+from .xml_registry import IndexedObjectSet
+from .xml_registry import IndexedFlowList
+from .xml_registry import LazyIndexedObjectSet
+from .xml_registry import LazyIndexedFlowList
+from .xml_registry import ObjectKeyIndex
+from .xml_registry import RevisionIndex
+from .xml_registry import StateMachineIndex
+from .xml_registry import ReferenceIndex
 from .xml_parser import XmlDictKeyListForObjects
 from .xml_parser import XmlDictKeyListForTypeIndex
 from .xml_parser import XmlDictKeyDictForObjectBaseTypes
+from .xml_parser import XmlSectionDict
 from .util import XML_DICT_KEY_0_DATA_LIST
 from .util import XML_DICT_KEY_1_FUNCTION_LIST
 from .util import XML_DICT_KEY_2_FUN_ELEM_LIST
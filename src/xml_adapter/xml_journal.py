@@ -0,0 +1,147 @@
+"""@defgroup xml_adapter
+Module for 3SE xml parsing and writing
+"""
+# Libraries
+import os
+import json
+from lxml import etree
+
+# Modules
+from tools import Logger
+
+
+class XmlJournal3SE:
+    """@ingroup xml_adapter
+    @anchor XmlJournal3SE
+    3SE model journal
+
+    Append-only file kept next to the XML file of the model ("<model>.journal"), recording the object deltas
+    saved since the last XML snapshot, one JSON record per line:
+    - {"op": "set", "parent": <list path>, "xml": <object XML element>} when an object is written or modified
+    - {"op": "delete", "tag": <object XML tag>, "id": <object id>} when an object is deleted
+
+    Records are idempotent: replaying a record already folded into the snapshot leaves the model unchanged, so that
+    a crash between the snapshot replacement and the journal removal is harmless. A truncated last record, left by
+    a crash while appending, is ignored.
+    """
+
+    def __init__(self, p_xml_file):
+        """@var file
+        Journal file name
+        """
+        self.file = f"{os.path.splitext(p_xml_file)[0]}.journal"
+
+    def append(self, p_record_list):
+        """Append records to the journal file, that is synced to disk before returning
+        @param[in] p_record_list : list of records
+        @return None
+        """
+        if p_record_list:
+            with open(self.file, "a", encoding="utf-8") as file_writer:
+                file_writer.write(''.join(json.dumps(record) + '\n' for record in p_record_list))
+                file_writer.flush()
+                os.fsync(file_writer.fileno())
+        # Else do nothing
+
+    def read(self):
+        """Read the records of the journal file
+        @return list of records, empty if the journal file does not exist
+        """
+        record_list = []
+        if os.path.isfile(self.file):
+            with open(self.file, "r", encoding="utf-8") as file_reader:
+                for line in file_reader:
+                    try:
+                        record_list.append(json.loads(line))
+                    except ValueError:
+                        Logger.set_warning(__name__, f"Truncated record ignored in {self.file}")
+                        break
+        # Else do nothing
+
+        return record_list
+
+    def get_size(self):
+        """Get the size of the journal file
+        @return size in bytes, 0 if the journal file does not exist
+        """
+        if os.path.isfile(self.file):
+            size = os.path.getsize(self.file)
+        else:
+            size = 0
+
+        return size
+
+    def clear(self):
+        """Remove the journal file, once its records have been folded into the XML snapshot
+        @return None
+        """
+        if os.path.isfile(self.file):
+            os.remove(self.file)
+        # Else do nothing
+
+    def replay(self, p_root):
+        """Apply the records of the journal file on the XML elements tree of the last snapshot
+        @param[in,out] p_root : XML root object
+        @return number of applied records
+        """
+        record_list = self.read()
+        if record_list:
+            element_dict = {(elem.tag, elem.get('id')): elem for elem in p_root.iterfind('./*/*/*[@id]')}
+            for record in record_list:
+                self.apply(p_root, record, element_dict)
+
+            Logger.set_debug(__name__, f"{len(record_list)} records replayed from {self.file}")
+        # Else do nothing
+
+        return len(record_list)
+
+    @staticmethod
+    def apply(p_root, p_record, p_element_dict):
+        """Apply a record on the XML elements tree
+        @param[in,out] p_root : XML root object
+        @param[in] p_record : record
+        @param[in,out] p_element_dict : dictionary of object XML elements by (tag, id)
+        @return None
+        """
+        if p_record['op'] == 'set':
+            elem = etree.fromstring(p_record['xml'])
+            key = (elem.tag, elem.get('id'))
+            old_elem = p_element_dict.get(key)
+            if old_elem is not None and old_elem.getparent() is not None:
+                old_elem.getparent().replace(old_elem, elem)
+            else:
+                parent = p_root
+                for tag in p_record['parent'].split('/'):
+                    child = parent.find(tag)
+                    if child is None:
+                        child = etree.SubElement(parent, tag)
+                    # Else do nothing
+                    parent = child
+                parent.append(elem)
+            p_element_dict[key] = elem
+        else:
+            old_elem = p_element_dict.pop((p_record['tag'], p_record['id']), None)
+            if old_elem is not None and old_elem.getparent() is not None:
+                old_elem.getparent().remove(old_elem)
+            # Else do nothing
+
+    @staticmethod
+    def get_set_record(p_elem):
+        """Get the record of a written or modified object
+        @param[in] p_elem : object XML element
+        @return record
+        """
+        list_elem = p_elem.getparent()
+
+        return {'op': 'set',
+                'parent': f"{list_elem.getparent().tag}/{list_elem.tag}",
+                'xml': etree.tostring(p_elem, encoding='unicode', with_tail=False)}
+
+    @staticmethod
+    def get_delete_record(p_tag, p_id):
+        """Get the record of a deleted object
+        @param[in] p_tag : object XML tag
+        @param[in] p_id : object id
+        @return record
+        """
+        return {'op': 'delete', 'tag': p_tag, 'id': p_id}
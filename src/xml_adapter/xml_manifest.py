@@ -0,0 +1,286 @@
+"""@defgroup xml_adapter
+Module for 3SE xml parsing and writing
+"""
+# Libraries
+import os
+import json
+from lxml import etree
+
+# Modules
+from tools import Logger
+from .xml_journal import XmlJournal3SE
+
+# Constants
+# Format of the manifest, to be changed each time the manifest content changes
+MANIFEST_FORMAT = 1
+# Attributes of an object XML element referring to other objects by id
+REFERENCE_ATTRIBUTE_LIST = ('type', 'derived', 'source', 'destination', 'base')
+
+
+class XmlManifest3SE:
+    """@ingroup xml_adapter
+    @anchor XmlManifest3SE
+    3SE model manifest
+
+    A root model declares sub-models within its XML file, each of them being a model of its own ("<sub-model>.xml"):
+    @verbatim
+    <systemAnalysis>
+      ...
+      <subModelList>
+        <subModel file="power.xml"/>
+      </subModelList>
+    </systemAnalysis>
+    @endverbatim
+    The manifest is the index of the objects of the root model and of its sub-models (tag, id, name, alias and ids
+    of the referred objects), kept next to the XML file of the root model ("<model>.manifest"). It gives the
+    sub-models to be loaded for a user input without parsing them: the index of a file is only built again when the
+    file or its journal has changed.
+
+    Objects of the loaded sub-models are merged within the XML elements tree of the root model, see @ref merge. An
+    object defined both in the root model and in a sub-model is taken from the root model.
+    """
+
+    def __init__(self, p_xml_file):
+        """@var xml_file
+        XML file name of the root model
+
+        @var file
+        Manifest file name
+
+        @var file_dict
+        Index of the root model and of its sub-models by XML file name
+
+        @var sub_model_stamp
+        Stamp of the XML file of the root model when its sub-models were read, see @ref get_file_stamp
+
+        @var sub_model_file_list
+        Sub-models declared by the root model, as read at sub_model_stamp
+        """
+        self.xml_file = p_xml_file
+        self.file = f"{os.path.splitext(p_xml_file)[0]}.manifest"
+        self.file_dict = {}
+        self.sub_model_stamp = None
+        self.sub_model_file_list = []
+
+    def get_sub_model_file_list(self):
+        """Get the sub-models declared by the root model. The XML file of the root model is only read again when it
+        or its journal has changed.
+        @return list of sub-model XML file names, relative to the current folder
+        """
+        stamp = self.get_file_stamp(self.xml_file)
+        if stamp != self.sub_model_stamp:
+            folder = os.path.dirname(self.xml_file)
+            sub_model_file_list = []
+            if os.path.isfile(self.xml_file):
+                for _, elem in etree.iterparse(self.xml_file, tag='subModel'):
+                    sub_model_file = os.path.normpath(os.path.join(folder, elem.get('file')))
+                    if sub_model_file not in sub_model_file_list:
+                        sub_model_file_list.append(sub_model_file)
+                    # Else do nothing
+                    elem.clear()
+            # Else do nothing
+            self.sub_model_stamp = stamp
+            self.sub_model_file_list = sub_model_file_list
+        # Else do nothing
+
+        return list(self.sub_model_file_list)
+
+    def read(self):
+        """Read the manifest file
+        @return index of the root model and of its sub-models by XML file name, empty if the manifest file does not
+        exist or cannot be read
+        """
+        file_dict = {}
+        if os.path.isfile(self.file):
+            try:
+                with open(self.file, "r", encoding="utf-8") as file_reader:
+                    manifest = json.load(file_reader)
+                if manifest.get('format') == MANIFEST_FORMAT:
+                    file_dict = manifest['file_dict']
+                # Else do nothing
+            except (OSError, ValueError, KeyError) as ex:
+                Logger.set_debug(__name__, f"Unable to read {self.file}: {str(ex)}")
+        # Else do nothing
+
+        return file_dict
+
+    def update(self):
+        """Index again the root model and the sub-models changed since they were indexed, the index being read from
+        the manifest file the first time. The manifest file is written if any of them has been indexed again.
+        @return None
+        """
+        file_dict = self.file_dict or self.read()
+        is_modified = False
+        self.file_dict = {}
+        for xml_file in [self.xml_file] + self.get_sub_model_file_list():
+            if not os.path.isfile(xml_file):
+                Logger.set_error(__name__, f"Sub-model {xml_file} of {self.xml_file} does not exist")
+                continue
+            # Else do nothing
+
+            stamp = self.get_file_stamp(xml_file)
+            file_index = file_dict.get(xml_file)
+            if file_index is None or file_index['stamp'] != stamp:
+                file_index = {'stamp': stamp, 'object_list': self.index_file(xml_file)}
+                is_modified = True
+                Logger.set_debug(__name__, f"{xml_file} indexed in {self.file}")
+            # Else do nothing
+            self.file_dict[xml_file] = file_index
+
+        if is_modified or set(file_dict) != set(self.file_dict):
+            self.save()
+        # Else do nothing
+
+    def save(self):
+        """Write the manifest file. The file is replaced at once so that it is never left partially written.
+        @return None
+        """
+        tmp_file = f"{self.file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as file_writer:
+                json.dump({'format': MANIFEST_FORMAT, 'file_dict': self.file_dict}, file_writer)
+            os.replace(tmp_file, self.file)
+        except OSError as ex:
+            Logger.set_warning(__name__, f"Unable to write {self.file}: {str(ex)}")
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+            # Else do nothing
+
+    @staticmethod
+    def get_file_stamp(p_xml_file):
+        """Get modification time and size of an XML file and of its journal
+        @param[in] p_xml_file : XML file name
+        @return [modification time, size, journal modification time, journal size] list, journal ones being None
+        if the XML file has no journal
+        """
+        stamp = []
+        for file_name in (p_xml_file, XmlJournal3SE(p_xml_file).file):
+            if os.path.isfile(file_name):
+                file_stat = os.stat(file_name)
+                stamp.extend([file_stat.st_mtime_ns, file_stat.st_size])
+            else:
+                stamp.extend([None, None])
+
+        return stamp
+
+    @staticmethod
+    def index_file(p_xml_file):
+        """Index the objects of an XML file and of its journal
+        @param[in] p_xml_file : XML file name
+        @return list of [tag, id, name, alias, list of referred ids] objects
+        """
+        root = etree.parse(p_xml_file, etree.XMLParser(collect_ids=False)).getroot()
+        XmlJournal3SE(p_xml_file).replay(root)
+
+        object_list = []
+        for elem in root.iterfind('./*/*/*[@id]'):
+            object_list.append([elem.tag, elem.get('id'), elem.get('name'), elem.get('alias'),
+                                sorted(XmlManifest3SE.get_referred_id_set(elem))])
+
+        return object_list
+
+    @staticmethod
+    def get_referred_id_set(p_elem):
+        """Get the ids referred by an object XML element
+        @param[in] p_elem : object XML element
+        @return set of referred ids
+        """
+        reference_set = {p_elem.get(attribute) for attribute in REFERENCE_ATTRIBUTE_LIST}
+        reference_set.update(sub_elem.get('id') for sub_elem in p_elem.iterdescendants())
+        reference_set.difference_update((None, '', p_elem.get('id')))
+
+        return reference_set
+
+    @staticmethod
+    def is_name_in_text(p_name, p_text):
+        """Check if an object name is written within a text, as a whole word
+        @param[in] p_name : object name
+        @param[in] p_text : text
+        @return True if the name is found, False otherwise
+        """
+        is_found = False
+        index = p_text.find(p_name)
+        while index >= 0 and not is_found:
+            before = p_text[index - 1] if index > 0 else ' '
+            after = p_text[index + len(p_name)] if index + len(p_name) < len(p_text) else ' '
+            is_found = not (before.isalnum() or before == '_' or after.isalnum() or after == '_')
+            index = p_text.find(p_name, index + 1)
+
+        return is_found
+
+    def get_loaded_file_list(self, p_text):
+        """Get the sub-models to be loaded for a user input: the sub-models defining the objects named in the input,
+        and the sub-models defining the objects they refer to by id
+        @param[in] p_text : user input
+        @return list of sub-model XML file names
+        """
+        self.update()
+
+        id_dict = {}
+        named_object_list = []
+        for xml_file, file_index in self.file_dict.items():
+            for _, object_id, object_name, object_alias, reference_list in file_index['object_list']:
+                # Objects of the root model are taken first
+                id_dict.setdefault(object_id, xml_file)
+                if any(self.is_name_in_text(name, p_text) for name in (object_name, object_alias) if name):
+                    named_object_list.append((xml_file, reference_list))
+                # Else do nothing
+
+        loaded_file_set = set()
+        for xml_file, reference_list in named_object_list:
+            loaded_file_set.add(xml_file)
+            # Cross-file references are resolved by id
+            loaded_file_set.update(id_dict[reference] for reference in reference_list if reference in id_dict)
+        loaded_file_set.discard(self.xml_file)
+
+        return sorted(loaded_file_set)
+
+    @staticmethod
+    def merge(p_root, p_sub_model_file):
+        """Merge the objects of a sub-model within the XML elements tree of the root model. Objects already
+        defined by the root model are not merged.
+        @param[in,out] p_root : XML root object of the root model
+        @param[in] p_sub_model_file : sub-model XML file name
+        @return list of (tag, id) of the merged objects
+        """
+        sub_root = etree.parse(p_sub_model_file, etree.XMLParser(remove_blank_text=True)).getroot()
+        XmlJournal3SE(p_sub_model_file).replay(sub_root)
+
+        key_set = {(elem.tag, elem.get('id')) for elem in p_root.iterfind('./*/*/*[@id]')}
+        merged_key_list = []
+        for sub_list_elem in sub_root.iterfind('./*/*'):
+            list_elem = None
+            for elem in list(sub_list_elem):
+                key = (elem.tag, elem.get('id'))
+                if key[1] is not None and key not in key_set:
+                    if list_elem is None:
+                        list_elem = XmlManifest3SE.get_list_element(p_root, sub_list_elem.getparent().tag,
+                                                                    sub_list_elem.tag)
+                    # Else do nothing
+                    list_elem.append(elem)
+                    key_set.add(key)
+                    merged_key_list.append(key)
+                # Else do nothing
+
+        Logger.set_debug(__name__, f"{len(merged_key_list)} objects merged from {p_sub_model_file}")
+
+        return merged_key_list
+
+    @staticmethod
+    def get_list_element(p_root, p_arch_tag, p_list_tag):
+        """Get a list XML element of the XML elements tree, created if it does not exist
+        @param[in,out] p_root : XML root object
+        @param[in] p_arch_tag : tag of the architecture XML element, e.g. "funcArch"
+        @param[in] p_list_tag : tag of the list XML element, e.g. "functionList"
+        @return list XML element
+        """
+        arch_elem = p_root.find(p_arch_tag)
+        if arch_elem is None:
+            arch_elem = etree.SubElement(p_root, p_arch_tag)
+        # Else do nothing
+        list_elem = arch_elem.find(p_list_tag)
+        if list_elem is None:
+            list_elem = etree.SubElement(arch_elem, p_list_tag)
+        # Else do nothing
+
+        return list_elem
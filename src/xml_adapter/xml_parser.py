@@ -2,12 +2,18 @@
 Module for 3SE xml parsing and writing
 """
 # Libraries
+from functools import partial
 from lxml import etree
 
 # Modules
 import datamodel
 from tools import Logger
 from . import util
+from .xml_registry import IndexedObjectSet, IndexedFlowList, LazyIndexedObjectSet, LazyIndexedFlowList, \
+    ObjectKeyIndex
+from .xml_journal import XmlJournal3SE
+from .xml_snapshot import XmlSnapshot3SE
+from .xml_manifest import XmlManifest3SE
 
 # Type definition
 
@@ -24,68 +30,86 @@ class XmlParser3SE:
 
         @var root
         Reference to the XML root object
+
+        @var loaded_section_set
+        Set of the sections of the XML file already parsed, see @ref XmlSectionDict
         """
 
-        self.xml_dict = {util.XML_DICT_KEY_0_DATA_LIST: set(),
-                         util.XML_DICT_KEY_1_FUNCTION_LIST: set(),
-                         util.XML_DICT_KEY_2_FUN_ELEM_LIST: set(),
-                         util.XML_DICT_KEY_3_FUN_INTF_LIST: set(),
-                         util.XML_DICT_KEY_4_PHY_ELEM_LIST: set(),
-                         util.XML_DICT_KEY_5_PHY_INTF_LIST: set(),
-                         util.XML_DICT_KEY_6_STATE_LIST: set(),
-                         util.XML_DICT_KEY_7_TRANSITION_LIST: set(),
-                         util.XML_DICT_KEY_8_REQUIREMENT_LIST: set(),
-                         util.XML_DICT_KEY_9_GOAL_LIST: set(),
-                         util.XML_DICT_KEY_10_ACTIVITY_LIST: set(),
-                         util.XML_DICT_KEY_11_INFORMATION_LIST: set(),
-                         util.XML_DICT_KEY_12_ATTRIBUTE_LIST: set(),
-                         util.XML_DICT_KEY_13_VIEW_LIST: set(),
-                         util.XML_DICT_KEY_14_TYPE_LIST: set(),
-                         util.XML_DICT_KEY_15_FUN_CONS_LIST: [],
-                         util.XML_DICT_KEY_16_FUN_PROD_LIST: [],
-                         util.XML_DICT_KEY_17_ACT_CONS_LIST: [],
-                         util.XML_DICT_KEY_18_ACT_PROD_LIST: []
+        self.xml_dict = {util.XML_DICT_KEY_0_DATA_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_1_FUNCTION_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_2_FUN_ELEM_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_3_FUN_INTF_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_4_PHY_ELEM_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_5_PHY_INTF_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_6_STATE_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_7_TRANSITION_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_8_REQUIREMENT_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_9_GOAL_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_10_ACTIVITY_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_11_INFORMATION_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_12_ATTRIBUTE_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_13_VIEW_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_14_TYPE_LIST: IndexedObjectSet(),
+                         util.XML_DICT_KEY_15_FUN_CONS_LIST: IndexedFlowList(),
+                         util.XML_DICT_KEY_16_FUN_PROD_LIST: IndexedFlowList(),
+                         util.XML_DICT_KEY_17_ACT_CONS_LIST: IndexedFlowList(),
+                         util.XML_DICT_KEY_18_ACT_PROD_LIST: IndexedFlowList()
                          }
         self.root = None
+        self.loaded_section_set = set()
+
+    def parse_xml(self, input_filename, p_is_lazy=False, p_sub_model_file_list=()):
+        """Parse the XML file and returns the XML dictionary. The XML dictionary is loaded from the snapshot of the
+        XML file if it matches, else the snapshot is written once the XML file is parsed (see @ref XmlSnapshot3SE).
+
+        If lazy, each section of the XML file is only parsed on first access to one of its lists in the XML
+        dictionary, together with the sections it depends on (see @ref XmlSectionDict). The keys of the objects of
+        each section are indexed at once (see @ref ObjectKeyIndex), so that looking up an object only parses the
+        section holding it. The snapshot is then not written.
 
-    def parse_xml(self, input_filename):
-        """Parse the XML file and returns the XML dictionary
+        Objects of the given sub-models are merged within the XML file before parsing, see @ref XmlManifest3SE.
         @param[in] input_filename : XML file name
+        @param[in] p_is_lazy : True to parse the sections on first access, False to parse them at once
+        @param[in] p_sub_model_file_list : list of sub-model XML file names
         @return XML dictionary
         """
+        snapshot = XmlSnapshot3SE(input_filename)
+        model_hash = snapshot.get_model_hash(input_filename, p_sub_model_file_list)
+        snapshot_xml_dict = snapshot.load(model_hash)
+        if snapshot_xml_dict is not None:
+            self.xml_dict.update(snapshot_xml_dict)
+            Logger.set_debug(__name__, f"{input_filename} loaded from {snapshot.file}")
+            return self.xml_dict
+        # Else do nothing
+
         # To speed up parsing (see lxml doc) : TBC if can be extended to xml_writer
         parser = etree.XMLParser(collect_ids=False)
         # Parse the XML file
         tree = etree.parse(input_filename, parser)
         # Get the XML tree
         self.root = tree.getroot()
+        # Apply the modifications saved in the journal since the XML file was written
+        XmlJournal3SE(input_filename).replay(self.root)
+        for sub_model_file in p_sub_model_file_list:
+            XmlManifest3SE.merge(self.root, sub_model_file)
         # Check xml root tag
         if self.check_xml():
-            # First retrieve extended types
-            self.xml_dict[util.XML_DICT_KEY_14_TYPE_LIST] = self.parse_type_list()
-            self.xml_dict[util.XML_DICT_KEY_10_ACTIVITY_LIST] = self.parse_activity_list()
-            self.xml_dict[util.XML_DICT_KEY_1_FUNCTION_LIST] = self.parse_function_list()
-            self.xml_dict[util.XML_DICT_KEY_6_STATE_LIST] = self.parse_state_list()
-            self.xml_dict[util.XML_DICT_KEY_7_TRANSITION_LIST] = self.parse_transition_list()
-            self.xml_dict[util.XML_DICT_KEY_2_FUN_ELEM_LIST] = self.parse_functional_element_list()
-            self.xml_dict[util.XML_DICT_KEY_13_VIEW_LIST] = self.parse_view_list()
-            self.xml_dict[util.XML_DICT_KEY_12_ATTRIBUTE_LIST] = self.parse_attribute_list()
-            self.xml_dict[util.XML_DICT_KEY_3_FUN_INTF_LIST] = self.parse_functional_interface_list()
-            self.xml_dict[util.XML_DICT_KEY_4_PHY_ELEM_LIST] = self.parse_physical_element_list()
-            self.xml_dict[util.XML_DICT_KEY_5_PHY_INTF_LIST] = self.parse_physical_interface_list()
-            self.xml_dict[util.XML_DICT_KEY_8_REQUIREMENT_LIST] = self.parse_requirement_list()
-            self.xml_dict[util.XML_DICT_KEY_9_GOAL_LIST] = self.parse_goal_list()
-
-            # Then create data and set predecessors, consumers, producers lists
-            self.xml_dict[util.XML_DICT_KEY_0_DATA_LIST], self.xml_dict[util.XML_DICT_KEY_16_FUN_PROD_LIST], \
-                self.xml_dict[util.XML_DICT_KEY_15_FUN_CONS_LIST] = self.parse_data_list()
-
-            # Then create information and set predecessors, consumers, producers lists
-            self.xml_dict[util.XML_DICT_KEY_11_INFORMATION_LIST], self.xml_dict[util.XML_DICT_KEY_18_ACT_PROD_LIST], \
-                self.xml_dict[util.XML_DICT_KEY_17_ACT_CONS_LIST] = self.parse_information_list()
-
-            # Finally update object types
-            self.update_object_type()
+            self.loaded_section_set = set()
+            if p_is_lazy:
+                for section, (key_list, _, _) in XmlSectionDict.items():
+                    for key in key_list:
+                        if isinstance(self.xml_dict[key], IndexedFlowList):
+                            self.xml_dict[key] = LazyIndexedFlowList(partial(self.load_section, section))
+                        else:
+                            self.xml_dict[key] = LazyIndexedObjectSet(partial(self.load_section, section),
+                                                                      self.get_object_key_index(section))
+            else:
+                # Sections are parsed in the order of their dependencies, types first
+                for section in XmlSectionDict:
+                    self.load_section(section)
+
+                snapshot.save(model_hash, {key: value for key, value in self.xml_dict.items()
+                                           if isinstance(value, (IndexedObjectSet, IndexedFlowList))})
         else:
             Logger.set_error(__name__,
                              f"Xml's file structure has changed, please delete {input_filename} "
@@ -93,6 +117,48 @@ class XmlParser3SE:
 
         return self.xml_dict
 
+    def load_section(self, p_section):
+        """Parse a section of the XML file, if not parsed yet, after the sections it depends on, and set its lists
+        in the XML dictionary with object types updated
+        @param[in] p_section : section tag, see @ref XmlSectionDict
+        @return None
+        """
+        if p_section not in self.loaded_section_set:
+            self.loaded_section_set.add(p_section)
+            key_list, parse_method_name, dependency_list = XmlSectionDict[p_section]
+            for dependency in dependency_list:
+                self.load_section(dependency)
+
+            value = getattr(self, parse_method_name)()
+            # Sections holding flows return their objects with producers and consumers lists
+            value_list = value if len(key_list) > 1 else (value,)
+            for key, key_value in zip(key_list, value_list):
+                if isinstance(self.xml_dict[key], (LazyIndexedObjectSet, LazyIndexedFlowList)):
+                    self.xml_dict[key].set_content(key_value)
+                else:
+                    self.xml_dict[key] = key_value
+
+            self.update_object_type(key_list)
+            Logger.set_debug(__name__, f"Section {p_section} parsed")
+
+            if len(self.loaded_section_set) == len(XmlSectionDict):
+                # XML tree is not needed anymore
+                self.root = None
+            # Else do nothing
+        # Else do nothing
+
+    def get_object_key_index(self, p_section):
+        """Index the keys of the objects of a section of the XML file, without parsing the section
+        @param[in] p_section : section tag, see @ref XmlSectionDict
+        @return object key index
+        """
+        key_index = ObjectKeyIndex()
+        for elem in self.root.iterfind(f'./*/{p_section}/*[@id]'):
+            key_index.add(elem.get('id'), util.denormalize_xml_string(elem.get('name')), elem.get('alias'),
+                          XmlManifest3SE.get_referred_id_set(elem))
+
+        return key_index
+
     def check_xml(self):
         """Check XML file structure
 
@@ -112,43 +178,43 @@ class XmlParser3SE:
         - set_parent()
         - add_child()
 
-        @param[in] parent_id_list : list of parent element identifiers
-        @param[in] element_list : list of element
+        @param[in] parent_id_list : dictionary of parent element identifiers by child element identifier
+        @param[in] element_list : list of element indexed by identifier
         @return None
         """
-        for child_id in parent_id_list:
-            for element in element_list:
-                if element.id == child_id:
-                    # We have the child element, now search for the parent element
-                    for parent_elem in element_list:
-                        if parent_elem.id == parent_id_list[child_id]:
-                            element.set_parent(parent_elem)
-                            parent_elem.add_child(element)
-
-                            Logger.set_debug(__name__, f"Element [{parent_elem.id}, {parent_elem.name}]"
-                                                       f" is parent of "
-                                                       f"element [{element.id}, {element.name}]")
-                            break
-                    break
+        for child_id, parent_id in parent_id_list.items():
+            element = element_list.get_by_id(child_id)
+            if element is not None:
+                # We have the child element, now search for the parent element
+                parent_elem = element_list.get_by_id(parent_id)
+                if parent_elem is not None:
+                    element.set_parent(parent_elem)
+                    parent_elem.add_child(element)
+
+                    Logger.set_debug(__name__, f"Element [{parent_elem.id}, {parent_elem.name}]"
+                                               f" is parent of "
+                                               f"element [{element.id}, {element.name}]")
+                # Else do nothing
+            # Else do nothing
 
     @staticmethod
     def update_derived_object(element_list):
         """Update derived objects of an element list based on their identifiers
 
-        @param[in] element_list : list of element
+        @param[in] element_list : list of element indexed by identifier
         @return None
         """
         for elem in element_list:
-            for derived in element_list:
-                if elem.derived == derived.id:
-                    elem.derived = derived
-                    break
+            derived = element_list.get_by_id(elem.derived)
+            if derived is not None:
+                elem.derived = derived
+            # Else do nothing
 
     def parse_activity_list(self):
         """Parse XML activity list
         @return activity list
         """
-        activity_list = set()
+        activity_list = IndexedObjectSet()
         parent_list = {}
         xml_activity_list = self.root.iter('activity')
         for xml_activity in xml_activity_list:
@@ -175,7 +241,7 @@ class XmlParser3SE:
         """Parse XML function list
         @return function list
         """
-        function_list = set()
+        function_list = IndexedObjectSet()
         parent_list = {}
         xml_function_list = self.root.iter('function')
         for xml_function in xml_function_list:
@@ -230,9 +296,10 @@ class XmlParser3SE:
         """Parse XML data list
         @return data list, producer function list, consumer function list
         """
-        data_list = set()
-        consumer_function_list = []
-        producer_function_list = []
+        data_list = IndexedObjectSet()
+        consumer_function_list = IndexedFlowList()
+        producer_function_list = IndexedFlowList()
+        predecessor_id_list = {}
 
         xml_data_list = self.root.iter('data')
         for xml_data in xml_data_list:
@@ -263,44 +330,45 @@ class XmlParser3SE:
             # looking for all elements with tag "consumer" and create a list [flow_name, consumer_function]
             xml_consumer_list = xml_data.iter('consumer')
             for xml_consumer in xml_consumer_list:
-                for function in self.xml_dict[util.XML_DICT_KEY_1_FUNCTION_LIST]:
-                    if xml_consumer.get('id') == function.id:
-                        consumer_function_list.append([data, function])
-                        Logger.set_debug(__name__, f"Data [{data.id}, {data.name}]"
-                                                   f" is consumed by "
-                                                   f"function [{function.id}, {function.name}]")
-
-                        if xml_consumer.get('role') != 'none':
-                            function.set_input_role(util.denormalize_xml_string(xml_data.get('name')))
-                        # Avoid to reset the input role once already set
-                        elif function.input_role is None:
-                            function.set_input_role(None)
+                function = self.xml_dict[util.XML_DICT_KEY_1_FUNCTION_LIST].get_by_id(xml_consumer.get('id'))
+                if function is not None:
+                    consumer_function_list.append([data, function])
+                    Logger.set_debug(__name__, f"Data [{data.id}, {data.name}]"
+                                               f" is consumed by "
+                                               f"function [{function.id}, {function.name}]")
+
+                    if xml_consumer.get('role') != 'none':
+                        function.set_input_role(util.denormalize_xml_string(xml_data.get('name')))
+                    # Avoid to reset the input role once already set
+                    elif function.input_role is None:
+                        function.set_input_role(None)
+                # Else do nothing
 
             # looking for all elements with tag "producer" and create a list [flow_name, producer_function]
             xml_producer_list = xml_data.iter('producer')
             for xml_producer in xml_producer_list:
-                for function in self.xml_dict[util.XML_DICT_KEY_1_FUNCTION_LIST]:
-                    if xml_producer.get('id') == function.id:
-                        producer_function_list.append([data, function])
-                        Logger.set_debug(__name__, f"Data [{data.id}, {data.name}]"
-                                                   f" is produced by "
-                                                   f"function [{function.id}, {function.name}]")
+                function = self.xml_dict[util.XML_DICT_KEY_1_FUNCTION_LIST].get_by_id(xml_producer.get('id'))
+                if function is not None:
+                    producer_function_list.append([data, function])
+                    Logger.set_debug(__name__, f"Data [{data.id}, {data.name}]"
+                                               f" is produced by "
+                                               f"function [{function.id}, {function.name}]")
+                # Else do nothing
+
+            # looking for all elements with tag "predecessor", resolved once all data are created
+            predecessor_id_list[data] = [xml_predecessor.get('id') for xml_predecessor in xml_data.iter('predecessor')]
 
         # Loop on the data_list once created to find the predecessor and add it to list
-        for object_data in data_list:
-            xml_data_list = self.root.iter('data')
-            for xml_data in xml_data_list:
-                if xml_data.get('id') == object_data.id:
-                    # looking for all elements with tag "predecessor"
-                    xml_predecessor_list = xml_data.iter('predecessor')
-                    for xml_predecessor in xml_predecessor_list:
-                        for dodo in data_list:
-                            if xml_predecessor.get('id') == dodo.id:
-                                object_data.add_predecessor(dodo)
-
-                                Logger.set_debug(__name__, f"Data [{dodo.id, dodo.name}]"
-                                                           f" is predecessor of "
-                                                           f"data [{object_data.id, object_data.name}]")
+        for object_data, data_predecessor_id_list in predecessor_id_list.items():
+            for data_predecessor_id in data_predecessor_id_list:
+                dodo = data_list.get_by_id(data_predecessor_id)
+                if dodo is not None:
+                    object_data.add_predecessor(dodo)
+
+                    Logger.set_debug(__name__, f"Data [{dodo.id, dodo.name}]"
+                                               f" is predecessor of "
+                                               f"data [{object_data.id, object_data.name}]")
+                # Else do nothing
 
         return data_list, producer_function_list, consumer_function_list
 
@@ -308,9 +376,10 @@ class XmlParser3SE:
         """Parse XML information list
         @return information list, producer activity list, consumer activity list
         """
-        information_list = set()
-        consumer_activity_list = []
-        producer_activity_list = []
+        information_list = IndexedObjectSet()
+        consumer_activity_list = IndexedFlowList()
+        producer_activity_list = IndexedFlowList()
+        predecessor_id_list = {}
 
         xml_information_list = self.root.iter('information')
         for xml_information in xml_information_list:
@@ -323,39 +392,40 @@ class XmlParser3SE:
             # looking for all elements with tag "consumer" and create a list [flow_name, consumer_activity]
             xml_consumer_list = xml_information.iter('consumer')
             for xml_consumer in xml_consumer_list:
-                for activity in self.xml_dict[util.XML_DICT_KEY_10_ACTIVITY_LIST]:
-                    if xml_consumer.get('id') == activity.id:
-                        consumer_activity_list.append([information, activity])
-                        Logger.set_debug(__name__, f"Information [{information.id}, {information.name}]"
-                                                   f" is consumed by "
-                                                   f"activity [{activity.id}, {activity.name}]")
-                    # Else do nothing
+                activity = self.xml_dict[util.XML_DICT_KEY_10_ACTIVITY_LIST].get_by_id(xml_consumer.get('id'))
+                if activity is not None:
+                    consumer_activity_list.append([information, activity])
+                    Logger.set_debug(__name__, f"Information [{information.id}, {information.name}]"
+                                               f" is consumed by "
+                                               f"activity [{activity.id}, {activity.name}]")
+                # Else do nothing
 
             # looking for all elements with tag "producer" and create a list [flow_name, producer_activity]
             xml_producer_list = xml_information.iter('producer')
             for xml_producer in xml_producer_list:
-                for activity in self.xml_dict[util.XML_DICT_KEY_10_ACTIVITY_LIST]:
-                    if xml_producer.get('id') == activity.id:
-                        producer_activity_list.append([information, activity])
-                        Logger.set_debug(__name__, f"Information [{information.id}, {information.name}]"
-                                                   f" is produced by "
-                                                   f"function [{activity.id}, {activity.name}]")
+                activity = self.xml_dict[util.XML_DICT_KEY_10_ACTIVITY_LIST].get_by_id(xml_producer.get('id'))
+                if activity is not None:
+                    producer_activity_list.append([information, activity])
+                    Logger.set_debug(__name__, f"Information [{information.id}, {information.name}]"
+                                               f" is produced by "
+                                               f"function [{activity.id}, {activity.name}]")
+                # Else do nothing
+
+            # looking for all elements with tag "predecessor", resolved once all information are created
+            predecessor_id_list[information] = [xml_predecessor.get('id')
+                                                for xml_predecessor in xml_information.iter('predecessor')]
 
         # Loop on the information_list once created to find the predecessor and add it to list
-        for object_information in information_list:
-            xml_information_list = self.root.iter('information')
-            for xml_information in xml_information_list:
-                if xml_information.get('id') == object_information.id:
-                    # looking for all elements with tag "predecessor"
-                    xml_predecessor_list = xml_information.iter('predecessor')
-                    for xml_predecessor in xml_predecessor_list:
-                        for dodo in information_list:
-                            if xml_predecessor.get('id') == dodo.id:
-                                object_information.add_predecessor(dodo)
-
-                                Logger.set_debug(__name__, f"Information [{dodo.id, dodo.name}]"
-                                                           f" is predecessor of "
-                                                           f"information [{object_information.id, object_information.name}]")
+        for object_information, information_predecessor_id_list in predecessor_id_list.items():
+            for information_predecessor_id in information_predecessor_id_list:
+                dodo = information_list.get_by_id(information_predecessor_id)
+                if dodo is not None:
+                    object_information.add_predecessor(dodo)
+
+                    Logger.set_debug(__name__, f"Information [{dodo.id, dodo.name}]"
+                                               f" is predecessor of "
+                                               f"information [{object_information.id, object_information.name}]")
+                # Else do nothing
 
         return information_list, producer_activity_list, consumer_activity_list
 
@@ -363,7 +433,7 @@ class XmlParser3SE:
         """Parse XML state list
         @return state list
         """
-        state_list = set()
+        state_list = IndexedObjectSet()
         parent_list = {}
         xml_state_list = self.root.iter('state')
         for xml_state in xml_state_list:
@@ -406,7 +476,7 @@ class XmlParser3SE:
         """Parse XML transition list
         @return transition list
         """
-        transition_list = set()
+        transition_list = IndexedObjectSet()
         xml_transition_list = self.root.iter('transition')
         for xml_transition in xml_transition_list:
             # Instantiate transitions and add them to a list
@@ -414,8 +484,9 @@ class XmlParser3SE:
                                               p_name=util.denormalize_xml_string(xml_transition.get('name')),
                                               p_alias=xml_transition.get('alias'),
                                               p_type=xml_transition.get('type'),
-                                              p_source=xml_transition.get('source'),
-                                              p_destination=xml_transition.get('destination'))
+                                              # Source and destination not set yet are written empty
+                                              p_source=xml_transition.get('source') or None,
+                                              p_destination=xml_transition.get('destination') or None)
 
             transition_list.add(transition)
 
@@ -439,7 +510,7 @@ class XmlParser3SE:
         """Parse XML functional element list
         @return functional element list
         """
-        functional_element_list = set()
+        functional_element_list = IndexedObjectSet()
         parent_list = {}
         xml_functional_element_list = self.root.iter('functionalElement')
         for xml_func_elem in xml_functional_element_list:
@@ -507,7 +578,7 @@ class XmlParser3SE:
         """Parse XML view list
         @return view list
         """
-        view_list = set()
+        view_list = IndexedObjectSet()
         xml_view_list = self.root.iter('view')
         for xml_view in xml_view_list:
             # Instantiate view and add them to a list
@@ -540,7 +611,7 @@ class XmlParser3SE:
         """Parse XML attribute list
         @return attribute list
         """
-        attribute_list = set()
+        attribute_list = IndexedObjectSet()
         xml_attribute_list = self.root.iter('attribute')
         for xml_attribute in xml_attribute_list:
             # Instantiate Attribute and add them to a list
@@ -577,7 +648,7 @@ class XmlParser3SE:
         """Parse XML functional interface list
         @return functional interface list
         """
-        functional_interface_list = set()
+        functional_interface_list = IndexedObjectSet()
         xml_fun_inter_list = self.root.iter('functionalInterface')
         for xml_fun_inter in xml_fun_inter_list:
             # Instantiate fun_inter and add them to a list
@@ -621,7 +692,7 @@ class XmlParser3SE:
         """Parse XML physical element list
         @return physical element list
         """
-        physical_element_list = set()
+        physical_element_list = IndexedObjectSet()
         parent_list = {}
         xml_physical_element_list = self.root.iter('physicalElement')
         for xml_phy_elem in xml_physical_element_list:
@@ -699,7 +770,7 @@ class XmlParser3SE:
         """Parse XML physical interface list
         @return physical interface list
         """
-        physical_interface_list = set()
+        physical_interface_list = IndexedObjectSet()
         xml_phy_inter_list = self.root.iter('physicalInterface')
         for xml_phy_inter in xml_phy_inter_list:
             # Instantiate phy_inter and add them to a list
@@ -743,7 +814,7 @@ class XmlParser3SE:
         """Parse XML type list
         @return type list
         """
-        type_list = set()
+        type_list = IndexedObjectSet()
         xml_type_list = self.root.iter('type')
         for xml_type in xml_type_list:
             # Instantiate Type and add them to a list
@@ -763,47 +834,45 @@ class XmlParser3SE:
                                            f"type [{type_obj.id}, {type_obj.name}]")
 
         # Update base type depending if it is a 3SE base type or if it is a custom one
+        base_type_str_list = [str(i) for i in datamodel.BaseType]
         for obj_type in type_list:
-            if any(obj_type.base in a for a in [str(i) for i in datamodel.BaseType]):
+            if any(obj_type.base in a for a in base_type_str_list):
                 obj_type.base = datamodel.BaseType[obj_type.base.upper().replace(" ", "_")]
             else:
-                is_found = False
-                for base in type_list:
-                    if obj_type.base == base.id:
-                        obj_type.base = base
-                        is_found = True
-                        break
-
-                if not is_found:
+                base = type_list.get_by_id(obj_type.base)
+                if base is not None:
+                    obj_type.base = base
+                else:
                     Logger.set_error(__name__,
                                      f"Unknown type {obj_type} found when parsing xml")
 
         return type_list
 
-    def update_object_type(self):
+    def update_object_type(self, p_key_list=None):
         """Update objects in the dictionary with their types.
+        @param[in] p_key_list : keys of the lists of the dictionary to be updated, all lists if None
         @return None
         """
         # Following lists does not contain any type definition
         unwanted_xml_list = (util.XML_DICT_KEY_14_TYPE_LIST, util.XML_DICT_KEY_15_FUN_CONS_LIST,
                              util.XML_DICT_KEY_16_FUN_PROD_LIST, util.XML_DICT_KEY_17_ACT_CONS_LIST,
                              util.XML_DICT_KEY_18_ACT_PROD_LIST)
-        for key, xml_list in self.xml_dict.items():
+        if p_key_list is None:
+            p_key_list = list(self.xml_dict)
+        # Else do nothing
+
+        for key in p_key_list:
             if key not in unwanted_xml_list:
-                for obj in xml_list:
+                for obj in self.xml_dict[key]:
                     try:
                         # Base type are defined with their names
                         obj.type = datamodel.BaseType[obj.type.upper().replace(" ", "_")]
                     except KeyError:
                         # Extended types are defined in xml_type_list with their ids
-                        is_found = False
-                        for type_obj in self.xml_dict[util.XML_DICT_KEY_14_TYPE_LIST]:
-                            if obj.type == type_obj.id:
-                                obj.type = type_obj
-                                is_found = True
-                                break
-
-                        if not is_found:
+                        type_obj = self.xml_dict[util.XML_DICT_KEY_14_TYPE_LIST].get_by_id(obj.type)
+                        if type_obj is not None:
+                            obj.type = type_obj
+                        else:
                             Logger.set_error(__name__,
                                              f"Unknown type {obj.type} found when parsing xml")
 
@@ -811,7 +880,7 @@ class XmlParser3SE:
         """Parse XML requirement list
         @return requirement list
         """
-        requirement_list = set()
+        requirement_list = IndexedObjectSet()
         parent_list = {}
         xml_requirement_list = self.root.iter('requirement')
         for xml_requirement in xml_requirement_list:
@@ -842,7 +911,7 @@ class XmlParser3SE:
         """Parse XML goal list
         @return goal list
         """
-        goal_list = set()
+        goal_list = IndexedObjectSet()
         parent_list = {}
         xml_goal_list = self.root.iter('goal')
         for xml_goal in xml_goal_list:
@@ -889,6 +958,34 @@ XmlDictKeyListForObjects = [util.XML_DICT_KEY_0_DATA_LIST,
                             ]
 XmlDictKeyListForTypeIndex = 14
 
+# Sections of the XML file, in parsing order: keys of the lists of the XML dictionary, parsing method name and
+# sections referenced by the objects of the section. Types are referenced by every section.
+XmlSectionDict = {
+    'typeList': ((util.XML_DICT_KEY_14_TYPE_LIST,), 'parse_type_list', ()),
+    'activityList': ((util.XML_DICT_KEY_10_ACTIVITY_LIST,), 'parse_activity_list', ('typeList',)),
+    'functionList': ((util.XML_DICT_KEY_1_FUNCTION_LIST,), 'parse_function_list', ('typeList',)),
+    'stateList': ((util.XML_DICT_KEY_6_STATE_LIST,), 'parse_state_list', ('typeList',)),
+    'transitionList': ((util.XML_DICT_KEY_7_TRANSITION_LIST,), 'parse_transition_list', ('typeList',)),
+    'functionalElementList': ((util.XML_DICT_KEY_2_FUN_ELEM_LIST,), 'parse_functional_element_list',
+                              ('typeList',)),
+    'viewList': ((util.XML_DICT_KEY_13_VIEW_LIST,), 'parse_view_list', ('typeList',)),
+    'attributeList': ((util.XML_DICT_KEY_12_ATTRIBUTE_LIST,), 'parse_attribute_list', ('typeList',)),
+    'functionalInterfaceList': ((util.XML_DICT_KEY_3_FUN_INTF_LIST,), 'parse_functional_interface_list',
+                                ('typeList',)),
+    'physicalElementList': ((util.XML_DICT_KEY_4_PHY_ELEM_LIST,), 'parse_physical_element_list', ('typeList',)),
+    'physicalInterfaceList': ((util.XML_DICT_KEY_5_PHY_INTF_LIST,), 'parse_physical_interface_list',
+                              ('typeList',)),
+    'requirementList': ((util.XML_DICT_KEY_8_REQUIREMENT_LIST,), 'parse_requirement_list', ('typeList',)),
+    'goalList': ((util.XML_DICT_KEY_9_GOAL_LIST,), 'parse_goal_list', ('typeList',)),
+    # Producers and consumers of data are functions
+    'dataList': ((util.XML_DICT_KEY_0_DATA_LIST, util.XML_DICT_KEY_16_FUN_PROD_LIST,
+                  util.XML_DICT_KEY_15_FUN_CONS_LIST), 'parse_data_list', ('typeList', 'functionList')),
+    # Producers and consumers of information are activities
+    'informationList': ((util.XML_DICT_KEY_11_INFORMATION_LIST, util.XML_DICT_KEY_18_ACT_PROD_LIST,
+                         util.XML_DICT_KEY_17_ACT_CONS_LIST), 'parse_information_list',
+                        ('typeList', 'activityList')),
+}
+
 XmlDictKeyDictForObjectBaseTypes = {
     datamodel.BaseType.DATA: util.XML_DICT_KEY_0_DATA_LIST,
     datamodel.BaseType.FUNCTION: util.XML_DICT_KEY_1_FUNCTION_LIST,
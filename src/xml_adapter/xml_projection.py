@@ -0,0 +1,170 @@
+"""@defgroup xml_adapter
+Module for 3SE xml parsing and writing
+"""
+# Libraries
+import gc
+from functools import partial
+
+# Modules
+from .xml_parser import XmlDictKeyListForObjects, XmlSectionDict
+from .xml_registry import IndexedObjectSet, IndexedFlowList, LazyContainer, LazyIndexedObjectSet, \
+    LazyIndexedFlowList, ObjectKeyIndex
+
+
+class XmlProjection3SE:
+    """@ingroup xml_adapter
+    @anchor XmlProjection3SE
+    Projection of a 3SE XML dictionary
+
+    Every object of the XML dictionary is shallow copied and the references between objects (parent, children,
+    derived object, type, allocations...) are redirected to the copies. Any change made on the projection, e.g. by
+    diagram generation, leaves the objects of the XML dictionary unchanged.
+
+    Sections of the XML dictionary not loaded yet (see @ref XmlParser3SE) are only projected on first access to one
+    of their projected lists, after the sections they depend on. In lazy mode, every section is projected that way,
+    so that only the sections actually read, e.g. by a diagram, are copied.
+    """
+
+    def __init__(self, p_xml_dict, p_is_lazy=False):
+        """@var xml_dict
+        Projected XML dictionary
+
+        @var object_dict
+        Dictionary of projected objects by identity of the XML dictionary objects
+
+        @var source_xml_dict
+        XML dictionary
+
+        @var projected_section_set
+        Set of the sections already projected, see @ref XmlSectionDict
+        """
+        self.object_dict = {}
+        self.xml_dict = {}
+        self.source_xml_dict = p_xml_dict
+        self.projected_section_set = set()
+
+        self.build(p_xml_dict, p_is_lazy)
+
+    def build(self, p_xml_dict, p_is_lazy):
+        """Build the projected XML dictionary
+        @param[in] p_xml_dict : XML dictionary
+        @param[in] p_is_lazy : indicates if every section is projected on first access (True) or only the sections
+        not loaded yet (False)
+        @return None
+        """
+        section_key_set = set()
+        for section, (key_list, _, _) in XmlSectionDict.items():
+            key_list = [key for key in key_list if key in p_xml_dict]
+            section_key_set.update(key_list)
+            if p_is_lazy or any(isinstance(p_xml_dict[key], LazyContainer) for key in key_list):
+                for key in key_list:
+                    if isinstance(p_xml_dict[key], IndexedFlowList):
+                        self.xml_dict[key] = LazyIndexedFlowList(partial(self.project_section, section))
+                    else:
+                        self.xml_dict[key] = LazyIndexedObjectSet(partial(self.project_section, section),
+                                                                  self.get_object_key_index(p_xml_dict[key]))
+            else:
+                self.project_section(section)
+
+        for key, value in p_xml_dict.items():
+            if key not in section_key_set:
+                # XML writer and any other entry are shared
+                self.xml_dict[key] = value
+            # Else do nothing
+
+    @staticmethod
+    def get_object_key_index(p_object_set):
+        """Get the index of the keys of the objects of a set of the XML dictionary, without projecting them
+        @param[in] p_object_set : set of the XML dictionary
+        @return object key index, None if unknown
+        """
+        if isinstance(p_object_set, LazyIndexedObjectSet):
+            key_index = p_object_set.key_index
+        else:
+            key_index = ObjectKeyIndex.from_object_list(p_object_set)
+
+        return key_index
+
+    def project_section(self, p_section):
+        """Project the lists of a section of the XML dictionary, if not projected yet, after the sections it depends
+        on
+        @param[in] p_section : section tag, see @ref XmlSectionDict
+        @return None
+        """
+        if p_section in self.projected_section_set:
+            return
+        # Else do nothing
+
+        self.projected_section_set.add(p_section)
+
+        # Projection only allocates objects and containers without creating garbage: pause the cyclic garbage
+        # collector, which would otherwise scan the whole model many times
+        is_gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.copy_section(p_section)
+        finally:
+            if is_gc_enabled:
+                gc.enable()
+            # Else do nothing
+
+    def copy_section(self, p_section):
+        """Copy the objects of a section of the XML dictionary, after projecting the sections it depends on
+        @param[in] p_section : section tag, see @ref XmlSectionDict
+        @return None
+        """
+        key_list, _, dependency_list = XmlSectionDict[p_section]
+        for dependency in dependency_list:
+            self.project_section(dependency)
+
+        # Create the projected objects first, so that references between objects can be redirected whatever the
+        # order of the objects
+        object_list = []
+        for key in key_list:
+            if key in XmlDictKeyListForObjects:
+                for obj in self.source_xml_dict.get(key, ()):
+                    projected_object = object.__new__(obj.__class__)
+                    self.object_dict[id(obj)] = projected_object
+                    object_list.append((obj, projected_object))
+            # Else do nothing
+
+        for obj, projected_object in object_list:
+            projected_object.__dict__ = {attribute: self.project(value) for attribute, value in vars(obj).items()}
+
+        for key in key_list:
+            if key not in self.source_xml_dict:
+                continue
+            elif key in XmlDictKeyListForObjects:
+                value = IndexedObjectSet(self.object_dict[id(obj)] for obj in self.source_xml_dict[key])
+            else:
+                value = IndexedFlowList([self.project(flow), self.project(elem)]
+                                        for flow, elem in self.source_xml_dict[key])
+
+            if isinstance(self.xml_dict.get(key), LazyContainer):
+                self.xml_dict[key].set_content(value)
+            else:
+                self.xml_dict[key] = value
+
+    def project(self, p_value):
+        """Get the projection of a value of the XML dictionary
+        @param[in] p_value : object, container of objects or any other value
+        @return projected object, new container of projected objects or the value itself
+        """
+        value_type = type(p_value)
+        if value_type in (str, int, float, bool) or p_value is None:
+            projected_value = p_value
+        elif value_type in (set, list, tuple):
+            projected_value = value_type(self.project(v) for v in p_value)
+        elif value_type is dict:
+            projected_value = {self.project(k): self.project(v) for k, v in p_value.items()}
+        else:
+            projected_value = self.object_dict.get(id(p_value), p_value)
+
+        return projected_value
+
+    def get_object(self, p_object):
+        """Get the projection of an object of the XML dictionary
+        @param[in] p_object : object of the XML dictionary
+        @return projected object, None if the object is not part of the XML dictionary
+        """
+        return self.object_dict.get(id(p_object))
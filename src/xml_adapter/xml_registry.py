@@ -0,0 +1,922 @@
+"""@defgroup xml_adapter
+Module for 3SE xml parsing and writing
+"""
+# Libraries
+
+# Modules
+import datamodel
+from . import util
+
+
+class IndexedObjectSet(set):
+    """@ingroup xml_adapter
+    @anchor IndexedObjectSet
+    Set of objects of the XML dictionary, indexed by identifier, name and alias
+
+    The set behaves as a standard set. Indexes are kept current when objects are added or removed. When the name or
+    the alias of an object already in the set is changed, @ref refresh must be called.
+    """
+
+    def __init__(self, p_object_list=()):
+        """@var id_dict
+        Dictionary of objects by identifier
+
+        @var name_dict
+        Dictionary of objects by name
+
+        @var alias_dict
+        Dictionary of objects by alias
+
+        @var lower_name_dict
+        Dictionary of objects by lower case name
+
+        @var lower_alias_dict
+        Dictionary of objects by lower case alias
+
+        @var key_dict
+        Dictionary of index keys by object, used to remove the object from the indexes
+        """
+        super().__init__()
+        self.id_dict = {}
+        self.name_dict = {}
+        self.alias_dict = {}
+        self.lower_name_dict = {}
+        self.lower_alias_dict = {}
+        self.key_dict = {}
+
+        for obj in p_object_list:
+            self.add(obj)
+
+    def add(self, p_object):
+        """Add an object to the set and to the indexes
+        @param[in] p_object : object
+        @return None
+        """
+        if p_object not in self:
+            super().add(p_object)
+            self.index(p_object)
+        # Else do nothing
+
+    def remove(self, p_object):
+        """Remove an object from the set and from the indexes, raise KeyError if the object is not in the set
+        @param[in] p_object : object
+        @return None
+        """
+        super().remove(p_object)
+        self.unindex(p_object)
+
+    def discard(self, p_object):
+        """Remove an object from the set and from the indexes if present
+        @param[in] p_object : object
+        @return None
+        """
+        if p_object in self:
+            self.remove(p_object)
+        # Else do nothing
+
+    def pop(self):
+        """Remove and return an arbitrary object from the set
+        @return object
+        """
+        obj = super().pop()
+        self.unindex(obj)
+
+        return obj
+
+    def clear(self):
+        """Remove all objects from the set and from the indexes
+        @return None
+        """
+        super().clear()
+        self.id_dict.clear()
+        self.name_dict.clear()
+        self.alias_dict.clear()
+        self.lower_name_dict.clear()
+        self.lower_alias_dict.clear()
+        self.key_dict.clear()
+
+    def update(self, *p_object_list_list):
+        """Add objects of all iterables to the set
+        @param[in] p_object_list_list : iterables of objects
+        @return None
+        """
+        for object_list in p_object_list_list:
+            for obj in object_list:
+                self.add(obj)
+
+    def difference_update(self, *p_object_list_list):
+        """Remove objects of all iterables from the set
+        @param[in] p_object_list_list : iterables of objects
+        @return None
+        """
+        for object_list in p_object_list_list:
+            for obj in list(object_list):
+                self.discard(obj)
+
+    def intersection_update(self, *p_object_list_list):
+        """Keep only objects found in all iterables
+        @param[in] p_object_list_list : iterables of objects
+        @return None
+        """
+        kept_object_list = set(self)
+        for object_list in p_object_list_list:
+            kept_object_list.intersection_update(object_list)
+
+        for obj in self.difference(kept_object_list):
+            self.remove(obj)
+
+    def symmetric_difference_update(self, p_object_list):
+        """Keep objects found either in the set or in the iterable but not in both
+        @param[in] p_object_list : iterable of objects
+        @return None
+        """
+        for obj in set(p_object_list):
+            if obj in self:
+                self.remove(obj)
+            else:
+                self.add(obj)
+
+    def __ior__(self, p_object_list):
+        self.update(p_object_list)
+        return self
+
+    def __iand__(self, p_object_list):
+        self.intersection_update(p_object_list)
+        return self
+
+    def __isub__(self, p_object_list):
+        self.difference_update(p_object_list)
+        return self
+
+    def __ixor__(self, p_object_list):
+        self.symmetric_difference_update(p_object_list)
+        return self
+
+    def __reduce__(self):
+        # Indexes are built again when unpickled, see @ref XmlSnapshot3SE
+        return self.__class__, (list(self),)
+
+    def index(self, p_object):
+        """Add an object to the indexes
+        @param[in] p_object : object
+        @return None
+        """
+        object_id = getattr(p_object, 'id', None)
+        object_name = getattr(p_object, 'name', None)
+        object_alias = getattr(p_object, 'alias', None)
+        if not object_alias:
+            # Empty alias is not a key
+            object_alias = None
+        # Else do nothing
+
+        self.key_dict[p_object] = (object_id, object_name, object_alias)
+
+        self.add_key(self.id_dict, object_id, p_object)
+        self.add_key(self.name_dict, object_name, p_object)
+        self.add_key(self.alias_dict, object_alias, p_object)
+        if isinstance(object_name, str):
+            self.add_key(self.lower_name_dict, object_name.lower(), p_object)
+        # Else do nothing
+        if isinstance(object_alias, str):
+            self.add_key(self.lower_alias_dict, object_alias.lower(), p_object)
+        # Else do nothing
+
+    def unindex(self, p_object):
+        """Remove an object from the indexes
+        @param[in] p_object : object
+        @return None
+        """
+        object_id, object_name, object_alias = self.key_dict.pop(p_object, (None, None, None))
+
+        self.remove_key(self.id_dict, object_id, p_object)
+        self.remove_key(self.name_dict, object_name, p_object)
+        self.remove_key(self.alias_dict, object_alias, p_object)
+        if isinstance(object_name, str):
+            self.remove_key(self.lower_name_dict, object_name.lower(), p_object)
+        # Else do nothing
+        if isinstance(object_alias, str):
+            self.remove_key(self.lower_alias_dict, object_alias.lower(), p_object)
+        # Else do nothing
+
+    def refresh(self, p_object):
+        """Update the indexes of an object of the set after a change of its identifier, name or alias
+        @param[in] p_object : object
+        @return None
+        """
+        if p_object in self:
+            self.unindex(p_object)
+            self.index(p_object)
+        # Else do nothing
+
+    def get_by_id(self, p_id):
+        """Get an object by its identifier
+        @param[in] p_id : object identifier
+        @return object if found, None otherwise
+        """
+        return self.get_key(self.id_dict, p_id)
+
+    def get_by_name(self, p_name, p_is_case_sensitive=True):
+        """Get an object by its name, or by its alias if not any object has this name
+        @param[in] p_name : object name or alias
+        @param[in] p_is_case_sensitive : indicates if the comparison is case-sensitive (True) or not (False)
+        @return object if found, None otherwise
+        """
+        if p_is_case_sensitive:
+            obj = self.get_key(self.name_dict, p_name)
+            if obj is None:
+                obj = self.get_key(self.alias_dict, p_name)
+            # Else do nothing
+        else:
+            obj = self.get_key(self.lower_name_dict, p_name.lower())
+            if obj is None:
+                obj = self.get_key(self.lower_alias_dict, p_name.lower())
+            # Else do nothing
+
+        return obj
+
+    @staticmethod
+    def add_key(p_dict, p_key, p_object):
+        """Add an object to an index under a key. Several objects can share the same key.
+        @param[in] p_dict : index
+        @param[in] p_key : key
+        @param[in] p_object : object
+        @return None
+        """
+        if p_key is not None:
+            object_dict = p_dict.get(p_key)
+            if object_dict is None:
+                p_dict[p_key] = {p_object: None}
+            else:
+                object_dict[p_object] = None
+        # Else do nothing
+
+    @staticmethod
+    def remove_key(p_dict, p_key, p_object):
+        """Remove an object from an index
+        @param[in] p_dict : index
+        @param[in] p_key : key
+        @param[in] p_object : object
+        @return None
+        """
+        if p_key in p_dict:
+            p_dict[p_key].pop(p_object, None)
+            if not p_dict[p_key]:
+                del p_dict[p_key]
+            # Else do nothing
+        # Else do nothing
+
+    @staticmethod
+    def get_key(p_dict, p_key):
+        """Get the first object registered in an index under a key
+        @param[in] p_dict : index
+        @param[in] p_key : key
+        @return object if found, None otherwise
+        """
+        object_dict = p_dict.get(p_key)
+        if object_dict:
+            obj = next(iter(object_dict))
+        else:
+            obj = None
+
+        return obj
+
+
+class IndexedFlowList(list):
+    """@ingroup xml_adapter
+    @anchor IndexedFlowList
+    List of [flow, element] relationships of the XML dictionary (consumers and producers), indexed by flow, by
+    element and by [flow, element] pair
+
+    The list behaves as a standard list. Indexes are kept current when relationships are added or removed.
+    Relationships must not be modified in place.
+    """
+
+    def __init__(self, p_relationship_list=()):
+        """@var pair_dict
+        Number of occurrences by (flow, element) pair
+
+        @var flow_dict
+        Dictionary of elements by flow
+
+        @var element_dict
+        Dictionary of flows by element
+        """
+        super().__init__()
+        self.pair_dict = {}
+        self.flow_dict = {}
+        self.element_dict = {}
+
+        self.extend(p_relationship_list)
+
+    def append(self, p_relationship):
+        """Add a relationship at the end of the list
+        @param[in] p_relationship : [flow, element]
+        @return None
+        """
+        super().append(p_relationship)
+        self.index_relationship(p_relationship)
+
+    def extend(self, p_relationship_list):
+        """Add relationships at the end of the list
+        @param[in] p_relationship_list : iterable of [flow, element]
+        @return None
+        """
+        for relationship in p_relationship_list:
+            self.append(relationship)
+
+    def insert(self, p_index, p_relationship):
+        """Insert a relationship before index
+        @param[in] p_index : index
+        @param[in] p_relationship : [flow, element]
+        @return None
+        """
+        super().insert(p_index, p_relationship)
+        self.index_relationship(p_relationship)
+
+    def remove(self, p_relationship):
+        """Remove first occurrence of a relationship, raise ValueError if the relationship is not present
+        @param[in] p_relationship : [flow, element]
+        @return None
+        """
+        super().remove(p_relationship)
+        self.unindex_relationship(p_relationship)
+
+    def pop(self, p_index=-1):
+        """Remove and return a relationship at index (default last)
+        @param[in] p_index : index
+        @return [flow, element]
+        """
+        relationship = super().pop(p_index)
+        self.unindex_relationship(relationship)
+
+        return relationship
+
+    def clear(self):
+        """Remove all relationships from the list and from the indexes
+        @return None
+        """
+        super().clear()
+        self.pair_dict.clear()
+        self.flow_dict.clear()
+        self.element_dict.clear()
+
+    def __setitem__(self, p_index, p_relationship):
+        if isinstance(p_index, slice):
+            for relationship in self[p_index]:
+                self.unindex_relationship(relationship)
+            p_relationship = list(p_relationship)
+            for relationship in p_relationship:
+                self.index_relationship(relationship)
+        else:
+            self.unindex_relationship(self[p_index])
+            self.index_relationship(p_relationship)
+
+        super().__setitem__(p_index, p_relationship)
+
+    def __delitem__(self, p_index):
+        if isinstance(p_index, slice):
+            for relationship in self[p_index]:
+                self.unindex_relationship(relationship)
+        else:
+            self.unindex_relationship(self[p_index])
+
+        super().__delitem__(p_index)
+
+    def __iadd__(self, p_relationship_list):
+        self.extend(p_relationship_list)
+        return self
+
+    def __reduce__(self):
+        # Indexes are built again when unpickled, see @ref XmlSnapshot3SE
+        return self.__class__, (list(self),)
+
+    def __contains__(self, p_relationship):
+        try:
+            is_contained = len(p_relationship) == 2 and (p_relationship[0], p_relationship[1]) in self.pair_dict
+        except (TypeError, IndexError, KeyError):
+            # Not a [flow, element] relationship
+            is_contained = super().__contains__(p_relationship)
+
+        return is_contained
+
+    def count(self, p_relationship):
+        try:
+            if len(p_relationship) == 2:
+                relationship_count = self.pair_dict.get((p_relationship[0], p_relationship[1]), 0)
+            else:
+                relationship_count = 0
+        except (TypeError, IndexError, KeyError):
+            # Not a [flow, element] relationship
+            relationship_count = super().count(p_relationship)
+
+        return relationship_count
+
+    def index_relationship(self, p_relationship):
+        """Add a relationship to the indexes
+        @param[in] p_relationship : [flow, element]
+        @return None
+        """
+        flow, element = p_relationship
+        self.pair_dict[(flow, element)] = self.pair_dict.get((flow, element), 0) + 1
+        self.flow_dict.setdefault(flow, {})[element] = None
+        self.element_dict.setdefault(element, {})[flow] = None
+
+    def unindex_relationship(self, p_relationship):
+        """Remove a relationship from the indexes
+        @param[in] p_relationship : [flow, element]
+        @return None
+        """
+        flow, element = p_relationship
+        pair_count = self.pair_dict.get((flow, element), 0) - 1
+        if pair_count > 0:
+            self.pair_dict[(flow, element)] = pair_count
+        else:
+            self.pair_dict.pop((flow, element), None)
+            self.flow_dict.get(flow, {}).pop(element, None)
+            if not self.flow_dict.get(flow, True):
+                del self.flow_dict[flow]
+            # Else do nothing
+            self.element_dict.get(element, {}).pop(flow, None)
+            if not self.element_dict.get(element, True):
+                del self.element_dict[element]
+            # Else do nothing
+
+    def has_flow(self, p_flow):
+        """Check if a flow is part of any relationship
+        @param[in] p_flow : flow
+        @return True if the flow is found, False otherwise
+        """
+        return p_flow in self.flow_dict
+
+    def has_element(self, p_element):
+        """Check if an element is part of any relationship
+        @param[in] p_element : element
+        @return True if the element is found, False otherwise
+        """
+        return p_element in self.element_dict
+
+    def get_element_list(self, p_flow):
+        """Get the elements related to a flow
+        @param[in] p_flow : flow
+        @return list of elements, in insertion order
+        """
+        return list(self.flow_dict.get(p_flow, ()))
+
+    def get_flow_list(self, p_element):
+        """Get the flows related to an element
+        @param[in] p_element : element
+        @return list of flows, in insertion order
+        """
+        return list(self.element_dict.get(p_element, ()))
+
+
+class ObjectKeyIndex:
+    """@ingroup xml_adapter
+    @anchor ObjectKeyIndex
+    Index of the identifiers, names and aliases of the objects of a container not loaded yet, and of the identifiers
+    they refer to, see @ref LazyIndexedObjectSet
+
+    It tells which containers may hold an object without loading them: a container is only loaded when the key is
+    found. Names and aliases are indexed in lower case, so that the index applies to case-insensitive lookups.
+    """
+
+    def __init__(self):
+        """@var id_set
+        Set of object identifiers
+
+        @var name_set
+        Set of lower case object names and aliases
+
+        @var reference_id_set
+        Set of identifiers referred by the objects
+        """
+        self.id_set = set()
+        self.name_set = set()
+        self.reference_id_set = set()
+
+    @classmethod
+    def from_object_list(cls, p_object_list):
+        """Build the index of loaded objects
+        @param[in] p_object_list : iterable of objects
+        @return object key index
+        """
+        key_index = cls()
+        for obj in p_object_list:
+            key_index.add(obj.id, obj.name, getattr(obj, 'alias', None), ReferenceIndex.get_referred_id_list(obj))
+
+        return key_index
+
+    def add(self, p_id, p_name, p_alias, p_reference_id_list):
+        """Add the keys of an object to the index
+        @param[in] p_id : object identifier
+        @param[in] p_name : object name
+        @param[in] p_alias : object alias, None or empty if any
+        @param[in] p_reference_id_list : identifiers referred by the object
+        @return None
+        """
+        self.id_set.add(p_id)
+        for name in (p_name, p_alias):
+            if name:
+                self.name_set.add(name.lower())
+            # Else do nothing
+        self.reference_id_set.update(p_reference_id_list)
+
+
+class LazyContainer:
+    """@ingroup xml_adapter
+    @anchor LazyContainer
+    Mixin of the containers of the XML dictionary whose content is loaded on first access, see @ref XmlParser3SE
+
+    Any method call or index access loads the content through the loader given at creation. Once loaded, the
+    container becomes an instance of its base class (@ref IndexedObjectSet or @ref IndexedFlowList), so that it is
+    then used without any overhead.
+
+    Built-in functions reading the storage of another set or list directly, e.g. set(container) or
+    [...] + container, do not load the content: the container shall be iterated instead.
+    """
+    # Class of the container once loaded
+    base_class = None
+
+    def __getattr__(self, p_name):
+        # Only called for missing attributes, i.e. indexes of a container not loaded yet
+        if p_name != 'loader' and 'loader' in self.__dict__:
+            LazyContainer.load(self)
+            return getattr(self, p_name)
+        # Else do nothing
+
+        raise AttributeError(p_name)
+
+    def load(self):
+        """Load the content of the container, if not loaded yet
+        @return None
+        """
+        loader = self.__dict__.pop('loader', None)
+        if loader is not None:
+            loader()
+        # Else do nothing
+
+    def set_content(self, p_content):
+        """Set the content of the container, that becomes an instance of its base class
+        @param[in] p_content : iterable of objects or relationships
+        @return None
+        """
+        base_class = self.base_class
+        self.__dict__.pop('loader', None)
+        self.__dict__.pop('key_index', None)
+        self.__class__ = base_class
+        base_class.__init__(self, p_content)
+
+
+def get_lazy_method_dict(p_base_class):
+    """@ingroup xml_adapter
+    @anchor get_lazy_method_dict
+    Get the methods of a container class loading the content before being called, see @ref LazyContainer
+
+    @param[in] p_base_class : container class, e.g. @ref IndexedObjectSet
+    @return dictionary of methods by name
+    """
+    # Methods not related to the content
+    unwanted_name_list = ('__new__', '__init__', '__getattribute__', '__getattr__', '__setattr__', '__delattr__',
+                          '__init_subclass__', '__subclasshook__', '__class_getitem__', '__sizeof__', '__dir__',
+                          '__format__')
+
+    def get_lazy_method(p_method):
+        def lazy_method(self, *args, **kwargs):
+            LazyContainer.load(self)
+            return p_method(self, *args, **kwargs)
+
+        lazy_method.__name__ = p_method.__name__
+        lazy_method.__doc__ = p_method.__doc__
+        return lazy_method
+
+    method_dict = {}
+    for cls in reversed(p_base_class.__mro__[:-1]):
+        for name, method in vars(cls).items():
+            if name not in unwanted_name_list and callable(method) and \
+                    not isinstance(method, (staticmethod, classmethod)):
+                method_dict[name] = get_lazy_method(method)
+            # Else do nothing
+
+    return method_dict
+
+
+class LazyIndexedObjectSet(LazyContainer, IndexedObjectSet):
+    """@ingroup xml_adapter
+    @anchor LazyIndexedObjectSet
+    @ref IndexedObjectSet whose content is loaded on first access, see @ref LazyContainer
+
+    When the keys of the objects are known before loading (see @ref ObjectKeyIndex), lookups check them first, so
+    that the content is not loaded for an object it does not hold.
+    """
+    base_class = IndexedObjectSet
+
+    def __init__(self, p_loader, p_key_index=None):
+        """@var loader
+        Function loading the content, calling @ref set_content
+
+        @var key_index
+        Index of the keys of the objects to be loaded, None if unknown
+        """
+        set.__init__(self)
+        self.loader = p_loader
+        self.key_index = p_key_index
+
+    def may_hold_id(self, p_id):
+        """Check, without loading the content, if an object identifier may be held
+        @param[in] p_id : object identifier
+        @return False if the identifier is not held, True otherwise
+        """
+        return self.key_index is None or p_id in self.key_index.id_set
+
+    def may_hold_name(self, p_name):
+        """Check, without loading the content, if an object name or alias may be held
+        @param[in] p_name : object name or alias
+        @return False if the name is not held, True otherwise
+        """
+        return self.key_index is None or p_name.lower() in self.key_index.name_set
+
+    def may_refer_to(self, p_id):
+        """Check, without loading the content, if an object identifier may be referred by the objects held
+        @param[in] p_id : object identifier
+        @return False if the identifier is not referred, True otherwise
+        """
+        return self.key_index is None or p_id in self.key_index.reference_id_set
+
+
+class LazyIndexedFlowList(LazyContainer, IndexedFlowList):
+    """@ingroup xml_adapter
+    @anchor LazyIndexedFlowList
+    @ref IndexedFlowList whose content is loaded on first access, see @ref LazyContainer
+    """
+    base_class = IndexedFlowList
+
+    def __init__(self, p_loader):
+        """@var loader
+        Function loading the content, calling @ref set_content
+        """
+        list.__init__(self)
+        self.loader = p_loader
+
+
+# Lazy containers load their content before any method of their base class
+for lazy_class in (LazyIndexedObjectSet, LazyIndexedFlowList):
+    for method_name, lazy_method in get_lazy_method_dict(lazy_class.base_class).items():
+        setattr(lazy_class, method_name, lazy_method)
+
+
+class RevisionIndex:
+    """@ingroup xml_adapter
+    @anchor RevisionIndex
+    Base class of the indexes built from the XML dictionary once per model revision
+
+    The most recently built index of each class is reused as long as the revision of the XML writer, under
+    'output_xml' key, is unchanged. An index is built each time if the revision is unknown.
+    """
+    # Most recently built index
+    last_index = None
+
+    @classmethod
+    def build(cls, p_revision, **kwargs):
+        """Build the index of the XML dictionary
+        @param[in] p_revision : model revision, None if unknown
+        @param[in] kwargs : XML dictionary
+        @return index
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def get(cls, **kwargs):
+        """Get the index of the XML dictionary, built again only if the model revision has changed
+        @param[in] kwargs : XML dictionary
+        @return index
+        """
+        revision = getattr(kwargs.get('output_xml'), 'revision', None)
+        index = cls.last_index
+        if index is None or revision is None or index.revision != revision:
+            index = cls.build(revision, **kwargs)
+            if revision is not None:
+                cls.last_index = index
+            # Else do nothing
+        # Else do nothing
+
+        return index
+
+
+class StateMachineIndex(RevisionIndex):
+    """@ingroup xml_adapter
+    @anchor StateMachineIndex
+    Index of the transitions of the XML dictionary by source state and by destination state, with the entry and exit
+    states
+
+    The index only holds identifiers, so that it also applies to any projection of the XML dictionary
+    (see @ref XmlProjection3SE). It is built once per model revision, see @ref RevisionIndex.
+    """
+
+    def __init__(self, p_state_list, p_transition_list, p_revision=None):
+        """@var revision
+        Model revision of the index, None if unknown
+
+        @var source_dict
+        Dictionary of transition identifiers by source state identifier
+
+        @var destination_dict
+        Dictionary of transition identifiers by destination state identifier
+
+        @var entry_state_id_set
+        Set of entry state identifiers
+
+        @var exit_state_id_set
+        Set of exit state identifiers
+        """
+        self.revision = p_revision
+        self.source_dict = {}
+        self.destination_dict = {}
+        self.entry_state_id_set = set()
+        self.exit_state_id_set = set()
+
+        for transition in p_transition_list:
+            if transition.source is not None:
+                self.source_dict.setdefault(transition.source, []).append(transition.id)
+            # Else do nothing
+            if transition.destination is not None:
+                self.destination_dict.setdefault(transition.destination, []).append(transition.id)
+            # Else do nothing
+
+        for state in p_state_list:
+            if not isinstance(state.type, datamodel.BaseType) and hasattr(state.type, 'name'):
+                if datamodel.ExitStateLabel in state.type.name.lower():
+                    self.exit_state_id_set.add(state.id)
+                elif datamodel.EntryStateLabel in state.type.name.lower():
+                    self.entry_state_id_set.add(state.id)
+                # Else do nothing
+            # Else do nothing
+
+    @classmethod
+    def build(cls, p_revision, **kwargs):
+        """Build the index of the XML dictionary
+        @param[in] p_revision : model revision, None if unknown
+        @param[in] kwargs : XML dictionary
+        @return state machine index
+        """
+        return cls(kwargs[util.XML_DICT_KEY_6_STATE_LIST], kwargs[util.XML_DICT_KEY_7_TRANSITION_LIST], p_revision)
+
+    def get_source_transition_id_list(self, p_state_id):
+        """Get the transitions whose source is a state
+        @param[in] p_state_id : state identifier
+        @return list of transition identifiers
+        """
+        return self.source_dict.get(p_state_id, [])
+
+    def get_destination_transition_id_list(self, p_state_id):
+        """Get the transitions whose destination is a state
+        @param[in] p_state_id : state identifier
+        @return list of transition identifiers
+        """
+        return self.destination_dict.get(p_state_id, [])
+
+    def is_entry_state(self, p_state_id):
+        """Check if a state is an entry state
+        @param[in] p_state_id : state identifier
+        @return True if the state is typed as entry state, False otherwise
+        """
+        return p_state_id in self.entry_state_id_set
+
+    def is_exit_state(self, p_state_id):
+        """Check if a state is an exit state
+        @param[in] p_state_id : state identifier
+        @return True if the state is typed as exit state, False otherwise
+        """
+        return p_state_id in self.exit_state_id_set
+
+
+class ReferenceIndex(RevisionIndex):
+    """@ingroup xml_adapter
+    @anchor ReferenceIndex
+    Index of the objects of the XML dictionary referring to an object identifier: allocations, exposed interfaces,
+    transition sources and destinations and items described by attributes
+
+    Referrers of an object are found without scanning the XML dictionary. The index is built once per model
+    revision, see @ref RevisionIndex. Sets of the XML dictionary not loaded yet (see @ref LazyIndexedObjectSet) are
+    only loaded and indexed when they may refer to a looked up identifier.
+    """
+    # Attributes holding lists of referred objects or identifiers
+    reference_list_attribute_list = ('allocated_activity_list', 'allocated_data_list', 'allocated_fun_elem_list',
+                                     'allocated_fun_inter_list', 'allocated_function_list', 'allocated_goal_list',
+                                     'allocated_info_list', 'allocated_item_list', 'allocated_req_list',
+                                     'allocated_state_list', 'exposed_interface_list')
+    # Attributes holding a single referred identifier
+    reference_attribute_list = ('source', 'destination')
+
+    def __init__(self, p_object_list, p_revision=None, p_lazy_object_set_list=()):
+        """@var revision
+        Model revision of the index, None if unknown
+
+        @var referrer_dict
+        Dictionary of (referrer, attribute) pairs by referred object identifier
+
+        @var lazy_object_set_list
+        List of the object sets not indexed yet
+        """
+        self.revision = p_revision
+        self.referrer_dict = {}
+        self.lazy_object_set_list = list(p_lazy_object_set_list)
+
+        self.add_object_list(p_object_list)
+
+    @classmethod
+    def build(cls, p_revision, **kwargs):
+        """Build the index of the XML dictionary
+        @param[in] p_revision : model revision, None if unknown
+        @param[in] kwargs : XML dictionary
+        @return reference index
+        """
+        object_set_list = [value for value in kwargs.values() if isinstance(value, IndexedObjectSet)]
+
+        return cls((obj for value in object_set_list if not isinstance(value, LazyIndexedObjectSet) for obj in value),
+                   p_revision,
+                   [value for value in object_set_list if isinstance(value, LazyIndexedObjectSet)])
+
+    @classmethod
+    def get_reference_list(cls, p_object):
+        """Get the references of an object
+        @param[in] p_object : object
+        @return list of (referred object identifier, attribute) pairs
+        """
+        reference_list = []
+        for attribute in cls.reference_list_attribute_list:
+            for referred in getattr(p_object, attribute, ()):
+                reference_list.append((getattr(referred, 'id', referred), attribute))
+
+        for attribute in cls.reference_attribute_list:
+            referred = getattr(p_object, attribute, None)
+            if referred is not None:
+                reference_list.append((referred, attribute))
+            # Else do nothing
+
+        # Described items are [identifier, value]
+        for described_item in getattr(p_object, 'described_item_list', ()):
+            reference_list.append((described_item[0], 'described_item_list'))
+
+        return reference_list
+
+    @classmethod
+    def get_referred_id_list(cls, p_object):
+        """Get the identifiers referred by an object
+        @param[in] p_object : object
+        @return list of referred object identifiers
+        """
+        return [referred_id for referred_id, _ in cls.get_reference_list(p_object)]
+
+    def add_object_list(self, p_object_list):
+        """Add the references of objects to the index
+        @param[in] p_object_list : iterable of objects
+        @return None
+        """
+        for obj in p_object_list:
+            for referred_id, attribute in self.get_reference_list(obj):
+                self.add_reference(referred_id, obj, attribute)
+
+    def load_referrer_list(self, p_id):
+        """Index the object sets not indexed yet that may refer to an object identifier, loading them if needed
+        @param[in] p_id : referred object identifier
+        @return None
+        """
+        lazy_object_set_list = []
+        for object_set in self.lazy_object_set_list:
+            # Object set may have been loaded since the index was built
+            if not isinstance(object_set, LazyIndexedObjectSet) or object_set.may_refer_to(p_id):
+                self.add_object_list(object_set)
+            else:
+                lazy_object_set_list.append(object_set)
+        self.lazy_object_set_list = lazy_object_set_list
+
+    def add_reference(self, p_id, p_referrer, p_attribute):
+        """Add a reference to the index
+        @param[in] p_id : referred object identifier
+        @param[in] p_referrer : referrer object
+        @param[in] p_attribute : referrer attribute holding the reference
+        @return None
+        """
+        self.referrer_dict.setdefault(p_id, {})[(p_referrer, p_attribute)] = None
+
+    def get_referrer_list(self, p_id, *p_attribute_list):
+        """Get the objects referring to an object identifier
+        @param[in] p_id : referred object identifier
+        @param[in] p_attribute_list : referrer attributes to be considered, all if empty
+        @return list of referrer objects
+        """
+        self.load_referrer_list(p_id)
+
+        return [referrer for referrer, attribute in self.referrer_dict.get(p_id, ())
+                if not p_attribute_list or attribute in p_attribute_list]
+
+    def has_referrer(self, p_id, *p_attribute_list):
+        """Check if an object identifier is referred
+        @param[in] p_id : referred object identifier
+        @param[in] p_attribute_list : referrer attributes to be considered, all if empty
+        @return True if at least one object refers to the identifier, False otherwise
+        """
+        self.load_referrer_list(p_id)
+
+        return any(not p_attribute_list or attribute in p_attribute_list
+                   for _, attribute in self.referrer_dict.get(p_id, ()))
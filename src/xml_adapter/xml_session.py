@@ -0,0 +1,189 @@
+"""@defgroup xml_adapter
+Module for 3SE xml parsing and writing
+"""
+# Libraries
+import os
+
+# Modules
+from tools import Config, Logger
+from .xml_parser import XmlParser3SE
+from .xml_writer import XmlWriter3SE
+from .xml_snapshot import XmlSnapshot3SE
+from .xml_manifest import XmlManifest3SE
+from .xml_registry import LazyContainer
+from . import util
+
+
+class XmlSession3SE:
+    """@ingroup xml_adapter
+    @anchor XmlSession3SE
+    3SE model session
+
+    Keeps the XML dictionary of the current model alive between user inputs. The model is only parsed again
+    when its XML file or its journal has been changed on disk by someone else (modification time and content
+    hash).
+
+    View activation ("under <view>") is not written within the XML file: it only applies to the cell declaring it,
+    views being deactivated when the model is reused by another cell.
+
+    Sub-models declared by the model (see @ref XmlManifest3SE) are only loaded when a user input names one of
+    their objects, or an object referring to one of their objects. Loaded sub-models are kept until another model
+    is opened.
+    """
+
+    def __init__(self):
+        """@var xml_dict
+        XML dictionary of the current model
+
+        @var file
+        XML file of the current model
+
+        @var file_stat
+        Modification time and size of the XML file when the XML dictionary was last synchronized
+
+        @var file_hash
+        Content hash of the XML file when the XML dictionary was last synchronized
+
+        @var manifest
+        Manifest of the current model
+
+        @var sub_model_file_list
+        List of the sub-model XML files loaded within the XML dictionary
+        """
+        self.xml_dict = None
+        self.file = None
+        self.file_stat = None
+        self.file_hash = None
+        self.manifest = None
+        self.sub_model_file_list = []
+
+    def open(self, p_xml_name, p_input_str=None, p_is_view_reset=True):
+        """Get the XML dictionary of the model, parsing or creating its XML file only when needed
+        @param[in] p_xml_name : model name (XML file name without extension)
+        @param[in] p_input_str : user input, giving the sub-models to be loaded. Not any sub-model is loaded if None
+        @param[in] p_is_view_reset : True to deactivate the views of a reused model, i.e. for a new cell, False to
+        keep them active, e.g. for the inputs following a model declaration in the console
+        @return XML dictionary, including the XML writer under 'output_xml' key
+        """
+        if len(p_xml_name) > 1:
+            xml_file = f"{p_xml_name}.xml"
+        else:
+            xml_file = ""
+
+        if self.manifest is None or self.manifest.xml_file != f"{p_xml_name}.xml":
+            self.manifest = XmlManifest3SE(f"{p_xml_name}.xml")
+            self.sub_model_file_list = []
+        # Else do nothing
+
+        if os.path.isfile(f"{p_xml_name}.xml"):
+            sub_model_file_list = self.sub_model_file_list
+            if p_input_str is not None and self.manifest.get_sub_model_file_list():
+                sub_model_file_list = sorted(set(sub_model_file_list).union(
+                    self.manifest.get_loaded_file_list(p_input_str)))
+            # Else do nothing
+
+            if sub_model_file_list != self.sub_model_file_list or not self.is_up_to_date(f"{p_xml_name}.xml"):
+                for sub_model_file in sub_model_file_list:
+                    if sub_model_file not in self.sub_model_file_list:
+                        Logger.set_info(__name__, f"Sub-model {sub_model_file} loaded")
+                    # Else do nothing
+                self.sub_model_file_list = sub_model_file_list
+                xml_parser = XmlParser3SE()
+                self.xml_dict = xml_parser.parse_xml(f"{p_xml_name}.xml", p_is_lazy=Config.is_lazy,
+                                                     p_sub_model_file_list=self.sub_model_file_list)
+                self.xml_dict['output_xml'] = XmlWriter3SE(f"{p_xml_name}.xml",
+                                                           p_sub_model_file_list=self.sub_model_file_list)
+                self.file = f"{p_xml_name}.xml"
+            else:
+                Logger.set_debug(__name__, f"{p_xml_name}.xml reused from session")
+                if p_is_view_reset:
+                    self.deactivate_view_list()
+                # Else do nothing
+
+            Logger.set_info(__name__, f"{p_xml_name}.xml parsed")
+        else:
+            # Create an empty XML dictionary or will be named by default "Output"
+            if len(xml_file) > 0:
+                Logger.set_info(__name__, f"Creating {p_xml_name}.xml !")
+            else:
+                Logger.set_info(__name__, "Xml's file does not exist, creating it ('output.xml' by default) !")
+
+            self.xml_dict = XmlParser3SE().xml_dict
+            output_xml = XmlWriter3SE(xml_file)
+            output_xml.write()
+            self.xml_dict['output_xml'] = output_xml
+            self.file = output_xml.file
+
+        self.synchronize()
+
+        return self.xml_dict
+
+    def is_up_to_date(self, p_file):
+        """Check if the XML dictionary of the session still reflects the XML file
+        @param[in] p_file : XML file name
+        @return True if the XML file does not need to be parsed again, False otherwise
+        """
+        is_up_to_date = False
+        if self.xml_dict is not None and self.file == p_file:
+            file_stat = self.get_file_stat(p_file, self.sub_model_file_list)
+            if file_stat == self.file_stat:
+                is_up_to_date = True
+            elif self.get_file_hash(p_file, self.sub_model_file_list) == self.file_hash:
+                # File touched without content change
+                self.file_stat = file_stat
+                is_up_to_date = True
+            # Else do nothing
+        # Else do nothing
+
+        return is_up_to_date
+
+    def synchronize(self):
+        """Record the XML file state once the XML dictionary and the XML file are consistent, i.e. after the
+        XML writer has applied the user input
+        @return None
+        """
+        if self.file is not None and os.path.isfile(self.file):
+            self.file_stat = self.get_file_stat(self.file, self.sub_model_file_list)
+            self.file_hash = self.get_file_hash(self.file, self.sub_model_file_list)
+        else:
+            self.invalidate()
+
+    def deactivate_view_list(self):
+        """Deactivate the views of the XML dictionary, as they are when the XML file is parsed
+        @return None
+        """
+        view_list = self.xml_dict.get(util.XML_DICT_KEY_13_VIEW_LIST, ())
+        # Views not loaded yet are not activated
+        if not isinstance(view_list, LazyContainer):
+            for view in view_list:
+                view.set_activation(False)
+        # Else do nothing
+
+    def invalidate(self):
+        """Force the XML file to be parsed again at next opening
+        @return None
+        """
+        self.xml_dict = None
+        self.file = None
+        self.file_stat = None
+        self.file_hash = None
+
+    @staticmethod
+    def get_file_stat(p_file, p_sub_model_file_list=()):
+        """Get modification time and size of an XML file and of its journal, and of the sub-models loaded with it
+        @param[in] p_file : XML file name
+        @param[in] p_sub_model_file_list : list of sub-model XML file names
+        @return (modification time, size, journal modification time, journal size) tuple, journal ones being None
+        if the XML file has no journal, followed by the ones of each sub-model
+        """
+        return tuple(value for xml_file in [p_file, *p_sub_model_file_list]
+                     for value in XmlManifest3SE.get_file_stamp(xml_file))
+
+    @staticmethod
+    def get_file_hash(p_file, p_sub_model_file_list=()):
+        """Get content hash of an XML file and of its journal, and of the sub-models loaded with it
+        @param[in] p_file : XML file name
+        @param[in] p_sub_model_file_list : list of sub-model XML file names
+        @return hexadecimal hash
+        """
+        return XmlSnapshot3SE.get_model_hash(p_file, p_sub_model_file_list)
@@ -0,0 +1,160 @@
+"""@defgroup xml_adapter
+Module for 3SE xml parsing and writing
+"""
+# Libraries
+import os
+import gc
+import pickle
+import hashlib
+import functools
+from importlib.metadata import version, PackageNotFoundError
+
+# Modules
+import datamodel
+from tools import Logger
+from .xml_journal import XmlJournal3SE
+from . import xml_registry
+
+# Constants
+# Format of the snapshot, to be changed each time the snapshot content changes independently of jarvis4se version
+SNAPSHOT_FORMAT = 1
+
+
+def get_jarvis_version():
+    """@ingroup xml_adapter
+    @anchor get_jarvis_version
+    Get the version of the installed jarvis4se package
+
+    @return version string, "unknown" if jarvis4se is not installed as a package
+    """
+    try:
+        jarvis_version = version('jarvis4se')
+    except PackageNotFoundError:
+        jarvis_version = "unknown"
+
+    return jarvis_version
+
+
+@functools.lru_cache(maxsize=None)
+def get_code_hash():
+    """@ingroup xml_adapter
+    @anchor get_code_hash
+    Get content hash of the modules defining the classes held by a snapshot (datamodel objects and containers of the
+    XML dictionary), computed once
+
+    @return hexadecimal hash, empty if a module file cannot be read
+    """
+    code_hash = hashlib.sha1()
+    try:
+        for module in (datamodel.datamodel, xml_registry):
+            with open(module.__file__, 'rb') as file:
+                code_hash.update(file.read())
+    except (OSError, TypeError) as ex:
+        Logger.set_debug(__name__, f"Unable to hash the datamodel modules: {str(ex)}")
+        return ""
+
+    return code_hash.hexdigest()
+
+
+class XmlSnapshot3SE:
+    """@ingroup xml_adapter
+    @anchor XmlSnapshot3SE
+    3SE model snapshot
+
+    Binary file kept next to the XML file of the model ("<model>.jcache"), holding the XML dictionary as parsed
+    from the XML file and its journal (see @ref XmlJournal3SE), with all the links between objects. The snapshot is
+    keyed by the content hash of the XML file and its journal, the jarvis4se version and the snapshot format: it is
+    only loaded if they all match, the XML file remaining the reference. If jarvis4se is not installed as a package,
+    the version is unknown and the snapshot is keyed by the content hash of the datamodel modules instead.
+
+    The snapshot is a pickle file, it shall only be loaded from a trusted folder as the XML file itself.
+    """
+
+    def __init__(self, p_xml_file):
+        """@var xml_file
+        XML file name
+
+        @var file
+        Snapshot file name
+        """
+        self.xml_file = p_xml_file
+        self.file = f"{os.path.splitext(p_xml_file)[0]}.jcache"
+
+    @staticmethod
+    def get_model_hash(p_xml_file, p_sub_model_file_list=()):
+        """Get content hash of an XML file and of its journal, and of the sub-models merged within it
+        @param[in] p_xml_file : XML file name
+        @param[in] p_sub_model_file_list : list of sub-model XML file names, see @ref XmlManifest3SE
+        @return hexadecimal hash
+        """
+        model_hash = hashlib.sha1()
+        for file_name in (f for xml_file in [p_xml_file, *p_sub_model_file_list]
+                          for f in (xml_file, XmlJournal3SE(xml_file).file)):
+            if os.path.isfile(file_name):
+                with open(file_name, 'rb') as file:
+                    for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                        model_hash.update(chunk)
+            # Else do nothing
+
+        return model_hash.hexdigest()
+
+    @staticmethod
+    def get_header(p_model_hash):
+        """Get the header identifying a snapshot
+        @param[in] p_model_hash : content hash of the XML file and its journal
+        @return header dictionary
+        """
+        jarvis_version = get_jarvis_version()
+        if jarvis_version == "unknown":
+            # Datamodel may change from one source checkout to another
+            jarvis_version = f"unknown-{get_code_hash()}"
+        # Else do nothing
+
+        return {'format': SNAPSHOT_FORMAT, 'version': jarvis_version, 'hash': p_model_hash}
+
+    def load(self, p_model_hash):
+        """Load the XML dictionary from the snapshot file if it matches the XML file
+        @param[in] p_model_hash : content hash of the XML file and its journal
+        @return XML dictionary, None if the snapshot does not exist, does not match or cannot be read
+        """
+        xml_dict = None
+        if os.path.isfile(self.file):
+            try:
+                with open(self.file, 'rb') as file_reader:
+                    if pickle.load(file_reader) == self.get_header(p_model_hash):
+                        # Objects graph is kept alive: garbage collections triggered by its creation would be useless
+                        is_gc_enabled = gc.isenabled()
+                        gc.disable()
+                        try:
+                            xml_dict = pickle.load(file_reader)
+                        finally:
+                            if is_gc_enabled:
+                                gc.enable()
+                            # Else do nothing
+                    else:
+                        Logger.set_debug(__name__, f"{self.file} does not match {self.xml_file}")
+            except (OSError, EOFError, AttributeError, ImportError, IndexError, pickle.UnpicklingError) as ex:
+                Logger.set_debug(__name__, f"Unable to read {self.file}: {str(ex)}")
+        # Else do nothing
+
+        return xml_dict
+
+    def save(self, p_model_hash, p_xml_dict):
+        """Write the XML dictionary within the snapshot file. The file is replaced at once so that it is never left
+        partially written.
+        @param[in] p_model_hash : content hash of the XML file and its journal, when parsed
+        @param[in] p_xml_dict : XML dictionary
+        @return None
+        """
+        # Process id distinguishes concurrent writers of the same snapshot, see @ref export_diagrams
+        tmp_file = f"{self.file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, 'wb') as file_writer:
+                pickle.dump(self.get_header(p_model_hash), file_writer, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(p_xml_dict, file_writer, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.file)
+        except (OSError, TypeError, RecursionError, pickle.PicklingError) as ex:
+            Logger.set_warning(__name__, f"Unable to write {self.file}: {str(ex)}")
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+            # Else do nothing
@@ -2,21 +2,64 @@
 Module for 3SE xml parsing and writing
 """
 # Libraries
+import os
+import copy
+import itertools
+import functools
 from lxml import etree
 
 # Modules
 import datamodel
 from . import util
-from tools import Logger
+from .xml_journal import XmlJournal3SE
+from .xml_manifest import XmlManifest3SE
+from .xml_snapshot import XmlSnapshot3SE
+from sqlite_adapter import SqliteStorage3SE
+from tools import Config, Logger
+
+
+def journaled(p_method):
+    """@ingroup xml_adapter
+    @anchor journaled
+    Decorate a method of @ref XmlWriter3SE modifying objects, so that the objects given as arguments are recorded
+    in the journal or in the SQLite storage at next save, in journal or SQLite mode
+
+    @param[in] p_method : method modifying objects
+    @return decorated method
+    """
+    @functools.wraps(p_method)
+    def wrapper(self, *args, **kwargs):
+        if self.is_journaled or self.storage is not None:
+            self.touch(args)
+        # Else do nothing
+
+        return p_method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class XmlWriter3SE:
     """@ingroup xml_adapter
     @anchor XmlWriter3SE
     3SE XML writer
+
+    In journal mode, saved modifications are appended to the journal of the model (see @ref XmlJournal3SE) instead
+    of rewriting the XML file. The journal is folded into the XML file by @ref compact, called at once when the
+    journal exceeds journal_max_size.
+
+    In SQLite mode, saved modifications are also written within the SQLite storage of the model (see
+    @ref SqliteStorage3SE), one transaction per save.
+
+    Objects of the given sub-models are merged within the XML elements tree (see @ref XmlManifest3SE). Each of them
+    is written back within its sub-model XML file, other objects being written within the XML file. Saved
+    modifications are then never appended to the journal.
     """
+    # Revisions are unique among all writers, so that a revision identifies a model state within the session
+    revision_counter = itertools.count(1)
+    # Journal size in bytes beyond which the journal is folded into the XML file
+    journal_max_size = 1024 * 1024
 
-    def __init__(self, xml_file):
+    def __init__(self, xml_file, p_is_journaled=None, p_is_stored=None, p_sub_model_file_list=()):
         """@var root
         Reference to the XML root object
 
@@ -25,6 +68,40 @@ class XmlWriter3SE:
 
         @var file
         Reference to the XML file to be written
+
+        @var is_buffered
+        Indicates if the modifications are kept in memory until @ref flush (True) or written at once (False)
+
+        @var is_loaded
+        Indicates if the XML file has been loaded in memory in buffered mode (True) or not (False)
+
+        @var is_modified
+        Indicates if the XML elements tree has been modified in buffered mode since the last flush (True)
+        or not (False)
+
+        @var revision
+        Model revision, changed each time the XML elements tree is modified
+
+        @var is_journaled
+        Indicates if the modifications are appended to the journal (True) or written within the XML file (False)
+
+        @var journal
+        Journal of the model
+
+        @var storage
+        SQLite storage of the model, None if not in SQLite mode
+
+        @var touched_dict
+        Dictionary of the (tag, id) of the objects modified since the last save, in journal or SQLite mode
+
+        @var element_dict
+        Dictionary of the object XML elements by (tag, id), see @ref get_element_list
+
+        @var sub_model_file_list
+        List of the sub-model XML files merged within the XML elements tree
+
+        @var owner_dict
+        Dictionary of the sub-model XML files by (tag, id) of the merged objects
         """
 
         self.root = etree.Element("systemAnalysis")
@@ -52,6 +129,289 @@ class XmlWriter3SE:
         else:
             self.file = "Output.xml"
 
+        self.is_buffered = False
+        self.is_loaded = False
+        self.is_modified = False
+        self.revision = next(XmlWriter3SE.revision_counter)
+
+        if p_is_journaled is None:
+            self.is_journaled = Config.is_journal
+        else:
+            self.is_journaled = p_is_journaled
+        self.journal = XmlJournal3SE(self.file)
+        if p_is_stored is None:
+            p_is_stored = Config.is_sqlite
+        # Else do nothing
+        if p_is_stored:
+            self.storage = SqliteStorage3SE(f"{os.path.splitext(self.file)[0]}.db")
+        else:
+            self.storage = None
+        self.touched_dict = {}
+        self.element_dict = {}
+        self.sub_model_file_list = list(p_sub_model_file_list)
+        self.owner_dict = {}
+
+    def start_buffer(self):
+        """Start buffered mode: the XML file is loaded once and all the modifications are kept in memory until
+        @ref flush
+        @return None
+        """
+        self.is_buffered = True
+
+    def flush(self):
+        """Write the modifications kept in memory within the XML file and stop buffered mode
+        @return None
+        """
+        if self.is_modified:
+            Logger.set_debug(__name__, self.flush.__name__)
+            self.commit()
+        # Else do nothing
+
+        self.is_buffered = False
+        # XML elements tree is kept in memory in journal mode, the XML file not reflecting the journal, and in
+        # SQLite mode, the SQLite storage being only filled in at loading
+        self.is_loaded = self.is_journaled or self.storage is not None
+        self.is_modified = False
+
+    def write_buffer(self):
+        """Write the modifications kept in memory within the XML file without stopping buffered mode, so that the XML
+        file reflects the model
+        @return None
+        """
+        if self.is_modified:
+            self.commit()
+            self.is_modified = False
+        # Else do nothing
+
+    def parse(self):
+        """Get the XML root object, parsing the XML file, replaying its journal and merging the sub-models unless
+        already loaded in buffered, journal or SQLite mode. In SQLite mode, the model is then imported within the
+        SQLite storage, unless the SQLite storage already matches the XML file.
+        @return XML root object
+        """
+        if not self.is_loaded:
+            parser = etree.XMLParser(remove_blank_text=True)
+            root = self.tree.parse(self.file, parser)
+            self.journal.replay(root)
+            self.owner_dict.clear()
+            for sub_model_file in self.sub_model_file_list:
+                self.owner_dict.update((key, sub_model_file) for key in XmlManifest3SE.merge(root, sub_model_file))
+            if self.storage is not None:
+                model_hash = XmlSnapshot3SE.get_model_hash(self.file, self.sub_model_file_list)
+                if self.storage.get_model_hash() != model_hash:
+                    self.storage.import_root(root, model_hash)
+                # Else SQLite storage is up to date
+            # Else do nothing
+            self.is_loaded = self.is_buffered or self.is_journaled or self.storage is not None
+            self.element_dict.clear()
+        else:
+            root = self.tree.getroot()
+
+        return root
+
+    def save(self):
+        """Save the modifications of the XML elements tree, within the XML file or in memory in buffered mode
+        @return None
+        """
+        self.revision = next(XmlWriter3SE.revision_counter)
+
+        if self.is_buffered:
+            self.is_modified = True
+        else:
+            self.commit()
+
+    def commit(self):
+        """Write the saved modifications: appended to the journal in journal mode, else within the XML file. They
+        are written first within the SQLite storage in SQLite mode.
+        @return None
+        """
+        if self.touched_dict:
+            record_list = self.get_journal_record_list()
+        else:
+            record_list = []
+
+        if self.storage is not None:
+            self.storage.apply_record_list(record_list)
+        # Else do nothing
+
+        if self.is_journaled and os.path.isfile(self.file) and not self.owner_dict:
+            self.journal.append(record_list)
+            if self.journal.get_size() > self.journal_max_size:
+                self.compact()
+            # Else do nothing
+        else:
+            self.write_file()
+
+        if self.storage is not None:
+            self.storage.set_model_hash(XmlSnapshot3SE.get_model_hash(self.file, self.sub_model_file_list))
+        # Else do nothing
+
+    def compact(self):
+        """Fold the journal into the XML file
+        @return None
+        """
+        self.parse()
+        self.write_file()
+        Logger.set_debug(__name__, f"{self.journal.file} folded into {self.file}")
+
+    def write_file(self):
+        """Write the XML elements tree within the XML file, objects merged from sub-models being written within
+        their sub-model XML file (see @ref write_sub_model_file). The file is replaced at once so that it is never
+        left partially written. The journal, folded into the XML file, is then removed.
+        @return None
+        """
+        # Objects merged from sub-models are detached while the XML file is written
+        detached_list = []
+        if self.owner_dict:
+            for elem in self.tree.getroot().iterfind('./*/*/*[@id]'):
+                if (elem.tag, elem.get('id')) in self.owner_dict:
+                    detached_list.append((elem.getparent(), elem.getparent().index(elem), elem))
+                # Else do nothing
+            for parent, _, elem in detached_list:
+                parent.remove(elem)
+        # Else do nothing
+
+        try:
+            tmp_file = f"{self.file}.tmp"
+            self.tree.write(tmp_file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+            os.replace(tmp_file, self.file)
+        finally:
+            for parent, index, elem in detached_list:
+                parent.insert(index, elem)
+        self.journal.clear()
+        self.touched_dict.clear()
+
+        sub_model_element_dict = {sub_model_file: {} for sub_model_file in self.owner_dict.values()}
+        for _, _, elem in detached_list:
+            key = (elem.tag, elem.get('id'))
+            sub_model_element_dict[self.owner_dict[key]][key] = elem
+        for sub_model_file, element_dict in sub_model_element_dict.items():
+            self.write_sub_model_file(sub_model_file, element_dict)
+
+    def write_sub_model_file(self, p_sub_model_file, p_element_dict):
+        """Write the objects merged from a sub-model within its XML file, only if any of them has been modified or
+        deleted. The journal of the sub-model, then folded into its XML file, is removed.
+        @param[in] p_sub_model_file : sub-model XML file name
+        @param[in] p_element_dict : dictionary of the object XML elements merged from the sub-model by (tag, id)
+        @return None
+        """
+        sub_tree = etree.parse(p_sub_model_file, etree.XMLParser(remove_blank_text=True))
+        sub_journal = XmlJournal3SE(p_sub_model_file)
+        sub_journal.replay(sub_tree.getroot())
+        is_modified = False
+        for sub_elem in list(sub_tree.getroot().iterfind('./*/*/*[@id]')):
+            key = (sub_elem.tag, sub_elem.get('id'))
+            if self.owner_dict.get(key) == p_sub_model_file:
+                elem = p_element_dict.get(key)
+                if elem is None:
+                    # Object deleted
+                    sub_elem.getparent().remove(sub_elem)
+                    del self.owner_dict[key]
+                    is_modified = True
+                elif etree.tostring(elem, with_tail=False) != etree.tostring(sub_elem, with_tail=False):
+                    sub_elem.getparent().replace(sub_elem, copy.deepcopy(elem))
+                    is_modified = True
+                # Else do nothing
+            # Else object defined by the root model
+
+        if is_modified:
+            tmp_file = f"{p_sub_model_file}.tmp"
+            sub_tree.write(tmp_file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+            os.replace(tmp_file, p_sub_model_file)
+            sub_journal.clear()
+            Logger.set_debug(__name__, f"{p_sub_model_file} updated")
+        # Else do nothing
+
+    def write_sub_model_list(self, p_sub_model_file_list):
+        """Declare sub-models of the model, see @ref XmlManifest3SE. The XML file is written at once, the journal
+        being folded into it in journal mode.
+        @param[in] p_sub_model_file_list : list of sub-model XML file names, relative to the folder of the XML file
+        @return None
+        """
+        root = self.parse()
+        sub_model_list_tag = root.find('subModelList')
+        if sub_model_list_tag is None:
+            sub_model_list_tag = etree.SubElement(root, 'subModelList')
+        # Else do nothing
+
+        for sub_model_file in p_sub_model_file_list:
+            if sub_model_list_tag.find(f"subModel[@file='{sub_model_file}']") is None:
+                etree.SubElement(sub_model_list_tag, 'subModel', {'file': sub_model_file})
+            # Else do nothing
+
+        if self.storage is not None:
+            # Sub-models are declared within the XML document, which is only stored at import
+            self.storage.import_root(root)
+        # Else do nothing
+
+        self.save()
+        if self.is_journaled:
+            self.compact()
+        # Else do nothing
+
+    def touch(self, p_arg):
+        """Record the objects found within a method argument as modified, see @ref journaled
+        @param[in] p_arg : method argument, object or (nested) list of objects
+        @return None
+        """
+        if isinstance(p_arg, (list, tuple, set)):
+            for arg in p_arg:
+                self.touch(arg)
+        elif hasattr(p_arg, 'id') and not isinstance(p_arg, (str, datamodel.BaseType)):
+            elem_tag = self.get_object_tag(p_arg)
+            if elem_tag:
+                self.touched_dict[(elem_tag, p_arg.id)] = None
+            # Else do nothing
+        # Else do nothing
+
+    def get_journal_record_list(self):
+        """Get the journal records of the objects modified since the last journal append
+        @return list of records
+        """
+        record_list = []
+        is_indexed = False
+        for elem_tag, elem_id in self.touched_dict:
+            elem = self.element_dict.get((elem_tag, elem_id))
+            if elem is None and not is_indexed:
+                # Object written since the last indexing
+                self.element_dict = {(e.tag, e.get('id')): e for e in self.tree.getroot().iterfind('./*/*/*[@id]')}
+                is_indexed = True
+                elem = self.element_dict.get((elem_tag, elem_id))
+            # Else do nothing
+
+            if elem is not None and elem.getparent() is not None:
+                record_list.append(XmlJournal3SE.get_set_record(elem))
+            else:
+                record_list.append(XmlJournal3SE.get_delete_record(elem_tag, elem_id))
+                self.element_dict.pop((elem_tag, elem_id), None)
+        self.touched_dict.clear()
+
+        return record_list
+
+    def get_element_list(self, p_elem_tag, p_elem_id, p_sub_path=None):
+        """Get the XML element of an object from the dictionary of the object XML elements, instead of searching
+        the whole XML elements tree. The dictionary is indexed again when the object is not found within it, e.g.
+        written since the last indexing.
+        @param[in] p_elem_tag : XML tag of the object
+        @param[in] p_elem_id : object id
+        @param[in] p_sub_path : path of the XML sub-elements to be got from the object XML element, if any
+        @return list of XML elements, empty if the object is not found
+        """
+        elem = self.element_dict.get((p_elem_tag, p_elem_id))
+        if elem is None or elem.getparent() is None:
+            self.element_dict = {(e.tag, e.get('id')): e for e in self.tree.getroot().iterfind('./*/*/*[@id]')}
+            elem = self.element_dict.get((p_elem_tag, p_elem_id))
+        # Else do nothing
+
+        if elem is None:
+            elem_list = []
+        elif p_sub_path is None:
+            elem_list = [elem]
+        else:
+            elem_list = elem.findall(p_sub_path)
+
+        return elem_list
+
     @staticmethod
     def check_object_type(obj):
         """Check object type against 3SE base types
@@ -66,18 +426,18 @@ class XmlWriter3SE:
 
         return type_str
 
+    @journaled
     def write_activity(self, activity_list):
         """Write activities from list of activities
         @param[in] activity_list : list of activities
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//activityList') is None:
+        if root.find('./*/activityList') is None:
             etree.SubElement(root.find('./funcArch'), 'activityList')
 
-        for activity_list_tag in root.findall(".//activityList"):
+        for activity_list_tag in root.findall("./*/activityList"):
             for activity in activity_list:
                 activity_tag = etree.SubElement(activity_list_tag, "activity",
                                                 {'id': activity.id,
@@ -86,20 +446,20 @@ class XmlWriter3SE:
                                                  'alias': activity.alias})
 
         Logger.set_debug(__name__, self.write_activity.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_function(self, function_list):
         """Write functions from list of functions
         @param[in] function_list : list of functions
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//functionList') is None:
+        if root.find('./*/functionList') is None:
             etree.SubElement(root.find('./funcArch'), 'functionList')
 
-        for function_list_tag in root.findall(".//functionList"):
+        for function_list_tag in root.findall("./*/functionList"):
             for function in function_list:
                 if function.derived is not None:
                     derived_elem_id = function.derived.id
@@ -126,20 +486,20 @@ class XmlWriter3SE:
                                                           {'id': str(allocated_req.id)})
 
         Logger.set_debug(__name__, self.write_function.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_data(self, data_list):
         """Write data from list of data
         @param[in] data_list : list of data
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//dataList') is None:
+        if root.find('./*/dataList') is None:
             etree.SubElement(root.find('./funcArch'), 'dataList')
 
-        for data_list_tag in root.findall('.//dataList'):
+        for data_list_tag in root.findall('./*/dataList'):
             for data in data_list:
                 data_tag = etree.SubElement(data_list_tag, "data",
                                             {'name': util.normalize_xml_string(data.name),
@@ -171,27 +531,24 @@ class XmlWriter3SE:
                                                            {'id': str(allocated_information_id)})
 
         Logger.set_debug(__name__, self.write_data.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_data_consumer(self, consumer_list):
         """Write consumers by list [data, function]
         @param[in] consumer_list : list of consumers
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        self.parse()
 
         for consumer in consumer_list:
-            for xml_element in root.findall(".//dataList/data[@name='" + util.normalize_xml_string(consumer[0].name)
-                                            + "']"):
+            for xml_element in self.get_element_list("data", consumer[0].id):
                 if xml_element.find('consumerList') is None:
                     etree.SubElement(xml_element, 'consumerList')
                     if xml_element.find('producerList') is None:
                         etree.SubElement(xml_element, 'producerList')
 
-            for consumer_list_tag in root.findall(".//dataList/data[@name='"
-                                                  + util.normalize_xml_string(consumer[0].name)
-                                                  + "']/consumerList"):
+            for consumer_list_tag in self.get_element_list("data", consumer[0].id, "consumerList"):
                 if not consumer[1].operand:
                     _consumer_tag = etree.SubElement(consumer_list_tag, "consumer",
                                                      {'id': consumer[1].id, 'role': "none"})
@@ -201,56 +558,50 @@ class XmlWriter3SE:
                                                       'role': util.normalize_xml_string(consumer[1].operand)})
 
         Logger.set_debug(__name__, self.write_data_consumer.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_data_producer(self, producer_list):
         """Write producers by list [data, function]
         @param[in] producer_list : list of producers
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        self.parse()
 
         for producer in producer_list:
-            for xml_element in root.findall(".//dataList/data[@name='" + util.normalize_xml_string(producer[0].name)
-                                            + "']"):
+            for xml_element in self.get_element_list("data", producer[0].id):
                 if xml_element.find('producerList') is None:
                     etree.SubElement(xml_element, 'producerList')
                     if xml_element.find('consumerList') is None:
                         etree.SubElement(xml_element, 'consumerList')
 
-            for producer_list_tag in root.findall(".//dataList/data[@name='"
-                                                  + util.normalize_xml_string(producer[0].name)
-                                                  + "']/producerList"):
+            for producer_list_tag in self.get_element_list("data", producer[0].id, "producerList"):
                 _producer_tag = etree.SubElement(producer_list_tag, "producer", {'id': producer[1].id})
 
         Logger.set_debug(__name__, self.write_data_producer.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_data_predecessor(self, predecessor_list):
         """Write predecessors by list [data, predecessor]
         @param[in] predecessor_list : list of predecessors
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        self.parse()
 
         for predecessor in predecessor_list:
-            for xml_element in root.findall(".//dataList/data[@name='"
-                                            + util.normalize_xml_string(predecessor[0].name)
-                                            + "']"):
+            for xml_element in self.get_element_list("data", predecessor[0].id):
                 if xml_element.find('predecessorList') is None:
                     etree.SubElement(xml_element, 'predecessorList')
 
-            for predecessor_list_tag in root.findall(".//dataList/data[@name='"
-                                                     + util.normalize_xml_string(predecessor[0].name)
-                                                     + "']/predecessorList"):
+            for predecessor_list_tag in self.get_element_list("data", predecessor[0].id, "predecessorList"):
                 _predecessor_tag = etree.SubElement(predecessor_list_tag, "predecessor",
                                                     {'id': predecessor[1].id})
 
         Logger.set_debug(__name__, self.write_data_predecessor.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_data_relationship(self, flow_function, relationship_type):
         """Write data relationship (either consumer or producer or predecessor)
 
@@ -270,6 +621,7 @@ class XmlWriter3SE:
         else:
             Logger.set_error(__name__, f"Unknown data relationship type: {relationship_type}")
 
+    @journaled
     def delete_data_relationship(self, flow_function, relationship_type):
         """Delete data relationship (either consumer or producer or predecessor)
 
@@ -277,35 +629,28 @@ class XmlWriter3SE:
         @param[in] relationship_type : "consumer" or "producer" or "predecessor"
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
-
-        for tag in root.findall(".//data[@name='"
-                                + util.normalize_xml_string(flow_function[0].name)
-                                + "']/"
-                                + relationship_type
-                                + "List/"
-                                + relationship_type
-                                + "[@id='"
-                                + flow_function[1].id
-                                + "']"):
+        self.parse()
+
+        for tag in self.get_element_list("data", flow_function[0].id,
+                                         relationship_type + "List/" + relationship_type + "[@id='"
+                                         + flow_function[1].id + "']"):
             tag.getparent().remove(tag)
 
         Logger.set_debug(__name__, self.delete_data_relationship.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_information(self, information_list):
         """Write information from list of information
         @param[in] information_list : list of information
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//informationList') is None:
+        if root.find('./*/informationList') is None:
             etree.SubElement(root.find('./funcArch'), 'informationList')
 
-        for data_list_tag in root.findall('.//informationList'):
+        for data_list_tag in root.findall('./*/informationList'):
             for information in information_list:
                 information_tag = etree.SubElement(data_list_tag, "information",
                                             {'name': util.normalize_xml_string(information.name),
@@ -325,83 +670,72 @@ class XmlWriter3SE:
                                                         {'id': predecessor.id})
 
         Logger.set_debug(__name__, self.write_data.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_information_consumer(self, consumer_list):
         """Write consumers by list [information, activity]
         @param[in] consumer_list : list of consumers
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        self.parse()
 
         for consumer in consumer_list:
-            for xml_element in root.findall(".//informationList/information[@name='"
-                                            + util.normalize_xml_string(consumer[0].name)
-                                            + "']"):
+            for xml_element in self.get_element_list("information", consumer[0].id):
                 if xml_element.find('consumerList') is None:
                     etree.SubElement(xml_element, 'consumerList')
                     if xml_element.find('producerList') is None:
                         etree.SubElement(xml_element, 'producerList')
 
-            for consumer_list_tag in root.findall(".//informationList/information[@name='"
-                                                  + util.normalize_xml_string(consumer[0].name)
-                                                  + "']/consumerList"):
+            for consumer_list_tag in self.get_element_list("information", consumer[0].id, "consumerList"):
                 _consumer_tag = etree.SubElement(consumer_list_tag, "consumer",
                                                  {'id': consumer[1].id})
 
         Logger.set_debug(__name__, self.write_information_consumer.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_information_producer(self, producer_list):
         """Write producers by list [information, activity]
         @param[in] producer_list : list of producers
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        self.parse()
 
         for producer in producer_list:
-            for xml_element in root.findall(".//informationList/information[@name='"
-                                            + util.normalize_xml_string(producer[0].name)
-                                            + "']"):
+            for xml_element in self.get_element_list("information", producer[0].id):
                 if xml_element.find('producerList') is None:
                     etree.SubElement(xml_element, 'producerList')
                     if xml_element.find('consumerList') is None:
                         etree.SubElement(xml_element, 'consumerList')
 
-            for producer_list_tag in root.findall(".//informationList/information[@name='"
-                                                  + util.normalize_xml_string(producer[0].name)
-                                                  + "']/producerList"):
+            for producer_list_tag in self.get_element_list("information", producer[0].id, "producerList"):
                 _producer_tag = etree.SubElement(producer_list_tag, "producer", {'id': producer[1].id})
 
         Logger.set_debug(__name__, self.write_information_producer.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_information_predecessor(self, predecessor_list):
         """Write predecessors by list [information, predecessor]
         @param[in] predecessor_list : list of predecessors
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        self.parse()
 
         for predecessor in predecessor_list:
-            for xml_element in root.findall(".//informationList/information[@name='"
-                                            + util.normalize_xml_string(predecessor[0].name)
-                                            + "']"):
+            for xml_element in self.get_element_list("information", predecessor[0].id):
                 if xml_element.find('predecessorList') is None:
                     etree.SubElement(xml_element, 'predecessorList')
 
-            for predecessor_list_tag in root.findall(".//informationList/information[@name='"
-                                                     + util.normalize_xml_string(predecessor[0].name)
-                                                     + "']/predecessorList"):
+            for predecessor_list_tag in self.get_element_list("information", predecessor[0].id, "predecessorList"):
                 _predecessor_tag = etree.SubElement(predecessor_list_tag, "predecessor",
                                                     {'id': predecessor[1].id})
 
         Logger.set_debug(__name__, self.write_information_predecessor.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_information_relationship(self, information_activity, relationship_type):
         """Write information relationship (either consumer or producer or predecessor)
 
@@ -422,6 +756,7 @@ class XmlWriter3SE:
         else:
             Logger.set_error(__name__, f"Unknown information relationship type: {relationship_type}")
 
+    @journaled
     def delete_information_relationship(self, information_activity, relationship_type):
         """Delete data relationship (either consumer or producer or predecessor)
 
@@ -429,42 +764,35 @@ class XmlWriter3SE:
         @param[in] relationship_type : "consumer" or "producer" or "predecessor"
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
-
-        for tag in root.findall(".//information[@name='"
-                                + util.normalize_xml_string(information_activity[0].name)
-                                + "']/"
-                                + relationship_type
-                                + "List/"
-                                + relationship_type
-                                + "[@id='"
-                                + information_activity[1].id
-                                + "']"):
+        self.parse()
+
+        for tag in self.get_element_list("information", information_activity[0].id,
+                                         relationship_type + "List/" + relationship_type + "[@id='"
+                                         + information_activity[1].id + "']"):
             tag.getparent().remove(tag)
 
         Logger.set_debug(__name__, self.delete_data_relationship.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
     def write(self):
         """Write within the XML file
         @return None
         """
         Logger.set_debug(__name__, self.write.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.write_file()
 
+    @journaled
     def write_state(self, state_list):
         """Write state from list of states
         @param[in] state_list : list of states
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//stateList') is None:
+        if root.find('./*/stateList') is None:
             etree.SubElement(root.find('./funcArch'), 'stateList')
 
-        for state_list_tag in root.findall(".//stateList"):
+        for state_list_tag in root.findall("./*/stateList"):
             for state in state_list:
                 state_tag = etree.SubElement(state_list_tag, "state",
                                              {'id': state.id,
@@ -491,20 +819,20 @@ class XmlWriter3SE:
                                                           {'id': allocated_req_id})
 
         Logger.set_debug(__name__, self.write_state.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_transition(self, transition_list):
         """Write transition from list of transitions
         @param[in] transition_list : list of transitions
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//transitionList') is None:
+        if root.find('./*/transitionList') is None:
             etree.SubElement(root.find('./funcArch'), 'transitionList')
 
-        for transition_list_tag in root.findall(".//transitionList"):
+        for transition_list_tag in root.findall("./*/transitionList"):
             for transition in transition_list:
                 transition_tag = etree.SubElement(transition_list_tag, "transition",
                                                   {'id': transition.id,
@@ -527,68 +855,66 @@ class XmlWriter3SE:
                                                           {'id': allocated_req_id})
 
         Logger.set_debug(__name__, self.write_transition.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_transition_condition(self, transition_condition_list):
         """Write transitions by list [transition, condition]
         @param[in] transition_condition_list : list of transitions
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
-
-        for transition_tag in root.findall(".//transition"):
-            for transition, condition in transition_condition_list:
-                if transition_tag.get('id') == transition.id:
-                    tag = transition_tag.find('conditionList')
-                    _state_part_tag = etree.SubElement(tag, "condition",
-                                                       {'text': util.normalize_xml_string(condition)})
+        self.parse()
+
+        for transition, condition in transition_condition_list:
+            for tag in self.get_element_list('transition', transition.id, 'conditionList'):
+                _state_part_tag = etree.SubElement(tag, "condition",
+                                                   {'text': util.normalize_xml_string(condition)})
 
         Logger.set_debug(__name__, self.write_transition_condition.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_transition_source(self, transition_source_list):
         """Write transition source by list [transition, source]
         @param[in] transition_source_list : list of sources
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        self.parse()
 
         for transition_src in transition_source_list:
-            for state_tag in root.findall(".//transition[@id='" + transition_src[0].id + "']"):
+            for state_tag in self.get_element_list("transition", transition_src[0].id):
                 state_tag.set('source', transition_src[1].id)
 
         Logger.set_debug(__name__, self.write_transition_source.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_transition_destination(self, transition_destination_list):
         """Write transition destination by list [transition, destination]
         @param[in] transition_destination_list : list of destinations
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        self.parse()
 
         for transition_dest in transition_destination_list:
-            for state_tag in root.findall(".//transition[@id='" + transition_dest[0].id + "']"):
+            for state_tag in self.get_element_list("transition", transition_dest[0].id):
                 state_tag.set('destination', transition_dest[1].id)
 
         Logger.set_debug(__name__, self.write_transition_destination.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_functional_element(self, functional_element_list):
         """Write functional element from list of functional elements
         @param[in] functional_element_list : list of functional elements
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//functionalElementList') is None:
+        if root.find('./*/functionalElementList') is None:
             etree.SubElement(root.find('./funcArch'), 'functionalElementList')
 
-        for functional_element_list_tag in root.findall(".//functionalElementList"):
+        for functional_element_list_tag in root.findall("./*/functionalElementList"):
             for functional_element in functional_element_list:
                 if functional_element.derived is not None:
                     derived_elem_id = functional_element.derived.id
@@ -634,8 +960,9 @@ class XmlWriter3SE:
                                                           {'id': allocated_req_id})
 
         Logger.set_debug(__name__, self.write_functional_element.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_element_exposed_interface(self, element_interface_list):
         """Write interface by list [element, interface]
         @param[in] element_interface_list : list of interfaces
@@ -644,33 +971,31 @@ class XmlWriter3SE:
         for element, inter in element_interface_list:
             element_tag = self.get_object_tag(element)
             if element_tag:
-                parser = etree.XMLParser(remove_blank_text=True)
-                root = self.tree.parse(self.file, parser)
-
-                for xml_element in root.findall(".//" + element_tag):
-                    if xml_element.find('exposedInterfaceList') is None:
-                        etree.SubElement(xml_element, 'exposedInterfaceList')
+                self.parse()
 
-                    if xml_element.get('id') == element.id:
-                        tag = xml_element.find('exposedInterfaceList')
-                        _exposed_interface_tag = etree.SubElement(tag, "exposedInterface",
-                                                                  {'id': inter.id})
+                for xml_element in self.get_element_list(element_tag, element.id):
+                    tag = xml_element.find('exposedInterfaceList')
+                    if tag is None:
+                        tag = etree.SubElement(xml_element, 'exposedInterfaceList')
+                    # Else do nothing
+                    _exposed_interface_tag = etree.SubElement(tag, "exposedInterface",
+                                                              {'id': inter.id})
 
                 Logger.set_debug(__name__, self.write_element_exposed_interface.__name__)
-                self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+                self.save()
 
+    @journaled
     def write_view(self, view_list):
         """Write view from list of views
         @param[in] view_list : list of views
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//viewList') is None:
+        if root.find('./*/viewList') is None:
             etree.SubElement(root.find('./viewPoint'), 'viewList')
 
-        for view_list_tag in root.findall(".//viewList"):
+        for view_list_tag in root.findall("./*/viewList"):
             for view in view_list:
                 if isinstance(view.type, datamodel.BaseType):
                     type_str = str(view.type)
@@ -689,20 +1014,20 @@ class XmlWriter3SE:
                                                            {'id': allocated_item_id})
 
         Logger.set_debug(__name__, self.write_view.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_attribute(self, attribute_list):
         """Write attribute from list of attributes
         @param[in] attribute_list : list of attributes
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//attributeList') is None:
+        if root.find('./*/attributeList') is None:
             etree.SubElement(root.find('./viewPoint'), 'attributeList')
 
-        for attribute_list_tag in root.findall(".//attributeList"):
+        for attribute_list_tag in root.findall("./*/attributeList"):
             for attribute in attribute_list:
                 attribute_tag = etree.SubElement(attribute_list_tag, "attribute",
                                                  {'id': attribute.id,
@@ -724,39 +1049,37 @@ class XmlWriter3SE:
                                                           {'id': allocated_req_id})
 
         Logger.set_debug(__name__, self.write_attribute.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_attribute_described_item(self, attribute_item_list):
         """Write attribute described item by list [attribute, (described_item, value)]
         @param[in] attribute_item_list : list of attribute described items
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        self.parse()
 
-        for attribute_element in root.findall(".//attribute"):
-            for attribute, item in attribute_item_list:
-                if attribute_element.get('id') == attribute.id:
-                    tag = attribute_element.find('describedItemList')
-                    _allocated_item_tag = etree.SubElement(tag, "describedItem",
-                                                           {'id': item[0].id,
-                                                            'value': util.normalize_xml_string(item[1])})
+        for attribute, item in attribute_item_list:
+            for tag in self.get_element_list('attribute', attribute.id, 'describedItemList'):
+                _allocated_item_tag = etree.SubElement(tag, "describedItem",
+                                                       {'id': item[0].id,
+                                                        'value': util.normalize_xml_string(item[1])})
 
         Logger.set_debug(__name__, self.write_attribute_described_item.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_functional_interface(self, functional_interface_list):
         """Write functional interface from list of functional interfaces
         @param[in] functional_interface_list : list of functional interfaces
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//functionalInterfaceList') is None:
+        if root.find('./*/functionalInterfaceList') is None:
             etree.SubElement(root.find('./funcArch'), 'functionalInterfaceList')
 
-        for fun_interface_list_tag in root.findall(".//functionalInterfaceList"):
+        for fun_interface_list_tag in root.findall("./*/functionalInterfaceList"):
             for fun_interface in functional_interface_list:
                 if fun_interface.derived is not None:
                     derived_elem_id = fun_interface.derived.id
@@ -784,20 +1107,20 @@ class XmlWriter3SE:
                                                           {'id': allocated_req_id})
 
         Logger.set_debug(__name__, self.write_functional_interface.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_physical_element(self, physical_element_list):
         """Write physical element from list of physical elements
         @param[in] physical_element_list : list of physical elements
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//physicalElementList') is None:
+        if root.find('./*/physicalElementList') is None:
             etree.SubElement(root.find('./phyArch'), 'physicalElementList')
 
-        for physical_element_list_tag in root.findall(".//physicalElementList"):
+        for physical_element_list_tag in root.findall("./*/physicalElementList"):
             for physical_element in physical_element_list:
                 if physical_element.derived is not None:
                     derived_elem_id = physical_element.derived.id
@@ -843,20 +1166,20 @@ class XmlWriter3SE:
                                                           {'id': allocated_req_id})
 
         Logger.set_debug(__name__, self.write_physical_element.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_physical_interface(self, physical_interface_list):
         """Write physical interface from list of physical interfaces
         @param[in] physical_interface_list : list of physical interfaces
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//physicalInterfaceList') is None:
+        if root.find('./*/physicalInterfaceList') is None:
             etree.SubElement(root.find('./phyArch'), 'physicalInterfaceList')
 
-        for phy_interface_list_tag in root.findall(".//physicalInterfaceList"):
+        for phy_interface_list_tag in root.findall("./*/physicalInterfaceList"):
             for phy_interface in physical_interface_list:
                 if phy_interface.derived is not None:
                     derived_elem_id = phy_interface.derived.id
@@ -884,7 +1207,7 @@ class XmlWriter3SE:
                                                           {'id': allocated_req_id})
 
         Logger.set_debug(__name__, self.write_physical_interface.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
     @staticmethod
     def get_object_tag(obj):
@@ -917,6 +1240,8 @@ class XmlWriter3SE:
             elem_tag = "attribute"
         elif isinstance(obj, datamodel.Requirement):
             elem_tag = "requirement"
+        elif isinstance(obj, datamodel.Goal):
+            elem_tag = "goal"
         elif isinstance(obj, datamodel.View):
             elem_tag = "view"
         elif isinstance(obj, datamodel.Type):
@@ -926,6 +1251,7 @@ class XmlWriter3SE:
             Logger.set_error(__name__, f"Unsupported type for object {obj.id}")
         return elem_tag
 
+    @journaled
     def write_object_alias(self, object_list):
         """Write object alias by list [object]
         @param[in] object_list : list of objects
@@ -934,15 +1260,15 @@ class XmlWriter3SE:
         for obj in object_list:
             elem_tag = self.get_object_tag(obj)
             if elem_tag:
-                parser = etree.XMLParser(remove_blank_text=True)
-                root = self.tree.parse(self.file, parser)
+                self.parse()
 
-                for obj_tag in root.findall(".//" + elem_tag + "[@id='" + obj.id + "']"):
+                for obj_tag in self.get_element_list(elem_tag, obj.id):
                     obj_tag.set('alias', str(obj.alias))
 
                 Logger.set_debug(__name__, self.write_object_alias.__name__)
-                self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+                self.save()
 
+    @journaled
     def write_object_derived(self, object_list):
         """Write object derived reference by list [object]
         @param[in] object_list : list of objects
@@ -951,15 +1277,15 @@ class XmlWriter3SE:
         for obj in object_list:
             elem_tag = self.get_object_tag(obj)
             if elem_tag:
-                parser = etree.XMLParser(remove_blank_text=True)
-                root = self.tree.parse(self.file, parser)
+                self.parse()
 
-                for obj_tag in root.findall(".//" + elem_tag + "[@id='" + obj.id + "']"):
+                for obj_tag in self.get_element_list(elem_tag, obj.id):
                     obj_tag.set('derived', str(obj.derived.id))
 
                 Logger.set_debug(__name__, self.write_object_derived.__name__)
-                self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+                self.save()
 
+    @journaled
     def write_object_type(self, object_list):
         """Write object type by list [object]
         @param[in] object_list : list of objects
@@ -968,15 +1294,15 @@ class XmlWriter3SE:
         for obj in object_list:
             elem_tag = self.get_object_tag(obj)
             if elem_tag:
-                parser = etree.XMLParser(remove_blank_text=True)
-                root = self.tree.parse(self.file, parser)
+                self.parse()
 
-                for obj_tag in root.findall(".//" + elem_tag + "[@id='" + obj.id + "']"):
+                for obj_tag in self.get_element_list(elem_tag, obj.id):
                     obj_tag.set('type', self.check_object_type(obj.type))
 
                 Logger.set_debug(__name__, self.write_object_type.__name__)
-                self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+                self.save()
 
+    @journaled
     def write_object_child(self, object_child_list):
         """Write object child by list [parent, child]
         @param[in] object_child_list : list of children
@@ -985,34 +1311,41 @@ class XmlWriter3SE:
         for parent, child in object_child_list:
             elem_tag = self.get_object_tag(parent)
             if elem_tag:
-                parser = etree.XMLParser(remove_blank_text=True)
-                root = self.tree.parse(self.file, parser)
-                for obj in root.findall(".//" + elem_tag):
-                    if obj.get('id') == parent.id:
-                        tag = obj.find(elem_tag + 'PartList')
-                        _obj_element_part_tag = etree.SubElement(tag,
-                                                                 elem_tag + 'Part',
-                                                                 {'id': child.id})
+                self.parse()
+                for obj in self.get_element_list(elem_tag, parent.id):
+                    tag = obj.find(elem_tag + 'PartList')
+                    _obj_element_part_tag = etree.SubElement(tag,
+                                                             elem_tag + 'Part',
+                                                             {'id': child.id})
 
                 Logger.set_debug(__name__, self.write_object_child.__name__)
-                self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+                self.save()
 
+    @journaled
     def delete_object(self, object_list):
-        """Delete object type by list [object]
+        """Delete object type by list [object]. Objects are deleted at once, each of them being found through
+        @ref get_element_list
         @param[in] object_list : list of objects
         @return None
         """
+        tag_id_dict = {}
         for obj in object_list:
             elem_tag = self.get_object_tag(obj)
             if elem_tag:
-                parser = etree.XMLParser(remove_blank_text=True)
-                root = self.tree.parse(self.file, parser)
+                tag_id_dict.setdefault(elem_tag, set()).add(obj.id)
+            # Else do nothing
 
-                for obj_tag in root.findall(".//" + elem_tag + "[@id='" + obj.id + "']"):
-                    obj_tag.getparent().remove(obj_tag)
+        if tag_id_dict:
+            self.parse()
 
-                Logger.set_debug(__name__, self.delete_object.__name__)
-                self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+            for elem_tag, id_set in tag_id_dict.items():
+                for obj_id in id_set:
+                    for obj_tag in self.get_element_list(elem_tag, obj_id):
+                        obj_tag.getparent().remove(obj_tag)
+
+            Logger.set_debug(__name__, self.delete_object.__name__)
+            self.save()
+        # Else do nothing
 
     @staticmethod
     def get_allocation_tag(obj):
@@ -1046,6 +1379,7 @@ class XmlWriter3SE:
 
         return elem_tag
 
+    @journaled
     def write_object_allocation(self, object_allocated_object_list):
         """Write allocated objects from list [Object, Allocated object]
         @param[in] object_allocated_object_list : list of allocated objects
@@ -1057,44 +1391,42 @@ class XmlWriter3SE:
 
             elem_tag = self.get_object_tag(obj)
             if elem_tag:
-                parser = etree.XMLParser(remove_blank_text=True)
-                root = self.tree.parse(self.file, parser)
+                self.parse()
 
-                for obj_tag in root.findall(".//" + elem_tag):
-                    if obj_tag.get('id') == obj.id:
-                        if elem_tag == "view":
-                            allocated_tag = self.get_allocation_tag(obj)
-                        else:
-                            allocated_tag = self.get_allocation_tag(allocated_obj)
-
-                        tag = obj_tag.find(allocated_tag + 'List')
-                        if tag is None:
-                            tag = etree.SubElement(obj_tag, allocated_tag + 'List')
-                        # Else do nothing
-
-                        if len(object_allocated_object) > 2:
-                            if object_allocated_object[2] is not None and object_allocated_object[3] is not None:
-                                _allocated_obj_tag = etree.SubElement(tag, allocated_tag,
-                                                                      {'id': allocated_obj.id,
-                                                                       'consumer': object_allocated_object[2].id,
-                                                                       'producer': object_allocated_object[3].id})
-                            else:
-                                _allocated_obj_tag = etree.SubElement(tag, allocated_tag,
-                                                                      {'id': allocated_obj.id,
-                                                                       'consumer': '',
-                                                                       'producer': ''
-                                                                       })
+                for obj_tag in self.get_element_list(elem_tag, obj.id):
+                    if elem_tag == "view":
+                        allocated_tag = self.get_allocation_tag(obj)
+                    else:
+                        allocated_tag = self.get_allocation_tag(allocated_obj)
+
+                    tag = obj_tag.find(allocated_tag + 'List')
+                    if tag is None:
+                        tag = etree.SubElement(obj_tag, allocated_tag + 'List')
+                    # Else do nothing
+
+                    if len(object_allocated_object) > 2:
+                        if object_allocated_object[2] is not None and object_allocated_object[3] is not None:
+                            _allocated_obj_tag = etree.SubElement(tag, allocated_tag,
+                                                                  {'id': allocated_obj.id,
+                                                                   'consumer': object_allocated_object[2].id,
+                                                                   'producer': object_allocated_object[3].id})
                         else:
                             _allocated_obj_tag = etree.SubElement(tag, allocated_tag,
                                                                   {'id': allocated_obj.id,
                                                                    'consumer': '',
                                                                    'producer': ''
                                                                    })
-                    # Else do nothing
+                    else:
+                        _allocated_obj_tag = etree.SubElement(tag, allocated_tag,
+                                                              {'id': allocated_obj.id,
+                                                               'consumer': '',
+                                                               'producer': ''
+                                                               })
 
             Logger.set_debug(__name__, self.write_object_allocation.__name__)
-            self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+            self.save()
 
+    @journaled
     def delete_object_allocation(self, object_allocated_object_list):
         """Delete allocated objects from list [Object, Allocated object]
         @param[in] object_allocated_object_list : list of allocated objects
@@ -1103,36 +1435,34 @@ class XmlWriter3SE:
         for obj, allocated_obj in object_allocated_object_list:
             elem_tag = self.get_object_tag(obj)
             if elem_tag:
-                parser = etree.XMLParser(remove_blank_text=True)
-                root = self.tree.parse(self.file, parser)
+                self.parse()
 
-                for obj_tag in root.findall(".//" + elem_tag):
-                    if obj_tag.get('id') == obj.id:
-                        if elem_tag == "view":
-                            allocated_tag = self.get_allocation_tag(obj)
-                        else:
-                            allocated_tag = self.get_allocation_tag(allocated_obj)
+                for obj_tag in self.get_element_list(elem_tag, obj.id):
+                    if elem_tag == "view":
+                        allocated_tag = self.get_allocation_tag(obj)
+                    else:
+                        allocated_tag = self.get_allocation_tag(allocated_obj)
 
-                        tag = obj_tag.find(allocated_tag + 'List')
+                    tag = obj_tag.find(allocated_tag + 'List')
 
-                        for allocated_obj_tag in tag.findall(allocated_tag + "[@id='" + allocated_obj.id + "']"):
-                            tag.remove(allocated_obj_tag)
+                    for allocated_obj_tag in tag.findall(allocated_tag + "[@id='" + allocated_obj.id + "']"):
+                        tag.remove(allocated_obj_tag)
 
             Logger.set_debug(__name__, self.delete_object_allocation.__name__)
-            self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+            self.save()
 
+    @journaled
     def write_type_element(self, type_list):
         """Write type element from list of types
         @param[in] type_list : list of types
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//typeList') is None:
+        if root.find('./*/typeList') is None:
             etree.SubElement(root.find('./viewPoint'), 'typeList')
 
-        for type_list_tag in root.findall(".//typeList"):
+        for type_list_tag in root.findall("./*/typeList"):
             for type_elem in type_list:
                 _elem_tag = etree.SubElement(type_list_tag, "type",
                                              {'id': type_elem.id,
@@ -1141,20 +1471,20 @@ class XmlWriter3SE:
                                               'base': self.check_object_type(type_elem.base)})
 
         Logger.set_debug(__name__, self.write_type_element.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_requirement(self, requirement_list):
         """Write attribute from list of attributes
         @param[in] requirement_list : list of requirements
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//requirementList') is None:
+        if root.find('./*/requirementList') is None:
             etree.SubElement(root.find('./viewPoint'), 'requirementList')
 
-        for requirement_list_tag in root.findall(".//requirementList"):
+        for requirement_list_tag in root.findall("./*/requirementList"):
             for requirement in requirement_list:
                 requirement_tag = etree.SubElement(requirement_list_tag, "requirement",
                                                    {'id': requirement.id,
@@ -1168,38 +1498,35 @@ class XmlWriter3SE:
                 _req_part_list_tag = etree.SubElement(requirement_tag, "requirementPartList")
 
         Logger.set_debug(__name__, self.write_requirement.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_requirement_text(self, p_text_list):
         """Write requirement text from list [requirement, text]
         @param[in] p_text_list : list of requirement text
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
-
-        for requirement_tag in root.findall(".//requirement"):
-            for req, text_req in p_text_list:
-                if requirement_tag.get('id') == req.id:
-                    tag = requirement_tag.find('text')
-                    tag.text = util.normalize_xml_string(text_req)
-                # Else do nothing
+        self.parse()
+
+        for req, text_req in p_text_list:
+            for tag in self.get_element_list('requirement', req.id, 'text'):
+                tag.text = util.normalize_xml_string(text_req)
 
         Logger.set_debug(__name__, self.write_requirement_text.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
+    @journaled
     def write_goal(self, goal_list):
         """Write goal from list of goals
         @param[in] goal_list : list of goals
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
+        root = self.parse()
 
-        if root.find('.//goalList') is None:
+        if root.find('./*/goalList') is None:
             etree.SubElement(root.find('./viewPoint'), 'goalList')
 
-        for goal_list_tag in root.findall(".//goalList"):
+        for goal_list_tag in root.findall("./*/goalList"):
             for goal in goal_list:
                 goal_tag = etree.SubElement(goal_list_tag, "goal",
                                                    {'id': goal.id,
@@ -1213,23 +1540,20 @@ class XmlWriter3SE:
                 _req_part_list_tag = etree.SubElement(goal_tag, "goalPartList")
 
         Logger.set_debug(__name__, self.write_goal.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        self.save()
 
 
+    @journaled
     def write_goal_text(self, p_text_list):
         """Write goal text from list [goal, text]
         @param[in] p_text_list : list of goal text
         @return None
         """
-        parser = etree.XMLParser(remove_blank_text=True)
-        root = self.tree.parse(self.file, parser)
-
-        for goal_tag in root.findall(".//goal"):
-            for goal, goal_req in p_text_list:
-                if goal_tag.get('id') == goal.id:
-                    tag = goal_tag.find('text')
-                    tag.text = util.normalize_xml_string(goal_req)
-                # Else do nothing
+        self.parse()
+
+        for goal, goal_req in p_text_list:
+            for tag in self.get_element_list('goal', goal.id, 'text'):
+                tag.text = util.normalize_xml_string(goal_req)
 
         Logger.set_debug(__name__, self.write_goal_text.__name__)
-        self.tree.write(self.file, encoding='utf-8', xml_declaration=True, pretty_print=True)
\ No newline at end of file
+        self.save()
\ No newline at end of file
@@ -15,6 +15,7 @@ Defines the following non regression tests:
 - @ref test_input_cell : Tests about Jarvis outputs
 - @ref test_magic_tools : Tests about Jarvis IPython magic tools
 - @ref test_question_answer : Tests about Jarvis answer to user's question
+- @ref test_sqlite_file : Tests about sqlite storage
 - @ref test_xml_file : Tests about xml file generation
 """
 
@@ -974,6 +975,58 @@ def input_test_fun_elem_with_interfaces_3():
                       ""])
 
 
+@pytest.fixture
+def input_test_function_sequence_cycle():
+    """@ingroup test_plantuml_sequence
+    @anchor input_test_function_sequence_cycle
+    Defines input fixture for @ref test_function_sequence_cycle_plantuml_sequence
+
+    @return input fixture
+
+    **Jarvis4se equivalent:**
+
+        A is a data
+        B is a data
+        C is a data
+        D is a data
+        F1 is a function
+        F2 is a function
+        F3 is a function
+        F1 produces A
+        F2 consumes A
+        F2 produces B
+        F3 consumes B
+        F3 produces C
+        F1 consumes C
+        F1 produces D
+        F3 consumes D
+        B implies A
+        C implies B
+        D implies C
+        C implies D
+    """
+    return "\n".join(["A is a data",
+                      "B is a data",
+                      "C is a data",
+                      "D is a data",
+                      "F1 is a function",
+                      "F2 is a function",
+                      "F3 is a function",
+                      "F1 produces A",
+                      "F2 consumes A",
+                      "F2 produces B",
+                      "F3 consumes B",
+                      "F3 produces C",
+                      "F1 consumes C",
+                      "F1 produces D",
+                      "F3 consumes D",
+                      "B implies A",
+                      "C implies B",
+                      "D implies C",
+                      "C implies D",
+                      ""])
+
+
 @pytest.fixture
 def input_test_entry_exit():
     """@ingroup test_plantuml_state
@@ -1907,6 +1960,152 @@ def input_test_fun_elem_with_internal_interfaces_plantuml_decomposition():
                       'I_A2_A3 allocates C'])
 
 
+@pytest.fixture
+def input_test_fun_elem_paged_decomposition():
+    """@ingroup test_plantuml_decomposition
+    @anchor input_test_fun_elem_paged_decomposition
+    Defines input fixture for @ref test_fun_elem_paged_plantuml_decomposition
+
+    @return input fixture
+
+    **Jarvis4se equivalent:**
+
+        E is a functional element
+        E1 is a functional element
+        E2 is a functional element
+        E3 is a functional element
+        E1 composes E
+        E2 composes E
+        E3 composes E
+        E11 is a functional element
+        E12 is a functional element
+        E11 composes E1
+        E12 composes E1
+        E21 is a functional element
+        E22 is a functional element
+        E21 composes E2
+        E22 composes E2
+    """
+    return "\n".join(["E is a functional element",
+                      "E1 is a functional element",
+                      "E2 is a functional element",
+                      "E3 is a functional element",
+                      "E1 composes E",
+                      "E2 composes E",
+                      "E3 composes E",
+                      "E11 is a functional element",
+                      "E12 is a functional element",
+                      "E11 composes E1",
+                      "E12 composes E1",
+                      "E21 is a functional element",
+                      "E22 is a functional element",
+                      "E21 composes E2",
+                      "E22 composes E2",
+                      ""])
+
+
+@pytest.fixture
+def input_test_fun_elem_budget_decomposition():
+    """@ingroup test_plantuml_decomposition
+    @anchor input_test_fun_elem_budget_decomposition
+    Defines input fixture for @ref test_fun_elem_budget_plantuml_decomposition
+
+    @return input fixture
+
+    **Jarvis4se equivalent:**
+
+        E is a functional element
+        E1 is a functional element
+        E2 is a functional element
+        E11 is a functional element
+        E12 is a functional element
+        E21 is a functional element
+        E1 composes E
+        E2 composes E
+        E11 composes E1
+        E12 composes E1
+        E21 composes E2
+        F1 is a function
+        F2 is a function
+        F3 is a function
+        F4 is a function
+        E allocates F1
+        E allocates F2
+        E allocates F3
+        E allocates F4
+        E1 allocates F1
+        E1 allocates F2
+        E11 allocates F1
+        E12 allocates F2
+        E2 allocates F3
+        E21 allocates F3
+        A is a data
+        B is a data
+        C is a data
+        F1 produces A
+        F2 consumes A
+        F2 produces B
+        F3 consumes B
+        F3 produces C
+        F4 consumes C
+        I_11_12 is a functional interface
+        I_11_12 allocates A
+        E11 exposes I_11_12
+        E12 exposes I_11_12
+        I_1_2 is a functional interface
+        I_1_2 allocates B
+        E1 exposes I_1_2
+        E12 exposes I_1_2
+        E2 exposes I_1_2
+        E21 exposes I_1_2
+    """
+    return "\n".join(["E is a functional element",
+                      "E1 is a functional element",
+                      "E2 is a functional element",
+                      "E11 is a functional element",
+                      "E12 is a functional element",
+                      "E21 is a functional element",
+                      "E1 composes E",
+                      "E2 composes E",
+                      "E11 composes E1",
+                      "E12 composes E1",
+                      "E21 composes E2",
+                      "F1 is a function",
+                      "F2 is a function",
+                      "F3 is a function",
+                      "F4 is a function",
+                      "E allocates F1",
+                      "E allocates F2",
+                      "E allocates F3",
+                      "E allocates F4",
+                      "E1 allocates F1",
+                      "E1 allocates F2",
+                      "E11 allocates F1",
+                      "E12 allocates F2",
+                      "E2 allocates F3",
+                      "E21 allocates F3",
+                      "A is a data",
+                      "B is a data",
+                      "C is a data",
+                      "F1 produces A",
+                      "F2 consumes A",
+                      "F2 produces B",
+                      "F3 consumes B",
+                      "F3 produces C",
+                      "F4 consumes C",
+                      "I_11_12 is a functional interface",
+                      "I_11_12 allocates A",
+                      "E11 exposes I_11_12",
+                      "E12 exposes I_11_12",
+                      "I_1_2 is a functional interface",
+                      "I_1_2 allocates B",
+                      "E1 exposes I_1_2",
+                      "E12 exposes I_1_2",
+                      "E2 exposes I_1_2",
+                      "E21 exposes I_1_2",
+                      ""])
+
+
 @pytest.fixture
 def input_test_requirement():
     """@ingroup test_requirement
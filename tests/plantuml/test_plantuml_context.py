@@ -6,6 +6,8 @@ Tests about Plantuml context diagrams
 # Modules
 import test_lib
 import plantuml_adapter
+import xml_adapter
+from jarvis.diagram import diagram_pager
 
 # Initialisation of Jarvis
 jarvis4se = test_lib.get_jarvis4se()[0]
@@ -237,6 +239,80 @@ def test_fun_elem_with_interfaces_plantuml_context(mocker, input_test_fun_elem_w
     assert len(result) - len(''.join(expected)) == 4 * len("\'id: xxxxxxxxxx\n")
 
 
+
+def test_fun_elem_for_interface_plantuml_context(mocker, input_test_fun_elem_with_interfaces):
+    """@ingroup test_plantuml_context
+    @anchor test_fun_elem_for_interface_plantuml_context
+    Test context diagram display of a functional element limited to one of its interfaces
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] input_test_fun_elem_with_interfaces : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_fun_elem_with_interfaces
+   """
+    spy = mocker.spy(plantuml_adapter, "get_fun_elem_context_diagram")
+    file_name = "test_fun_elem_for_interface_plantuml_context"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_fun_elem_with_interfaces}\n"
+                         f"show context Fun_elem_1 for interface Fun_inter_1")
+
+    # result = plantuml text without "@startuml ... @enduml" tags
+    result = spy.spy_return
+    expected = ['component "Fun_elem_2" as fun_elem_2 <<Functional element>>{\n',
+                'object "F2" as f2 <<Function>>\n',
+                '}\n',
+                'component "Fun_elem_1" as fun_elem_1 <<Functional element>>{\n',
+                'object "F1" as f1 <<Function>>\n',
+                '}\n',
+                'fun_elem_1', ' -- ', 'fun_elem_2 ', ': Fun_inter_1\n']
+
+    test_lib.remove_xml_file(file_name)
+
+    assert all(i in result for i in expected)
+    # Flows of data not allocated to the interface are not displayed
+    assert ': B\n' not in result
+    assert ': C\n' not in result
+    assert len(result) - len(''.join(expected)) == 4 * len("\'id: xxxxxxxxxx\n")
+
+
+def test_fun_elem_paged_plantuml_context(mocker, monkeypatch, input_test_fun_elem_with_interfaces):
+    """@ingroup test_plantuml_context
+    @anchor test_fun_elem_paged_plantuml_context
+    Test that an oversized context diagram of a functional element is split into pages per interface, the flows
+    without interface being displayed on a last page
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] monkeypatch : monkeypatch fixture reference
+    @param[in] input_test_fun_elem_with_interfaces : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_fun_elem_with_interfaces
+   """
+    monkeypatch.setattr(diagram_pager, "DIAGRAM_PAGE_SIZE", 300)
+    spy = mocker.spy(diagram_pager, "get_page_list")
+    file_name = "test_fun_elem_paged_plantuml_context"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_fun_elem_with_interfaces}\n"
+                         f"show context Fun_elem_1")
+
+    result = spy.spy_return
+    expected = ['context Fun_elem_1 for interface Fun_inter_1',
+                'context Fun_elem_1 without interface']
+
+    test_lib.remove_xml_file(file_name)
+
+    assert [page_str for page_str, _ in result] == expected
+    # Flows of data not allocated to any interface are displayed on the last page
+    assert 'fun_elem_1 -- fun_elem_2 : Fun_inter_1\n' in result[0][1]
+    assert ': B\n' not in result[0][1]
+    assert ': C\n' not in result[0][1]
+    assert 'f2 #--> f1 : B\n' in result[1][1]
+    assert 'f1 --> f1_o  : C\n' in result[1][1]
+
+
 def test_simple_state_in_out_plantuml_context(mocker, input_test_simple_state_in_out):
     """@ingroup test_plantuml_context
     @anchor test_simple_function_plantuml_context
@@ -388,3 +464,75 @@ def test_fun_elem_decomposed_with_interfaces_single_plantuml_context(mocker,
 
     assert all(i in result for i in expected)
     assert len(result) - len(''.join(expected)) == 6 * len("\'id: xxxxxxxxxx\n")
+
+
+def test_hub_function_plantuml_context(mocker):
+    """@ingroup test_plantuml_context
+    @anchor test_hub_function_plantuml_context
+    Test context diagram display of a function exchanging with several functions: only the flows of the function
+    are joined with their opposite functions, the unrelated flows of the model are not visited
+
+    @param[in] mocker : mocker fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_hub_function_plantuml_context
+        F1 is a function
+        F2 is a function
+        F3 is a function
+        F4 is a function
+        F5 is a function
+        a is a data
+        b is a data
+        c is a data
+        d is a data
+        F1 produces a
+        F2 consumes a
+        F1 produces b
+        F3 consumes b
+        F2 produces c
+        F1 consumes c
+        F4 produces d
+        F5 consumes d
+        show context F1
+    """
+    spy = mocker.spy(plantuml_adapter, "get_function_diagrams")
+    join_spy = mocker.spy(xml_adapter.IndexedFlowList, "get_element_list")
+    file_name = "test_hub_function_plantuml_context"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F1 is a function\n"
+                         "F2 is a function\n"
+                         "F3 is a function\n"
+                         "F4 is a function\n"
+                         "F5 is a function\n"
+                         "a is a data\n"
+                         "b is a data\n"
+                         "c is a data\n"
+                         "d is a data\n"
+                         "F1 produces a\n"
+                         "F2 consumes a\n"
+                         "F1 produces b\n"
+                         "F3 consumes b\n"
+                         "F2 produces c\n"
+                         "F1 consumes c\n"
+                         "F4 produces d\n"
+                         "F5 consumes d\n")
+    join_spy.reset_mock()
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show context F1\n")
+
+    # result = plantuml text without "@startuml ... @enduml" tags
+    result = spy.spy_return
+    expected = ['object "F1" as f1 <<Function>>\n',
+                'object "F2" as f2 <<Function>>\n',
+                'object "F3" as f3 <<Function>>\n',
+                'f1 #--> f2 : a\n',
+                'f1 #--> f3 : b\n',
+                'f2 #--> f1 : c\n']
+
+    test_lib.remove_xml_file(file_name)
+
+    assert all(i in result for i in expected)
+    assert 'f4' not in result and 'f5' not in result
+    assert sorted(call.args[1].name for call in join_spy.call_args_list) == ['a', 'b', 'c']
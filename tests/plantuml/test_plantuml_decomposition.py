@@ -7,6 +7,7 @@ Tests about Plantuml decomposition diagrams
 # Modules
 import test_lib
 import plantuml_adapter
+from jarvis.diagram import diagram_pager
 
 # Initialisation of Jarvis
 jarvis4se = test_lib.get_jarvis4se()[0]
@@ -335,4 +336,83 @@ def test_fun_elem_with_internal_interfaces_plantuml_decomposition(
     test_lib.remove_xml_file(file_name)
 
     assert all(i in result for i in expected)
-    assert len(result) - len(''.join(expected)) == 12 * len("\'id: xxxxxxxxxx\n")
\ No newline at end of file
+    assert len(result) - len(''.join(expected)) == 12 * len("\'id: xxxxxxxxxx\n")
+
+def test_fun_elem_paged_plantuml_decomposition(mocker, monkeypatch, input_test_fun_elem_paged_decomposition):
+    """@ingroup test_plantuml_decomposition
+    @anchor test_fun_elem_paged_plantuml_decomposition
+    Test that an oversized functional element decomposition is split into pages per subtree
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] monkeypatch : monkeypatch fixture reference
+    @param[in] input_test_fun_elem_paged_decomposition : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_fun_elem_paged_decomposition
+    """
+    monkeypatch.setattr(diagram_pager, "DIAGRAM_PAGE_SIZE", 300)
+    spy = mocker.spy(diagram_pager, "get_page_list")
+    url_spy = mocker.spy(jarvis4se.parser.generator, "get_diagram_url")
+    file_name = "test_fun_elem_paged_plantuml_decomposition"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_fun_elem_paged_decomposition}\n"
+                         "show decomposition E\n")
+
+    result = spy.spy_return
+    expected = ['decomposition E at level 1', 'decomposition E1', 'decomposition E2']
+
+    test_lib.remove_xml_file(file_name)
+
+    assert [page_str for page_str, _ in result] == expected
+    assert result[0][1].startswith('title decomposition E at level 1 (1/3)\n')
+    assert 'component "E3" as e3 <<Functional element>>{\n' in result[0][1]
+    assert 'component "E11"' not in result[0][1]
+    assert 'component "E11" as e11 <<Functional element>>{\n' in result[1][1]
+    assert 'component "E21" as e21 <<Functional element>>{\n' in result[2][1]
+    assert all(len(page_text) <= 300 for _, page_text in result)
+    assert url_spy.call_count == 3
+
+
+def test_fun_elem_budget_plantuml_decomposition(mocker, input_test_fun_elem_budget_decomposition):
+    """@ingroup test_plantuml_decomposition
+    @anchor test_fun_elem_budget_plantuml_decomposition
+    Test that functional elements beyond the node budget of a decomposition are collapsed into a summary, their
+    flows and interfaces being redirected to them
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] input_test_fun_elem_budget_decomposition : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_fun_elem_budget_decomposition
+    """
+    spy = mocker.spy(plantuml_adapter, "get_fun_elem_decomposition")
+    file_name = "test_fun_elem_budget_plantuml_decomposition"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_fun_elem_budget_decomposition}\n"
+                         "show decomposition E with budget 3\n")
+
+    # result = plantuml text without "@startuml ... @enduml" tags
+    result = spy.spy_return
+    expected = ['component "E" as e <<Functional element>>{\n',
+                'object "F4" as f4 <<Function>>\n',
+                'component "E1" as e1 <<Functional element>>{\n',
+                'object "functions: 2, flows: 1, interfaces: 2" as e1_summary <<Collapsed>>\n',
+                '}\n',
+                'component "E2" as e2 <<Functional element>>{\n',
+                'object "functions: 1, flows: 0, interfaces: 1" as e2_summary <<Collapsed>>\n',
+                '}\n',
+                '}\n',
+                'e2 #--> f4 : C\n',
+                'e1 -- e2 : I_1_2\n']
+
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show decomposition E with budget 0\n")
+    invalid_result = spy.call_count
+
+    test_lib.remove_xml_file(file_name)
+
+    assert all(i in result for i in expected)
+    assert len(result) - len(''.join(expected)) == 4 * len("\'id: xxxxxxxxxx\n")
+    assert invalid_result == 1
@@ -0,0 +1,87 @@
+"""@defgroup test_plantuml_renderer
+Tests about Plantuml rendering
+"""
+# Libraries
+import sys
+
+# Modules
+import plantuml_adapter
+from plantuml_adapter import plantuml_connector
+from plantuml_adapter.plantuml_renderer import PIPE_DELIMITER
+
+# PlantUml process stub: answers each diagram with a .svg giving its number of lines, followed by the delimiter on
+# the same line as PlantUml does, hangs on "@startuml hang"
+PLANTUML_PIPE_STUB = "\n".join([
+    "import sys",
+    "line_list = []",
+    "for line in sys.stdin:",
+    "    if line.startswith('@startuml hang'):",
+    "        sys.stdin.read()",
+    "    line_list.append(line)",
+    "    if line.startswith('@enduml'):",
+    "        sys.stdout.write(f'<svg>\\n{len(line_list)}</svg>" + PIPE_DELIMITER + "\\n')",
+    "        sys.stdout.flush()",
+    "        line_list = []",
+    ""])
+
+
+def test_pipe_renderer_plantuml_renderer():
+    """@ingroup test_plantuml_renderer
+    @anchor test_pipe_renderer_plantuml_renderer
+    Test that diagrams are rendered by a single PlantUml process, started again when it does not answer
+
+    @return None
+    """
+    renderer = plantuml_adapter.PlantUmlPipeRenderer(None, p_timeout=2,
+                                                     p_cmd=[sys.executable, "-c", PLANTUML_PIPE_STUB])
+
+    assert renderer.render("@startuml\nA -> B\n@enduml") == b"<svg>\n3</svg>"
+    process = renderer.process
+    assert renderer.render("@startuml\nA -> B\nB -> C\n@enduml") == b"<svg>\n4</svg>"
+    assert renderer.process is process
+
+    assert renderer.render("@startuml hang\n@enduml") is None
+    assert renderer.process is None
+
+    assert renderer.render("@startuml\n@enduml") == b"<svg>\n2</svg>"
+    assert renderer.process is not process
+
+    renderer.close()
+    assert renderer.process is None
+
+
+def test_lazy_server_plantuml_renderer(mocker, monkeypatch, tmp_path):
+    """@ingroup test_plantuml_renderer
+    @anchor test_lazy_server_plantuml_renderer
+    Test that java and network are only called at first diagram, and that the .jar version is only retrieved once
+    per .jar
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] monkeypatch : monkeypatch fixture reference
+    @param[in] tmp_path : tmp_path fixture reference
+    @return None
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "plantuml-1.2024.7.jar").write_bytes(b"jar")
+    monkeypatch.setattr(plantuml_connector.PlantUmlPicoServer, "version_cache_file",
+                        str(tmp_path / "cache" / "plantuml_version.json"))
+    monkeypatch.setattr(plantuml_connector.PlantUmlPicoServer, "ready_timeout", 0)
+    run_spy = mocker.patch.object(plantuml_connector.subprocess, "run",
+                                  return_value=mocker.Mock(stdout="PlantUML version 1.2024.7 (Sun Aug 25)"))
+    popen_spy = mocker.patch.object(plantuml_connector.subprocess, "Popen")
+    urlopen_spy = mocker.patch.object(plantuml_connector, "urlopen", side_effect=plantuml_connector.URLError(""))
+
+    generator = plantuml_adapter.PlantUmlConnector()
+    assert generator.plantuml_jar_path is not None
+    assert run_spy.call_count == 0
+    assert popen_spy.call_count == 0
+    assert urlopen_spy.call_count == 0
+
+    assert generator.get_diagram_url("A -> B\n").startswith("http://127.0.0.1:8080/plantuml/svg/")
+    generator.get_diagram_url("B -> C\n")
+    assert run_spy.call_count == 1
+    assert popen_spy.call_count == 1
+
+    # .jar version kept on disk
+    plantuml_adapter.PlantUmlConnector().get_diagram_url("A -> B\n")
+    assert run_spy.call_count == 1
@@ -44,3 +44,47 @@ def test_fun_elem_with_interfaces_plantuml_sequence(mocker, input_test_fun_elem_
 
     assert all(i in result for i in expected)
     assert len(result) == len(''.join(expected))
+
+
+def test_function_sequence_cycle_plantuml_sequence(capsys, mocker, input_test_function_sequence_cycle):
+    """@ingroup test_plantuml_sequence
+    @anchor test_function_sequence_cycle_plantuml_sequence
+    Test sequence diagram display for functions with a cycle between data predecessors
+
+    @param[in] capsys : capsys fixture reference
+    @param[in] mocker : mocker fixture reference
+    @param[in] input_test_function_sequence_cycle : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_function_sequence_cycle
+    """
+    spy = mocker.spy(plantuml_adapter, "get_sequence_diagram")
+    file_name = "function_sequence_cycle"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_function_sequence_cycle}\n"
+                         "show sequence F1, F2, F3\n")
+
+    # result = plantuml text without "@startuml ... @enduml" tags
+    result = spy.spy_return
+    expected = ['!pragma teoz true\n',
+                'participant "F1" as f1 <<Function>>\n',
+                'participant "F2" as f2 <<Function>>\n',
+                'participant "F3" as f3 <<Function>>\n',
+                'activate f1\n',
+                'activate f2\n',
+                'f1 -> f2 : 1- A\n',
+                'activate f3\n',
+                'f2 -> f3 : 2- B\n',
+                'deactivate f2\n',
+                'f3 -> f1 : C\n',
+                'f1 -> f3 : D\n',
+                'deactivate f1\n',
+                'deactivate f3\n']
+
+    captured = capsys.readouterr()
+    test_lib.remove_xml_file(file_name)
+
+    assert '[WARNING] Messages cannot be ordered because of the data predecessor cycle: D -> C -> D\n' in \
+           captured.out
+    assert result == ''.join(expected)
@@ -4,6 +4,7 @@ Tests about Plantuml state diagrams
 # Modules
 import test_lib
 import plantuml_adapter
+import xml_adapter
 
 # Initialisation of Jarvis
 jarvis4se = test_lib.get_jarvis4se()[0]
@@ -48,3 +49,91 @@ def test_entry_exit_plantuml_state(mocker, input_test_entry_exit):
 
     assert all(i in result for i in expected)
     assert len(result) - len(''.join(expected)) == 2 * len("\'id: xxxxxxxxxx\n")
+
+
+def test_fun_elem_plantuml_state(mocker):
+    """@ingroup test_plantuml_state
+    @anchor test_fun_elem_plantuml_state
+    Test state machine diagram display of functional elements: transitions are found through the state machine
+    index, built once per model revision
+
+    @param[in] mocker : mocker fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_fun_elem_plantuml_state
+        E1 is a functional element
+        E2 is a functional element
+        S0 is a state
+        S1 is a state
+        S2 is a state
+        S3 is a state
+        T0 is a transition
+        The source of T0 is S0
+        The destination of T0 is S1
+        T1 is a transition
+        The source of T1 is S1
+        The destination of T1 is S2
+        Condition for T1 is: A > 1
+        T2 is a transition
+        The source of T2 is S3
+        The destination of T2 is S3
+        E1 allocates S0
+        E1 allocates S1
+        E1 allocates S2
+        E2 allocates S3
+        ========================================
+        with test_fun_elem_plantuml_state
+        show state E1
+        ========================================
+        with test_fun_elem_plantuml_state
+        show state E2
+    """
+    spy = mocker.spy(plantuml_adapter, "get_state_machine_diagram")
+    index_spy = mocker.spy(xml_adapter.StateMachineIndex, "__init__")
+    file_name = "test_fun_elem_plantuml_state"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "E1 is a functional element\n"
+                         "E2 is a functional element\n"
+                         "S0 is a state\n"
+                         "S1 is a state\n"
+                         "S2 is a state\n"
+                         "S3 is a state\n"
+                         "T0 is a transition\n"
+                         "The source of T0 is S0\n"
+                         "The destination of T0 is S1\n"
+                         "T1 is a transition\n"
+                         "The source of T1 is S1\n"
+                         "The destination of T1 is S2\n"
+                         "Condition for T1 is: A > 1\n"
+                         "T2 is a transition\n"
+                         "The source of T2 is S3\n"
+                         "The destination of T2 is S3\n"
+                         "E1 allocates S0\n"
+                         "E1 allocates S1\n"
+                         "E1 allocates S2\n"
+                         "E2 allocates S3\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show state E1\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show state E2\n")
+
+    # result = plantuml text without "@startuml ... @enduml" tags
+    result_list = spy.spy_return_list
+    expected_list = [['state "S0" as s0 <<State>>\n',
+                      'state "S1" as s1 <<State>>\n',
+                      'state "S2" as s2 <<State>>\n',
+                      's0 --> s1 : No Condition Yet\n',
+                      's1 --> s2 : A > 1\n'],
+                     ['state "S3" as s3 <<State>>\n',
+                      's3 --> s3 : No Condition Yet\n']]
+
+    test_lib.remove_xml_file(file_name)
+
+    assert len(result_list) == 2
+    assert all(i in result_list[0] for i in expected_list[0])
+    assert 's3' not in result_list[0]
+    assert all(i in result_list[1] for i in expected_list[1])
+    assert 's1' not in result_list[1]
+    assert index_spy.call_count == 1
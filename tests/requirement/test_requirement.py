@@ -10,6 +10,9 @@ nltk.download('averaged_perceptron_tagger_eng')
 
 # Modules
 import test_lib
+import datamodel
+from xml_adapter import IndexedObjectSet, XML_DICT_KEY_8_REQUIREMENT_LIST
+from jarvis.orchestrator import orchestrator_viewpoint_requirement
 
 # Initialisation of Jarvis
 jarvis4se = test_lib.get_jarvis4se()[0]
@@ -112,4 +115,69 @@ def test_requirement_derivation(capsys, input_test_requirement):
 
     test_lib.remove_xml_file(file_name)
 
-    assert all(i in captured.out for i in expected)
\ No newline at end of file
+    assert all(i in captured.out for i in expected)
+
+
+def test_requirement_similarity_index():
+    """@ingroup test_requirement
+    @anchor test_requirement_similarity_index
+    Test that requirements with the same text are found through the similarity index, including after requirement
+    text changes and requirement removal
+
+    @return None
+    """
+    requirement_text_list = ['The system shall open the door',
+                             'The system shall open the doors',
+                             'The system shall close the door',
+                             'The door shall open the system',
+                             'If the system detects an emergency stop, then the system shall open the door',
+                             'When the system is stopped, the system shall open the door']
+    xml_requirement_list = IndexedObjectSet()
+    for index, requirement_text in enumerate(requirement_text_list):
+        requirement = datamodel.Requirement(p_id=str(index), p_name=f"REQ{index}")
+        requirement.set_text(requirement_text)
+        xml_requirement_list.add(requirement)
+    kwargs = {XML_DICT_KEY_8_REQUIREMENT_LIST: xml_requirement_list}
+
+    sequence_ratio_list = orchestrator_viewpoint_requirement.evaluate_text_similarities('the system',
+                                                                                       'open the door',
+                                                                                       '',
+                                                                                       '',
+                                                                                       **kwargs)
+    assert sequence_ratio_list == {}
+
+    sequence_ratio_list = orchestrator_viewpoint_requirement.evaluate_text_similarities('The system',
+                                                                                       'open the door',
+                                                                                       '',
+                                                                                       '',
+                                                                                       **kwargs)
+    assert sequence_ratio_list == {'REQ0': 1.0, 'REQ1': 1.0}
+
+    sequence_ratio_list = orchestrator_viewpoint_requirement.evaluate_text_similarities('the system',
+                                                                                       'open the door',
+                                                                                       'the system detects an '
+                                                                                       'emergency stop',
+                                                                                       '',
+                                                                                       **kwargs)
+    assert sequence_ratio_list == {'REQ4': 1.0}
+
+    # Index is updated with the requirements changed
+    requirement = xml_requirement_list.get_by_id('1')
+    requirement.set_text('The system shall lock the door')
+    orchestrator_viewpoint_requirement.update_requirement_similarity_index(xml_requirement_list, requirement)
+    requirement = xml_requirement_list.get_by_id('0')
+    xml_requirement_list.remove(requirement)
+    orchestrator_viewpoint_requirement.update_requirement_similarity_index(xml_requirement_list, requirement)
+    sequence_ratio_list = orchestrator_viewpoint_requirement.evaluate_text_similarities('The system',
+                                                                                       'open the door',
+                                                                                       '',
+                                                                                       '',
+                                                                                       **kwargs)
+    assert sequence_ratio_list == {}
+
+    sequence_ratio_list = orchestrator_viewpoint_requirement.evaluate_text_similarities('The system',
+                                                                                       'lock the doors',
+                                                                                       '',
+                                                                                       '',
+                                                                                       **kwargs)
+    assert sequence_ratio_list == {'REQ1': 1.0}
@@ -249,3 +249,62 @@ def test_function_output_auto_external_in(capsys, input_test_function_output_aut
     test_lib.remove_xml_file(file_name)
 
     assert all(i in last_out for i in expected)
+
+
+def test_alias_reference_in(capsys):
+    """@ingroup test_input_cell
+    @anchor test_alias_reference_in
+    Test that an object can be referenced by an alias set in a previous cell
+
+    @param[in] capsys : capture fixture reference
+    @return None
+    """
+    file_name = "test_alias_reference_in"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F1 is a function\n"
+                         "The alias of F1 is f1\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "The alias of F1 is g1\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F2 is a function\n"
+                         "g1 is composed of F2\n"
+                         "f1 is composed of F2\n")
+
+    captured = capsys.readouterr()
+    expected = ["The alias for F1 is g1\n",
+                "F1 is composed of F2\n",
+                "f1 does not exist"]
+
+    test_lib.remove_xml_file(file_name)
+
+    assert all(i in captured.out for i in expected)
+
+
+def test_command_order_in(capsys):
+    """@ingroup test_input_cell
+    @anchor test_command_order_in
+    Test that commands are handled by kind whatever their order within the cell, and that duplicated declarations
+    are handled once
+
+    @param[in] capsys : capture fixture reference
+    @return None
+    """
+    file_name = "test_command_order_in"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F2 composes F1. F2 consumes a\n"
+                         "F1 is a function. F2 is a function\n"
+                         "a is a data\n"
+                         "F1 is a function\n")
+
+    captured = capsys.readouterr()
+    expected = ["F1 is a Function\n",
+                "F2 is a Function\n",
+                "a is a Data\n",
+                "F1 is composed of F2\n",
+                'Function "F2" consumes data "a"\n']
+
+    test_lib.remove_xml_file(file_name)
+
+    assert all(i in captured.out for i in expected)
+    assert captured.out.count("F1 is a Function\n") == 1
+    assert captured.out.index("a is a Data\n") < captured.out.index("F1 is composed of F2\n")
@@ -42,6 +42,12 @@ def remove_xml_file(file_name):
     if path:
         os.remove(path)
 
+    # Journal, snapshot, sqlite storage and manifest of the XML file, if any
+    for extension in ('journal', 'jcache', 'db', 'manifest'):
+        file_path = os.path.join("./", f"{file_name}.{extension}")
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
 
 def remove_csv_file(file_name):
     """@ingroup test_lib
@@ -2,7 +2,9 @@
 Tests about Jarvis IPython magic tools
 """
 # Libraries
-
+import os
+import sys
+import subprocess
 
 # Modules
 import test_lib
@@ -64,3 +66,16 @@ def test_diagram_cell_tool(capsys, mocker):
     captured = capsys.readouterr()
     assert spy.spy_return == expected_plantuml_link
     assert captured.out == expected_notebook_output
+
+
+def test_lazy_nltk_tool():
+    """@ingroup test_magic_tools
+    Test that loading Jarvis does not load NLTK, which is only needed by requirement analysis
+
+    @return None
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run([sys.executable, "-c", "import sys, jarvis; print('nltk' in sys.modules)"],
+                            capture_output=True, text=True, env=env)
+
+    assert result.stdout.strip().endswith("False")
@@ -0,0 +1,174 @@
+"""@defgroup test_sqlite_file
+Tests about sqlite storage
+"""
+# Libraries
+from lxml import etree
+
+# Modules
+import test_lib
+from sqlite_adapter import SqliteStorage3SE
+from tools import Config
+
+# Initialisation of Jarvis
+jarvis4se = test_lib.get_jarvis4se()[0]
+
+
+def get_canonical_xml(p_xml_file):
+    """@ingroup test_sqlite_file
+    @anchor get_canonical_xml
+    Get the XML file content without formatting
+
+    @param[in] p_xml_file : XML file name
+    @return XML string
+    """
+    parser = etree.XMLParser(remove_blank_text=True)
+
+    return etree.tostring(etree.parse(p_xml_file, parser))
+
+
+def test_round_trip_sqlite(input_test_fun_elem_with_attribute):
+    """@ingroup test_sqlite_file
+    @anchor test_round_trip_sqlite
+    Test that the XML file imported within the sqlite storage is exported unchanged
+
+    @param[in] input_test_fun_elem_with_attribute : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_fun_elem_with_attribute
+    """
+    file_name = "test_round_trip_sqlite"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_fun_elem_with_attribute[0]}\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_fun_elem_with_attribute[1]}\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_fun_elem_with_attribute[2]}\n")
+
+    storage = SqliteStorage3SE(file_name + ".db")
+    storage.import_xml(file_name + ".xml")
+    storage.export_xml(file_name + "_export.xml")
+    storage.close()
+
+    xml = get_canonical_xml(file_name + ".xml")
+    exported_xml = get_canonical_xml(file_name + "_export.xml")
+
+    test_lib.remove_xml_file(file_name)
+    test_lib.remove_xml_file(file_name + "_export")
+
+    assert exported_xml == xml
+
+
+def test_incremental_sqlite(monkeypatch):
+    """@ingroup test_sqlite_file
+    @anchor test_incremental_sqlite
+    Test that, in sqlite mode, modifications are written within the sqlite storage and queried through its indexes
+
+    @param[in] monkeypatch : monkeypatch fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_incremental_sqlite
+        F is a function
+        F1 is a function
+        F is composed of F1
+        a is a data
+        F1 produces a
+        b is a data
+        E is a functional element
+        E allocates F1
+        ========================================
+        with test_incremental_sqlite
+        A is an attribute
+        The A of F1 is 4
+        ========================================
+        with test_incremental_sqlite
+        delete b
+    """
+    file_name = "test_incremental_sqlite"
+    monkeypatch.setattr(Config, "is_sqlite", True)
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F is a function\n"
+                         "F1 is a function\n"
+                         "F is composed of F1\n"
+                         "a is a data\n"
+                         "F1 produces a\n"
+                         "b is a data\n"
+                         "E is a functional element\n"
+                         "E allocates F1\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "A is an attribute\n"
+                         "The A of F1 is 4\n")
+
+    storage = SqliteStorage3SE(file_name + ".db")
+    assert storage.get_object_by_name('data', 'b') is not None
+    function_id = storage.get_object_by_name('function', 'F1').get('id')
+    assert storage.get_name_list('function', storage.get_parent_id_list(function_id)) == ['F']
+    assert storage.get_name_list('data', storage.get_element_flow_id_list(function_id, 'producer')) == ['a']
+    assert storage.get_name_list('functionalElement',
+                                 storage.get_allocating_id_list(function_id, 'functionalElement')) == ['E']
+    assert [value for _, value in storage.get_attribute_value_list(function_id)] == ['4']
+
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "delete b\n")
+    assert storage.get_object_by_name('data', 'b') is None
+
+    storage.export_xml(file_name + "_export.xml")
+    storage.close()
+
+    xml = get_canonical_xml(file_name + ".xml")
+    exported_xml = get_canonical_xml(file_name + "_export.xml")
+
+    test_lib.remove_xml_file(file_name)
+    test_lib.remove_xml_file(file_name + "_export")
+
+    assert exported_xml == xml
+
+
+def test_stale_sqlite(monkeypatch, mocker):
+    """@ingroup test_sqlite_file
+    @anchor test_stale_sqlite
+    Test that, in sqlite mode, the model is imported within the sqlite storage only when the sqlite storage does not
+    match the XML file
+
+    @param[in] monkeypatch : monkeypatch fixture reference
+    @param[in] mocker : mocker fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_stale_sqlite
+        F is a function
+        ========================================
+        with test_stale_sqlite
+        F1 is a function
+        ========================================
+        with test_stale_sqlite
+        F2 is a function
+    """
+    file_name = "test_stale_sqlite"
+    monkeypatch.setattr(Config, "is_sqlite", True)
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F is a function\n")
+
+    import_spy = mocker.spy(SqliteStorage3SE, "import_root")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F1 is a function\n")
+    assert import_spy.call_count == 0
+
+    # XML file modified outside of the sqlite mode
+    xml = get_canonical_xml(file_name + ".xml")
+    with open(file_name + ".xml", "wb") as file:
+        file.write(xml.replace(b'name="F1"', b'name="F3"'))
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F2 is a function\n")
+    assert import_spy.call_count == 1
+
+    storage = SqliteStorage3SE(file_name + ".db")
+    name_list = [name for name in ('F', 'F1', 'F2', 'F3') if storage.get_object_by_name('function', name) is not None]
+    storage.close()
+
+    test_lib.remove_xml_file(file_name)
+
+    assert name_list == ['F', 'F2', 'F3']
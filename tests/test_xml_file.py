@@ -3,12 +3,24 @@ Tests about xml file generation
 """
 # Libraries
 import os
+import gc
+import shutil
+import threading
 from pathlib import Path
+from unittest import mock
+import pytest
+from lxml import etree
 
 # Modules
 import test_lib
-from xml_adapter import XmlParser3SE
+from xml_adapter import XmlParser3SE, XmlWriter3SE, XmlProjection3SE, XmlSession3SE, IndexedObjectSet, \
+    IndexedFlowList, ReferenceIndex, XmlSectionDict
+from xml_adapter import XmlDictKeyListForObjects
+from xml_adapter import xml_manifest
 from datamodel import BaseType
+from plantuml_adapter import plantuml_connector
+from jarvis.diagram import diagram_generator, DiagramCache
+from tools import Config
 
 # Initialisation of Jarvis
 jarvis4se = test_lib.get_jarvis4se()[0]
@@ -340,3 +352,1025 @@ def test_function_output_auto_external_xml(input_test_function_output_auto_decom
     assert result_producer_list == expected_producer_list
 
     test_lib.remove_xml_file(file_name)
+
+
+def test_model_session_xml(mocker, input_test_simple_function):
+    """@ingroup test_xml_file
+    @anchor test_model_session_xml
+    Test that the xml file is parsed once between cells, and parsed again only when changed on disk
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] input_test_simple_function : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_simple_function
+    """
+    spy = mocker.spy(XmlParser3SE, "parse_xml")
+    file_name = "test_model_session_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_simple_function}\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F2 is a function\n")
+    jarvis4se.jarvis("", f"with {file_name}\n")
+
+    assert spy.call_count == 0
+
+    # Model changed on disk outside the session
+    path = Path(os.path.join("./", file_name + ".xml"))
+    read_xml = path.read_text(encoding="utf-8")
+    path.write_text(read_xml.replace('name="F2"', 'name="F3"'), encoding="utf-8")
+    jarvis4se.jarvis("", f"with {file_name}\n")
+
+    assert spy.call_count == 1
+    assert {f.name for f in jarvis4se.session.xml_dict['xml_function_list']} == {'F1', 'F3'}
+
+    # Model possibly changed in memory by a failed cell
+    with mock.patch.object(jarvis4se.parser, "lookup_command_list", side_effect=RuntimeError):
+        with pytest.raises(RuntimeError):
+            jarvis4se.jarvis("", f"with {file_name}\n"
+                                 "F4 is a function\n")
+    jarvis4se.jarvis("", f"with {file_name}\n")
+
+    test_lib.remove_xml_file(file_name)
+
+    assert spy.call_count == 2
+
+
+def test_session_view_xml(mocker):
+    """@ingroup test_xml_file
+    @anchor test_session_view_xml
+    Test that a view activated within a cell is not active anymore in the next cells reusing the model
+
+    @param[in] mocker : mocker fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_session_view_xml
+        F is a function
+        F1 is a function
+        F3 is a function
+        F is composed of F1
+        F is composed of F3
+        ========================================
+        with test_session_view_xml
+        under V
+        consider F, F1
+        ========================================
+        with test_session_view_xml
+        F2 is a function
+        consider F2
+        ========================================
+        with test_session_view_xml
+        show decomposition F
+    """
+    file_name = "test_session_view_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F is a function\n"
+                         "F1 is a function\n"
+                         "F3 is a function\n"
+                         "F is composed of F1\n"
+                         "F is composed of F3\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "under V\n"
+                         "consider F, F1\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F2 is a function\n"
+                         "consider F2\n")
+
+    show_spy = mocker.spy(diagram_generator, "filter_show_command")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show decomposition F\n")
+    jarvis4se.parser.wait_diagrams()
+
+    obj_dict = xml_parser.parse_xml(file_name + ".xml")
+    view = obj_dict['xml_view_list'].get_by_name('V')
+    allocated_name_set = {obj_dict['xml_function_list'].get_by_id(item_id).name
+                          for item_id in view.allocated_item_list}
+
+    test_lib.remove_xml_file(file_name)
+
+    assert allocated_name_set == {'F', 'F1'}
+    assert not any(v.activated for v in jarvis4se.session.xml_dict['xml_view_list'])
+    assert 'F3' in show_spy.spy_return
+
+
+def get_model_description(p_xml_dict):
+    """@ingroup test_xml_file
+    @anchor get_model_description
+    Get the content of an XML dictionary, objects being referred by identifier and containers being sorted
+
+    @param[in] p_xml_dict : XML dictionary
+    @return dictionary of object descriptions and relationships by XML dictionary key
+    """
+    def describe(p_value):
+        if isinstance(p_value, (str, int, float, bool)) or p_value is None:
+            description = p_value
+        elif isinstance(p_value, (set, list, tuple)):
+            description = sorted((describe(v) for v in p_value), key=repr)
+        elif isinstance(p_value, dict):
+            description = sorted(([describe(k), describe(v)] for k, v in p_value.items()), key=repr)
+        elif hasattr(p_value, 'id'):
+            description = p_value.id
+        else:
+            description = repr(p_value)
+
+        return description
+
+    model_description = {key: sorted(([obj.id, sorted([attribute, describe(value)]
+                                                       for attribute, value in vars(obj).items())]
+                                      for obj in p_xml_dict[key]), key=repr)
+                         for key in XmlDictKeyListForObjects}
+    for key in ('xml_consumer_function_list', 'xml_producer_function_list', 'xml_consumer_activity_list',
+                'xml_producer_activity_list'):
+        model_description[key] = sorted([flow.id, elem.id] for flow, elem in p_xml_dict[key])
+
+    return model_description
+
+
+def test_session_model_xml():
+    """@ingroup test_xml_file
+    @anchor test_session_model_xml
+    Test that the model kept by the session between cells matches its XML file
+
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_session_model_xml
+        F is a function
+        F1 is a function
+        F2 is a function
+        F is composed of F1, F2
+        a is a data
+        b is a data
+        F1 produces a
+        F2 consumes a
+        F2 produces b
+        ========================================
+        with test_session_model_xml
+        E is a functional element
+        F1 is allocated to E
+        I is a functional interface
+        E exposes I
+        ========================================
+        with test_session_model_xml
+        S is a state
+        S1 is a state
+        T is a transition
+        Condition for T is: VOLTAGE > 7V
+        The source of T is S
+        The destination of T is S1
+        T2 is a transition
+        S is allocated to E
+        ========================================
+        with test_session_model_xml
+        A is an attribute
+        The A of F1 is 4
+        P is a physical element
+        P allocates E
+        ACT is an activity
+        P allocates ACT
+        ========================================
+        with test_session_model_xml
+        P allocates E
+        F3 is a function
+        F3 consumes b
+        The alias of F1 is f1
+        ========================================
+        with test_session_model_xml
+        delete F3
+        delete T2
+        Q is a physical interface
+        P exposes Q
+    """
+    file_name = "test_session_model_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F is a function\n"
+                         "F1 is a function\n"
+                         "F2 is a function\n"
+                         "F is composed of F1, F2\n"
+                         "a is a data\n"
+                         "b is a data\n"
+                         "F1 produces a\n"
+                         "F2 consumes a\n"
+                         "F2 produces b\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "E is a functional element\n"
+                         "F1 is allocated to E\n"
+                         "I is a functional interface\n"
+                         "E exposes I\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "S is a state\n"
+                         "S1 is a state\n"
+                         "T is a transition\n"
+                         "Condition for T is: VOLTAGE > 7V\n"
+                         "The source of T is S\n"
+                         "The destination of T is S1\n"
+                         "T2 is a transition\n"
+                         "S is allocated to E\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "A is an attribute\n"
+                         "The A of F1 is 4\n"
+                         "P is a physical element\n"
+                         "P allocates E\n"
+                         "ACT is an activity\n"
+                         "P allocates ACT\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "P allocates E\n"
+                         "F3 is a function\n"
+                         "F3 consumes b\n"
+                         "The alias of F1 is f1\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "delete F3\n"
+                         "delete T2\n"
+                         "Q is a physical interface\n"
+                         "P exposes Q\n")
+
+    session_model_description = get_model_description(jarvis4se.session.xml_dict)
+    obj_dict = XmlParser3SE().parse_xml(file_name + ".xml")
+    model_description = get_model_description(obj_dict)
+    allocated_fun_elem_count = len(etree.parse(file_name + ".xml").findall('.//allocatedFunctionalElement'))
+
+    test_lib.remove_xml_file(file_name)
+
+    assert session_model_description == model_description
+    assert {t.name for t in obj_dict['xml_transition_list']} == {'T'}
+    assert allocated_fun_elem_count == 1
+
+
+def test_buffered_write_xml(mocker, input_test_fun_elem_with_attribute):
+    """@ingroup test_xml_file
+    @anchor test_buffered_write_xml
+    Test that the xml file is written once per cell
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] input_test_fun_elem_with_attribute : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_fun_elem_with_attribute
+    """
+    file_name = "test_buffered_write_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n")
+
+    spy = mocker.spy(XmlWriter3SE, "write_file")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_fun_elem_with_attribute[0]}\n"
+                         f"{input_test_fun_elem_with_attribute[1]}\n"
+                         f"{input_test_fun_elem_with_attribute[2]}\n")
+
+    assert spy.call_count == 1
+
+    obj_dict = xml_parser.parse_xml(file_name + ".xml")
+
+    assert len(obj_dict['xml_function_list']) == 1
+    assert len(obj_dict['xml_fun_elem_list']) == 1
+    assert len(obj_dict['xml_attribute_list']) == 3
+    assert sum(len(a.described_item_list) for a in obj_dict['xml_attribute_list']) == 4
+
+    test_lib.remove_xml_file(file_name)
+
+
+def test_flow_index_xml(input_test_function_output_auto_decomposition):
+    """@ingroup test_xml_file
+    @anchor test_flow_index_xml
+    Test consumer / producer relationships lookup by flow and by function
+
+    @param[in] input_test_function_output_auto_decomposition : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_function_output_auto_decomposition
+    """
+    file_name = "test_flow_index_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_function_output_auto_decomposition[0]}\n"
+                         f"{input_test_function_output_auto_decomposition[1]}\n")
+
+    obj_dict = xml_parser.parse_xml(file_name + ".xml")
+
+    test_lib.remove_xml_file(file_name)
+
+    consumer_list = obj_dict['xml_consumer_function_list']
+    producer_list = obj_dict['xml_producer_function_list']
+    data_a = obj_dict['xml_data_list'].get_by_name("a")
+    fun_f2 = obj_dict['xml_function_list'].get_by_name("F2")
+
+    assert isinstance(consumer_list, IndexedFlowList)
+    assert [data_a, fun_f2] in consumer_list
+    assert [data_a, fun_f2] not in producer_list
+    assert consumer_list.get_flow_list(fun_f2) == [data_a]
+    assert {f.name for f in producer_list.get_element_list(data_a)} == {'F', 'F1'}
+
+    consumer_list.remove([data_a, fun_f2])
+
+    assert not consumer_list.has_flow(data_a)
+    assert not consumer_list.has_element(fun_f2)
+    assert producer_list.has_flow(data_a)
+
+
+def test_show_model_unchanged_xml(mocker, input_test_function_simple_decomposition):
+    """@ingroup test_xml_file
+    @anchor test_show_model_unchanged_xml
+    Test that diagram display does not alter the model kept between cells
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] input_test_function_simple_decomposition : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_function_simple_decomposition
+    """
+    def get_model_snapshot(p_xml_dict):
+        return ({f.name: (f.parent.name if f.parent else None, sorted(c.name for c in f.child_list))
+                 for f in p_xml_dict['xml_function_list']},
+                sorted((flow.name, fun.name) for flow, fun in p_xml_dict['xml_consumer_function_list']),
+                sorted((flow.name, fun.name) for flow, fun in p_xml_dict['xml_producer_function_list']))
+
+    file_name = "test_show_model_unchanged_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_function_simple_decomposition[0]}\n"
+                         f"{input_test_function_simple_decomposition[1]}\n"
+                         f"{input_test_function_simple_decomposition[2]}\n"
+                         f"{input_test_function_simple_decomposition[3]}\n")
+    expected = get_model_snapshot(jarvis4se.session.xml_dict)
+
+    spy = mocker.spy(XmlParser3SE, "parse_xml")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show decomposition F1\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show context F1\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show context F11\n")
+
+    assert spy.call_count == 0
+    assert get_model_snapshot(jarvis4se.session.xml_dict) == expected
+    assert get_model_snapshot(xml_parser.parse_xml(file_name + ".xml")) == expected
+
+    test_lib.remove_xml_file(file_name)
+
+
+def test_show_diagram_cache_xml(mocker, monkeypatch, input_test_function_simple_decomposition):
+    """@ingroup test_xml_file
+    @anchor test_show_diagram_cache_xml
+    Test that a diagram is generated again only when the model has changed, and that diagram files are reused
+    without calling the PlantUml server
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] monkeypatch : monkeypatch fixture reference
+    @param[in] input_test_function_simple_decomposition : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_function_simple_decomposition
+    """
+    file_name = "test_show_diagram_cache_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_function_simple_decomposition[0]}\n"
+                         f"{input_test_function_simple_decomposition[1]}\n")
+
+    monkeypatch.setattr(Config, "is_diagram_file", True)
+    response = mocker.Mock(content=b"<svg/>")
+    request_spy = mocker.patch.object(plantuml_connector.requests.Session, "get", return_value=response)
+    show_spy = mocker.spy(diagram_generator, "filter_show_command")
+
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show decomposition F1\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show decomposition  F1\n")
+    jarvis4se.parser.wait_diagrams()
+    # Same diagram on the same model, whether already rendered or still being rendered
+    assert show_spy.call_count == 1
+    assert request_spy.call_count == 1
+    assert request_spy.call_args.kwargs["timeout"] == plantuml_connector.PlantUmlConnector.request_timeout
+
+    svg_file_path = DiagramCache.get_svg_file_path(show_spy.spy_return)
+    assert os.path.isfile(svg_file_path)
+
+    # Model change
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_function_simple_decomposition[2]}\n"
+                         "show decomposition F1\n")
+    jarvis4se.parser.wait_diagrams()
+    assert show_spy.call_count == 2
+    assert request_spy.call_count == 2
+
+    # Diagram file already written
+    jarvis4se.parser.diagram_cache.clear()
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show decomposition F1\n")
+    jarvis4se.parser.wait_diagrams()
+    assert show_spy.call_count == 3
+    assert request_spy.call_count == 2
+
+    shutil.rmtree(os.path.dirname(svg_file_path))
+    test_lib.remove_xml_file(file_name)
+
+
+
+def test_show_diagram_view_cache_xml(mocker):
+    """@ingroup test_xml_file
+    @anchor test_show_diagram_view_cache_xml
+    Test that a diagram is generated again when the active view has changed, even if the model has not
+
+    @param[in] mocker : mocker fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_show_diagram_view_cache_xml
+        F is a function
+        F1 is a function
+        F3 is a function
+        F is composed of F1
+        F is composed of F3
+        under V
+        consider F, F1
+        ========================================
+        with test_show_diagram_view_cache_xml
+        show decomposition F
+        ========================================
+        with test_show_diagram_view_cache_xml
+        under V
+        show decomposition F
+    """
+    file_name = "test_show_diagram_view_cache_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F is a function\n"
+                         "F1 is a function\n"
+                         "F3 is a function\n"
+                         "F is composed of F1\n"
+                         "F is composed of F3\n"
+                         "under V\n"
+                         "consider F, F1\n")
+
+    show_spy = mocker.spy(diagram_generator, "filter_show_command")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show decomposition F\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "under V\n"
+                         "show decomposition F\n")
+    jarvis4se.parser.wait_diagrams()
+
+    test_lib.remove_xml_file(file_name)
+
+    assert show_spy.call_count == 2
+    assert 'F3' in show_spy.spy_return_list[0]
+    assert 'F3' not in show_spy.spy_return_list[1]
+
+
+def test_show_diagram_async_xml(mocker, monkeypatch, input_test_function_simple_decomposition):
+    """@ingroup test_xml_file
+    @anchor test_show_diagram_async_xml
+    Test that diagram files are rendered in background, concurrently, a placeholder being displayed until then
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] monkeypatch : monkeypatch fixture reference
+    @param[in] input_test_function_simple_decomposition : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_function_simple_decomposition
+    """
+    file_name = "test_show_diagram_async_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_function_simple_decomposition[0]}\n"
+                         f"{input_test_function_simple_decomposition[1]}\n")
+
+    monkeypatch.setattr(Config, "is_diagram_file", True)
+    render_barrier = threading.Barrier(3, timeout=10)
+
+    def render(p_plantuml_text):
+        render_barrier.wait()
+        return b"<svg/>"
+
+    mocker.patch.object(jarvis4se.parser.generator, "get_diagram_svg", side_effect=render)
+    show_spy = mocker.spy(diagram_generator, "filter_show_command")
+
+    # Both diagrams are being rendered when the commands return
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show decomposition F1\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show context F11\n")
+    svg_file_path_list = [DiagramCache.get_svg_file_path(text) for text in show_spy.spy_return_list]
+    assert len(jarvis4se.parser.pending_diagram_dict) == 2
+    assert not any(os.path.isfile(svg_file_path) for svg_file_path in svg_file_path_list)
+
+    render_barrier.wait()
+    jarvis4se.parser.wait_diagrams()
+    assert all(os.path.isfile(svg_file_path) for svg_file_path in svg_file_path_list)
+
+    shutil.rmtree(os.path.dirname(svg_file_path_list[0]))
+    test_lib.remove_xml_file(file_name)
+
+
+def test_export_diagrams_xml(mocker, input_test_function_simple_decomposition):
+    """@ingroup test_xml_file
+    @anchor test_export_diagrams_xml
+    Test that the diagrams of a model are exported as PlantUml text and .svg files
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] input_test_function_simple_decomposition : input fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+    @ref input_test_function_simple_decomposition
+
+        E1 is a functional element
+        E11 is a functional element
+        E11 composes E1
+        S1 is a state
+        S1 is allocated to E1
+    """
+    file_name = "test_export_diagrams_xml"
+    output_folder = f"{file_name}_folder"
+    render_spy = mocker.patch.object(jarvis4se.parser.generator, "get_diagram_svg", return_value=b"<svg/>")
+
+    # Model modifications are written before export
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"{input_test_function_simple_decomposition[0]}\n"
+                         f"{input_test_function_simple_decomposition[1]}\n"
+                         "E1 is a functional element\n"
+                         "E11 is a functional element\n"
+                         "E11 composes E1\n"
+                         "S1 is a state\n"
+                         "S1 is allocated to E1\n"
+                         f"export diagrams to {output_folder}\n")
+
+    expected = {"context_F1", "context_F11", "decomposition_E1", "state_E1"}
+    assert render_spy.call_count == len(expected)
+    assert {os.path.splitext(f)[0] for f in os.listdir(output_folder) if f.endswith(".svg")} == expected
+    assert {os.path.splitext(f)[0] for f in os.listdir(output_folder) if f.endswith(".puml")} == expected
+    assert Path(output_folder, "context_F1.puml").read_text(encoding="utf-8").startswith("@startuml")
+
+    # Export is not handled as csv export
+    assert not os.path.isfile(f"diagrams to {output_folder}.csv")
+
+    shutil.rmtree(output_folder)
+    test_lib.remove_xml_file(file_name)
+
+
+def test_delete_objects_xml(mocker):
+    """@ingroup test_xml_file
+    @anchor test_delete_objects_xml
+    Test that objects without relationship are deleted at once, and that objects with relationships are kept
+
+    @param[in] mocker : mocker fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_delete_objects_xml
+        F1 is a function
+        F2 is a function
+        F3 is a function
+        a is a data
+        F1 produces a
+        S1 is a state
+        S2 is a state
+        E1 is a functional element
+        E1 allocates S2
+        T1 is a transition
+        ========================================
+        with test_delete_objects_xml
+        delete F1
+        delete F2
+        delete F3
+        delete a
+        delete S1
+        delete S2
+        delete T1
+    """
+    file_name = "test_delete_objects_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F1 is a function\n"
+                         "F2 is a function\n"
+                         "F3 is a function\n"
+                         "a is a data\n"
+                         "F1 produces a\n"
+                         "S1 is a state\n"
+                         "S2 is a state\n"
+                         "E1 is a functional element\n"
+                         "E1 allocates S2\n"
+                         "T1 is a transition\n")
+
+    delete_spy = mocker.spy(XmlWriter3SE, "delete_object")
+    index_spy = mocker.spy(ReferenceIndex, "__init__")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "delete F1\n"
+                         "delete F2\n"
+                         "delete F3\n"
+                         "delete a\n"
+                         "delete S1\n"
+                         "delete S2\n"
+                         "delete T1\n")
+
+    assert delete_spy.call_count == 1
+    assert index_spy.call_count == 1
+
+    obj_dict = xml_parser.parse_xml(file_name + ".xml")
+
+    test_lib.remove_xml_file(file_name)
+
+    assert {f.name for f in obj_dict['xml_function_list']} == {'F1'}
+    assert {d.name for d in obj_dict['xml_data_list']} == {'a'}
+    assert {s.name for s in obj_dict['xml_state_list']} == {'S2'}
+    assert not obj_dict['xml_transition_list']
+
+
+def test_journal_xml(mocker, monkeypatch):
+    """@ingroup test_xml_file
+    @anchor test_journal_xml
+    Test that, in journal mode, modifications are appended to the journal without rewriting the XML file, that the
+    journal is replayed when parsing the XML file and that compaction folds the journal into the XML file
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] monkeypatch : monkeypatch fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_journal_xml
+        F1 is a function
+        F2 is a function
+        a is a data
+        F1 produces a
+        ========================================
+        with test_journal_xml
+        delete F2
+    """
+    file_name = "test_journal_xml"
+    monkeypatch.setattr(Config, "is_journal", True)
+    write_spy = mocker.spy(XmlWriter3SE, "write_file")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F1 is a function\n"
+                         "F2 is a function\n"
+                         "a is a data\n"
+                         "F1 produces a\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "delete F2\n")
+
+    # XML file only written at creation
+    assert write_spy.call_count == 1
+    assert "F1" not in Path(file_name + ".xml").read_text(encoding="utf-8")
+    journal_file = file_name + ".journal"
+    assert os.path.isfile(journal_file)
+
+    # Record truncated by a crash
+    with open(journal_file, "a", encoding="utf-8") as file_writer:
+        file_writer.write('{"op": "set", "par')
+
+    obj_dict = xml_parser.parse_xml(file_name + ".xml")
+    assert {f.name for f in obj_dict['xml_function_list']} == {'F1'}
+    assert [[d.name, f.name] for d, f in obj_dict['xml_producer_function_list']] == [['a', 'F1']]
+
+    jarvis4se.session.xml_dict['output_xml'].compact()
+    assert not os.path.isfile(journal_file)
+    assert "F1" in Path(file_name + ".xml").read_text(encoding="utf-8")
+
+    obj_dict = xml_parser.parse_xml(file_name + ".xml")
+
+    test_lib.remove_xml_file(file_name)
+
+    assert {f.name for f in obj_dict['xml_function_list']} == {'F1'}
+    assert [[d.name, f.name] for d, f in obj_dict['xml_producer_function_list']] == [['a', 'F1']]
+
+
+def test_snapshot_xml(mocker):
+    """@ingroup test_xml_file
+    @anchor test_snapshot_xml
+    Test that the model is loaded from its snapshot, with the links between objects, as long as the snapshot
+    matches the XML file
+
+    @param[in] mocker : mocker fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_snapshot_xml
+        F is a function
+        F1 is a function
+        F2 is a function
+        F is composed of F1
+        F is composed of F2
+        a is a data
+        F1 produces a
+        F2 consumes a
+        E is a functional element
+        E allocates F
+        ========================================
+        with test_snapshot_xml
+        F3 is a function
+    """
+    file_name = "test_snapshot_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F is a function\n"
+                         "F1 is a function\n"
+                         "F2 is a function\n"
+                         "F is composed of F1\n"
+                         "F is composed of F2\n"
+                         "a is a data\n"
+                         "F1 produces a\n"
+                         "F2 consumes a\n"
+                         "E is a functional element\n"
+                         "E allocates F\n")
+
+    parse_spy = mocker.spy(XmlParser3SE, "parse_function_list")
+    XmlParser3SE().parse_xml(file_name + ".xml")
+    assert parse_spy.call_count == 1
+    assert os.path.isfile(file_name + ".jcache")
+
+    obj_dict = XmlParser3SE().parse_xml(file_name + ".xml")
+    assert parse_spy.call_count == 1
+
+    function = obj_dict['xml_function_list'].get_by_name('F')
+    assert {f.name for f in function.child_list} == {'F1', 'F2'}
+    assert all(f.parent is function for f in function.child_list)
+    assert [[d.name, f.name] for d, f in obj_dict['xml_consumer_function_list']] == [['a', 'F2']]
+    assert obj_dict['xml_consumer_function_list'].get_flow_list(
+        obj_dict['xml_function_list'].get_by_name('F2'))[0] is obj_dict['xml_data_list'].get_by_name('a')
+    assert function.id in obj_dict['xml_fun_elem_list'].get_by_name('E').allocated_function_list
+
+    # Garbage collector is left disabled if it was
+    gc.disable()
+    try:
+        XmlParser3SE().parse_xml(file_name + ".xml")
+        is_gc_enabled = gc.isenabled()
+    finally:
+        gc.enable()
+    assert not is_gc_enabled
+    assert parse_spy.call_count == 1
+
+    # Snapshot no longer matches the XML file
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F3 is a function\n")
+    obj_dict = XmlParser3SE().parse_xml(file_name + ".xml")
+    assert parse_spy.call_count == 2
+    assert 'F3' in {f.name for f in obj_dict['xml_function_list']}
+
+    # Corrupted snapshot
+    Path(file_name + ".jcache").write_bytes(b"corrupted")
+    obj_dict = XmlParser3SE().parse_xml(file_name + ".xml")
+
+    test_lib.remove_xml_file(file_name)
+
+    assert parse_spy.call_count == 3
+    assert 'F3' in {f.name for f in obj_dict['xml_function_list']}
+
+
+def test_lazy_xml(mocker):
+    """@ingroup test_xml_file
+    @anchor test_lazy_xml
+    Test that the sections of a lazily parsed model are only parsed on first access, with the sections they depend on
+
+    @param[in] mocker : mocker fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_lazy_xml
+        Safety function extends function
+        F is a Safety function
+        F1 is a function
+        F is composed of F1
+        a is a data
+        F1 produces a
+        REQ is a requirement
+        E is a physical element
+    """
+    file_name = "test_lazy_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "Safety function extends function\n"
+                         "F is a Safety function\n"
+                         "F1 is a function\n"
+                         "F is composed of F1\n"
+                         "a is a data\n"
+                         "F1 produces a\n"
+                         "REQ is a requirement\n"
+                         "E is a physical element\n")
+
+    spy_dict = {section: mocker.spy(XmlParser3SE, section) for section in
+                ("parse_type_list", "parse_function_list", "parse_data_list", "parse_requirement_list",
+                 "parse_physical_element_list")}
+    obj_dict = XmlParser3SE().parse_xml(file_name + ".xml", p_is_lazy=True)
+    assert not any(spy.call_count for spy in spy_dict.values())
+
+    assert obj_dict['xml_requirement_list'].get_by_name('REQ') is not None
+    assert {section for section, spy in spy_dict.items() if spy.call_count} == \
+           {"parse_type_list", "parse_requirement_list"}
+
+    # Producers of data are functions
+    assert sorted([d.name, f.name] for d, f in obj_dict['xml_producer_function_list']) == [['a', 'F'], ['a', 'F1']]
+    assert {section for section, spy in spy_dict.items() if spy.call_count} == \
+           {"parse_type_list", "parse_requirement_list", "parse_data_list", "parse_function_list"}
+    function = obj_dict['xml_function_list'].get_by_name('F')
+    assert function.type is obj_dict['xml_type_list'].get_by_name('Safety function')
+    assert obj_dict['xml_producer_function_list'].get_flow_list(function) == \
+           [obj_dict['xml_data_list'].get_by_name('a')]
+
+    # Projection does not load the other sections
+    projection = XmlProjection3SE(obj_dict)
+    assert not spy_dict["parse_physical_element_list"].call_count
+    assert projection.xml_dict['xml_function_list'].get_by_name('F') is not function
+    assert projection.xml_dict['xml_phy_elem_list'].get_by_name('E') is not None
+    assert spy_dict["parse_physical_element_list"].call_count == 1
+    assert type(obj_dict['xml_phy_elem_list']) is IndexedObjectSet
+    # Lazy projection only copies the sections read
+    projection = XmlProjection3SE(obj_dict, p_is_lazy=True)
+    assert not projection.projected_section_set
+    assert projection.xml_dict['xml_requirement_list'].get_by_name('REQ') is not \
+           obj_dict['xml_requirement_list'].get_by_name('REQ')
+    assert projection.projected_section_set == {"typeList", "requirementList"}
+    # Snapshot is not written
+    is_snapshot = os.path.isfile(file_name + ".jcache")
+
+    test_lib.remove_xml_file(file_name)
+
+    assert not is_snapshot
+
+
+def test_lazy_command_xml(mocker, monkeypatch):
+    """@ingroup test_xml_file
+    @anchor test_lazy_command_xml
+    Test that, in lazy mode, looking up objects by name and checking their referrers only parse the sections that may
+    hold them
+
+    @param[in] mocker : mocker fixture reference
+    @param[in] monkeypatch : monkeypatch fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_lazy_command_xml
+        F is a function
+        F1 is a function
+        S is a state
+        E is a physical element
+        ========================================
+        with test_lazy_command_xml
+        delete E
+        ========================================
+        with test_lazy_command_xml
+        delete S
+    """
+    file_name = "test_lazy_command_xml"
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F is a function\n"
+                         "F1 is a function\n"
+                         "S is a state\n"
+                         "E is a physical element\n")
+
+    monkeypatch.setattr(Config, "is_lazy", True)
+    lazy_jarvis4se = test_lib.get_jarvis4se()[0]
+    spy_dict = {section: mocker.spy(XmlParser3SE, parse_method_name)
+                for section, (_, parse_method_name, _) in XmlSectionDict.items()}
+    lazy_jarvis4se.jarvis("", f"with {file_name}\n"
+                              "delete E\n")
+    parsed_section_set = {section for section, spy in spy_dict.items() if spy.call_count}
+
+    # Referrers of a state are transitions (source, destination) and allocating objects
+    lazy_jarvis4se.jarvis("", f"with {file_name}\n"
+                              "delete S\n")
+    state_parsed_section_set = {section for section, spy in spy_dict.items() if spy.call_count}
+
+    obj_dict = XmlParser3SE().parse_xml(file_name + ".xml")
+
+    test_lib.remove_xml_file(file_name)
+
+    assert parsed_section_set == {"typeList", "physicalElementList"}
+    assert state_parsed_section_set == {"typeList", "physicalElementList", "stateList"}
+    assert {f.name for f in obj_dict['xml_function_list']} == {'F', 'F1'}
+    assert not obj_dict['xml_phy_elem_list']
+    assert not obj_dict['xml_state_list']
+
+
+def test_sub_model_xml():
+    """@ingroup test_xml_file
+    @anchor test_sub_model_xml
+    Test that the sub-models of a model are only loaded when one of their objects is named or referred to, and that
+    their objects are written within their own XML file
+
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_sub_model_power_xml
+        P is a physical element
+        P1 is a physical element
+        P is composed of P1
+        ========================================
+        with test_sub_model_avionics_xml
+        A is a physical element
+        ========================================
+        with test_sub_model_xml
+        include test_sub_model_power_xml
+        include test_sub_model_avionics_xml
+        S is a physical element
+        ========================================
+        with test_sub_model_xml
+        S is composed of P
+        ========================================
+        with test_sub_model_xml
+        The alias of P1 is p1
+    """
+    file_name = "test_sub_model_xml"
+    power_file_name = "test_sub_model_power_xml"
+    avionics_file_name = "test_sub_model_avionics_xml"
+    jarvis4se.jarvis("", f"with {power_file_name}\n"
+                         "P is a physical element\n"
+                         "P1 is a physical element\n"
+                         "P is composed of P1\n")
+    jarvis4se.jarvis("", f"with {avionics_file_name}\n"
+                         "A is a physical element\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"include {power_file_name}\n"
+                         f"include {avionics_file_name}\n"
+                         "S is a physical element\n")
+    assert not jarvis4se.session.sub_model_file_list
+
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "S is composed of P\n")
+    sub_model_file_list = jarvis4se.session.sub_model_file_list
+    phy_elem_name_set = {p.name for p in jarvis4se.session.xml_dict['xml_phy_elem_list']}
+
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "The alias of P1 is p1\n")
+    obj_dict = XmlParser3SE().parse_xml(file_name + ".xml")
+    root_phy_elem_name_set = {p.name for p in obj_dict['xml_phy_elem_list']}
+    obj_dict = XmlParser3SE().parse_xml(power_file_name + ".xml")
+    power_alias = obj_dict['xml_phy_elem_list'].get_by_name('P1').alias
+
+    # Sub-model is loaded through the reference of S to P
+    session = XmlSession3SE()
+    obj_dict = session.open(file_name, "S is a physical element")
+    session_sub_model_file_list = session.sub_model_file_list
+    child_name_list = [c.name for c in obj_dict['xml_phy_elem_list'].get_by_name('S').child_list]
+
+    for xml_file_name in (file_name, power_file_name, avionics_file_name):
+        test_lib.remove_xml_file(xml_file_name)
+
+    assert sub_model_file_list == [power_file_name + ".xml"]
+    assert phy_elem_name_set == {'S', 'P', 'P1'}
+    assert root_phy_elem_name_set == {'S'}
+    assert power_alias == 'p1'
+    assert session_sub_model_file_list == [power_file_name + ".xml"]
+    assert child_name_list == ['P']
+
+
+def test_sub_model_export_xml(mocker):
+    """@ingroup test_xml_file
+    @anchor test_sub_model_export_xml
+    Test that the diagrams of the sub-models loaded within the session are exported, and that the sub-models declared
+    by a model are only read again when its XML file has changed
+
+    @param[in] mocker : mocker fixture reference
+    @return None
+
+    **Jarvis4se equivalent:**
+
+        with test_sub_model_export_power_xml
+        F1 is a function
+        ========================================
+        with test_sub_model_export_xml
+        include test_sub_model_export_power_xml
+        F is a function
+        ========================================
+        with test_sub_model_export_xml
+        F is composed of F1
+        ========================================
+        with test_sub_model_export_xml
+        export diagrams to test_sub_model_export_xml_folder
+        ========================================
+        with test_sub_model_export_xml
+        show context F1
+    """
+    file_name = "test_sub_model_export_xml"
+    power_file_name = "test_sub_model_export_power_xml"
+    output_folder = f"{file_name}_folder"
+    mocker.patch.object(jarvis4se.parser.generator, "get_diagram_svg", return_value=b"<svg/>")
+    jarvis4se.jarvis("", f"with {power_file_name}\n"
+                         "F1 is a function\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"include {power_file_name}\n"
+                         "F is a function\n")
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "F is composed of F1\n")
+
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         f"export diagrams to {output_folder}\n")
+    svg_file_set = {os.path.splitext(f)[0] for f in os.listdir(output_folder) if f.endswith(".svg")}
+
+    # Model is unchanged since last cell
+    iterparse_spy = mocker.patch.object(xml_manifest.etree, "iterparse", wraps=xml_manifest.etree.iterparse)
+    jarvis4se.jarvis("", f"with {file_name}\n"
+                         "show context F1\n")
+    iterparse_call_count = iterparse_spy.call_count
+
+    shutil.rmtree(output_folder)
+    for xml_file_name in (file_name, power_file_name):
+        test_lib.remove_xml_file(xml_file_name)
+
+    assert svg_file_set == {"context_F", "context_F1"}
+    assert iterparse_call_count == 0